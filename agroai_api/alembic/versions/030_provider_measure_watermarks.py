@@ -0,0 +1,50 @@
+"""Add per-measure provider sync watermarks.
+
+Revision ID: 030_provider_measure_watermarks
+Revises: 029_platform_cli_device_auth
+Create Date: 2026-10-18
+
+Stores the newest persisted data point per (tenant, provider, connection,
+measure) so scheduled provider syncs request only data newer than the last
+stored point (minus a small overlap for late arrivals) instead of refetching
+the full lookback window every cycle.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "030_provider_measure_watermarks"
+down_revision = "029_platform_cli_device_auth"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "provider_measure_watermarks",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("connection_key", sa.String(), nullable=False),
+        sa.Column("measure_id", sa.String(), nullable=False),
+        sa.Column("high_water_mark", sa.DateTime(), nullable=False),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "tenant_id", "provider", "connection_key", "measure_id",
+            name="uq_provider_measure_watermark",
+        ),
+    )
+    op.create_index(
+        "ix_provider_measure_watermarks_tenant_id",
+        "provider_measure_watermarks",
+        ["tenant_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_provider_measure_watermarks_tenant_id", table_name="provider_measure_watermarks")
+    op.drop_table("provider_measure_watermarks")
@@ -0,0 +1,54 @@
+"""Add sharded Platform API credit counters.
+
+Revision ID: 031_platform_credit_shards
+Revises: 030_provider_measure_watermarks
+Create Date: 2026-10-18
+
+Holds per-period credit usage in N shard rows per organization so
+concurrent credit reservations lock one shard instead of serializing on the
+organization row.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "031_platform_credit_shards"
+down_revision = "030_provider_measure_watermarks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platform_credit_shards",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column(
+            "organization_id",
+            sa.String(),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("billing_period_key", sa.String(), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("included_credits", sa.Integer(), nullable=True),
+        sa.Column("capacity_credits", sa.Integer(), nullable=True),
+        sa.Column("used_credits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint(
+            "organization_id", "billing_period_key", "shard",
+            name="uq_platform_credit_shard",
+        ),
+    )
+    op.create_index(
+        "ix_platform_credit_shards_organization_id",
+        "platform_credit_shards",
+        ["organization_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_platform_credit_shards_organization_id", table_name="platform_credit_shards")
+    op.drop_table("platform_credit_shards")
@@ -0,0 +1,63 @@
+"""Add Platform API webhook endpoint circuit state.
+
+Revision ID: 032_webhook_endpoint_health
+Revises: 031_platform_credit_shards
+Create Date: 2026-10-18
+
+One row per webhook endpoint that has failed deliveries. It records the
+circuit state (closed, open or half_open), the consecutive failures and
+openings, and the single in-flight probe delivery.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "032_webhook_endpoint_health"
+down_revision = "031_platform_credit_shards"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platform_webhook_endpoint_health",
+        sa.Column(
+            "endpoint_id",
+            sa.String(),
+            sa.ForeignKey("platform_webhook_endpoints.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "organization_id",
+            sa.String(),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("state", sa.String(), nullable=False, server_default="closed"),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("open_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("open_until", sa.DateTime(), nullable=True),
+        sa.Column("probe_outbox_id", sa.String(), nullable=True),
+        sa.Column("probe_claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("last_failure_at", sa.DateTime(), nullable=True),
+        sa.Column("last_success_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_platform_webhook_endpoint_health_organization_id",
+        "platform_webhook_endpoint_health",
+        ["organization_id"],
+    )
+    op.create_index(
+        "ix_platform_webhook_endpoint_health_state",
+        "platform_webhook_endpoint_health",
+        ["state"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_platform_webhook_endpoint_health_state", table_name="platform_webhook_endpoint_health")
+    op.drop_index("ix_platform_webhook_endpoint_health_organization_id", table_name="platform_webhook_endpoint_health")
+    op.drop_table("platform_webhook_endpoint_health")
@@ -0,0 +1,47 @@
+"""Add stored page text for uploaded PDF sources.
+
+Revision ID: 033_data_source_text_pages
+Revises: 032_webhook_endpoint_health
+Create Date: 2026-10-18
+
+One row per non-empty page of an uploaded PDF, keyed by tenant and content
+hash. The connector worker extracts the text once on ingest, and
+intelligence context reads it back without downloading the object.
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "033_data_source_text_pages"
+down_revision = "032_webhook_endpoint_health"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_source_text_pages",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("tenant_id", sa.String(), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("page_number", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_data_source_text_pages_id", "data_source_text_pages", ["id"])
+    op.create_index("ix_data_source_text_pages_tenant_id", "data_source_text_pages", ["tenant_id"])
+    op.create_index(
+        "uq_data_source_text_page",
+        "data_source_text_pages",
+        ["tenant_id", "content_sha256", "page_number"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_data_source_text_page", table_name="data_source_text_pages")
+    op.drop_index("ix_data_source_text_pages_tenant_id", table_name="data_source_text_pages")
+    op.drop_index("ix_data_source_text_pages_id", table_name="data_source_text_pages")
+    op.drop_table("data_source_text_pages")
@@ -28,6 +28,7 @@ from app.schemas.ai import (
     VerificationResult,
 )
 from app.services.ai_gateway import parse_model_json
+from app.services.ai_response_cache import ResponseCacheScope
 from app.services.evaluation_seed import ensure_evaluation_context
 from app.services.model_router import ModelRouter
 
@@ -469,6 +470,7 @@ async def _run_ai(
     history: list[dict[str, Any]] | None = None,
     audience: str | None = None,
     uploaded_evidence: list[dict[str, Any]] | None = None,
+    cache_scope: ResponseCacheScope | None = None,
 ) -> tuple[dict[str, Any], Any]:
     router = ModelRouter()
     if is_local_ai():
@@ -484,6 +486,7 @@ async def _run_ai(
             messages=messages,
             temperature=temperature,
             response_format=None,
+            cache_scope=cache_scope,
         )
         answer = str(result.content or "").strip()
         if not answer or result.status != "ok":
@@ -508,7 +511,7 @@ async def _run_ai(
             ),
         },
     ]
-    plan_result, _selection = await router.run(task=model_task, messages=planner_messages, temperature=0.1, response_format={"type": "json_object"})
+    plan_result, _selection = await router.run(task=model_task, messages=planner_messages, temperature=0.1, response_format={"type": "json_object"}, cache_scope=cache_scope)
     plan_body = parse_model_json(plan_result.content)
 
     if plan_result.status != "ok" or plan_result.demo_fallback or plan_body.get("_safe_mode"):
@@ -528,7 +531,7 @@ async def _run_ai(
             ),
         },
     ]
-    answer_result, _selection = await router.run(task=model_task, messages=final_messages, temperature=temperature, response_format={"type": "json_object"})
+    answer_result, _selection = await router.run(task=model_task, messages=final_messages, temperature=temperature, response_format={"type": "json_object"}, cache_scope=cache_scope)
     body = parse_model_json(answer_result.content)
     if answer_result.status == "ok" and not _looks_like_json_object(answer_result.content):
         body["_safe_mode"] = True
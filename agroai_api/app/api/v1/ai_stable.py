@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+from contextlib import aclosing
 from typing import Any
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
@@ -18,10 +20,14 @@ from app.api.v1.brain import (
 from app.core.security import require_current_tenant_id
 from app.db.base import get_db
 from app.models.saas import Organization, User
-from app.schemas.ai import ChatRequest, ChatResponse
+from app.schemas.ai import ChatRequest, ChatResponse, EvidenceContext
+from app.services.ai_gateway import AIGatewayResult
 from app.services.ai_gateway import parse_model_json
+from app.services.ai_response_cache import response_cache_scope
+from app.services.citation_verifier import verify_citations
 from app.services.intelligence_context import build_intelligence_context
-from app.services.language import language_matches_target, resolve_language
+from app.services.language import LanguageDecision, language_matches_target, resolve_language
+from app.services.live_intelligence import LiveIntelligence
 from app.services.model_router import ModelRouter
 from app.services.quota import commit_reservation, release_reservation, reserve_quota
 from app.services.resilient_intelligence import run_resilient_intelligence
@@ -35,6 +41,15 @@ Return customer-safe JSON only using this shape:
 Never invent live telemetry, integrations, water use, compliance status, yield, savings, or customer facts. Use only supplied context. Do not expose runtime/provider/debug details."""
 
 
+STREAM_SYSTEM = """You are AGRO-AI, the agriculture operations intelligence layer.
+Answer in plain customer-facing text, without JSON, code fences, or <think> tags.
+Never invent live telemetry, integrations, water use, compliance status, yield, savings, or customer facts. Use only supplied context. Do not expose runtime/provider/debug details."""
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
 def _normalize(body: dict[str, Any], fallback: dict[str, Any]) -> dict[str, Any]:
     if not isinstance(body, dict):
         return fallback
@@ -111,6 +126,7 @@ async def resilient_intelligence_run(
             question=payload.question,
             messages=messages,
             preferred_language=payload.preferred_language,
+            cache_scope=response_cache_scope(bundle, tenant_id=tenant_id),
         )
         commit_reservation(
             db,
@@ -199,3 +215,100 @@ async def chat(payload: ChatRequest, tenant_id: str = Depends(require_current_te
         verification=_verification(result.status, context),
         raw={**body, "language": language.__dict__},
     )
+
+
+async def _finish_streamed_chat(
+    result: AIGatewayResult | None,
+    *,
+    payload: ChatRequest,
+    context: EvidenceContext,
+    language: LanguageDecision,
+    fallback: dict[str, Any],
+    tenant_id: str,
+) -> ChatResponse:
+    """Language repair and citation checks over the streamed answer, run once it is complete."""
+    result = result or AIGatewayResult(status="unavailable", content="", provider="offline", model=None, error="stream ended without a result")
+    answer = result.content.strip() if result.status == "ok" and not result.demo_fallback else ""
+    language_failed = False
+    if answer and not language_matches_target(answer, language.response_code):
+        runtime = LiveIntelligence()
+        finished = await runtime.finish_lane(
+            answer,
+            result.model or "",
+            result.provider,
+            language.response_code,
+            language.response_name,
+            runtime.profile("chat", payload.message),
+            runtime.remote(),
+            allow_remote_repair=True,
+        )
+        answer = finished.content.strip() if finished.status == "ok" else ""
+        language_failed = not answer
+    body = local_plain_body(answer, context, question=payload.message) if answer else fallback
+    verification, body = verify_citations(
+        citations=context.citations,
+        result=body,
+        tenant_id=tenant_id,
+        workspace_id=context.workspace_id,
+    )
+    if not answer:
+        verification = _verification("unavailable", context)
+    raw = {**body, "language": language.__dict__}
+    if language_failed:
+        raw["error"] = "language_generation_failed"
+    return ChatResponse(
+        status="ok" if answer else "unavailable",
+        output=str(body.get("answer") or body.get("summary") or fallback["summary"]),
+        provider=result.provider,
+        model=result.model,
+        demo_fallback=result.demo_fallback,
+        evidence_context=context,
+        citations=verification.citations,
+        verification=verification,
+        raw=raw,
+    )
+
+
+@router.post("/ai/chat/stream")
+async def chat_stream(payload: ChatRequest, tenant_id: str = Depends(require_current_tenant_id), db: Session = Depends(get_db)) -> StreamingResponse:
+    """Server-sent events variant of ``/ai/chat``.
+
+    ``delta`` events carry answer text as the model generates it. A single
+    ``done`` event then carries the full :class:`ChatResponse`, after the
+    answer has been cleaned, checked for the requested language (and
+    repaired if needed) and had its citations verified. Its ``output``
+    replaces the streamed text.
+    """
+    context = _get_evidence_context(db=db, tenant_id=tenant_id, block_id=payload.block_id, workspace_id=payload.workspace_id)
+    language = resolve_language(payload.preferred_language, payload.message)
+    fallback = _deterministic_body(context, user_instruction=payload.message, task="chat")
+    evidence_json = json.dumps(context.model_dump(mode="python"), default=str)[:9000]
+    messages = [
+        {"role": "system", "content": STREAM_SYSTEM},
+        {"role": "user", "content": f"{language.instruction}\n\nUser request: {payload.message}\n\nEvidence context JSON: {evidence_json}"},
+    ]
+    router_model = ModelRouter()
+
+    async def events():
+        result: AIGatewayResult | None = None
+        async with aclosing(router_model.stream(task="chat", messages=messages, temperature=payload.temperature)) as stream:
+            async for event in stream:
+                if event.result is not None:
+                    result = event.result
+                elif event.delta:
+                    yield _sse("delta", {"text": event.delta})
+        response = await _finish_streamed_chat(
+            result,
+            payload=payload,
+            context=context,
+            language=language,
+            fallback=fallback,
+            tenant_id=tenant_id,
+        )
+        yield _sse("done", response.model_dump(mode="json"))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,13 +6,13 @@ from pathlib import Path
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from app.api.v1.connector_hub import ingest_upload
+from app.api.v1.connector_hub import ingest_spooled_upload
 from app.api.v1.connectors import public_connection
 from app.core.security import require_current_tenant_id
 from app.db.base import get_db
 from app.models.operational_records import ConnectorConnection
 from app.services.durable_ingestion_staging import stage_durable_object_job
-from app.services.ingestion_stream import read_spooled_bytes, stream_upload_to_spool
+from app.services.ingestion_stream import stream_upload_to_spool
 from app.services.object_storage import get_object_store, object_storage_configured
 from app.services.redis_task_queue import queue_configured
 from app.services.task_outbox_service import drain_pending_outbox
@@ -97,14 +97,13 @@ async def upload_connection_stream(
             Path(receipt.path).unlink(missing_ok=True)
 
     try:
-        data = read_spooled_bytes(receipt)
-        return ingest_upload(
+        return ingest_spooled_upload(
             db,
             tenant_id=tenant_id,
             connection=connection,
             filename=receipt.filename,
             content_type=receipt.content_type,
-            data=data,
+            receipt=receipt,
         )
     except HTTPException:
         raise
@@ -3,22 +3,25 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterable, Literal
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.api.v1.connectors import (
+    ParsedUpload,
     _create_evidence_rows,
     _job,
     create_or_get_connection,
     evidence_public,
     parse_rows,
+    parse_upload_stream,
     public_connection,
     safe_credential_ref,
     sanitize_config,
     save_upload_bytes,
+    save_upload_file,
     suggest_mapping,
     verify_connector_schema,
 )
@@ -26,9 +29,10 @@ from app.api.v1.source_library import source_public
 from app.core.security import require_current_tenant_id
 from app.db.base import get_db
 from app.models.operational_records import ConnectorConnection, DataSource, EvidenceRecord, IngestionJob
-from app.services.ingestion_stream import read_spooled_bytes, stream_upload_to_spool
+from app.services.ingestion_stream import StreamedUpload, iter_spooled_chunks, stream_upload_to_spool
 from app.services.oauth_state import sign_oauth_state
 from app.services.oauth_urls import oauth_url
+from app.services.source_text_jobs import queue_source_text_extraction
 import app.services.connector_commercial_guard as _connector_commercial_guard  # noqa: F401,E402
 
 router = APIRouter(tags=["connector-hub-actions"])
@@ -175,11 +179,42 @@ def _job_customer_safe(job: IngestionJob) -> dict[str, Any]:
     }
 
 
-def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnection, filename: str, content_type: str | None, data: bytes) -> dict[str, Any]:
+def _require_upload_provider(connection: ConnectorConnection) -> None:
     if connection.provider not in UPLOAD_PROVIDERS:
         raise HTTPException(status_code=400, detail="This connector does not accept file uploads. Use account/API connection instead.")
-    raw_text, rows, columns, warnings = parse_rows(filename, content_type, data)
+
+
+def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnection, filename: str, content_type: str | None, data: bytes) -> dict[str, Any]:
+    _require_upload_provider(connection)
+    parsed = ParsedUpload.from_rows(*parse_rows(filename, content_type, data))
     storage_path = save_upload_bytes(tenant_id, connection.id, filename, data)
+    return ingest_parsed_upload(db, tenant_id=tenant_id, connection=connection, filename=filename, content_type=content_type, parsed=parsed, storage_path=storage_path)
+
+
+def parse_upload(connection: ConnectorConnection, *, filename: str, content_type: str | None, open_stream: Callable[[], Iterable[bytes]]) -> ParsedUpload:
+    """Stream-parse an upload already held in durable storage.
+
+    Nothing is written; pair with :func:`ingest_parsed_upload` once the
+    stream (and any integrity check it performs) has completed.
+    """
+    _require_upload_provider(connection)
+    return parse_upload_stream(filename, content_type, open_stream)
+
+
+def ingest_spooled_upload(db: Session, *, tenant_id: str, connection: ConnectorConnection, filename: str, content_type: str | None, receipt: StreamedUpload) -> dict[str, Any]:
+    """Ingest a spooled upload without loading it onto the heap.
+
+    The spool is parsed (and checksum-verified) in chunks, then kept as the
+    stored copy; callers still own deleting ``receipt.path``.
+    """
+    parsed = parse_upload(connection, filename=filename, content_type=content_type, open_stream=lambda: iter_spooled_chunks(receipt))
+    storage_path = save_upload_file(tenant_id, connection.id, filename, receipt.path, receipt.sha256)
+    return ingest_parsed_upload(db, tenant_id=tenant_id, connection=connection, filename=filename, content_type=content_type, parsed=parsed, storage_path=storage_path)
+
+
+def ingest_parsed_upload(db: Session, *, tenant_id: str, connection: ConnectorConnection, filename: str, content_type: str | None, parsed: ParsedUpload, storage_path: str) -> dict[str, Any]:
+    _require_upload_provider(connection)
+    columns, warnings = parsed.columns, parsed.warnings
     mapping = suggest_mapping(columns)
     source = DataSource(
         tenant_id=tenant_id,
@@ -190,11 +225,11 @@ def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnectio
         filename=filename,
         content_type=content_type,
         storage_path=storage_path,
-        raw_text=raw_text[:200000],
+        raw_text=parsed.raw_text,
         metadata_json={
             "columns": columns,
-            "rows_parsed": len(rows),
-            "parsed_rows": rows[:500],
+            "rows_parsed": parsed.rows_parsed,
+            "parsed_rows": parsed.preview_rows,
             "mapping_suggestions": mapping,
             "normalized_gateway": connection.provider == "universal_controller",
             "warnings": warnings,
@@ -204,7 +239,7 @@ def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnectio
     db.add(source)
     db.commit()
     db.refresh(source)
-    records = _create_evidence_rows(db, tenant_id=tenant_id, workspace_id=connection.workspace_id, connection_id=connection.id, data_source_id=source.id, provider=connection.provider, filename=filename, rows=rows, columns=columns)
+    records = _create_evidence_rows(db, tenant_id=tenant_id, workspace_id=connection.workspace_id, connection_id=connection.id, data_source_id=source.id, provider=connection.provider, filename=filename, rows=parsed.preview_rows, columns=columns)
     connection.status = "synced" if records else "mapping_required"
     connection.last_sync_at = datetime.utcnow()
     connection.last_error = None if records else "Uploaded file stored but produced no evidence records."
@@ -216,9 +251,11 @@ def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnectio
         data_source_id=source.id,
         job_type="connector_hub_upload_parse",
         input_json={"provider": connection.provider, "filename": filename},
-        output_json={"rows_parsed": len(rows), "columns": columns, "mapping_suggestions": mapping, "evidence_records_created": len(records), "warnings": warnings, "data_source_id": source.id},
+        output_json={"rows_parsed": parsed.rows_parsed, "columns": columns, "mapping_suggestions": mapping, "evidence_records_created": len(records), "warnings": warnings, "data_source_id": source.id},
         status_value="completed_with_warnings" if warnings else "completed",
     )
+    # PDF text is extracted once by the worker, never while answering a question.
+    queue_source_text_extraction(db, source=source, commit=False)
     db.commit()
     db.refresh(connection)
     return {
@@ -226,7 +263,7 @@ def ingest_upload(db: Session, *, tenant_id: str, connection: ConnectorConnectio
         "connection": public_connection(connection),
         "data_source": source_public(source, evidence_count=len(records)),
         "job": _job_customer_safe(job),
-        "rows_parsed": len(rows),
+        "rows_parsed": parsed.rows_parsed,
         "columns": columns,
         "mapping_suggestions": mapping,
         "evidence_records_created": len(records),
@@ -288,8 +325,7 @@ async def upload_hub_evidence_file(provider: ProviderId = Query(default="manual_
     connection = create_or_get_connection(db, tenant_id=tenant_id, provider=provider, workspace_id=workspace_id, mode=mode, config={"created_by": "direct_evidence_upload"})
     receipt = await stream_upload_to_spool(file, tenant_id=tenant_id, connection_id=connection.id)
     try:
-        data = read_spooled_bytes(receipt)
-        return ingest_upload(db, tenant_id=tenant_id, connection=connection, filename=file.filename or "upload", content_type=file.content_type, data=data)
+        return ingest_spooled_upload(db, tenant_id=tenant_id, connection=connection, filename=file.filename or "upload", content_type=file.content_type, receipt=receipt)
     except HTTPException:
         raise
     except Exception as exc:
@@ -8,15 +8,19 @@ custom enterprise API contract.
 """
 from __future__ import annotations
 
+import codecs
 import csv
 import hashlib
 import io
+import itertools
 import json
 import os
 import re
+import shutil
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterable, Iterator, Literal
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel, Field
@@ -171,6 +175,9 @@ CANONICAL_FIELDS = {
 
 TABLES = [ConnectorConnection.__table__, DataSource.__table__, IngestionJob.__table__, EvidenceRecord.__table__, IntelligenceRun.__table__, GeneratedArtifact.__table__]
 SECRET_FIELD_HINTS = ("secret", "token", "password", "api_key", "apikey", "credential", "private_key")
+UPLOAD_RAW_TEXT_CHARS = 200000
+UPLOAD_PREVIEW_ROWS = 500
+EVIDENCE_ROWS_PER_UPLOAD = 100
 
 
 class ConnectorStartRequest(BaseModel):
@@ -406,6 +413,128 @@ def parse_rows(filename: str, content_type: str | None, data: bytes) -> tuple[st
     return text, rows, columns, warnings
 
 
+@dataclass
+class ParsedUpload:
+    """Bounded summary of a parsed upload: only the prefix that gets stored."""
+    raw_text: str
+    rows_parsed: int
+    preview_rows: list[dict[str, Any]]
+    columns: list[str]
+    warnings: list[str]
+
+    @classmethod
+    def from_rows(cls, text: str, rows: list[dict[str, Any]], columns: list[str], warnings: list[str]) -> "ParsedUpload":
+        return cls(
+            raw_text=text[:UPLOAD_RAW_TEXT_CHARS],
+            rows_parsed=len(rows),
+            preview_rows=rows[:UPLOAD_PREVIEW_ROWS],
+            columns=columns,
+            warnings=warnings,
+        )
+
+
+def _is_buffered_format(filename: str, content_type: str | None) -> bool:
+    lower = filename.lower()
+    return (
+        lower.endswith((".json", ".pdf"))
+        or (content_type or "").endswith("/json")
+        or content_type == "application/pdf"
+    )
+
+
+def _decoded_lines(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """Decode byte chunks incrementally into ``\n``-terminated lines."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        cut = text.rfind("\n") + 1
+        for line in text[:cut].split("\n")[:-1]:
+            yield line + "\n"
+        pending = text[cut:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _parse_table_stream(filename: str, open_stream: Callable[[], Iterable[bytes]], encoding: str) -> ParsedUpload:
+    prefix: list[str] = []
+    prefix_chars = 0
+    has_content = False
+
+    def tracked(lines: Iterator[str]) -> Iterator[str]:
+        nonlocal prefix_chars, has_content
+        for line in lines:
+            if prefix_chars < UPLOAD_RAW_TEXT_CHARS:
+                prefix.append(line)
+                prefix_chars += len(line)
+            has_content = has_content or bool(line.strip())
+            yield line
+
+    lines = tracked(_decoded_lines(open_stream(), encoding))
+    head: list[str] = []
+    head_chars = 0
+    for line in lines:
+        head.append(line)
+        head_chars += len(line)
+        if head_chars >= 4096:
+            break
+    sample = "".join(head)[:4096]
+    try:
+        dialect = csv.Sniffer().sniff(sample) if any(token in sample for token in [",", "\t", ";"]) else csv.excel
+    except csv.Error:
+        dialect = csv.excel
+
+    rows_parsed = 0
+    preview: list[dict[str, Any]] = []
+    columns: set[str] = set()
+    for row in csv.DictReader(itertools.chain(head, lines), dialect=dialect):
+        rows_parsed += 1
+        columns.update(str(key) for key in row.keys())
+        if len(preview) < UPLOAD_PREVIEW_ROWS:
+            preview.append(dict(row))
+
+    warnings: list[str] = []
+    if not rows_parsed and has_content:
+        # Second pass: keeps memory flat even for a huge single-column file
+        for line in _decoded_lines(open_stream(), encoding):
+            for part in line.splitlines():
+                if part.strip():
+                    rows_parsed += 1
+                    if len(preview) < UPLOAD_PREVIEW_ROWS:
+                        preview.append({"note": part.strip()})
+        columns = {"note"} if rows_parsed else set()
+        warnings.append("File did not look like a table; ingested non-empty lines as field notes.")
+    if not rows_parsed:
+        warnings.append("No parseable rows found.")
+    return ParsedUpload(
+        raw_text="".join(prefix)[:UPLOAD_RAW_TEXT_CHARS],
+        rows_parsed=rows_parsed,
+        preview_rows=preview,
+        columns=sorted(columns),
+        warnings=warnings,
+    )
+
+
+def parse_upload_stream(filename: str, content_type: str | None, open_stream: Callable[[], Iterable[bytes]]) -> ParsedUpload:
+    """Row-streaming counterpart of :func:`parse_rows`.
+
+    ``open_stream`` returns a fresh byte-chunk iterator on each call. CSV and
+    text are decoded and parsed line by line, keeping only the stored prefix,
+    so memory does not grow with file size; a second pass is made only when
+    UTF-8 decoding fails (latin-1 retry) or the file turns out to be notes.
+    JSON and PDF need the whole document and are buffered. Every pass runs
+    the iterator to exhaustion, so a verifying stream can raise at the end.
+    """
+    if _is_buffered_format(filename, content_type):
+        data = b"".join(open_stream())
+        return ParsedUpload.from_rows(*parse_rows(filename, content_type, data))
+    try:
+        return _parse_table_stream(filename, open_stream, "utf-8-sig")
+    except UnicodeDecodeError:
+        return _parse_table_stream(filename, open_stream, "latin-1")
+
+
 def suggest_mapping(columns: list[str]) -> dict[str, str]:
     mapping: dict[str, str] = {}
     for column in columns:
@@ -430,6 +559,27 @@ def save_upload_bytes(tenant_id: str, connection_id: str, filename: str | None,
         return f"inline://sha256/{digest}/{safe_filename(filename)}"
 
 
+def save_upload_file(tenant_id: str, connection_id: str, filename: str | None, source: str | Path, sha256: str) -> str:
+    """Keep a verified spool file as the stored upload without reading it.
+
+    Hard-links when the spool shares a filesystem with the upload dir, else
+    copies file to file; naming matches :func:`save_upload_bytes`.
+    """
+    digest = sha256[:16]
+    root = Path(getattr(settings, "CONNECTOR_UPLOAD_DIR", "/tmp/agroai_uploads"))
+    try:
+        target_dir = root / safe_filename(tenant_id) / safe_filename(connection_id)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{digest}-{safe_filename(filename)}"
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        return str(target)
+    except OSError:
+        return f"inline://sha256/{digest}/{safe_filename(filename)}"
+
+
 async def _bounded_upload_bytes(tenant_id: str, connection_id: str, file: UploadFile) -> bytes:
     receipt = await stream_upload_to_spool(file, tenant_id=tenant_id, connection_id=connection_id)
     try:
@@ -453,7 +603,7 @@ def _job_public(row: IngestionJob) -> dict[str, Any]:
 def _create_evidence_rows(db: Session, *, tenant_id: str, workspace_id: str | None, connection_id: str | None, data_source_id: str, provider: str, filename: str, rows: list[dict[str, Any]], columns: list[str]) -> list[EvidenceRecord]:
     evidence: list[EvidenceRecord] = []
     mapping = suggest_mapping(columns)
-    for index, row in enumerate(rows[:100]):
+    for index, row in enumerate(rows[:EVIDENCE_ROWS_PER_UPLOAD]):
         label = row.get("field") or row.get("block") or row.get("zone") or row.get("station") or row.get("note") or filename
         record = EvidenceRecord(
             tenant_id=tenant_id,
@@ -24,6 +24,7 @@ from app.api.v1.ai import (
     _verification,
 )
 from app.schemas.ai import IntelligenceRunRequest, IntelligenceRunResponse
+from app.services.ai_response_cache import response_cache_scope
 from app.services.citation_verifier import verify_citations
 from app.services.field_operating_loop import audit_trail, build_field_ops_context, command_center, list_tasks
 from app.services.intelligence_context import build_intelligence_context
@@ -621,6 +622,7 @@ async def intelligence_run(
         history=payload.history[-2:],
         audience=payload.audience,
         uploaded_evidence=payload.uploaded_evidence,
+        cache_scope=response_cache_scope(context_bundle, tenant_id=tenant_id),
     )
 
     model_router = ModelRouter()
@@ -59,6 +59,8 @@ class Settings(BaseSettings):
     PLATFORM_API_WEBHOOK_DELIVERY_ENABLED: bool = False
     PLATFORM_API_PUBLIC_DOCS_ENABLED: bool = False
     PLATFORM_API_USAGE_METERING_ENFORCEMENT_ENABLED: bool = False
+    PLATFORM_API_CREDIT_ACCOUNTING: str = "locked"  # locked (organization row lock) | sharded
+    PLATFORM_API_CREDIT_SHARDS: int = 8  # credit counter rows per organization and billing period
     PLATFORM_API_MARKETING_ENABLED: bool = False
     PLATFORM_API_APPLICATIONS_ENABLED: bool = False
     PLATFORM_API_PRIVATE_BETA_ENABLED: bool = False
@@ -92,9 +94,16 @@ class Settings(BaseSettings):
     PLATFORM_API_RATE_LIMIT_BACKEND: str = "memory"
     PLATFORM_API_REDIS_URL: str = ""
     PLATFORM_API_RATE_LIMIT_FAIL_OPEN: bool = False
+    PLATFORM_API_RATE_LIMIT_ALGORITHM: str = "fixed"  # fixed | sliding (previous window weighted by overlap)
+    PLATFORM_API_RATE_LIMIT_MEMORY_MAX_COUNTERS: int = 100000  # process-local counter ceiling
+    PLATFORM_API_RATE_LIMIT_MODE: str = "exact"  # exact | lease (redis backend only)
+    PLATFORM_API_RATE_LIMIT_LEASE_SIZE: int = 20  # most units one process reserves per counter and window
     PLATFORM_API_REDIS_MAX_RETRIES: int = 1
     PLATFORM_API_REDIS_CONNECT_TIMEOUT_SECONDS: float = 2.0
     PLATFORM_API_REDIS_SOCKET_TIMEOUT_SECONDS: float = 2.0
+    PLATFORM_API_KEY_CACHE_BACKEND: str = "auto"  # auto (redis when a Redis URL is set, else disabled) | redis | memory (single process only) | disabled
+    PLATFORM_API_KEY_CACHE_TTL_SECONDS: int = 30  # 0 disables the verified-key cache
+    PLATFORM_API_KEY_CACHE_MAX_ENTRIES: int = 10000
     PLATFORM_API_TEST_BURST_LIMIT: int = 60
     PLATFORM_API_TEST_SUSTAINED_LIMIT: int = 600
     PLATFORM_API_LIVE_BURST_LIMIT: int = 600
@@ -107,6 +116,15 @@ class Settings(BaseSettings):
     PLATFORM_API_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
     PLATFORM_API_WEBHOOK_MAX_RESPONSE_BYTES: int = 8192
     PLATFORM_API_WEBHOOK_MAX_ATTEMPTS: int = 6
+    PLATFORM_API_WEBHOOK_WORKER_CONCURRENCY: int = 32  # deliveries in flight per webhook worker process
+    PLATFORM_API_WEBHOOK_ENDPOINT_CONCURRENCY: int = 4  # deliveries in flight per endpoint in one worker
+    PLATFORM_API_WEBHOOK_WORKER_POLL_SECONDS: float = 1.0
+    PLATFORM_API_WEBHOOK_CLIENT_POOL_SIZE: int = 256  # pooled clients, one per pinned address and SNI host
+    PLATFORM_API_WEBHOOK_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures that open an endpoint's circuit
+    PLATFORM_API_WEBHOOK_CIRCUIT_COOLDOWN_SECONDS: float = 30.0  # first cooldown; doubles with each reopening
+    PLATFORM_API_WEBHOOK_CIRCUIT_MAX_COOLDOWN_SECONDS: float = 3600.0
+    PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SIZE: int = 50  # parked deliveries released together after recovery
+    PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SECONDS: float = 5.0  # spacing between released batches
     PLATFORM_API_WEBHOOK_SECRET_OVERLAP_MINUTES: int = 60
     PLATFORM_API_APPLICATION_LIMIT_PER_DAY: int = 3
     PLATFORM_API_PLAN_CATALOG_VERSION: str = "2026-07-provisional"
@@ -147,6 +165,10 @@ class Settings(BaseSettings):
     COMPLIANCE_ALLOW_BROWSER_TENANT_API_KEYS: bool = False
     COMPLIANCE_OBJECT_STORAGE_BACKEND: str = "disabled"
 
+    # Tenant API key usage (last_used_at / usage_count) is written behind
+    API_KEY_USAGE_BACKEND: str = "memory"  # memory | redis (shared through REDIS_URL)
+    API_KEY_USAGE_FLUSH_SECONDS: int = 30
+
     # Field Intelligence (voice-first / offline field capture)
     FIELD_TRANSCRIPTION_PROVIDER: str = ""  # cloudflare_workers_ai | openai_whisper | http | fake (dev only)
     FIELD_TRANSCRIPTION_ENDPOINT: str = ""  # real provider endpoint (http provider)
@@ -189,14 +211,22 @@ class Settings(BaseSettings):
 
     # Scheduler
     SYNC_INTERVAL_MINUTES: int = 15
-    SYNC_LOOKBACK_DAYS: int = 14
+    SYNC_LOOKBACK_DAYS: int = 14  # window for first sync of a measure and for backfills
+    SYNC_WATERMARK_OVERLAP_MINUTES: int = 60  # re-read before each measure's watermark for late data
     ENABLE_SCHEDULER: bool = False
+    SCHEDULER_COMPUTE_WORKERS: int = 1  # >1 runs block estimation/forecast in a process pool
+    SCHEDULER_COMPUTE_BATCH_SIZE: int = 200  # blocks per task shipped to a pool worker
 
     # External Providers
     WISECONN_API_URL: str = "https://api.wiseconn.com"
     WISECONN_API_KEY: str = ""
     WISECONN_TIMEOUT_SECONDS: int = 30
     WISECONN_MAX_RETRIES: int = 3
+    WISECONN_PERSIST_CHUNK_SIZE: int = 1000  # telemetry rows per bulk insert statement
+    WISECONN_MAX_CONCURRENCY: int = 8  # in-flight WiseConn requests per sync
+    WISECONN_PERSIST_QUEUE_SIZE: int = 16  # fetched measure batches buffered ahead of persistence
+    WISECONN_RATE_LIMIT_BACKOFF_SECONDS: float = 1.0  # first backoff after a 429, doubled per retry
+    WISECONN_RATE_LIMIT_MAX_RETRIES: int = 4
     RAINBIRD_API_URL: str = "http://mock-rainbird"
     OPENET_API_URL: str = "https://openet-api.org"
     OPENET_TIMEOUT_SECONDS: int = 45
@@ -297,6 +327,21 @@ class Settings(BaseSettings):
     AI_LOCAL_THINKING: bool = False
     AI_EDGE_TIMEOUT_SECONDS: int = 45
     AI_TIMEOUT_SECONDS: int = 30
+    AI_HTTP_MAX_CONNECTIONS: int = 64  # per lane and origin, pooled AI clients
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    AI_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 90.0
+    AI_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AI_HTTP2_ENABLED: bool = True  # takes effect only when the h2 package is installed
+    AI_RESPONSE_CACHE_TTL_SECONDS: int = 900  # 0 disables the Ask AGRO-AI response cache
+    AI_RESPONSE_CACHE_MAX_ENTRIES: int = 2000
+    AI_RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # total cached answer content per process
+    AI_LANE_EWMA_ALPHA: float = 0.2  # weight of the newest attempt in lane latency and error-rate averages
+    AI_LANE_MIN_SAMPLES: int = 5  # attempts before a lane's stats reorder lanes or set its hedge delay
+    AI_LANE_MODEL_DEMOTE_ERROR_RATE: float = 0.5  # models failing this often move to the end of their lane
+    AI_HEDGE_ENABLED: bool = True  # False runs lanes strictly one after another
+    AI_HEDGE_DEFAULT_DELAY_SECONDS: float = 8.0  # hedge delay for hedge_cold callers until a lane has AI_LANE_MIN_SAMPLES attempts
+    AI_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    AI_HEDGE_MAX_DELAY_SECONDS: float = 30.0
     INTELLIGENCE_FRESHNESS_POLICY_JSON: str = ""
 
     # Connector ingestion / transient spool
@@ -323,6 +368,16 @@ class Settings(BaseSettings):
     TASK_QUEUE_LEASE_SECONDS: int = 120
     TASK_QUEUE_MAX_ATTEMPTS: int = 5
     TASK_QUEUE_RETRY_BASE_SECONDS: int = 15
+    TASK_QUEUE_READ_BATCH: int = 16  # XREADGROUP COUNT per connector worker read
+    TASK_QUEUE_CLAIM_BATCH: int = 32  # XAUTOCLAIM COUNT per stale-claim page
+    TASK_QUEUE_CLAIM_INTERVAL_SECONDS: float = 15.0  # stale-claim scan timer
+    TASK_QUEUE_OUTBOX_INTERVAL_SECONDS: float = 2.0  # task outbox publication timer
+    TASK_QUEUE_DEFER_SECONDS: float = 2.0  # delay before a deferred job is retried by the same worker
+    CONNECTOR_WORKER_MODE: str = "serial"  # serial | supervised
+    CONNECTOR_WORKER_SLOTS: int = 32  # supervised mode: concurrent I/O-bound tasks per worker process
+    CONNECTOR_WORKER_PROCESSES: int = 2  # supervised mode: process pool for CPU-bound ingestion parsing
+    CONNECTOR_WORKER_TASK_LIMITS_JSON: str = ""  # {"task_type": max concurrent} overrides per task type
+    CONNECTOR_WORKER_DRAIN_SECONDS: float = 90.0  # SIGTERM budget for in-flight tasks before exiting
     CLOUDFLARE_QUEUE_PUBLISH_URL: str = ""
     CLOUDFLARE_QUEUE_PUBLISH_TOKEN: str = ""
     CLOUDFLARE_QUEUE_CONSUMER_TOKEN: str = ""
@@ -1,5 +1,5 @@
 """Prometheus metrics configuration."""
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Response
 
 # Metrics
@@ -73,10 +73,16 @@ platform_rate_limit_checks = Counter(
 platform_rate_limit_latency = Histogram(
     'agroai_platform_rate_limit_latency_seconds',
     'Platform API rate-limit backend latency',
-    ['backend'],
+    ['backend', 'mode'],
     buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
 )
 
+platform_key_cache = Counter(
+    'agroai_platform_key_cache_total',
+    'Platform API verified-key cache lookups and invalidations',
+    ['backend', 'outcome']
+)
+
 platform_product_events = Counter(
     'agroai_platform_product_events_total',
     'Audited Platform API product events without customer identifiers',
@@ -101,7 +107,81 @@ platform_billing_events = Counter(
     ['event_class', 'outcome']
 )
 
+platform_webhook_delivery_latency = Histogram(
+    'agroai_platform_webhook_delivery_seconds',
+    'Platform API webhook delivery duration, claim to recorded outcome',
+    ['outcome'],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+)
+
+platform_webhook_deliveries_in_flight = Gauge(
+    'agroai_platform_webhook_deliveries_in_flight',
+    'Platform API webhook deliveries currently running in this worker'
+)
+
+platform_webhook_circuit = Counter(
+    'agroai_platform_webhook_circuit_total',
+    'Platform API webhook endpoint circuit transitions and parked deliveries',
+    ['transition']
+)
+
 
 def metrics_endpoint():
     """Expose Prometheus metrics."""
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+connector_tasks_in_flight = Gauge(
+    'agroai_connector_tasks_in_flight',
+    'Connector tasks currently running in a supervised connector worker',
+    ['task_type']
+)
+
+task_outbox_publish_lag = Gauge(
+    'agroai_task_outbox_publish_lag_seconds',
+    'Age of the oldest unpublished outbox row, per outbox',
+    ['outbox']
+)
+
+ai_http_requests = Counter(
+    'agroai_ai_http_requests_total',
+    'Requests sent over pooled AI lane HTTP clients',
+    ['lane']
+)
+
+ai_http_connections_opened = Counter(
+    'agroai_ai_http_connections_opened_total',
+    'New TCP connections opened by pooled AI lane HTTP clients',
+    ['lane']
+)
+
+ai_http_time_to_headers = Histogram(
+    'agroai_ai_http_time_to_headers_seconds',
+    'Time from sending an AI lane request to receiving its response headers',
+    ['lane'],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+)
+
+ai_response_cache = Counter(
+    'agroai_ai_response_cache_total',
+    'Ask AGRO-AI model response cache hits, misses, stores and invalidations',
+    ['route', 'outcome']
+)
+
+ai_response_cache_saved_seconds = Counter(
+    'agroai_ai_response_cache_saved_seconds_total',
+    'Model latency avoided by Ask AGRO-AI response cache hits',
+    ['route']
+)
+
+ai_lane_latency = Histogram(
+    'agroai_ai_lane_latency_seconds',
+    'AI lane attempt latency by outcome (ok, failed, cancelled)',
+    ['lane', 'outcome'],
+    buckets=[0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0]
+)
+
+ai_lane_hedges = Counter(
+    'agroai_ai_lane_hedges_total',
+    'AI lanes started because the running lane exceeded its observed p90',
+    ['lane']
+)
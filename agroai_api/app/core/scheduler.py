@@ -5,14 +5,16 @@ keeping AGRO-AI telemetry and irrigation data fresh.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import insert
 
 from app.adapters.registry import AdapterRegistry
 from app.core.config import settings
@@ -22,9 +24,8 @@ from app.models.block import Block
 from app.models.water_state import WaterState
 from app.models.forecast import Forecast
 from app.services.wiseconn_sync import WiseConnSyncService
+from app.services.block_compute import BlockComputeTask, run_block_compute
 from app.services.feature_builder import FeatureBuilder
-from app.services.water_state_engine import WaterStateEngine
-from app.services.forecast_engine import ForecastEngine
 from app.services.crop_soil_profile import get_profile
 from app.services.recommendation_outcome_tracker import RecommendationOutcomeTracker
 from app.services.schedule_match_runner import ScheduleMatchRunner
@@ -36,106 +37,128 @@ _scheduler: Optional[AsyncIOScheduler] = None
 _last_sync_result: Optional[Dict[str, Any]] = None
 
 
-def _run_water_state_estimation(db, tenant_id: str) -> int:
-    """Estimate water state for all blocks belonging to a tenant.
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 1)
 
-    Runs after each sync cycle to keep water state fresh.
-    Returns the number of blocks processed.
-    """
-    import uuid as _uuid
-
-    blocks = db.query(Block).filter(Block.tenant_id == tenant_id).all()
-    if not blocks:
-        return 0
-
-    builder = FeatureBuilder()
-    engine = WaterStateEngine()
-    count = 0
-
-    for block in blocks:
-        try:
-            fs = builder.build(db, block.id)
-            estimate = engine.estimate(fs)
-
-            ws = WaterState(
-                id=str(_uuid.uuid4()),
-                tenant_id=tenant_id,
-                block_id=block.id,
-                estimated_at=estimate.estimated_at,
-                root_zone_vwc=estimate.root_zone_vwc,
-                depth_profile=estimate.depth_profile,
-                stress_risk=estimate.stress_risk,
-                refill_status=estimate.refill_status,
-                depletion_rate=estimate.depletion_rate,
-                hours_to_stress=estimate.hours_to_stress,
-                et_demand_mm_day=estimate.et_demand_mm_day,
-                last_irrigation_at=estimate.last_irrigation_at,
-                last_irrigation_volume_m3=estimate.last_irrigation_volume_m3,
-                confidence=estimate.confidence,
-                anomaly_flags=estimate.anomaly_flags,
-                feature_snapshot=estimate.feature_snapshot,
-                engine_version=estimate.engine_version,
-            )
-            db.add(ws)
-            count += 1
-        except Exception as e:
-            logger.warning(
-                "Water state estimation failed for block %s: %s",
-                block.id, e,
-            )
-
-    if count > 0:
-        db.commit()
-    logger.info("Water state estimated for %d/%d blocks", count, len(blocks))
-    return count
 
+def _run_block_pipeline(db, tenant_id: str) -> Dict[str, Any]:
+    """Estimate water state and forecast VWC for every block of a tenant.
 
-def _run_forecasts(db, tenant_id: str) -> int:
-    """Run VWC forecast for all blocks belonging to a tenant.
+    Builds each block's FeatureSet once (one batched ``build_many`` pass)
+    and feeds it to both WaterStateEngine and ForecastEngine, inline or in a
+    process pool per ``SCHEDULER_COMPUTE_WORKERS``. The resulting WaterState
+    and Forecast rows are bulk-inserted by this process in a single
+    transaction. Per-block engine failures are logged and skipped.
 
-    Runs after water state estimation to produce forecast trajectories.
-    Returns the number of blocks forecast.
+    Returns counts plus per-stage timings in milliseconds.
     """
     import uuid as _uuid
 
+    summary: Dict[str, Any] = {
+        "blocks": 0,
+        "water_states": 0,
+        "forecasts": 0,
+        "timings_ms": {},
+    }
+    timings = summary["timings_ms"]
+
+    started = time.perf_counter()
     blocks = db.query(Block).filter(Block.tenant_id == tenant_id).all()
+    summary["blocks"] = len(blocks)
     if not blocks:
-        return 0
-
-    builder = FeatureBuilder()
-    engine = ForecastEngine()
-    count = 0
-
-    for block in blocks:
-        try:
-            profile = get_profile(block.crop_type, block.soil_type)
-            fs = builder.build(db, block.id)
-            forecast = engine.forecast(fs, profile)
-
-            fc_record = Forecast(
-                id=str(_uuid.uuid4()),
-                tenant_id=tenant_id,
-                block_id=block.id,
-                computed_at=forecast.computed_at,
-                current_vwc=forecast.current_vwc,
-                points=[p.__dict__ for p in forecast.points],
-                hours_to_stress=forecast.hours_to_stress,
-                optimal_irrigation_window=forecast.optimal_irrigation_window,
-                confidence=forecast.confidence,
-                profile_used=forecast.profile_used,
-                forecast_version=forecast.forecast_version,
+        return summary
+    features = FeatureBuilder().build_many(db, [block.id for block in blocks])
+    timings["features"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    tasks = [
+        BlockComputeTask(
+            block_id=block.id,
+            features=features[block.id],
+            profile=get_profile(block.crop_type, block.soil_type),
+        )
+        for block in blocks
+    ]
+    results = run_block_compute(
+        tasks,
+        workers=settings.SCHEDULER_COMPUTE_WORKERS,
+        batch_size=settings.SCHEDULER_COMPUTE_BATCH_SIZE,
+    )
+    timings["compute"] = _elapsed_ms(started)
+    timings["water_state"] = round(sum(r.estimate_seconds for r in results) * 1000.0, 1)
+    timings["forecast"] = round(sum(r.forecast_seconds for r in results) * 1000.0, 1)
+
+    water_rows: List[Dict[str, Any]] = []
+    forecast_rows: List[Dict[str, Any]] = []
+    for result in results:
+        estimate = result.estimate
+        if estimate is not None:
+            water_rows.append({
+                "id": str(_uuid.uuid4()),
+                "tenant_id": tenant_id,
+                "block_id": result.block_id,
+                "estimated_at": estimate.estimated_at,
+                "root_zone_vwc": estimate.root_zone_vwc,
+                "depth_profile": estimate.depth_profile,
+                "stress_risk": estimate.stress_risk,
+                "refill_status": estimate.refill_status,
+                "depletion_rate": estimate.depletion_rate,
+                "hours_to_stress": estimate.hours_to_stress,
+                "et_demand_mm_day": estimate.et_demand_mm_day,
+                "last_irrigation_at": estimate.last_irrigation_at,
+                "last_irrigation_volume_m3": estimate.last_irrigation_volume_m3,
+                "confidence": estimate.confidence,
+                "anomaly_flags": estimate.anomaly_flags,
+                "feature_snapshot": estimate.feature_snapshot,
+                "engine_version": estimate.engine_version,
+            })
+        else:
+            logger.warning(
+                "Water state estimation failed for block %s: %s",
+                result.block_id, result.estimate_error,
             )
-            db.add(fc_record)
-            count += 1
-        except Exception as e:
+
+        forecast = result.forecast
+        if forecast is not None:
+            forecast_rows.append({
+                "id": str(_uuid.uuid4()),
+                "tenant_id": tenant_id,
+                "block_id": result.block_id,
+                "computed_at": forecast.computed_at,
+                "current_vwc": forecast.current_vwc,
+                "points": [p.__dict__ for p in forecast.points],
+                "hours_to_stress": forecast.hours_to_stress,
+                "optimal_irrigation_window": forecast.optimal_irrigation_window,
+                "confidence": forecast.confidence,
+                "profile_used": forecast.profile_used,
+                "forecast_version": forecast.forecast_version,
+            })
+        else:
             logger.warning(
-                "Forecast failed for block %s: %s", block.id, e,
+                "Forecast failed for block %s: %s",
+                result.block_id, result.forecast_error,
             )
 
-    if count > 0:
-        db.commit()
-    logger.info("Forecasts generated for %d/%d blocks", count, len(blocks))
-    return count
+    started = time.perf_counter()
+    if water_rows or forecast_rows:
+        try:
+            if water_rows:
+                db.execute(insert(WaterState), water_rows)
+            if forecast_rows:
+                db.execute(insert(Forecast), forecast_rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    timings["persist"] = _elapsed_ms(started)
+
+    summary["water_states"] = len(water_rows)
+    summary["forecasts"] = len(forecast_rows)
+    logger.info(
+        "Block pipeline for %d blocks: %d water states, %d forecasts (%s)",
+        len(blocks), len(water_rows), len(forecast_rows), timings,
+    )
+    return summary
 
 
 async def run_wiseconn_sync() -> None:
@@ -153,45 +176,57 @@ async def run_wiseconn_sync() -> None:
         return
 
     start_time = time.time()
+    timings: Dict[str, float] = {}
     db = SessionLocal()
     try:
         registry = AdapterRegistry()
         adapter = registry.get_wiseconn()
 
+        stage_started = time.perf_counter()
         sync_service = WiseConnSyncService(adapter=adapter, db=db)
         result = await sync_service.full_sync(
             tenant_id="wiseconn-demo",
             days=settings.SYNC_LOOKBACK_DAYS,
+            incremental=True,
         )
+        timings["sync"] = _elapsed_ms(stage_started)
 
         sync_runs_total.labels(status="success").inc()
         sync_duration.observe(time.time() - start_time)
 
-        # Run water state estimation for all blocks after sync
-        water_state_count = _run_water_state_estimation(db, "wiseconn-demo")
-
-        # Run VWC forecast for all blocks after water state
-        forecast_count = 0
+        # Build features once per block, then water state + forecast
+        pipeline: Dict[str, Any] = {"blocks": 0, "water_states": 0, "forecasts": 0, "timings_ms": {}}
         try:
-            forecast_count = _run_forecasts(db, "wiseconn-demo")
+            if settings.SCHEDULER_COMPUTE_WORKERS > 1:
+                # Wait on the process pool off the event loop so API requests
+                # served by this process keep flowing during large syncs.
+                pipeline = await asyncio.to_thread(_run_block_pipeline, db, "wiseconn-demo")
+            else:
+                pipeline = _run_block_pipeline(db, "wiseconn-demo")
         except Exception as e:
-            logger.warning("Forecast generation failed: %s", e)
+            db.rollback()
+            logger.warning("Water state and forecast pipeline failed: %s", e)
+        timings.update(pipeline["timings_ms"])
 
         # Run schedule matching (must happen before verification)
         match_summary = {"forward_matched": 0, "retroactive_created": 0}
+        stage_started = time.perf_counter()
         try:
             match_runner = ScheduleMatchRunner()
             match_summary = match_runner.run(db, "wiseconn-demo")
         except Exception as e:
             logger.warning("Schedule matching failed: %s", e)
+        timings["schedule_match"] = _elapsed_ms(stage_started)
 
         # Run outcome tracking for pending decision runs
         outcome_count = 0
+        stage_started = time.perf_counter()
         try:
             tracker = RecommendationOutcomeTracker()
             outcome_count = tracker.run(db, "wiseconn-demo")
         except Exception as e:
             logger.warning("Outcome tracking failed: %s", e)
+        timings["outcome_tracking"] = _elapsed_ms(stage_started)
 
         _last_sync_result = {
             "run_id": run_id,
@@ -202,13 +237,14 @@ async def run_wiseconn_sync() -> None:
                 "blocks": len(result.get("blocks_created", [])),
                 "telemetry_zones": len(result.get("telemetry", [])),
                 "irrigation_zones": len(result.get("irrigations", [])),
-                "water_states_estimated": water_state_count,
-                "forecasts_generated": forecast_count,
+                "water_states_estimated": pipeline["water_states"],
+                "forecasts_generated": pipeline["forecasts"],
                 "schedules_matched": match_summary.get("forward_matched", 0),
                 "retroactive_decisions": match_summary.get("retroactive_created", 0),
                 "verifications_processed": outcome_count,
                 "errors": result.get("errors", []),
             },
+            "timings_ms": timings,
         }
         logger.info(
             "Scheduled sync completed (run_id=%s): %s",
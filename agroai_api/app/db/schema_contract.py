@@ -5,10 +5,14 @@ from typing import Mapping
 import sqlalchemy as sa
 
 
-HEAD_ALEMBIC_REVISION = "029_platform_cli_device_auth"
+HEAD_ALEMBIC_REVISION = "033_data_source_text_pages"
 
 
 HEAD_SCHEMA_REQUIREMENTS: dict[str, set[str]] = {
+    "data_source_text_pages": {"tenant_id", "content_sha256", "page_number", "text"},
+    "platform_webhook_endpoint_health": {"endpoint_id", "state", "consecutive_failures", "open_until", "probe_outbox_id"},
+    "platform_credit_shards": {"organization_id", "billing_period_key", "shard", "capacity_credits", "used_credits"},
+    "provider_measure_watermarks": {"tenant_id", "provider", "connection_key", "measure_id", "high_water_mark"},
     "platform_cli_device_authorizations": {"device_code_hash", "user_code", "status", "expires_at", "consumed_at"},
     "compliance_export_metadata": {"id", "tenant_id"},
     "assurance_passports": {"id"},
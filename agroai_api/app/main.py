@@ -79,6 +79,13 @@ async def lifespan(app: FastAPI):
         logger.warning("SaaS Portal schema is not ready; run Alembic migrations before serving production traffic: %s", schema_status)
     scheduler_started = False
 
+    try:
+        from app.services.ai_http_clients import bind_ai_http_clients
+
+        bind_ai_http_clients()
+    except Exception:
+        logger.exception("Pooled AI HTTP clients are unavailable; AI calls will open a client per request")
+
     if settings.ENABLE_SCHEDULER and settings.WISECONN_API_KEY:
         try:
             from app.core.scheduler import start_scheduler
@@ -105,8 +112,39 @@ async def lifespan(app: FastAPI):
     except Exception:
         logger.exception("Field Intelligence worker failed to start; captures will still stage durably")
 
+    usage_flusher_started = False
+    try:
+        from app.services.api_key_usage import start_api_key_usage_flusher
+
+        start_api_key_usage_flusher()
+        usage_flusher_started = True
+    except Exception:
+        logger.exception("API key usage flusher failed to start; usage will be written per request")
+
     yield
 
+    try:
+        from app.services.ai_http_clients import close_ai_http_clients
+
+        await close_ai_http_clients()
+    except Exception:
+        logger.exception("Pooled AI HTTP clients could not be closed")
+
+    try:
+        from app.platform_api.rate_limits import release_rate_limit_leases
+
+        release_rate_limit_leases()
+    except Exception:
+        logger.exception("Platform API rate-limit leases could not be released")
+
+    if usage_flusher_started:
+        try:
+            from app.services.api_key_usage import stop_api_key_usage_flusher
+
+            stop_api_key_usage_flusher()
+        except Exception:
+            logger.exception("API key usage flusher failed to stop cleanly")
+
     if field_worker_started:
         try:
             from app.services.field_intelligence_worker import stop_field_intelligence_worker
@@ -25,7 +25,8 @@ from app.models.saas import (
 )
 from app.models.operational_records import (
     ChatConversation, ChatMessage, ConnectorConnection, DataSource,
-    EvidenceRecord, GeneratedArtifact, IngestionJob, IntelligenceRun,
+    DataSourceTextPage, EvidenceRecord, GeneratedArtifact, IngestionJob,
+    IntelligenceRun,
 )
 from app.models.field_intelligence import (
     FieldCaptureSession, FieldObservation, FieldObservationAsset,
@@ -55,13 +56,13 @@ from app.models.platform_api import (
     ActionSafetyConfiguration, ApiProject, ApiServiceAccount,
     PlatformApiKey, PlatformApiUsageEvent, PlatformIdempotencyRecord,
     PlatformWebhookAuditEvent, PlatformWebhookDeliveryAttempt, PlatformWebhookEndpoint,
-    PlatformWebhookOutbox,
+    PlatformWebhookEndpointHealth, PlatformWebhookOutbox,
     PlatformWebhookEvent, ProviderCapabilityRecord, ProviderExternalIdentityMap,
 )
 from app.models.platform_product import (
     PlatformAbuseEvent, PlatformApiApplication, PlatformApiOperationCost,
     PlatformApiPlan, PlatformApiSubscription, PlatformCheckoutIdempotency,
-    PlatformCreditReservation,
+    PlatformCreditReservation, PlatformCreditShard,
     PlatformLiveAccessRequest, PlatformNotification, PlatformPartnerDossier,
     PlatformProductAuditEvent, PlatformProgramEnrollment, PlatformRequestLog,
     PlatformSandboxState, PlatformStatusComponent, PlatformStatusIncident,
@@ -79,7 +80,7 @@ __all__ = [
     "EntitlementOverride", "ManagedEntity", "OnboardingState", "Organization",
     "OrganizationMembership", "OrganizationVerificationProfile", "QuotaReservation", "SaaSRequest", "SecurityAuditEvent", "TeamInvitation",
     "UsageEvent", "User", "UserPreference", "Workspace", "ConnectorConnection",
-    "DataSource", "IngestionJob", "EvidenceRecord", "IntelligenceRun",
+    "DataSource", "DataSourceTextPage", "IngestionJob", "EvidenceRecord", "IntelligenceRun",
     "GeneratedArtifact", "ChatConversation", "ChatMessage",
     "FieldCaptureSession", "FieldObservation", "FieldObservationAsset",
     "FieldObservationProcessingRun", "FieldObservationAuditEvent", "ComplianceJurisdiction",
@@ -97,11 +98,11 @@ __all__ = [
     "ActionSafetyConfiguration", "ApiProject", "ApiServiceAccount",
     "PlatformApiKey", "PlatformApiUsageEvent", "PlatformIdempotencyRecord",
     "PlatformWebhookAuditEvent", "PlatformWebhookDeliveryAttempt", "PlatformWebhookEndpoint",
-    "PlatformWebhookOutbox",
+    "PlatformWebhookEndpointHealth", "PlatformWebhookOutbox",
     "PlatformWebhookEvent", "ProviderCapabilityRecord", "ProviderExternalIdentityMap",
     "PlatformAbuseEvent", "PlatformApiApplication", "PlatformApiOperationCost",
     "PlatformApiPlan", "PlatformApiSubscription", "PlatformCheckoutIdempotency",
-    "PlatformCreditReservation",
+    "PlatformCreditReservation", "PlatformCreditShard",
     "PlatformLiveAccessRequest", "PlatformNotification", "PlatformPartnerDossier",
     "PlatformProductAuditEvent", "PlatformProgramEnrollment", "PlatformRequestLog",
     "PlatformSandboxState", "PlatformStatusComponent", "PlatformStatusIncident",
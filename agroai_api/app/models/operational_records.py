@@ -59,6 +59,23 @@ class DataSource(Base):
     )
 
 
+class DataSourceTextPage(Base):
+    """Text extracted from one page of an uploaded document, shared by every source with the same content hash."""
+
+    __tablename__ = "data_source_text_pages"
+
+    id = Column(String, primary_key=True, default=new_id, index=True)
+    tenant_id = Column(String, ForeignKey("organizations.id"), nullable=False, index=True)
+    content_sha256 = Column(String(64), nullable=False)
+    page_number = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("uq_data_source_text_page", "tenant_id", "content_sha256", "page_number", unique=True),
+    )
+
+
 class IngestionJob(Base):
     __tablename__ = "ingestion_jobs"
 
@@ -288,6 +288,24 @@ class PlatformWebhookOutbox(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
+class PlatformWebhookEndpointHealth(Base):
+    """Delivery circuit of one webhook endpoint: closed, open or half_open."""
+
+    __tablename__ = "platform_webhook_endpoint_health"
+
+    endpoint_id = Column(String, ForeignKey("platform_webhook_endpoints.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
+    state = Column(String, default="closed", nullable=False, index=True)  # closed | open | half_open
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    open_count = Column(Integer, default=0, nullable=False)  # consecutive openings; drives the cooldown
+    open_until = Column(DateTime, nullable=True)
+    probe_outbox_id = Column(String, nullable=True)
+    probe_claimed_at = Column(DateTime, nullable=True)
+    last_failure_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class PlatformWebhookAuditEvent(Base):
     __tablename__ = "platform_webhook_audit_events"
     __table_args__ = (
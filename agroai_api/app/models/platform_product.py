@@ -406,6 +406,31 @@ class PlatformCreditReservation(Base):
     released_at = Column(DateTime, nullable=True)
 
 
+class PlatformCreditShard(Base):
+    """One of N counters that together hold an organization's period credits.
+
+    Active (reserved plus committed) credits of a billing period are spread
+    over shard rows so concurrent reservations lock one shard instead of the
+    organization row. ``capacity_credits`` is this shard's share of the
+    plan's included credits, or NULL when the plan has no included limit.
+    """
+
+    __tablename__ = "platform_credit_shards"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "billing_period_key", "shard", name="uq_platform_credit_shard"),
+    )
+
+    id = Column(String, primary_key=True, default=new_product_id)
+    organization_id = Column(String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
+    billing_period_key = Column(String, nullable=False)
+    shard = Column(Integer, nullable=False)
+    included_credits = Column(Integer, nullable=True)
+    capacity_credits = Column(Integer, nullable=True)
+    used_credits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
 class PlatformStripeMeterOutbox(Base):
     __tablename__ = "platform_stripe_meter_outbox"
     __table_args__ = (
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, JSON, String, Text
+from sqlalchemy import Column, DateTime, JSON, String, Text, UniqueConstraint
 
 from app.db.base import Base
 
@@ -22,3 +22,28 @@ class ConnectorSyncCursor(Base):
     last_success_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ProviderMeasureWatermark(Base):
+    """Newest stored data point per (connection, measure) for incremental sync.
+
+    ``connection_key`` is the ConnectorConnection id, or a provider-scoped key
+    for environment-configured integrations such as the WiseConn scheduler.
+    """
+    __tablename__ = "provider_measure_watermarks"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "provider", "connection_key", "measure_id",
+            name="uq_provider_measure_watermark",
+        ),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tenant_id = Column(String, nullable=False, index=True)
+    provider = Column(String, nullable=False)
+    connection_key = Column(String, nullable=False)
+    measure_id = Column(String, nullable=False)
+    high_water_mark = Column(DateTime, nullable=False)
+    last_synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -7,6 +7,7 @@ from datetime import datetime
 
 from fastapi import HTTPException, status
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -17,6 +18,7 @@ from app.models.platform_product import (
     PlatformApiPlan,
     PlatformApiSubscription,
     PlatformCreditReservation,
+    PlatformCreditShard,
     PlatformStripeMeterOutbox,
 )
 from app.models.saas import Organization
@@ -76,6 +78,95 @@ def _scoped_logical_operation_id(operation_id: str, logical_operation_id: str) -
     ).hexdigest()
 
 
+def _credit_accounting() -> str:
+    mode = str(getattr(settings, "PLATFORM_API_CREDIT_ACCOUNTING", "locked") or "locked").strip().lower()
+    if mode not in {"locked", "sharded"}:
+        raise RuntimeError("PLATFORM_API_CREDIT_ACCOUNTING must be 'locked' or 'sharded'")
+    return mode
+
+
+def _find_reservation(db: Session, principal: PlatformPrincipal, scoped_logical_id: str) -> PlatformCreditReservation | None:
+    return (
+        db.query(PlatformCreditReservation)
+        .filter(
+            PlatformCreditReservation.organization_id == principal.organization_id,
+            PlatformCreditReservation.api_project_id == principal.api_project_id,
+            PlatformCreditReservation.logical_operation_id == scoped_logical_id,
+        )
+        .first()
+    )
+
+
+def _active_credits(db: Session, organization_id: str, period_key: str) -> int:
+    """Committed plus still-reserved credits of one billing period."""
+    committed = int(
+        db.query(func.coalesce(func.sum(PlatformCreditReservation.committed_credits), 0))
+        .filter(
+            PlatformCreditReservation.organization_id == organization_id,
+            PlatformCreditReservation.billing_period_key == period_key,
+            PlatformCreditReservation.state == "committed",
+        )
+        .scalar()
+        or 0
+    )
+    reserved = int(
+        db.query(func.coalesce(func.sum(PlatformCreditReservation.reserved_credits), 0))
+        .filter(
+            PlatformCreditReservation.organization_id == organization_id,
+            PlatformCreditReservation.billing_period_key == period_key,
+            PlatformCreditReservation.state == "reserved",
+        )
+        .scalar()
+        or 0
+    )
+    return committed + reserved
+
+
+def _overage_credits(
+    principal: PlatformPrincipal,
+    plan: PlatformApiPlan | None,
+    included: int | None,
+    active: int,
+    credits: int,
+) -> int:
+    """Credits beyond the plan allowance, or 429 when the plan has no overages."""
+    if included is None or active + credits <= included:
+        return 0
+    overage = active + credits - max(included, active)
+    if not plan.overages_allowed:
+        platform_quota_decisions.labels(environment=principal.environment, outcome="quota_denied").inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"code": "api_credit_quota_exceeded", "included_credits": included},
+        )
+    return overage
+
+
+def _new_reservation(
+    principal: PlatformPrincipal,
+    *,
+    operation_id: str,
+    scoped_logical_id: str,
+    period: tuple[str, datetime, datetime],
+    credits: int,
+    overage: int,
+    **metadata,
+) -> PlatformCreditReservation:
+    period_key, period_start, period_end = period
+    return PlatformCreditReservation(
+        organization_id=principal.organization_id,
+        api_project_id=principal.api_project_id,
+        api_key_id=principal.api_key_id,
+        operation_id=operation_id,
+        logical_operation_id=scoped_logical_id,
+        billing_period_key=period_key,
+        reserved_credits=credits,
+        state="reserved",
+        overage_credits=max(0, overage),
+        metadata_json={"period_start": period_start.isoformat(), "period_end": period_end.isoformat(), **metadata},
+    )
+
+
 def reserve_credits(
     db: Session,
     *,
@@ -86,15 +177,7 @@ def reserve_credits(
     if not principal.organization_id or not principal.api_project_id or not principal.environment:
         raise HTTPException(status_code=401, detail={"code": "platform_principal_required"})
     scoped_logical_id = _scoped_logical_operation_id(operation_id, logical_operation_id)
-    existing = (
-        db.query(PlatformCreditReservation)
-        .filter(
-            PlatformCreditReservation.organization_id == principal.organization_id,
-            PlatformCreditReservation.api_project_id == principal.api_project_id,
-            PlatformCreditReservation.logical_operation_id == scoped_logical_id,
-        )
-        .first()
-    )
+    existing = _find_reservation(db, principal, scoped_logical_id)
     if existing:
         platform_quota_decisions.labels(environment=principal.environment, outcome="replay").inc()
         return existing
@@ -106,6 +189,14 @@ def reserve_credits(
             raise HTTPException(status_code=503, detail={"code": "operation_cost_not_configured"})
         platform_quota_decisions.labels(environment=principal.environment, outcome="unenforced_unpriced").inc()
         return None
+    if _credit_accounting() == "sharded":
+        return _reserve_sharded(
+            db,
+            principal=principal,
+            operation_id=operation_id,
+            scoped_logical_id=scoped_logical_id,
+            credits=credits,
+        )
     organization = (
         db.query(Organization)
         .filter(Organization.id == principal.organization_id)
@@ -114,64 +205,205 @@ def reserve_credits(
     )
     if organization is None:
         raise HTTPException(status_code=401, detail={"code": "organization_unavailable"})
-    existing = (
-        db.query(PlatformCreditReservation)
-        .filter(
-            PlatformCreditReservation.organization_id == principal.organization_id,
-            PlatformCreditReservation.api_project_id == principal.api_project_id,
-            PlatformCreditReservation.logical_operation_id == scoped_logical_id,
-        )
-        .first()
-    )
+    existing = _find_reservation(db, principal, scoped_logical_id)
     if existing:
         platform_quota_decisions.labels(environment=principal.environment, outcome="replay").inc()
         return existing
     subscription, plan = _subscription_and_plan(db, organization.id)
-    period_key, period_start, period_end = billing_period(subscription)
-    committed = int(
-        db.query(func.coalesce(func.sum(PlatformCreditReservation.committed_credits), 0))
-        .filter(
-            PlatformCreditReservation.organization_id == organization.id,
-            PlatformCreditReservation.billing_period_key == period_key,
-            PlatformCreditReservation.state == "committed",
-        )
-        .scalar()
-        or 0
+    period = billing_period(subscription)
+    included = int(plan.included_credits) if plan and plan.included_credits is not None else None
+    overage = _overage_credits(principal, plan, included, _active_credits(db, organization.id, period[0]), credits)
+    row = _new_reservation(
+        principal,
+        operation_id=operation_id,
+        scoped_logical_id=scoped_logical_id,
+        period=period,
+        credits=credits,
+        overage=overage,
     )
-    reserved = int(
-        db.query(func.coalesce(func.sum(PlatformCreditReservation.reserved_credits), 0))
+    db.add(row)
+    db.flush()
+    platform_quota_decisions.labels(
+        environment=principal.environment,
+        outcome="overage_reserved" if overage else "reserved",
+    ).inc()
+    return row
+
+
+# Sharded accounting. An organization's active credits for a billing period
+# are held in PLATFORM_API_CREDIT_SHARDS counter rows whose capacities add up
+# to the plan's included credits, plus one overflow row (capacity 0) for
+# credits beyond the allowance. A reservation locks one random shard with
+# room (SKIP LOCKED, so concurrent requests pick different rows) instead of
+# the organization row. Shards are filled in order and the overflow row only
+# grows once every shard is full, so a fit in any one shard proves the
+# period total stays within the allowance. When no single shard fits, every
+# shard is locked and the reservation is decided on the exact total, like
+# the locked path.
+_OVERFLOW_SHARD = -1
+
+
+def _shard_count() -> int:
+    return max(1, int(getattr(settings, "PLATFORM_API_CREDIT_SHARDS", 8) or 1))
+
+
+def _shards_query(db: Session, organization_id: str, period_key: str):
+    return db.query(PlatformCreditShard).filter(
+        PlatformCreditShard.organization_id == organization_id,
+        PlatformCreditShard.billing_period_key == period_key,
+    )
+
+
+def _lock_all_shards(db: Session, organization_id: str, period_key: str) -> list[PlatformCreditShard]:
+    # Descending so the overflow row is always locked last; release relies on it.
+    return (
+        _shards_query(db, organization_id, period_key)
+        .order_by(PlatformCreditShard.shard.desc())
+        .with_for_update()
+        .populate_existing()
+        .all()
+    )
+
+
+def _shards_current(rows, count: int, included: int) -> bool:
+    return (
+        len(rows) == count + 1
+        and {row.shard for row in rows} == {_OVERFLOW_SHARD, *range(count)}
+        and all(row.included_credits == included for row in rows)
+    )
+
+
+def _fill(shards: list[PlatformCreditShard], overflow: PlatformCreditShard, credits: int) -> dict[str, int]:
+    """Spread ``credits`` over free shard capacity in shard order, the rest to overflow."""
+    allocation: dict[str, int] = {}
+    for shard in sorted(shards, key=lambda row: row.shard):
+        if credits <= 0:
+            break
+        take = min(credits, max(0, shard.capacity_credits - shard.used_credits))
+        if take:
+            shard.used_credits += take
+            allocation[str(shard.shard)] = take
+            credits -= take
+    if credits > 0:
+        overflow.used_credits += credits
+        allocation[str(overflow.shard)] = credits
+    return allocation
+
+
+def _ensure_shards(db: Session, organization_id: str, period_key: str, included: int) -> None:
+    """Create the period's shards, or rebalance them after a plan or shard-count change.
+
+    Runs under the organization lock, once per organization and period in the
+    common case; the shards are seeded from the reservation ledger.
+    """
+    count = _shard_count()
+    if _shards_current(
+        _shards_query(db, organization_id, period_key)
+        .with_entities(PlatformCreditShard.shard, PlatformCreditShard.included_credits)
+        .all(),
+        count,
+        included,
+    ):
+        return
+    organization = (
+        db.query(Organization)
+        .filter(Organization.id == organization_id)
+        .with_for_update()
+        .first()
+    )
+    if organization is None:
+        raise HTTPException(status_code=401, detail={"code": "organization_unavailable"})
+    rows = _lock_all_shards(db, organization_id, period_key)
+    if _shards_current(rows, count, included):
+        return
+    existing = {row.shard: row for row in rows}
+    for index in [*range(count), _OVERFLOW_SHARD]:
+        if index not in existing:
+            existing[index] = PlatformCreditShard(
+                organization_id=organization_id,
+                billing_period_key=period_key,
+                shard=index,
+            )
+            db.add(existing[index])
+    for index, row in existing.items():
+        if index != _OVERFLOW_SHARD and index >= count:
+            db.delete(row)
+            continue
+        row.included_credits = included
+        row.capacity_credits = 0 if index == _OVERFLOW_SHARD else included // count + (1 if index < included % count else 0)
+        row.used_credits = 0
+    _fill(
+        [existing[index] for index in range(count)],
+        existing[_OVERFLOW_SHARD],
+        _active_credits(db, organization_id, period_key),
+    )
+    db.flush()
+
+
+def _claim_shard(db: Session, organization_id: str, period_key: str, credits: int) -> PlatformCreditShard | None:
+    """Lock one shard that still has room for ``credits``; unlocked shards first."""
+    query = (
+        _shards_query(db, organization_id, period_key)
         .filter(
-            PlatformCreditReservation.organization_id == organization.id,
-            PlatformCreditReservation.billing_period_key == period_key,
-            PlatformCreditReservation.state == "reserved",
+            PlatformCreditShard.shard != _OVERFLOW_SHARD,
+            PlatformCreditShard.used_credits + credits <= PlatformCreditShard.capacity_credits,
         )
-        .scalar()
-        or 0
+        .order_by(func.random())
+        .limit(1)
+        .populate_existing()
     )
+    return query.with_for_update(skip_locked=True).first() or query.with_for_update().first()
+
+
+def _reserve_sharded(
+    db: Session,
+    *,
+    principal: PlatformPrincipal,
+    operation_id: str,
+    scoped_logical_id: str,
+    credits: int,
+) -> PlatformCreditReservation:
+    if db.get(Organization, principal.organization_id) is None:
+        raise HTTPException(status_code=401, detail={"code": "organization_unavailable"})
+    subscription, plan = _subscription_and_plan(db, principal.organization_id)
+    period = billing_period(subscription)
+    period_key = period[0]
     included = int(plan.included_credits) if plan and plan.included_credits is not None else None
-    overage = 0
-    if included is not None and committed + reserved + credits > included:
-        overage = committed + reserved + credits - max(included, committed + reserved)
-        if not plan.overages_allowed:
-            platform_quota_decisions.labels(environment=principal.environment, outcome="quota_denied").inc()
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={"code": "api_credit_quota_exceeded", "included_credits": included},
+    if included is not None:
+        _ensure_shards(db, principal.organization_id, period_key, included)
+    try:
+        # The savepoint keeps a losing duplicate from leaving its shard claim behind.
+        with db.begin_nested():
+            overage, allocation = 0, {}
+            if included is not None:
+                shard = _claim_shard(db, principal.organization_id, period_key, credits)
+                if shard is not None:
+                    shard.used_credits = PlatformCreditShard.used_credits + credits
+                    allocation = {str(shard.shard): credits}
+                else:
+                    rows = _lock_all_shards(db, principal.organization_id, period_key)
+                    overage = _overage_credits(
+                        principal, plan, included, sum(row.used_credits for row in rows), credits
+                    )
+                    overflow = next(row for row in rows if row.shard == _OVERFLOW_SHARD)
+                    allocation = _fill([row for row in rows if row.shard != _OVERFLOW_SHARD], overflow, credits)
+            row = _new_reservation(
+                principal,
+                operation_id=operation_id,
+                scoped_logical_id=scoped_logical_id,
+                period=period,
+                credits=credits,
+                overage=overage,
+                **({"credit_shards": allocation} if allocation else {}),
             )
-    row = PlatformCreditReservation(
-        organization_id=organization.id,
-        api_project_id=principal.api_project_id,
-        api_key_id=principal.api_key_id,
-        operation_id=operation_id,
-        logical_operation_id=scoped_logical_id,
-        billing_period_key=period_key,
-        reserved_credits=credits,
-        state="reserved",
-        overage_credits=max(0, overage),
-        metadata_json={"period_start": period_start.isoformat(), "period_end": period_end.isoformat()},
-    )
-    db.add(row)
-    db.flush()
+            db.add(row)
+            db.flush()
+    except IntegrityError:
+        existing = _find_reservation(db, principal, scoped_logical_id)
+        if existing is None:
+            raise
+        platform_quota_decisions.labels(environment=principal.environment, outcome="replay").inc()
+        return existing
     platform_quota_decisions.labels(
         environment=principal.environment,
         outcome="overage_reserved" if overage else "reserved",
@@ -179,6 +411,53 @@ def reserve_credits(
     return row
 
 
+def _return_shard_credits(db: Session, reservation: PlatformCreditReservation, allocation: dict[str, int]) -> None:
+    """Give a released reservation's credits back, draining overflow first.
+
+    Taking from the overflow row before the claimed shards keeps the rule
+    that overflow is only non-zero while every shard is full.
+    """
+    shards = {
+        str(row.shard): row
+        for row in _shards_query(db, reservation.organization_id, reservation.billing_period_key)
+        .filter(PlatformCreditShard.shard.in_([int(key) for key in allocation]))
+        .order_by(PlatformCreditShard.shard.desc())
+        .with_for_update()
+        .populate_existing()
+        .all()
+    }
+    remaining = sum(allocation.values())
+    overflow = shards.get(str(_OVERFLOW_SHARD))
+    if overflow is None:
+        # Claimed shards are locked, so the overflow row cannot grow under us.
+        overflow_used = (
+            _shards_query(db, reservation.organization_id, reservation.billing_period_key)
+            .filter(PlatformCreditShard.shard == _OVERFLOW_SHARD)
+            .with_entities(PlatformCreditShard.used_credits)
+            .scalar()
+        )
+        if overflow_used:
+            overflow = (
+                _shards_query(db, reservation.organization_id, reservation.billing_period_key)
+                .filter(PlatformCreditShard.shard == _OVERFLOW_SHARD)
+                .with_for_update()
+                .populate_existing()
+                .first()
+            )
+    if overflow is not None:
+        take = min(remaining, max(0, overflow.used_credits))
+        overflow.used_credits -= take
+        remaining -= take
+    for key, amount in sorted(allocation.items(), key=lambda item: int(item[0])):
+        shard = shards.get(key)
+        if remaining <= 0 or shard is None or shard is overflow:
+            continue
+        # Never below what the shard holds; after a rebalance that would hand out room twice.
+        take = min(remaining, amount, max(0, shard.used_credits))
+        shard.used_credits -= take
+        remaining -= take
+
+
 def commit_credits(
     db: Session,
     reservation: PlatformCreditReservation | None,
@@ -277,9 +556,11 @@ def commit_credits(
 def release_credits(db: Session, reservation: PlatformCreditReservation | None, *, reason: str) -> None:
     if reservation is None or reservation.state == "committed":
         return
+    metadata = dict(reservation.metadata_json or {})
+    if reservation.state == "reserved" and metadata.get("credit_shards"):
+        _return_shard_credits(db, reservation, metadata["credit_shards"])
     reservation.state = "released"
     reservation.released_at = datetime.utcnow()
-    metadata = dict(reservation.metadata_json or {})
     metadata["release_reason"] = reason[:200]
     reservation.metadata_json = metadata
     platform_quota_decisions.labels(environment="unknown", outcome="released").inc()
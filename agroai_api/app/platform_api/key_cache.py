@@ -0,0 +1,386 @@
+"""Bounded, TTL'd cache of verified Platform API keys.
+
+Verifying a key costs four to six queries on every authenticated request. A
+successful verification is cached as an immutable snapshot keyed by the key's
+HMAC digest and tagged with every row the decision depended on: the key, its
+project and service account, the organization and any workspaces involved.
+
+A session listener drops entries whose rows are updated or deleted, once at
+flush and again at commit, so rotation, revocation, project or service-account
+status changes and organization access changes apply to the next request. Key
+expiry and rotation overlap are re-checked on every hit, and the TTL bounds
+staleness for writes made outside the ORM.
+
+The ``redis`` backend shares entries and invalidations between API processes
+through PLATFORM_API_REDIS_URL or REDIS_URL; a Redis failure degrades to a
+cache miss, never to an authentication failure. The default ``auto`` uses
+Redis when one is configured and otherwise disables the cache. The
+``memory`` backend is opt-in and only safe for a single API process:
+invalidation reaches only the process that made the write, so the other
+processes keep accepting a revoked or rotated key until the TTL expires.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from itertools import chain
+from typing import Any, Iterable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import platform_key_cache
+from app.models.platform_api import ApiProject, ApiServiceAccount, PlatformApiKey
+from app.models.saas import Organization, Workspace
+from app.platform_api.rate_limits import _shared_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "agroai:platform-key-cache:v1"
+_SESSION_TAGS = "platform_key_cache_tags"
+
+_WATCHED_MODELS: dict[type, str] = {
+    PlatformApiKey: "key",
+    ApiProject: "project",
+    ApiServiceAccount: "service_account",
+    Organization: "organization",
+    Workspace: "workspace",
+}
+
+
+@dataclass(frozen=True)
+class PlatformKeySnapshot:
+    id: str
+    organization_id: str
+    api_project_id: str
+    service_account_id: str
+    workspace_id: str | None
+    name: str
+    environment: str
+    scopes: tuple[str, ...]
+    status: str
+    fingerprint: str
+    cidr_allowlist_json: tuple[str, ...]
+    provider_restrictions_json: dict[str, Any]
+    resource_restrictions_json: dict[str, Any]
+    expires_at: datetime | None
+    overlap_expires_at: datetime | None
+
+    @classmethod
+    def from_row(cls, row: PlatformApiKey) -> "PlatformKeySnapshot":
+        return cls(
+            id=row.id,
+            organization_id=row.organization_id,
+            api_project_id=row.api_project_id,
+            service_account_id=row.service_account_id,
+            workspace_id=row.workspace_id,
+            name=row.name,
+            environment=row.environment,
+            scopes=tuple(row.scopes or ()),
+            status=row.status,
+            fingerprint=row.fingerprint,
+            cidr_allowlist_json=tuple(row.cidr_allowlist_json or ()),
+            provider_restrictions_json=dict(row.provider_restrictions_json or {}),
+            resource_restrictions_json=dict(row.resource_restrictions_json or {}),
+            expires_at=row.expires_at,
+            overlap_expires_at=row.overlap_expires_at,
+        )
+
+    def expired(self, now: datetime) -> bool:
+        return bool(
+            (self.expires_at and self.expires_at <= now)
+            or (self.overlap_expires_at and self.overlap_expires_at <= now)
+        )
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    id: str
+    organization_id: str
+    workspace_id: str | None
+    environment: str
+    status: str
+
+    @classmethod
+    def from_row(cls, row: ApiProject) -> "ProjectSnapshot":
+        return cls(
+            id=row.id,
+            organization_id=row.organization_id,
+            workspace_id=row.workspace_id,
+            environment=row.environment,
+            status=row.status,
+        )
+
+
+@dataclass(frozen=True)
+class ServiceAccountSnapshot:
+    id: str
+    organization_id: str
+    api_project_id: str
+    workspace_id: str | None
+    status: str
+
+    @classmethod
+    def from_row(cls, row: ApiServiceAccount) -> "ServiceAccountSnapshot":
+        return cls(
+            id=row.id,
+            organization_id=row.organization_id,
+            api_project_id=row.api_project_id,
+            workspace_id=row.workspace_id,
+            status=row.status,
+        )
+
+
+@dataclass(frozen=True)
+class VerifiedPlatformKey:
+    key: PlatformKeySnapshot
+    project: ProjectSnapshot
+    service_account: ServiceAccountSnapshot
+
+    def tags(self) -> frozenset[str]:
+        workspace_ids = {self.key.workspace_id, self.project.workspace_id, self.service_account.workspace_id}
+        return frozenset(
+            {
+                f"key:{self.key.id}",
+                f"project:{self.project.id}",
+                f"service_account:{self.service_account.id}",
+                f"organization:{self.key.organization_id}",
+            }
+            | {f"workspace:{workspace_id}" for workspace_id in workspace_ids if workspace_id}
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"key": asdict(self.key), "project": asdict(self.project), "service_account": asdict(self.service_account)},
+            default=lambda value: value.isoformat(),
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "VerifiedPlatformKey":
+        data = json.loads(payload)
+        key = dict(data["key"])
+        for field in ("expires_at", "overlap_expires_at"):
+            key[field] = datetime.fromisoformat(key[field]) if key[field] else None
+        key["scopes"] = tuple(key["scopes"])
+        key["cidr_allowlist_json"] = tuple(key["cidr_allowlist_json"])
+        return cls(
+            key=PlatformKeySnapshot(**key),
+            project=ProjectSnapshot(**data["project"]),
+            service_account=ServiceAccountSnapshot(**data["service_account"]),
+        )
+
+
+def _redis_url() -> str:
+    return str(getattr(settings, "PLATFORM_API_REDIS_URL", "") or getattr(settings, "REDIS_URL", "") or "").strip()
+
+
+def _backend() -> str:
+    backend = str(getattr(settings, "PLATFORM_API_KEY_CACHE_BACKEND", "auto") or "disabled").strip().lower()
+    if int(getattr(settings, "PLATFORM_API_KEY_CACHE_TTL_SECONDS", 30)) <= 0:
+        return "disabled"
+    if backend == "auto":
+        return "redis" if _redis_url() else "disabled"
+    return backend
+
+
+def _ttl_seconds(verified: VerifiedPlatformKey, now: datetime) -> int:
+    ttl = int(getattr(settings, "PLATFORM_API_KEY_CACHE_TTL_SECONDS", 30))
+    for deadline in (verified.key.expires_at, verified.key.overlap_expires_at):
+        if deadline is not None:
+            ttl = min(ttl, int((deadline - now).total_seconds()) + 1)
+    return max(0, ttl)
+
+
+class MemoryKeyCache:
+    """Per-process LRU of verified keys with absolute expiry per entry."""
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, VerifiedPlatformKey, frozenset[str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key_hash: str) -> VerifiedPlatformKey | None:
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[key_hash]
+                return None
+            self._entries.move_to_end(key_hash)
+            return entry[1]
+
+    def put(self, key_hash: str, verified: VerifiedPlatformKey, ttl_seconds: int) -> None:
+        max_entries = max(1, int(getattr(settings, "PLATFORM_API_KEY_CACHE_MAX_ENTRIES", 10000)))
+        with self._lock:
+            self._entries[key_hash] = (self._clock() + ttl_seconds, verified, verified.tags())
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            stale = [key_hash for key_hash, entry in self._entries.items() if entry[2] & tags]
+            for key_hash in stale:
+                del self._entries[key_hash]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisKeyCache:
+    """Entries shared between processes; a tag set per row maps to entry keys."""
+
+    def __init__(self, *, client: Any | None = None) -> None:
+        self._client = client
+
+    def _redis_client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        url = _redis_url()
+        if not url:
+            raise RuntimeError("Redis key cache backend requires PLATFORM_API_REDIS_URL or REDIS_URL")
+        self._client = _shared_redis_client(
+            url,
+            float(getattr(settings, "PLATFORM_API_REDIS_CONNECT_TIMEOUT_SECONDS", 2.0)),
+            float(getattr(settings, "PLATFORM_API_REDIS_SOCKET_TIMEOUT_SECONDS", 2.0)),
+        )
+        return self._client
+
+    def get(self, key_hash: str) -> VerifiedPlatformKey | None:
+        payload = self._redis_client().get(f"{_REDIS_PREFIX}:entry:{key_hash}")
+        return VerifiedPlatformKey.from_json(payload) if payload else None
+
+    def put(self, key_hash: str, verified: VerifiedPlatformKey, ttl_seconds: int) -> None:
+        # Tag sets live for the full configured TTL so they always outlast
+        # the entries they point at, including expiry-shortened ones.
+        tag_ttl = max(ttl_seconds, int(getattr(settings, "PLATFORM_API_KEY_CACHE_TTL_SECONDS", 30)))
+        entry_key = f"{_REDIS_PREFIX}:entry:{key_hash}"
+        pipe = self._redis_client().pipeline(transaction=False)
+        pipe.set(entry_key, verified.to_json(), ex=ttl_seconds)
+        for tag in verified.tags():
+            tag_key = f"{_REDIS_PREFIX}:tag:{tag}"
+            pipe.sadd(tag_key, entry_key)
+            pipe.expire(tag_key, tag_ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        client = self._redis_client()
+        tag_keys = [f"{_REDIS_PREFIX}:tag:{tag}" for tag in tags]
+        pipe = client.pipeline(transaction=False)
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        entry_keys = set().union(*pipe.execute()) if tag_keys else set()
+        if entry_keys or tag_keys:
+            client.delete(*entry_keys, *tag_keys)
+
+
+_MEMORY_CACHE = MemoryKeyCache()
+
+
+def _cache_for(backend: str) -> MemoryKeyCache | RedisKeyCache | None:
+    if backend == "memory":
+        return _MEMORY_CACHE
+    if backend == "redis":
+        return RedisKeyCache()
+    return None
+
+
+def cached_verification(key_hash: str) -> VerifiedPlatformKey | None:
+    """Return a cached, unexpired verification for ``key_hash`` or ``None``."""
+    backend = _backend()
+    cache = _cache_for(backend)
+    if cache is None:
+        return None
+    try:
+        verified = cache.get(key_hash)
+    except Exception as exc:
+        logger.warning("Platform key cache read failed: %s", type(exc).__name__)
+        platform_key_cache.labels(backend=backend, outcome="error").inc()
+        return None
+    if verified is None or verified.key.expired(datetime.utcnow()):
+        platform_key_cache.labels(backend=backend, outcome="miss").inc()
+        return None
+    platform_key_cache.labels(backend=backend, outcome="hit").inc()
+    return verified
+
+
+def store_verification(key_hash: str, verified: VerifiedPlatformKey) -> None:
+    cache = _cache_for(_backend())
+    if cache is None:
+        return
+    ttl_seconds = _ttl_seconds(verified, datetime.utcnow())
+    if ttl_seconds <= 0:
+        return
+    try:
+        cache.put(key_hash, verified, ttl_seconds)
+    except Exception as exc:
+        logger.warning("Platform key cache write failed: %s", type(exc).__name__)
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """Drop every cached verification that depended on one of ``tags``."""
+    tags = frozenset(tags)
+    if not tags:
+        return
+    _MEMORY_CACHE.invalidate(tags)
+    if _backend() == "redis":
+        try:
+            RedisKeyCache().invalidate(tags)
+        except Exception as exc:
+            logger.warning("Platform key cache invalidation failed: %s", type(exc).__name__)
+        platform_key_cache.labels(backend="redis", outcome="invalidated").inc()
+    else:
+        platform_key_cache.labels(backend="memory", outcome="invalidated").inc()
+
+
+def clear_memory_cache() -> None:
+    _MEMORY_CACHE.clear()
+
+
+def _changed_row_tags(session: Session) -> set[str]:
+    tags = set()
+    for item in chain(session.dirty, session.deleted):
+        kind = _WATCHED_MODELS.get(type(item))
+        if kind is None:
+            continue
+        identity = inspect(item).identity
+        if identity:
+            tags.add(f"{kind}:{identity[0]}")
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_rows(session: Session, _flush_context) -> None:
+    tags = _changed_row_tags(session)
+    if not tags:
+        return
+    invalidate_tags(tags)
+    session.info.setdefault(_SESSION_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rows(session: Session) -> None:
+    # A concurrent request may have re-cached the pre-commit rows between
+    # flush and commit; dropping the same tags again closes that window.
+    tags = session.info.pop(_SESSION_TAGS, None)
+    if tags:
+        invalidate_tags(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_rows(session: Session) -> None:
+    session.info.pop(_SESSION_TAGS, None)
@@ -3,7 +3,6 @@ from __future__ import annotations
 import hashlib
 import hmac
 import secrets
-from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -15,6 +14,14 @@ from app.models.platform_api import ApiProject, ApiServiceAccount, PlatformApiKe
 from app.models.saas import Organization
 from app.platform_api.client_ip import normalize_cidr_allowlist
 from app.platform_api.isolation import assert_key_lineage, compatible_workspace_id
+from app.platform_api.key_cache import (
+    PlatformKeySnapshot,
+    ProjectSnapshot,
+    ServiceAccountSnapshot,
+    VerifiedPlatformKey,
+    cached_verification,
+    store_verification,
+)
 from app.platform_api.scopes import normalize_scopes
 from app.platform_api.restrictions import narrow_restrictions
 
@@ -22,13 +29,6 @@ from app.platform_api.restrictions import narrow_restrictions
 KEY_PREFIXES = {"test": "agro_test_", "live": "agro_live_"}
 
 
-@dataclass(frozen=True)
-class VerifiedPlatformKey:
-    key: PlatformApiKey
-    project: ApiProject
-    service_account: ApiServiceAccount
-
-
 def _pepper() -> bytes:
     configured = str(getattr(settings, "PLATFORM_API_KEY_PEPPER", "") or "").strip()
     if configured:
@@ -119,6 +119,9 @@ def verify_platform_key(db: Session, plaintext: str) -> VerifiedPlatformKey | No
     if not plaintext.startswith(("agro_test_", "agro_live_")):
         return None
     key_hash = _digest(plaintext)
+    cached = cached_verification(key_hash)
+    if cached is not None:
+        return cached
     row = db.query(PlatformApiKey).filter(PlatformApiKey.key_hash == key_hash).first()
     if row is None or row.status != "active" or row.revoked_at is not None:
         return None
@@ -156,7 +159,13 @@ def verify_platform_key(db: Session, plaintext: str) -> VerifiedPlatformKey | No
     org = db.get(Organization, row.organization_id)
     if not organization_access_allowed(org):
         return None
-    return VerifiedPlatformKey(key=row, project=project, service_account=service_account)
+    verified = VerifiedPlatformKey(
+        key=PlatformKeySnapshot.from_row(row),
+        project=ProjectSnapshot.from_row(project),
+        service_account=ServiceAccountSnapshot.from_row(service_account),
+    )
+    store_verification(key_hash, verified)
+    return verified
 
 
 def rotate_platform_key(
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import heapq
+import logging
 import math
 import secrets
+import threading
 import time
 from dataclasses import dataclass
 from functools import lru_cache
@@ -15,7 +18,7 @@ from app.platform_api.errors import PlatformApiHTTPException
 from app.platform_api.principal import PlatformPrincipal
 
 
-_MEMORY_BUCKETS: dict[str, tuple[int, int]] = {}
+logger = logging.getLogger(__name__)
 
 ROUTE_COSTS: dict[str, int] = {
     "platform.me": 1,
@@ -37,6 +40,7 @@ local cost = tonumber(ARGV[1])
 local now = tonumber(ARGV[2])
 local counter_count = tonumber(ARGV[3])
 local retry_key = KEYS[counter_count + 1]
+local sliding = ARGV[4 + counter_count * 3] == "sliding"
 local cached = redis.call("GET", retry_key)
 if cached then
   return cjson.decode(cached)
@@ -54,7 +58,15 @@ for i = 1, counter_count do
   local reset_epoch = tonumber(ARGV[offset + 2])
   local used = tonumber(redis.call("INCRBY", KEYS[i], cost))
   if used == cost then
-    redis.call("EXPIREAT", KEYS[i], reset_epoch + 5)
+    if sliding then
+      redis.call("EXPIREAT", KEYS[i], reset_epoch + window_seconds + 5)
+    else
+      redis.call("EXPIREAT", KEYS[i], reset_epoch + 5)
+    end
+  end
+  if sliding then
+    local previous = tonumber(redis.call("GET", KEYS[counter_count + 1 + i]) or "0")
+    used = used + math.floor(previous * (reset_epoch - now) / window_seconds)
   end
   local remaining = limit - used
   if min_remaining == nil or remaining < min_remaining then
@@ -86,6 +98,63 @@ return result
 """
 
 
+# Lease mode: reserve up to ARGV want units per counter in one call. A grant
+# never exceeds a quarter of what is left (but always covers the request
+# cost), so leases shrink towards exact accounting as a counter fills up.
+# Nothing is written unless every counter that needs a refill can cover the
+# request cost.
+_REDIS_LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local counter_count = tonumber(ARGV[2])
+local divisor = tonumber(ARGV[3])
+local allowed = 1
+local retry_after = 0
+local grants = {}
+local used = {}
+
+for i = 1, counter_count do
+  local offset = 4 + ((i - 1) * 5)
+  local limit = tonumber(ARGV[offset])
+  local reset_epoch = tonumber(ARGV[offset + 2])
+  local cost = tonumber(ARGV[offset + 3])
+  local want = tonumber(ARGV[offset + 4])
+  used[i] = tonumber(redis.call("GET", KEYS[i]) or "0")
+  grants[i] = 0
+  if want > 0 then
+    local remaining = limit - used[i]
+    if remaining < cost then
+      allowed = 0
+      if reset_epoch - now > retry_after then
+        retry_after = reset_epoch - now
+      end
+    else
+      grants[i] = math.min(want, math.max(cost, math.floor(remaining / divisor)))
+    end
+  end
+end
+
+if allowed == 1 then
+  for i = 1, counter_count do
+    if grants[i] > 0 then
+      used[i] = tonumber(redis.call("INCRBY", KEYS[i], grants[i]))
+      if used[i] == grants[i] then
+        redis.call("EXPIREAT", KEYS[i], tonumber(ARGV[4 + ((i - 1) * 5) + 2]) + 5)
+      end
+    end
+  end
+elseif retry_after < 1 then
+  retry_after = 1
+end
+
+local result = {allowed, retry_after}
+for i = 1, counter_count do
+  table.insert(result, grants[i])
+  table.insert(result, used[i])
+end
+return result
+"""
+_LEASE_REMAINING_DIVISOR = 4
+
 @dataclass(frozen=True)
 class RateLimitDecision:
     allowed: bool
@@ -127,12 +196,24 @@ def _policy_windows(principal: PlatformPrincipal) -> tuple[RateLimitWindow, ...]
         raise RuntimeError("Platform API rate limiting requires a test or live environment")
     if burst < 1 or sustained < 1:
         raise RuntimeError("Platform API rate-limit policies must be positive")
+    return _windows(burst, sustained)
+
+
+@lru_cache(maxsize=32)
+def _windows(burst: int, sustained: int) -> tuple[RateLimitWindow, ...]:
     return (
         RateLimitWindow("burst", burst, 60),
         RateLimitWindow("sustained", sustained, 3600),
     )
 
 
+def _algorithm() -> str:
+    algorithm = str(getattr(settings, "PLATFORM_API_RATE_LIMIT_ALGORITHM", "fixed") or "fixed").strip().lower()
+    if algorithm not in {"fixed", "sliding"}:
+        raise RuntimeError(f"unsupported Platform API rate-limit algorithm: {algorithm}")
+    return algorithm
+
+
 def _rate_limit_subjects(principal: PlatformPrincipal) -> tuple[tuple[str, str], ...]:
     if not principal.organization_id or not principal.api_project_id or not principal.api_key_id:
         raise RuntimeError("Platform API rate limiting requires organization, project, and API key identities")
@@ -150,36 +231,102 @@ def _bucket_key(subject: str, value: str, *, environment: str, window: RateLimit
     return key, window_start + window.window_seconds
 
 
-def _memory_check(principal: PlatformPrincipal, *, cost: int) -> RateLimitDecision:
-    now = int(time.time())
-    allowed = True
-    selected_limit = 0
-    selected_remaining: int | None = None
-    selected_reset = 0
-    retry_after = 0
-    environment = principal.environment or "unknown-env"
-    for subject, value in _rate_limit_subjects(principal):
-        for window in _policy_windows(principal):
-            key, reset = _bucket_key(subject, value, environment=environment, window=window, now=now)
-            used, _reset = _MEMORY_BUCKETS.get(key, (0, reset))
-            next_used = used + cost
-            _MEMORY_BUCKETS[key] = (next_used, reset)
-            remaining = window.limit - next_used
-            if selected_remaining is None or remaining < selected_remaining:
-                selected_remaining = remaining
-                selected_limit = window.limit
-                selected_reset = reset
-            if next_used > window.limit:
-                allowed = False
-                retry_after = max(retry_after, reset - now)
-    return RateLimitDecision(
-        allowed=allowed,
-        limit=selected_limit,
-        remaining=max(0, selected_remaining or 0),
-        reset_epoch=selected_reset,
-        retry_after=max(1, retry_after) if not allowed else 0,
-        backend="memory",
-    )
+class MemoryRateLimiter:
+    """Process-local limiter that makes the same decisions as the Redis script.
+
+    Counters are keyed by tuples instead of formatted strings and tracked in a
+    heap ordered by expiry, so windows that have closed are dropped as time
+    passes. Memory never exceeds ``max_counters``: at the ceiling the counter
+    closest to expiry is evicted to make room.
+    """
+
+    def __init__(self, *, max_counters: int | None = None, clock=time.time) -> None:
+        self._max_counters = max_counters
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, ...], int] = {}
+        self._expiry: list[tuple[int, tuple[str, ...]]] = []
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._expiry.clear()
+
+    def _ceiling(self) -> int:
+        configured = self._max_counters
+        if configured is None:
+            configured = int(getattr(settings, "PLATFORM_API_RATE_LIMIT_MEMORY_MAX_COUNTERS", 100000))
+        return max(1, configured)
+
+    def _increment(self, key: tuple[str, ...], cost: int, expires_at: int, ceiling: int) -> int:
+        used = self._counters.get(key)
+        if used is not None:
+            used += cost
+            self._counters[key] = used
+            return used
+        # Each counter is pushed once, so the heap and the dict stay in step.
+        while len(self._counters) >= ceiling and self._expiry:
+            _expires_at, evicted = heapq.heappop(self._expiry)
+            self._counters.pop(evicted, None)
+        self._counters[key] = cost
+        heapq.heappush(self._expiry, (expires_at, key))
+        return cost
+
+    def check(self, principal: PlatformPrincipal, *, cost: int, algorithm: str = "fixed") -> RateLimitDecision:
+        now = int(self._clock())
+        windows = _policy_windows(principal)
+        subjects = _rate_limit_subjects(principal)
+        environment = principal.environment or "unknown-env"
+        sliding = algorithm == "sliding"
+        allowed = True
+        selected_limit = 0
+        selected_remaining: int | None = None
+        selected_reset = 0
+        retry_after = 0
+        with self._lock:
+            expiry = self._expiry
+            while expiry and expiry[0][0] <= now:
+                _expires_at, expired = heapq.heappop(expiry)
+                self._counters.pop(expired, None)
+            ceiling = self._ceiling()
+            for subject, value in subjects:
+                for window in windows:
+                    seconds = window.window_seconds
+                    window_start = now - (now % seconds)
+                    reset = window_start + seconds
+                    key = (environment, subject, value, window.name, window_start)
+                    if sliding:
+                        used = self._increment(key, cost, reset + seconds + 5, ceiling)
+                        previous = self._counters.get((environment, subject, value, window.name, window_start - seconds), 0)
+                        used += previous * (reset - now) // seconds
+                    else:
+                        used = self._increment(key, cost, reset + 5, ceiling)
+                    remaining = window.limit - used
+                    if selected_remaining is None or remaining < selected_remaining:
+                        selected_remaining = remaining
+                        selected_limit = window.limit
+                        selected_reset = reset
+                    if used > window.limit:
+                        allowed = False
+                        retry_after = max(retry_after, reset - now)
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=selected_limit,
+            remaining=max(0, selected_remaining or 0),
+            reset_epoch=selected_reset,
+            retry_after=max(1, retry_after) if not allowed else 0,
+            backend="memory",
+        )
+
+
+_MEMORY_BUCKETS = MemoryRateLimiter()
+
+
+def _memory_check(principal: PlatformPrincipal, *, cost: int, algorithm: str = "fixed") -> RateLimitDecision:
+    return _MEMORY_BUCKETS.check(principal, cost=cost, algorithm=algorithm)
 
 
 class RedisRateLimiter:
@@ -213,24 +360,39 @@ class RedisRateLimiter:
 
         return RedisConnectionError, RedisTimeoutError
 
-    def check(self, principal: PlatformPrincipal, *, cost: int = 1, operation_id: str | None = None) -> RateLimitDecision:
+    def check(
+        self,
+        principal: PlatformPrincipal,
+        *,
+        cost: int = 1,
+        operation_id: str | None = None,
+        algorithm: str = "fixed",
+    ) -> RateLimitDecision:
         now = int(time.time())
         environment = principal.environment or "unknown-env"
         keys: list[str] = []
-        args: list[int] = [cost, now, 0]
+        previous_keys: list[str] = []
+        args: list[Any] = [cost, now, 0]
         for subject, value in _rate_limit_subjects(principal):
             for window in _policy_windows(principal):
                 key, reset = _bucket_key(subject, value, environment=environment, window=window, now=now)
                 keys.append(key)
                 args.extend([window.limit, window.window_seconds, reset])
+                if algorithm == "sliding":
+                    previous_keys.append(
+                        _bucket_key(subject, value, environment=environment, window=window, now=now - window.window_seconds)[0]
+                    )
         args[2] = len(keys)
         retry_token = operation_id or secrets.token_hex(16)
         keys.append(f"agroai:platform-rate-limit:v1:retry:{retry_token}")
+        if algorithm == "sliding":
+            keys.extend(previous_keys)
+            args.append("sliding")
         client = self._redis_client()
         attempt = 0
         while True:
             try:
-                with platform_rate_limit_latency.labels(backend="redis").time():
+                with platform_rate_limit_latency.labels(backend="redis", mode="exact").time():
                     result = client.eval(_REDIS_SCRIPT, len(keys), *keys, *args)
                 break
             except self._retryable_errors():
@@ -248,11 +410,184 @@ class RedisRateLimiter:
         )
 
 
-def _redis_check(principal: PlatformPrincipal, *, cost: int, operation_id: str) -> RateLimitDecision:
+@dataclass
+class _Lease:
+    balance: int
+    global_remaining: int
+    limit: int
+    reset_epoch: int
+
+
+class RedisLeaseRateLimiter(RedisRateLimiter):
+    """Spends capacity reserved from Redis in blocks instead of one EVAL per call.
+
+    Each process reserves up to ``lease_size`` units per counter and window
+    in one script call and spends them locally, so Redis sees roughly one
+    call per ``lease_size`` requests. Reserved capacity is counted in Redis
+    before it is spent; a lease ends with its window and its counter, so
+    unspent units go back to the shared pool on rollover, and ``release``
+    returns them early on shutdown. A check that keeps losing freshly refilled
+    units to concurrent checks spends anyway after two refills, so overshoot
+    is bounded by one process's in-flight costs. Denied lease requests do not
+    consume capacity, and ``remaining`` is an estimate as of the last refill.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Any | None = None,
+        url: str | None = None,
+        lease_size: int | None = None,
+        clock=time.time,
+    ) -> None:
+        super().__init__(client=client, url=url, max_retries=0)
+        self._lease_size = lease_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._leases: dict[str, _Lease] = {}
+        self._next_sweep = 0
+        self.refills = 0
+
+    def _want(self, cost: int) -> int:
+        configured = self._lease_size
+        if configured is None:
+            configured = int(getattr(settings, "PLATFORM_API_RATE_LIMIT_LEASE_SIZE", 20))
+        return max(cost, configured)
+
+    def _sweep(self, now: int) -> None:
+        if now < self._next_sweep:
+            return
+        self._leases = {key: lease for key, lease in self._leases.items() if lease.reset_epoch > now}
+        self._next_sweep = now + 60
+
+    def _spend(self, counters: list[tuple[str, RateLimitWindow, int]], cost: int) -> RateLimitDecision:
+        selected: tuple[int, int, int] | None = None
+        for key, window, reset in counters:
+            lease = self._leases[key]
+            lease.balance -= cost
+            remaining = lease.global_remaining + max(0, lease.balance)
+            if selected is None or remaining < selected[0]:
+                selected = (remaining, window.limit, reset)
+        remaining, limit, reset = selected or (0, 0, 0)
+        return RateLimitDecision(True, limit, max(0, remaining), reset, 0, backend="redis")
+
+    def check(
+        self,
+        principal: PlatformPrincipal,
+        *,
+        cost: int = 1,
+        operation_id: str | None = None,
+        algorithm: str = "fixed",
+    ) -> RateLimitDecision:
+        if algorithm != "fixed":
+            raise RuntimeError("Platform API rate-limit lease mode supports the fixed algorithm only")
+        with platform_rate_limit_latency.labels(backend="redis", mode="lease").time():
+            return self._check(principal, cost=cost)
+
+    def _check(self, principal: PlatformPrincipal, *, cost: int) -> RateLimitDecision:
+        now = int(self._clock())
+        environment = principal.environment or "unknown-env"
+        counters: list[tuple[str, RateLimitWindow, int]] = []
+        for subject, value in _rate_limit_subjects(principal):
+            for window in _policy_windows(principal):
+                key, reset = _bucket_key(subject, value, environment=environment, window=window, now=now)
+                counters.append((key, window, reset))
+        with self._lock:
+            self._sweep(now)
+        # A concurrent check may drain a lease between refill and spend; try
+        # again a couple of times, then spend anyway (the bounded overdraw).
+        for attempt in range(3):
+            with self._lock:
+                refill = {
+                    key for key, _window, _reset in counters
+                    if key not in self._leases or self._leases[key].balance < cost
+                }
+                if not refill or attempt == 2:
+                    for key, window, reset in counters:
+                        self._leases.setdefault(key, _Lease(0, 0, window.limit, reset))
+                    return self._spend(counters, cost)
+            denied = self._refill(counters, refill, cost, now)
+            if denied is not None:
+                return denied
+        raise AssertionError("unreachable")
+
+    def _refill(
+        self,
+        counters: list[tuple[str, RateLimitWindow, int]],
+        refill: set[str],
+        cost: int,
+        now: int,
+    ) -> RateLimitDecision | None:
+        want = self._want(cost)
+        args: list[Any] = [now, len(counters), _LEASE_REMAINING_DIVISOR]
+        for key, window, reset in counters:
+            args.extend([window.limit, window.window_seconds, reset, cost, want if key in refill else 0])
+        result = self._redis_client().eval(
+            _REDIS_LEASE_SCRIPT, len(counters), *[key for key, _window, _reset in counters], *args
+        )
+        self.refills += 1
+        allowed, retry_after = int(result[0]), int(result[1])
+        if not allowed:
+            remaining, limit, reset = min(
+                (window.limit - int(result[3 + index * 2]), window.limit, reset)
+                for index, (_key, window, reset) in enumerate(counters)
+            )
+            return RateLimitDecision(False, limit, max(0, remaining), reset, max(1, retry_after), backend="redis")
+        with self._lock:
+            for index, (key, window, reset) in enumerate(counters):
+                granted = int(result[2 + index * 2])
+                global_remaining = window.limit - int(result[3 + index * 2])
+                lease = self._leases.get(key)
+                if lease is None:
+                    self._leases[key] = _Lease(granted, global_remaining, window.limit, reset)
+                else:
+                    lease.balance += granted
+                    lease.global_remaining = global_remaining
+        return None
+
+    def release(self) -> None:
+        """Give unspent units of still-open windows back to Redis."""
+        now = int(self._clock())
+        with self._lock:
+            leases, self._leases = self._leases, {}
+        unspent = {key: lease.balance for key, lease in leases.items() if lease.reset_epoch > now and lease.balance > 0}
+        if not unspent:
+            return
+        pipe = self._redis_client().pipeline(transaction=False)
+        for key, balance in unspent.items():
+            pipe.decrby(key, balance)
+        pipe.execute()
+
+
+_LEASE_LIMITERS: dict[str, RedisLeaseRateLimiter] = {}
+
+
+def _lease_limiter(url: str) -> RedisLeaseRateLimiter:
+    limiter = _LEASE_LIMITERS.get(url)
+    if limiter is None:
+        limiter = _LEASE_LIMITERS.setdefault(url, RedisLeaseRateLimiter(url=url))
+    return limiter
+
+
+def release_rate_limit_leases() -> None:
+    """Return this process's unspent lease capacity; called on shutdown."""
+    for limiter in list(_LEASE_LIMITERS.values()):
+        try:
+            limiter.release()
+        except Exception:
+            logger.exception("Platform API rate-limit leases could not be released")
+
+
+def _redis_check(principal: PlatformPrincipal, *, cost: int, operation_id: str, algorithm: str = "fixed") -> RateLimitDecision:
     url = str(getattr(settings, "PLATFORM_API_REDIS_URL", "") or getattr(settings, "REDIS_URL", "") or "").strip()
     if not url:
         raise RuntimeError("Redis rate-limit backend requires PLATFORM_API_REDIS_URL or REDIS_URL")
-    return RedisRateLimiter(url=url).check(principal, cost=cost, operation_id=operation_id)
+    mode = str(getattr(settings, "PLATFORM_API_RATE_LIMIT_MODE", "exact") or "exact").strip().lower()
+    if mode == "lease":
+        return _lease_limiter(url).check(principal, cost=cost, operation_id=operation_id, algorithm=algorithm)
+    if mode != "exact":
+        raise RuntimeError(f"unsupported Platform API rate-limit mode: {mode}")
+    return RedisRateLimiter(url=url).check(principal, cost=cost, operation_id=operation_id, algorithm=algorithm)
 
 
 def check_rate_limit(principal: PlatformPrincipal, *, route_id: str, cost: int | None = None) -> RateLimitDecision:
@@ -261,13 +596,14 @@ def check_rate_limit(principal: PlatformPrincipal, *, route_id: str, cost: int |
     backend = str(getattr(settings, "PLATFORM_API_RATE_LIMIT_BACKEND", "memory") or "memory").strip().lower()
     operation_id = secrets.token_hex(16)
     try:
+        algorithm = _algorithm()
         if backend == "redis":
-            decision = _redis_check(principal, cost=cost, operation_id=operation_id)
+            decision = _redis_check(principal, cost=cost, operation_id=operation_id, algorithm=algorithm)
         elif backend == "memory":
             if str(getattr(settings, "APP_ENV", "development")).lower() == "production":
                 raise RuntimeError("process-local Platform API rate limiting is not permitted in production")
-            with platform_rate_limit_latency.labels(backend="memory").time():
-                decision = _memory_check(principal, cost=cost)
+            with platform_rate_limit_latency.labels(backend="memory", mode="exact").time():
+                decision = _memory_check(principal, cost=cost, algorithm=algorithm)
         else:
             raise RuntimeError(f"unsupported Platform API rate-limit backend: {backend}")
         platform_rate_limit_checks.labels(
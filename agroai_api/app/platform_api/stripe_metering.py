@@ -11,6 +11,7 @@ from app.core.metrics import platform_billing_events
 from app.db.base import SessionLocal
 from app.models.platform_product import PlatformApiSubscription, PlatformStripeMeterOutbox
 from app.platform_api.stripe_mode import platform_stripe_livemode_matches
+from app.services.outbox_relay import RelayTask, record_publish_lag, relay_outbox_batch
 from app.services.redis_task_queue import get_task_publisher
 
 
@@ -25,14 +26,10 @@ def stripe_api_ready() -> bool:
     )
 
 
-def publish_pending_meter_outbox(db: Session, *, limit: int = 100) -> dict[str, int]:
-    if not settings.PLATFORM_API_STRIPE_METER_EXPORT_ENABLED:
-        return {"published": 0, "failed": 0}
-    now = datetime.utcnow()
+def _meter_publishable(now: datetime):
     stale_claim = now - timedelta(minutes=10)
-    rows = (
-        db.query(PlatformStripeMeterOutbox)
-        .filter(
+    return (
+        (
             (PlatformStripeMeterOutbox.status == "pending")
             | (
                 (PlatformStripeMeterOutbox.status == "publishing")
@@ -40,35 +37,53 @@ def publish_pending_meter_outbox(db: Session, *, limit: int = 100) -> dict[str,
                     (PlatformStripeMeterOutbox.claimed_at.is_(None))
                     | (PlatformStripeMeterOutbox.claimed_at <= stale_claim)
                 )
-            ),
-            (PlatformStripeMeterOutbox.next_attempt_at.is_(None)) | (PlatformStripeMeterOutbox.next_attempt_at <= now),
+            )
         )
+        & ((PlatformStripeMeterOutbox.next_attempt_at.is_(None)) | (PlatformStripeMeterOutbox.next_attempt_at <= now))
+    )
+
+
+def _mark_meter_queued(row: PlatformStripeMeterOutbox, now: datetime) -> None:
+    row.status = "queued"
+    row.last_error_class = None
+
+
+def _mark_meter_failed(row: PlatformStripeMeterOutbox, exc: Exception, now: datetime) -> None:
+    row.status = "pending"
+    row.attempt_count = int(row.attempt_count or 0) + 1
+    row.next_attempt_at = now + timedelta(seconds=min(3600, 2 ** min(row.attempt_count, 10)))
+    row.last_error_class = exc.__class__.__name__
+
+
+def publish_pending_meter_outbox(db: Session, *, limit: int = 100) -> dict[str, int]:
+    if not settings.PLATFORM_API_STRIPE_METER_EXPORT_ENABLED:
+        return {"published": 0, "failed": 0}
+    now = datetime.utcnow()
+    rows = (
+        db.query(PlatformStripeMeterOutbox)
+        .filter(_meter_publishable(now))
         .order_by(PlatformStripeMeterOutbox.created_at.asc())
         .with_for_update(skip_locked=True)
         .limit(max(1, min(limit, 200)))
         .all()
     )
-    if not rows:
-        return {"published": 0, "failed": 0}
-    publisher = get_task_publisher()
-    published = failed = 0
-    for row in rows:
-        row.status = "publishing"
-        row.claimed_at = now
+    result = {"published": 0, "failed": 0}
+    if rows:
+        # One claim commit for the batch; a stale claim is retried after ten minutes.
+        for row in rows:
+            row.status = "publishing"
+            row.claimed_at = now
         db.commit()
-        try:
-            publisher.enqueue(row.id, row.organization_id, STRIPE_METER_TASK_TYPE)
-            row.status = "queued"
-            row.last_error_class = None
-            published += 1
-        except Exception as exc:
-            row.status = "pending"
-            row.attempt_count = int(row.attempt_count or 0) + 1
-            row.next_attempt_at = datetime.utcnow() + timedelta(seconds=min(3600, 2 ** min(row.attempt_count, 10)))
-            row.last_error_class = exc.__class__.__name__
-            failed += 1
-        db.commit()
-    return {"published": published, "failed": failed}
+        result = relay_outbox_batch(
+            db,
+            rows,
+            get_publisher=get_task_publisher,
+            task=lambda row: RelayTask(row.id, row.organization_id, STRIPE_METER_TASK_TYPE),
+            published=_mark_meter_queued,
+            failed=_mark_meter_failed,
+        )
+    record_publish_lag(db, "stripe_meter", PlatformStripeMeterOutbox.created_at, PlatformStripeMeterOutbox.status.in_(["pending", "publishing"]))
+    return result
 
 
 def process_meter_export_task(*, outbox_id: str, organization_id: str, worker_id: str) -> str:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import json
+import threading
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
+from typing import Iterator
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import httpx
@@ -23,6 +27,14 @@ from app.platform_api.webhooks import (
     webhook_signature,
 )
 from app.platform_api.abuse import record_abuse_signal
+from app.platform_api.webhook_health import (
+    CIRCUIT_OPEN_ERROR,
+    admit_delivery,
+    circuit_blocks_outbox,
+    parked_until_by_endpoint,
+    record_delivery_result,
+)
+from app.services.outbox_relay import RelayTask, record_publish_lag, relay_outbox_batch
 from app.services.redis_task_queue import get_task_publisher
 
 
@@ -61,9 +73,10 @@ def emit_webhook_event(
         .all()
     )
     now = datetime.utcnow()
+    endpoints = [endpoint for endpoint in endpoints if event_type in set(endpoint.subscribed_event_types or [])]
+    # Rows for an endpoint whose circuit is open start parked until its cooldown ends.
+    parked = parked_until_by_endpoint(db, [endpoint.id for endpoint in endpoints], now)
     for endpoint in endpoints:
-        if event_type not in set(endpoint.subscribed_event_types or []):
-            continue
         db.add(
             PlatformWebhookOutbox(
                 organization_id=organization_id,
@@ -72,7 +85,8 @@ def emit_webhook_event(
                 endpoint_id=endpoint.id,
                 status="pending",
                 attempt_count=0,
-                next_attempt_at=now,
+                next_attempt_at=parked.get(endpoint.id, now),
+                last_error=CIRCUIT_OPEN_ERROR if endpoint.id in parked else None,
                 created_at=now,
                 updated_at=now,
             )
@@ -102,21 +116,27 @@ def _deliverable(now: datetime):
     )
 
 
+def _mark_webhook_queued(row: PlatformWebhookOutbox, now: datetime) -> None:
+    row.status = "queued"
+    row.updated_at = now
+
+
 def _publish_webhook_rows(db: Session, rows: list[PlatformWebhookOutbox]) -> dict[str, int]:
-    queue = get_task_publisher()
-    published = 0
-    failed = 0
-    for row in rows:
-        try:
-            queue.enqueue(row.id, row.organization_id, WEBHOOK_TASK_TYPE)
-            row.status = "queued"
-            row.updated_at = datetime.utcnow()
-            db.commit()
-            published += 1
-        except Exception:
-            db.rollback()
-            failed += 1
-    return {"published": published, "failed": failed, "disabled": 0}
+    """Enqueue ``rows`` in one batch and mark the published ones queued in a single commit.
+
+    A row whose enqueue fails stays publishable for the next pass. If the
+    commit fails, rows already enqueued are delivered at most once anyway:
+    the delivery claim only accepts queued rows.
+    """
+    result = relay_outbox_batch(
+        db,
+        rows,
+        get_publisher=get_task_publisher,
+        task=lambda row: RelayTask(row.id, row.organization_id, WEBHOOK_TASK_TYPE),
+        published=_mark_webhook_queued,
+        failed=lambda row, exc, now: None,
+    )
+    return {**result, "disabled": 0}
 
 
 def publish_pending_webhook_outbox(db: Session, *, limit: int = 100) -> dict[str, int]:
@@ -131,9 +151,38 @@ def publish_pending_webhook_outbox(db: Session, *, limit: int = 100) -> dict[str
         .limit(max(1, min(limit, 200)))
         .all()
     )
-    if not rows:
-        return {"published": 0, "failed": 0, "disabled": 0}
-    return _publish_webhook_rows(db, rows)
+    result = {"published": 0, "failed": 0, "disabled": 0}
+    if rows:
+        result = _publish_webhook_rows(db, rows)
+    record_publish_lag(db, "webhook", PlatformWebhookOutbox.created_at, PlatformWebhookOutbox.status.in_(["pending", "retrying"]))
+    return result
+
+
+def lock_due_webhook_deliveries(
+    db: Session,
+    *,
+    limit: int,
+    exclude_endpoint_ids: list[str] | tuple[str, ...] = (),
+) -> list[PlatformWebhookOutbox]:
+    """Lock due rows, oldest first, for direct delivery by the webhook worker.
+
+    Returns rows that are publishable or already queued (or abandoned while
+    delivering), skipping rows other transactions hold, endpoints the caller
+    has no free slot for and endpoints whose circuit is open or probing.
+    """
+    now = datetime.utcnow()
+    query = db.query(PlatformWebhookOutbox).filter(
+        or_(_publishable(now), _deliverable(now)),
+        ~circuit_blocks_outbox(now),
+    )
+    if exclude_endpoint_ids:
+        query = query.filter(PlatformWebhookOutbox.endpoint_id.notin_(list(exclude_endpoint_ids)))
+    return (
+        query.order_by(PlatformWebhookOutbox.created_at.asc())
+        .with_for_update(skip_locked=True)
+        .limit(max(1, min(limit, 200)))
+        .all()
+    )
 
 
 def publish_webhook_outbox(
@@ -186,6 +235,79 @@ def _bounded_body(response: httpx.Response, max_bytes: int) -> str:
     return b"".join(chunks).decode("utf-8", errors="replace")
 
 
+class WebhookClientPool:
+    """Keep-alive HTTP clients keyed by pinned address, port and SNI host.
+
+    Deliveries are sent to the resolved address with the hostname carried
+    only as SNI and Host, while httpx pools connections by URL origin. One
+    client per (address, port, hostname) therefore keeps a TLS connection
+    from being reused for another hostname on a shared address. Clients are
+    kept least-recently-used up to ``max_clients``; a client that is lent
+    out is never closed by eviction.
+    """
+
+    def __init__(self, max_clients: int | None = None) -> None:
+        self._max_clients = max_clients
+        self._lock = threading.Lock()
+        self._clients: OrderedDict[tuple[str, int, str], httpx.Client] = OrderedDict()
+        self._leases: dict[tuple[str, int, str], int] = {}
+
+    def _new_client(self) -> httpx.Client:
+        timeout = max(0.5, min(float(getattr(settings, "PLATFORM_API_WEBHOOK_TIMEOUT_SECONDS", 10.0)), 30.0))
+        connections = max(1, int(getattr(settings, "PLATFORM_API_WEBHOOK_ENDPOINT_CONCURRENCY", 4)))
+        return httpx.Client(
+            timeout=timeout,
+            follow_redirects=False,
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    @contextmanager
+    def lease(self, address: str, port: int, hostname: str) -> Iterator[httpx.Client]:
+        key = (address, port, hostname)
+        limit = max(1, int(self._max_clients or getattr(settings, "PLATFORM_API_WEBHOOK_CLIENT_POOL_SIZE", 256)))
+        evicted: list[httpx.Client] = []
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._new_client()
+            self._clients.move_to_end(key)
+            self._leases[key] = self._leases.get(key, 0) + 1
+            for candidate in list(self._clients):
+                if len(self._clients) <= limit:
+                    break
+                if candidate != key and not self._leases.get(candidate):
+                    evicted.append(self._clients.pop(candidate))
+        for stale in evicted:
+            stale.close()
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._leases[key] -= 1
+                if not self._leases[key]:
+                    del self._leases[key]
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), OrderedDict()
+        for client in clients:
+            client.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+_CLIENT_POOL = WebhookClientPool()
+
+
+def close_webhook_clients() -> None:
+    _CLIENT_POOL.close()
+
+
 def _post_pinned(
     url: str,
     *,
@@ -193,24 +315,26 @@ def _post_pinned(
     headers: dict[str, str],
     client: httpx.Client | None = None,
 ) -> tuple[int, str]:
-    timeout = max(0.5, min(float(getattr(settings, "PLATFORM_API_WEBHOOK_TIMEOUT_SECONDS", 10.0)), 30.0))
     max_body = max(0, min(int(getattr(settings, "PLATFORM_API_WEBHOOK_MAX_RESPONSE_BYTES", 8192)), 65536))
-    owned = client is None
-    transport_client = client or httpx.Client(timeout=timeout, follow_redirects=False)
     current = url
-    try:
-        for redirect_count in range(_MAX_REDIRECTS + 1):
-            destination = resolve_webhook_destination(current)
-            address = destination.addresses[0]
-            request_headers = dict(headers)
-            request_headers["host"] = destination.hostname if destination.port == 443 else f"{destination.hostname}:{destination.port}"
-            request = httpx.Request(
-                "POST",
-                _pinned_url(destination, address),
-                headers=request_headers,
-                content=body,
-                extensions={"sni_hostname": destination.hostname.encode("ascii")},
-            )
+    for redirect_count in range(_MAX_REDIRECTS + 1):
+        destination = resolve_webhook_destination(current)
+        address = destination.addresses[0]
+        request_headers = dict(headers)
+        request_headers["host"] = destination.hostname if destination.port == 443 else f"{destination.hostname}:{destination.port}"
+        request = httpx.Request(
+            "POST",
+            _pinned_url(destination, address),
+            headers=request_headers,
+            content=body,
+            extensions={"sni_hostname": destination.hostname.encode("ascii")},
+        )
+        lease = (
+            nullcontext(client)
+            if client is not None
+            else _CLIENT_POOL.lease(address, destination.port, destination.hostname)
+        )
+        with lease as transport_client:
             response = transport_client.send(request, stream=True)
             try:
                 excerpt = _bounded_body(response, max_body)
@@ -219,13 +343,10 @@ def _post_pinned(
                 location = response.headers.get("location")
             finally:
                 response.close()
-            if not location or redirect_count >= _MAX_REDIRECTS:
-                raise RuntimeError("webhook redirect policy rejected the response")
-            current = urljoin(destination.url, location)
-        raise RuntimeError("webhook redirect limit exceeded")
-    finally:
-        if owned:
-            transport_client.close()
+        if not location or redirect_count >= _MAX_REDIRECTS:
+            raise RuntimeError("webhook redirect policy rejected the response")
+        current = urljoin(destination.url, location)
+    raise RuntimeError("webhook redirect limit exceeded")
 
 
 def process_webhook_delivery(
@@ -272,6 +393,16 @@ def process_webhook_delivery(
         db.commit()
         return "failed"
 
+    admission = admit_delivery(db, endpoint_id=endpoint.id, outbox_id=outbox.id)
+    if not admission.deliver:
+        # Parking is not an attempt: the row waits out the endpoint's circuit.
+        outbox.status = "retrying" if outbox.attempt_count else "pending"
+        outbox.next_attempt_at = admission.parked_until
+        outbox.last_error = CIRCUIT_OPEN_ERROR
+        outbox.claimed_at = None
+        db.commit()
+        return "parked"
+
     attempt_number = int(outbox.attempt_count or 0) + 1
     request_id = f"whd_{uuid.uuid4().hex}"
     attempt = PlatformWebhookDeliveryAttempt(
@@ -330,6 +461,13 @@ def process_webhook_delivery(
     completed = datetime.utcnow()
     attempt = db.get(PlatformWebhookDeliveryAttempt, attempt.id)
     outbox = db.get(PlatformWebhookOutbox, outbox.id)
+    record_delivery_result(
+        db,
+        endpoint_id=endpoint.id,
+        organization_id=organization_id,
+        succeeded=succeeded,
+        now=completed,
+    )
     attempt.response_status = response_status
     attempt.response_excerpt = excerpt
     attempt.error_classification = error
@@ -0,0 +1,221 @@
+"""Per-endpoint circuit breaker for Platform API webhook delivery.
+
+After PLATFORM_API_WEBHOOK_CIRCUIT_FAILURE_THRESHOLD consecutive failures an
+endpoint's circuit opens. While it is open, its outbox rows are parked with
+``next_attempt_at`` set to the end of the cooldown. Parking does not count
+as an attempt and does not occupy a worker with a request that would time
+out. The cooldown doubles with every reopening, up to
+PLATFORM_API_WEBHOOK_CIRCUIT_MAX_COOLDOWN_SECONDS.
+
+Once the cooldown ends, the next delivery becomes the single probe and the
+circuit goes half-open. A successful probe closes the circuit. The parked
+backlog is then released in batches of PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SIZE
+spaced PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SECONDS apart, so an endpoint that
+fell far behind is not flooded. A failed probe reopens the circuit.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, exists, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import platform_webhook_circuit
+from app.models.platform_api import PlatformWebhookEndpointHealth, PlatformWebhookOutbox
+
+
+CIRCUIT_OPEN_ERROR = "circuit_open"
+PROBE_TIMEOUT = timedelta(minutes=5)
+
+
+@dataclass(frozen=True)
+class Admission:
+    deliver: bool
+    probe: bool = False
+    parked_until: datetime | None = None
+
+
+def _failure_threshold() -> int:
+    return max(1, int(getattr(settings, "PLATFORM_API_WEBHOOK_CIRCUIT_FAILURE_THRESHOLD", 5)))
+
+
+def _cooldown(open_count: int) -> timedelta:
+    base = max(1.0, float(getattr(settings, "PLATFORM_API_WEBHOOK_CIRCUIT_COOLDOWN_SECONDS", 30.0)))
+    ceiling = max(base, float(getattr(settings, "PLATFORM_API_WEBHOOK_CIRCUIT_MAX_COOLDOWN_SECONDS", 3600.0)))
+    return timedelta(seconds=min(ceiling, base * 2 ** min(max(0, open_count - 1), 16)))
+
+
+def circuit_blocks_outbox(now: datetime):
+    """True for outbox rows whose endpoint is cooling down or already probing."""
+    return exists().where(
+        PlatformWebhookEndpointHealth.endpoint_id == PlatformWebhookOutbox.endpoint_id,
+        or_(
+            and_(
+                PlatformWebhookEndpointHealth.state == "open",
+                PlatformWebhookEndpointHealth.open_until > now,
+            ),
+            and_(
+                PlatformWebhookEndpointHealth.state == "half_open",
+                PlatformWebhookEndpointHealth.probe_claimed_at > now - PROBE_TIMEOUT,
+            ),
+        ),
+    )
+
+
+def parked_until_by_endpoint(db: Session, endpoint_ids: list[str], now: datetime | None = None) -> dict[str, datetime]:
+    """End of the cooldown for each of ``endpoint_ids`` whose circuit is open."""
+    if not endpoint_ids:
+        return {}
+    moment = now or datetime.utcnow()
+    rows = (
+        db.query(PlatformWebhookEndpointHealth.endpoint_id, PlatformWebhookEndpointHealth.open_until)
+        .filter(
+            PlatformWebhookEndpointHealth.endpoint_id.in_(endpoint_ids),
+            PlatformWebhookEndpointHealth.state == "open",
+            PlatformWebhookEndpointHealth.open_until > moment,
+        )
+        .all()
+    )
+    return {endpoint_id: open_until for endpoint_id, open_until in rows}
+
+
+def admit_delivery(db: Session, *, endpoint_id: str, outbox_id: str, now: datetime | None = None) -> Admission:
+    """Decide whether a claimed row may be sent now, as a probe, or must be parked."""
+    moment = now or datetime.utcnow()
+    health = (
+        db.query(PlatformWebhookEndpointHealth)
+        .filter(PlatformWebhookEndpointHealth.endpoint_id == endpoint_id)
+        .populate_existing()
+        .first()
+    )
+    if health is None or health.state == "closed":
+        return Admission(deliver=True)
+    if health.state == "open" and health.open_until is not None and health.open_until > moment:
+        platform_webhook_circuit.labels(transition="parked").inc()
+        return Admission(deliver=False, parked_until=health.open_until)
+    if health.state == "half_open" and health.probe_outbox_id == outbox_id:
+        return Admission(deliver=True, probe=True)
+    taken = db.execute(
+        update(PlatformWebhookEndpointHealth)
+        .where(
+            PlatformWebhookEndpointHealth.endpoint_id == endpoint_id,
+            or_(
+                and_(
+                    PlatformWebhookEndpointHealth.state == "open",
+                    or_(
+                        PlatformWebhookEndpointHealth.open_until.is_(None),
+                        PlatformWebhookEndpointHealth.open_until <= moment,
+                    ),
+                ),
+                and_(
+                    PlatformWebhookEndpointHealth.state == "half_open",
+                    or_(
+                        PlatformWebhookEndpointHealth.probe_claimed_at.is_(None),
+                        PlatformWebhookEndpointHealth.probe_claimed_at <= moment - PROBE_TIMEOUT,
+                    ),
+                ),
+            ),
+        )
+        .values(state="half_open", probe_outbox_id=outbox_id, probe_claimed_at=moment, updated_at=moment)
+        .execution_options(synchronize_session=False)
+    )
+    if taken.rowcount == 1:
+        platform_webhook_circuit.labels(transition="half_opened").inc()
+        return Admission(deliver=True, probe=True)
+    platform_webhook_circuit.labels(transition="parked").inc()
+    return Admission(deliver=False, parked_until=moment + PROBE_TIMEOUT)
+
+
+def _locked_health(db: Session, endpoint_id: str) -> PlatformWebhookEndpointHealth | None:
+    return (
+        db.query(PlatformWebhookEndpointHealth)
+        .filter(PlatformWebhookEndpointHealth.endpoint_id == endpoint_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+
+
+def _release_parked(db: Session, endpoint_id: str, now: datetime) -> int:
+    batch_size = max(1, int(getattr(settings, "PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SIZE", 50)))
+    spacing = max(0.0, float(getattr(settings, "PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SECONDS", 5.0)))
+    parked = [
+        outbox_id
+        for (outbox_id,) in db.query(PlatformWebhookOutbox.id)
+        .filter(
+            PlatformWebhookOutbox.endpoint_id == endpoint_id,
+            PlatformWebhookOutbox.status.in_(["pending", "retrying"]),
+            PlatformWebhookOutbox.last_error == CIRCUIT_OPEN_ERROR,
+        )
+        .order_by(PlatformWebhookOutbox.created_at.asc())
+        .all()
+    ]
+    for start in range(0, len(parked), batch_size):
+        db.execute(
+            update(PlatformWebhookOutbox)
+            .where(PlatformWebhookOutbox.id.in_(parked[start:start + batch_size]))
+            .values(
+                next_attempt_at=now + timedelta(seconds=spacing * (start // batch_size)),
+                last_error=None,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return len(parked)
+
+
+def record_delivery_result(
+    db: Session,
+    *,
+    endpoint_id: str,
+    organization_id: str,
+    succeeded: bool,
+    now: datetime | None = None,
+) -> None:
+    """Fold one delivery outcome into the endpoint's circuit; the caller commits."""
+    moment = now or datetime.utcnow()
+    health = _locked_health(db, endpoint_id)
+    if succeeded:
+        if health is None or (health.state == "closed" and not health.consecutive_failures):
+            return
+        recovered = health.state != "closed"
+        health.state = "closed"
+        health.consecutive_failures = 0
+        health.open_count = 0
+        health.open_until = None
+        health.probe_outbox_id = None
+        health.probe_claimed_at = None
+        health.last_success_at = moment
+        if recovered:
+            platform_webhook_circuit.labels(transition="closed").inc()
+            _release_parked(db, endpoint_id, moment)
+        return
+    if health is None:
+        try:
+            with db.begin_nested():
+                db.add(
+                    PlatformWebhookEndpointHealth(
+                        endpoint_id=endpoint_id,
+                        organization_id=organization_id,
+                        state="closed",
+                        consecutive_failures=0,
+                        open_count=0,
+                    )
+                )
+        except IntegrityError:
+            pass
+        health = _locked_health(db, endpoint_id)
+    health.consecutive_failures = int(health.consecutive_failures or 0) + 1
+    health.last_failure_at = moment
+    if health.state == "half_open" or (
+        health.state == "closed" and health.consecutive_failures >= _failure_threshold()
+    ):
+        health.open_count = int(health.open_count or 0) + 1
+        health.state = "open"
+        health.open_until = moment + _cooldown(health.open_count)
+        health.probe_outbox_id = None
+        health.probe_claimed_at = None
+        platform_webhook_circuit.labels(transition="opened").inc()
@@ -4,12 +4,14 @@ from __future__ import annotations
 import json
 import os
 import re
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
 from app.core.config import settings
+from app.services.ai_http_clients import ai_http_client, ai_timeout
 
 FINAL_ANSWER_PROMPT = """
 Return only the final customer-safe JSON answer.
@@ -47,6 +49,14 @@ class AIGatewayResult:
     error: str | None = None
 
 
+@dataclass
+class AIStreamEvent:
+    """A streamed text delta, or the final result once generation has finished."""
+
+    delta: str = ""
+    result: AIGatewayResult | None = None
+
+
 def _normalize_provider(value: str) -> str:
     provider = (value or "").strip().lower()
     if provider in {"openrouter", "openrouter.ai"}:
@@ -112,6 +122,82 @@ def clean_model_text(content: str) -> str:
     return text.strip()
 
 
+class ThinkingFilter:
+    """Drop ``<think>`` spans from streamed text, holding back tags split across chunks.
+
+    The final answer is still cleaned once with :func:`clean_model_text`; this
+    only keeps hidden reasoning out of the deltas a user sees.
+    """
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._inside = False
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+        visible: list[str] = []
+        while self._pending:
+            lower = self._pending.lower()
+            if self._inside:
+                end = lower.find(self._CLOSE)
+                if end < 0:
+                    self._pending = self._pending[-(len(self._CLOSE) - 1):]
+                    break
+                self._pending = self._pending[end + len(self._CLOSE):]
+                self._inside = False
+                continue
+            start = lower.find(self._OPEN)
+            if start >= 0:
+                visible.append(self._pending[:start])
+                self._pending = self._pending[start + len(self._OPEN):]
+                self._inside = True
+                continue
+            keep = next((size for size in range(len(self._OPEN) - 1, 0, -1) if lower.endswith(self._OPEN[:size])), 0)
+            visible.append(self._pending[: len(self._pending) - keep])
+            self._pending = self._pending[len(self._pending) - keep:]
+            break
+        return "".join(visible)
+
+    def flush(self) -> str:
+        rest, self._pending = ("" if self._inside else self._pending), ""
+        return rest
+
+
+def _sse_delta(line: str) -> tuple[str, bool]:
+    """Text delta of one OpenAI-compatible SSE line and whether the stream is done."""
+    if not line.startswith("data:"):
+        return "", False
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return "", True
+    body = json.loads(data)
+    if body.get("error"):
+        raise ValueError(f"stream error: {body['error']}")
+    choices = body.get("choices") or []
+    if not choices:
+        return "", False
+    value = (choices[0].get("delta") or {}).get("content")
+    if isinstance(value, list):
+        value = "".join(str(item.get("text") or "") if isinstance(item, dict) else str(item) for item in value)
+    return str(value or ""), False
+
+
+def _ndjson_delta(line: str) -> tuple[str, dict[str, Any] | None]:
+    """Text delta of one Ollama NDJSON line and the line itself once it reports ``done``."""
+    if not line.strip():
+        return "", None
+    body = json.loads(line)
+    if not isinstance(body, dict):
+        return "", None
+    if body.get("error"):
+        raise ValueError(f"stream error: {body['error']}")
+    value = (body.get("message") or {}).get("content") or body.get("response") or ""
+    return str(value), body if body.get("done") else None
+
+
 def extract_final_answer(content: str) -> str:
     return clean_model_text(content)
 
@@ -230,6 +316,29 @@ class AIGateway:
         except (httpx.HTTPError, KeyError, ValueError, TypeError) as exc:
             return AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider or "unconfigured", model=selected or None, error=str(exc))
 
+    async def chat_stream(self, messages: list[dict[str, str]], *, temperature: float = 0.2, response_format: dict[str, Any] | None = None, model_override: str | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None, max_model_attempts: int | None = None) -> AsyncIterator[AIStreamEvent]:
+        """Stream a chat completion as text deltas, ending with exactly one result event.
+
+        Deltas have ``<think>`` spans removed. The final result carries the
+        answer cleaned once with :func:`clean_model_text`, which callers
+        should treat as authoritative over the concatenated deltas.
+        """
+        selected = (model_override or self.model or "").strip()
+        if not self.is_configured_for(selected):
+            yield AIStreamEvent(result=self._offline_fallback(selected or None))
+            return
+        enriched = self._with_agroai_context(messages)
+        if self.provider == "ollama":
+            events = self._stream_ollama(enriched, temperature, model_override=model_override, max_tokens=max_tokens, timeout_seconds=timeout_seconds)
+        else:
+            events = self._stream_openai_compatible(enriched, temperature, response_format, model_override=model_override, max_tokens=max_tokens, timeout_seconds=timeout_seconds, max_model_attempts=max_model_attempts)
+        try:
+            async with aclosing(events):
+                async for event in events:
+                    yield event
+        except (httpx.HTTPError, KeyError, ValueError, TypeError) as exc:
+            yield AIStreamEvent(result=AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider or "unconfigured", model=selected or None, error=str(exc)))
+
     def _headers(self) -> dict[str, str]:
         headers = {"Authorization":f"Bearer {self.api_key}","Content-Type":"application/json"}
         if self.provider == "openrouter" or "openrouter.ai" in self.base_url.lower():
@@ -253,15 +362,42 @@ class AIGateway:
             return "\n".join(str(item.get("text") or item.get("content") or item) if isinstance(item, dict) else str(item) for item in value).strip()
         return ""
 
-    async def _post_openai_payload(self, client: httpx.AsyncClient, headers: dict[str, str], payload: dict[str, Any]) -> dict[str, Any]:
-        response = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload)
+    async def _post_openai_payload(self, client: httpx.AsyncClient, headers: dict[str, str], payload: dict[str, Any], timeout: httpx.Timeout | Any = httpx.USE_CLIENT_DEFAULT) -> dict[str, Any]:
+        response = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=payload, timeout=timeout)
         if response.status_code in {400, 422} and "response_format" in payload:
             retry = dict(payload)
             retry.pop("response_format", None)
-            response = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=retry)
+            response = await client.post(f"{self.base_url}/chat/completions", headers=headers, json=retry, timeout=timeout)
         response.raise_for_status()
         return response.json()
 
+    @staticmethod
+    def _final_content(raw_content: str, response_format: dict[str, Any] | None) -> str:
+        content = clean_model_text(raw_content)
+        if response_format:
+            try:
+                json.loads(raw_content)
+                content = raw_content
+            except json.JSONDecodeError:
+                content = json.dumps({"summary":content,"answer":content,"customer_safe":True})
+        return content
+
+    async def _send_openai_stream(self, client: httpx.AsyncClient, headers: dict[str, str], payload: dict[str, Any], timeout: httpx.Timeout | Any = httpx.USE_CLIENT_DEFAULT) -> httpx.Response:
+        url = f"{self.base_url}/chat/completions"
+        response = await client.send(client.build_request("POST", url, headers=headers, json=payload, timeout=timeout), stream=True)
+        if response.status_code in {400, 422} and "response_format" in payload:
+            await response.aclose()
+            retry = dict(payload)
+            retry.pop("response_format", None)
+            response = await client.send(client.build_request("POST", url, headers=headers, json=retry, timeout=timeout), stream=True)
+        if response.status_code >= 400:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            response.raise_for_status()
+        return response
+
     @staticmethod
     def _should_try_next_model(exc: httpx.HTTPStatusError) -> bool:
         code = exc.response.status_code if exc.response is not None else 0
@@ -272,48 +408,134 @@ class AIGateway:
         candidates = self._candidate_models(model_override, max_model_attempts)
         if not candidates:
             return AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider, model=None, error="No compatible model candidates configured.")
-        async with httpx.AsyncClient(timeout=max(4, min(int(timeout_seconds or self.timeout or 18), 75))) as client:
+        timeout = ai_timeout(max(4, min(int(timeout_seconds or self.timeout or 18), 75)))
+        async with ai_http_client(self.base_url, lane="hosted") as client:
             for model in candidates:
                 payload: dict[str, Any] = {"model":model,"messages":messages,"temperature":temperature,"max_tokens":int(max_tokens or 1200)}
                 if response_format:
                     payload["response_format"] = response_format
                 try:
-                    body = await self._post_openai_payload(client, self._headers(), payload)
+                    body = await self._post_openai_payload(client, self._headers(), payload, timeout)
                 except httpx.HTTPStatusError as exc:
                     errors.append(f"{model}: HTTP {exc.response.status_code if exc.response else 'unknown'}")
                     if not self._should_try_next_model(exc):
                         raise
                     continue
-                raw_content = self._message_content(body)
-                content = clean_model_text(raw_content)
-                if response_format:
-                    try:
-                        json.loads(raw_content)
-                        content = raw_content
-                    except json.JSONDecodeError:
-                        content = json.dumps({"summary":content,"answer":content,"customer_safe":True})
+                content = self._final_content(self._message_content(body), response_format)
                 if not content:
                     errors.append(f"{model}: empty_content")
                     continue
                 return AIGatewayResult(status="ok", content=content, provider=self.raw_provider or self.provider, model=model, raw=body)
-        return AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider, model=None, error="All configured AI models failed: " + " | ".join(errors))
+            return AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider, model=None, error="All configured AI models failed: " + " | ".join(errors))
+
+    async def _stream_openai_compatible(self, messages: list[dict[str, str]], temperature: float, response_format: dict[str, Any] | None, model_override: str | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None, max_model_attempts: int | None = None) -> AsyncIterator[AIStreamEvent]:
+        errors: list[str] = []
+        candidates = self._candidate_models(model_override, max_model_attempts)
+        if not candidates:
+            yield AIStreamEvent(result=AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider, model=None, error="No compatible model candidates configured."))
+            return
+        timeout = ai_timeout(max(4, min(int(timeout_seconds or self.timeout or 18), 75)))
+        async with ai_http_client(self.base_url, lane="hosted") as client:
+            for model in candidates:
+                payload: dict[str, Any] = {"model":model,"messages":messages,"temperature":temperature,"max_tokens":int(max_tokens or 1200),"stream":True}
+                if response_format:
+                    payload["response_format"] = response_format
+                try:
+                    response = await self._send_openai_stream(client, self._headers(), payload, timeout)
+                except httpx.HTTPStatusError as exc:
+                    errors.append(f"{model}: HTTP {exc.response.status_code if exc.response else 'unknown'}")
+                    if not self._should_try_next_model(exc):
+                        raise
+                    continue
+                # Once a delta has reached the caller the answer cannot switch models.
+                parts: list[str] = []
+                visible = ThinkingFilter()
+                try:
+                    async for line in response.aiter_lines():
+                        delta, done = _sse_delta(line)
+                        if delta:
+                            parts.append(delta)
+                            text = visible.feed(delta)
+                            if text:
+                                yield AIStreamEvent(delta=text)
+                        if done:
+                            break
+                finally:
+                    await response.aclose()
+                tail = visible.flush()
+                if tail:
+                    yield AIStreamEvent(delta=tail)
+                content = self._final_content("".join(parts), response_format)
+                if not content:
+                    errors.append(f"{model}: empty_content")
+                    if parts:
+                        break
+                    continue
+                yield AIStreamEvent(result=AIGatewayResult(status="ok", content=content, provider=self.raw_provider or self.provider, model=model, raw={"streamed": True}))
+                return
+            yield AIStreamEvent(result=AIGatewayResult(status="unavailable", content="", provider=self.raw_provider or self.provider, model=None, error="All configured AI models failed: " + " | ".join(errors)))
+
+    def _ollama_payload(self, messages: list[dict[str, str]], temperature: float, selected: str, max_tokens: int | None, timeout_seconds: int | None, *, stream: bool) -> tuple[dict[str, Any], httpx.Timeout]:
+        question = _extract_question(messages)
+        deep = any(term in question.lower() for term in ("report","analysis","pdf","document","packet","plan","diagnose","detailed","explain"))
+        payload = {"model":selected,"messages":messages,"stream":stream,"think":False,"keep_alive":"45m","options":{"temperature":min(float(temperature or 0.18),0.35),"num_predict":max(200,min(int(max_tokens or (1800 if deep else 1200)),2800)),"num_ctx":8192 if deep else 6144,"top_p":0.9}}
+        return payload, ai_timeout(max(12,min(int(timeout_seconds or (75 if deep else 35)),90)))
+
+    async def _stream_ollama(self, messages: list[dict[str, str]], temperature: float, model_override: str | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None) -> AsyncIterator[AIStreamEvent]:
+        selected = (model_override or self.model or "").strip()
+        edge_compat = _is_edge_ollama_compat_base(self.base_url)
+        default_provider = "cloudflare-workers-ai" if edge_compat else "ollama"
+        if not selected or ("/" in selected and not edge_compat):
+            yield AIStreamEvent(result=AIGatewayResult(status="unavailable", content="", provider="ollama", model=selected or None, error="No compatible local Ollama model configured."))
+            return
+        payload, timeout = self._ollama_payload(messages, temperature, selected, max_tokens, timeout_seconds, stream=True)
+        async with ai_http_client(self.base_url, lane="edge" if edge_compat else "local") as client:
+            response = await client.send(client.build_request("POST", f"{self.base_url}/api/chat", headers=self._ollama_headers(), json=payload, timeout=timeout), stream=True)
+            parts: list[str] = []
+            visible = ThinkingFilter()
+            final: dict[str, Any] = {}
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    delta, done = _ndjson_delta(line)
+                    if delta:
+                        parts.append(delta)
+                        text = visible.feed(delta)
+                        if text:
+                            yield AIStreamEvent(delta=text)
+                    if done is not None:
+                        final = done
+                        break
+            finally:
+                await response.aclose()
+            tail = visible.flush()
+            if tail:
+                yield AIStreamEvent(delta=tail)
+            content = clean_model_text("".join(parts))
+            actual_model = str(final.get("model") or selected).strip()
+            actual_provider = str(final.get("provider") or default_provider).strip()
+            if not content:
+                yield AIStreamEvent(result=AIGatewayResult(status="unavailable", content="", provider=actual_provider, model=actual_model, raw={"streamed": True}, error="Ollama-compatible origin returned no usable content."))
+                return
+            yield AIStreamEvent(result=AIGatewayResult(status="ok", content=content, provider=actual_provider, model=actual_model, raw={"streamed": True}))
 
     async def _chat_ollama(self, messages: list[dict[str, str]], temperature: float, model_override: str | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None) -> AIGatewayResult:
         selected = (model_override or self.model or "").strip()
         edge_compat = _is_edge_ollama_compat_base(self.base_url)
         if not selected or ("/" in selected and not edge_compat):
             return AIGatewayResult(status="unavailable", content="", provider="ollama", model=selected or None, error="No compatible local Ollama model configured.")
-        question = _extract_question(messages)
-        deep = any(term in question.lower() for term in ("report","analysis","pdf","document","packet","plan","diagnose","detailed","explain"))
-        payload = {"model":selected,"messages":messages,"stream":False,"think":False,"keep_alive":"45m","options":{"temperature":min(float(temperature or 0.18),0.35),"num_predict":max(200,min(int(max_tokens or (1800 if deep else 1200)),2800)),"num_ctx":8192 if deep else 6144,"top_p":0.9}}
-        async with httpx.AsyncClient(timeout=max(12,min(int(timeout_seconds or (75 if deep else 35)),90))) as client:
+        payload, timeout = self._ollama_payload(messages, temperature, selected, max_tokens, timeout_seconds, stream=False)
+        async with ai_http_client(self.base_url, lane="edge" if edge_compat else "local") as client:
             response = await client.post(
                 f"{self.base_url}/api/chat",
                 headers=self._ollama_headers(),
                 json=payload,
+                timeout=timeout,
             )
-            response.raise_for_status()
-            body = response.json()
+        response.raise_for_status()
+        body = response.json()
         content = clean_model_text(((body.get("message") or {}).get("content") or body.get("response") or "") if isinstance(body, dict) else "")
         actual_model = str(body.get("model") or selected).strip() if isinstance(body, dict) else selected
         actual_provider = str(body.get("provider") or ("cloudflare-workers-ai" if edge_compat else "ollama")).strip() if isinstance(body, dict) else ("cloudflare-workers-ai" if edge_compat else "ollama")
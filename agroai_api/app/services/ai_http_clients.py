@@ -0,0 +1,158 @@
+"""Shared keep-alive HTTP clients for the AI gateway and intelligence lanes.
+
+Every chat call used to open its own ``httpx.AsyncClient``, so every Ask
+AGRO-AI question paid a fresh TCP and TLS handshake to OpenRouter, the
+Cloudflare edge and Ollama. Callers now borrow a pooled client keyed by lane
+and origin. The lanes are ``hosted``, ``local`` and ``edge``. HTTP/2 is used
+when the optional ``h2`` package is installed. Pool sizes come from the
+AI_HTTP_* settings.
+
+Each caller passes its own read timeout per request through
+:func:`ai_timeout`, which keeps the lane's connect timeout short. Async
+connections belong to the event loop that opened them, so clients are only
+pooled on the app lifespan's loop, which binds the registry on startup and
+closes the pool on shutdown. Other loops, such as ``asyncio.run`` in workers
+and scripts, get a client per call that is closed when the call ends. A
+pooled client on a short-lived loop would keep that loop and its sockets
+alive for the life of the process.
+
+Metrics: ``agroai_ai_http_requests_total`` and
+``agroai_ai_http_connections_opened_total`` give the connection reuse ratio.
+``agroai_ai_http_time_to_headers_seconds`` is the time to the response
+headers.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import ssl
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import ai_http_connections_opened, ai_http_requests, ai_http_time_to_headers
+
+
+LANES = frozenset({"hosted", "local", "edge"})
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_SENT_AT = "agroai_sent_at"
+
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(str(base_url or "").strip())
+    return f"{parts.scheme}://{parts.netloc}".lower() if parts.scheme and parts.netloc else str(base_url or "")
+
+
+def ai_timeout(read_seconds: float) -> httpx.Timeout:
+    """A request timeout with the caller's read budget and the lane connect timeout."""
+    read = max(1.0, float(read_seconds))
+    connect = max(0.5, float(getattr(settings, "AI_HTTP_CONNECT_TIMEOUT_SECONDS", 5.0)))
+    return httpx.Timeout(read, connect=min(connect, read))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max(1, int(getattr(settings, "AI_HTTP_MAX_CONNECTIONS", 64))),
+        max_keepalive_connections=max(0, int(getattr(settings, "AI_HTTP_MAX_KEEPALIVE_CONNECTIONS", 16))),
+        keepalive_expiry=max(1.0, float(getattr(settings, "AI_HTTP_KEEPALIVE_EXPIRY_SECONDS", 90.0))),
+    )
+
+
+def _hooks(lane: str) -> dict:
+    async def trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            ai_http_connections_opened.labels(lane=lane).inc()
+
+    async def on_request(request: httpx.Request) -> None:
+        request.extensions["trace"] = trace
+        request.extensions[_SENT_AT] = time.perf_counter()
+        ai_http_requests.labels(lane=lane).inc()
+
+    async def on_response(response: httpx.Response) -> None:
+        sent_at = response.request.extensions.get(_SENT_AT)
+        if sent_at is not None:
+            ai_http_time_to_headers.labels(lane=lane).observe(time.perf_counter() - sent_at)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+class AIClientRegistry:
+    def __init__(self, *, verify: bool | ssl.SSLContext = True) -> None:
+        self._verify = verify
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: dict[tuple[str, str], httpx.AsyncClient] = {}
+
+    def _new_client(self, lane: str) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=_limits(),
+            timeout=ai_timeout(float(getattr(settings, "AI_TIMEOUT_SECONDS", 30) or 30)),
+            http2=_HTTP2_AVAILABLE and bool(getattr(settings, "AI_HTTP2_ENABLED", True)),
+            event_hooks=_hooks(lane),
+            verify=self._verify,
+        )
+
+    def bind(self) -> None:
+        """Pool clients on the running loop until :meth:`aclose`."""
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+
+    def pooling(self) -> bool:
+        return self._loop is not None and self._loop is asyncio.get_running_loop()
+
+    def client(self, base_url: str, *, lane: str) -> httpx.AsyncClient:
+        """The pooled client for ``lane`` and ``base_url``'s origin on the bound loop."""
+        if lane not in LANES:
+            raise ValueError(f"unknown AI lane: {lane}")
+        if not self.pooling():
+            raise RuntimeError("AI HTTP clients are only pooled on the bound event loop")
+        key = (lane, _origin(base_url))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or getattr(client, "is_closed", False):
+                client = self._new_client(lane)
+                self._clients[key] = client
+        return client
+
+    @asynccontextmanager
+    async def borrow(self, base_url: str, *, lane: str) -> AsyncIterator[httpx.AsyncClient]:
+        """The pooled client on the bound loop, otherwise a client closed on exit."""
+        if lane not in LANES:
+            raise ValueError(f"unknown AI lane: {lane}")
+        if self.pooling():
+            yield self.client(base_url, lane=lane)
+            return
+        async with self._new_client(lane) as client:
+            yield client
+
+    async def aclose(self) -> None:
+        """Close the pooled clients and stop pooling."""
+        with self._lock:
+            clients, self._clients, self._loop = self._clients, {}, None
+        for client in clients.values():
+            await client.aclose()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+
+_REGISTRY = AIClientRegistry()
+
+
+def ai_http_client(base_url: str, *, lane: str):
+    """``async with ai_http_client(url, lane=...) as client`` borrows a lane client."""
+    return _REGISTRY.borrow(base_url, lane=lane)
+
+
+def bind_ai_http_clients() -> None:
+    _REGISTRY.bind()
+
+
+async def close_ai_http_clients() -> None:
+    await _REGISTRY.aclose()
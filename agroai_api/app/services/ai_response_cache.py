@@ -0,0 +1,272 @@
+"""Bounded, TTL'd cache of Ask AGRO-AI model responses.
+
+An identical or near-identical question asked against the same workspace
+context used to pay the full LLM round trip every time. ``ModelRouter.run``
+and ``run_resilient_intelligence`` now accept a :class:`ResponseCacheScope`,
+built from the ``build_intelligence_context`` bundle. A successful answer is
+stored under a key made of:
+
+* the tenant and workspace;
+* the evidence fingerprint, which covers the ids and row versions of every
+  ``EvidenceRecord`` and ``DataSource`` the context was built from;
+* the task and call parameters;
+* the messages after normalization (Unicode NFKC, case folding, collapsed
+  whitespace and trailing punctuation), so questions that differ only in
+  spacing, case or a trailing "?" share an answer.
+
+The language instruction is part of the messages, so each language has its
+own entries.
+
+A session listener drops every entry of a tenant whose evidence or data
+sources are inserted, updated or deleted. It runs once at flush and again at
+commit. The TTL bounds staleness for writes made outside the ORM. Entries
+are per process and are checked against the caller's tenant on every hit.
+The cache is bounded by entry count and by the total size of cached
+content.
+
+Metrics: ``agroai_ai_response_cache_total`` counts hits, misses, stores and
+invalidations. ``agroai_ai_response_cache_saved_seconds_total`` adds up the
+model latency that hits avoided.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import ai_response_cache, ai_response_cache_saved_seconds
+from app.models.operational_records import DataSource, EvidenceRecord
+
+
+_SESSION_TENANTS = "ai_response_cache_tenants"
+_WATCHED_MODELS = (EvidenceRecord, DataSource)
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = ".?!;:,。？！؟"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ResponseCacheScope:
+    tenant_id: str
+    workspace_id: str | None
+    evidence_fingerprint: str
+
+
+def _row_version(row: Any) -> str:
+    values = {attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs}
+    payload = json.dumps(values, default=str, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def evidence_fingerprint(evidence: Iterable[EvidenceRecord], sources: Iterable[DataSource]) -> str:
+    """Digest of the ids and row versions of the evidence and data sources in a context."""
+    digest = hashlib.sha256()
+    for kind, rows in (("evidence", evidence), ("source", sources)):
+        for row_id, version in sorted((str(row.id), _row_version(row)) for row in rows):
+            digest.update(f"{kind}:{row_id}:{version}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def response_cache_scope(bundle: dict[str, Any], *, tenant_id: str) -> ResponseCacheScope | None:
+    """The cache scope of a ``build_intelligence_context`` bundle, if it carries a fingerprint."""
+    fingerprint = bundle.get("evidence_fingerprint")
+    if not fingerprint:
+        return None
+    workspace = bundle.get("workspace") or {}
+    return ResponseCacheScope(tenant_id=tenant_id, workspace_id=workspace.get("id"), evidence_fingerprint=fingerprint)
+
+
+def normalize_prompt(text: str) -> str:
+    value = unicodedata.normalize("NFKC", str(text or "")).casefold()
+    return _WHITESPACE.sub(" ", value).strip().rstrip(_TRAILING_PUNCTUATION).rstrip()
+
+
+def response_cache_key(
+    scope: ResponseCacheScope,
+    *,
+    route: str,
+    task: str,
+    messages: list[dict[str, str]],
+    params: dict[str, Any] | None = None,
+) -> str:
+    payload = json.dumps(
+        {
+            "route": route,
+            "tenant": scope.tenant_id,
+            "workspace": scope.workspace_id,
+            "evidence": scope.evidence_fingerprint,
+            "task": task,
+            "params": params or {},
+            "messages": [[str(item.get("role") or ""), normalize_prompt(item.get("content") or "")] for item in messages],
+        },
+        default=str,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "AI_RESPONSE_CACHE_TTL_SECONDS", 900))
+
+
+@dataclass(frozen=True)
+class _Entry:
+    expires_at: float
+    tenant_id: str
+    value: Any
+    elapsed_seconds: float
+    size: int
+
+
+class MemoryResponseCache:
+    """Per-process LRU of model responses, bounded by entry count and content size."""
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def get(self, key: str, *, tenant_id: str) -> tuple[Any, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock() or entry.tenant_id != tenant_id:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry.value), entry.elapsed_seconds
+
+    def put(self, key: str, *, tenant_id: str, value: Any, elapsed_seconds: float, size: int, ttl_seconds: int) -> None:
+        max_entries = max(1, int(getattr(settings, "AI_RESPONSE_CACHE_MAX_ENTRIES", 2000)))
+        max_bytes = max(1, int(getattr(settings, "AI_RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)))
+        if size > max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(self._clock() + ttl_seconds, tenant_id, copy.deepcopy(value), elapsed_seconds, size)
+            self._bytes += size
+            while len(self._entries) > max_entries or self._bytes > max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_tenants(self, tenant_ids: Iterable[str]) -> int:
+        tenant_ids = frozenset(tenant_ids)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.tenant_id in tenant_ids]
+            for key in stale:
+                self._drop(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_MEMORY_CACHE = MemoryResponseCache()
+
+
+async def through_response_cache(
+    scope: ResponseCacheScope | None,
+    *,
+    route: str,
+    task: str,
+    messages: list[dict[str, str]],
+    params: dict[str, Any] | None,
+    call: Callable[[], Awaitable[T]],
+    cacheable: Callable[[T], bool],
+) -> T:
+    """Return a cached response for this scope and prompt, or await ``call`` and cache its result."""
+    ttl_seconds = _ttl_seconds()
+    if scope is None or ttl_seconds <= 0:
+        return await call()
+    key = response_cache_key(scope, route=route, task=task, messages=messages, params=params)
+    cached = _MEMORY_CACHE.get(key, tenant_id=scope.tenant_id)
+    if cached is not None:
+        value, elapsed_seconds = cached
+        ai_response_cache.labels(route=route, outcome="hit").inc()
+        ai_response_cache_saved_seconds.labels(route=route).inc(elapsed_seconds)
+        return value
+    ai_response_cache.labels(route=route, outcome="miss").inc()
+
+    started = time.perf_counter()
+    value = await call()
+    if cacheable(value):
+        _MEMORY_CACHE.put(
+            key,
+            tenant_id=scope.tenant_id,
+            value=value,
+            elapsed_seconds=time.perf_counter() - started,
+            size=len(repr(value)),
+            ttl_seconds=ttl_seconds,
+        )
+        ai_response_cache.labels(route=route, outcome="store").inc()
+    return value
+
+
+def invalidate_tenants(tenant_ids: Iterable[str]) -> None:
+    """Drop every cached response of ``tenant_ids``."""
+    dropped = _MEMORY_CACHE.invalidate_tenants(tenant_ids)
+    if dropped:
+        ai_response_cache.labels(route="all", outcome="invalidated").inc(dropped)
+
+
+def clear_memory_cache() -> None:
+    _MEMORY_CACHE.clear()
+
+
+def _changed_tenants(session: Session) -> set[str]:
+    tenants = set()
+    for item in chain(session.new, session.dirty, session.deleted):
+        if isinstance(item, _WATCHED_MODELS) and item.tenant_id:
+            tenants.add(item.tenant_id)
+    return tenants
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_rows(session: Session, _flush_context) -> None:
+    tenants = _changed_tenants(session)
+    if not tenants:
+        return
+    invalidate_tenants(tenants)
+    session.info.setdefault(_SESSION_TENANTS, set()).update(tenants)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_rows(session: Session) -> None:
+    # A concurrent request may have cached an answer built from the
+    # pre-commit rows between flush and commit; drop the tenant again.
+    tenants = session.info.pop(_SESSION_TENANTS, None)
+    if tenants:
+        invalidate_tenants(tenants)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_rows(session: Session) -> None:
+    session.info.pop(_SESSION_TENANTS, None)
@@ -9,6 +9,7 @@ from sqlalchemy import and_
 
 from app.models.api_key import APIKey
 from app.models.tenant import Tenant
+from app.services.api_key_usage import record_api_key_use
 from app.services.audit import AuditService
 
 
@@ -146,10 +147,8 @@ class APIKeyService:
         if key_obj.expires_at and key_obj.expires_at < datetime.utcnow():
             return None
 
-        # Update usage tracking
-        key_obj.last_used_at = datetime.utcnow()
-        key_obj.usage_count = str(int(key_obj.usage_count or "0") + 1)
-        db.commit()
+        # Usage is written behind in batches; see app.services.api_key_usage
+        record_api_key_use(db, key_obj)
 
         return key_obj
 
@@ -0,0 +1,225 @@
+"""Write-behind usage tracking for tenant API keys.
+
+Authenticating with an API key used to update ``last_used_at`` and
+``usage_count`` and commit inside every request, turning reads into write
+transactions that serialize on hot key rows. Uses are now accumulated in
+memory (or in Redis, shared between processes) and written to the database
+in one batch by a background flusher, with a final flush on shutdown. The
+columns are eventually consistent: counts are added, never overwritten, and
+``last_used_at`` only moves forward.
+
+When no flusher is running (scripts, one-off processes) ``record_api_key_use``
+writes through on the caller's session as before.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.api_key import APIKey
+
+logger = logging.getLogger(__name__)
+
+PendingUsage = Dict[str, Tuple[int, datetime]]
+
+_REDIS_COUNTS = "agroai:api-key-usage:v1:counts"
+_REDIS_LAST_USED = "agroai:api-key-usage:v1:last-used"
+
+# Add to the count and keep the later last-used time. Timestamps are fixed-width
+# ISO strings, so string order is time order; a restored older batch never
+# replaces a newer use recorded since the drain.
+_REDIS_RECORD_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+local current = redis.call('HGET', KEYS[2], ARGV[1])
+if (not current) or current < ARGV[3] then
+  redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+end
+return 1
+"""
+
+# Read and clear both hashes atomically so concurrent uses land in the next batch.
+_REDIS_DRAIN_SCRIPT = """
+local counts = redis.call('HGETALL', KEYS[1])
+local last_used = redis.call('HGETALL', KEYS[2])
+redis.call('DEL', KEYS[1], KEYS[2])
+return {counts, last_used}
+"""
+
+
+class MemoryUsageAccumulator:
+    """Per-process counts and latest use per key id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: PendingUsage = {}
+
+    def record(self, key_id: str, used_at: datetime, count: int = 1) -> None:
+        with self._lock:
+            previous = self._pending.get(key_id)
+            if previous is None:
+                self._pending[key_id] = (count, used_at)
+            else:
+                self._pending[key_id] = (previous[0] + count, max(previous[1], used_at))
+
+    def drain(self) -> PendingUsage:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: PendingUsage) -> None:
+        for key_id, (count, used_at) in pending.items():
+            self.record(key_id, used_at, count)
+
+
+@lru_cache(maxsize=2)
+def _redis_client(url: str) -> Any:
+    import redis
+
+    return redis.Redis.from_url(
+        url,
+        decode_responses=True,
+        socket_connect_timeout=1.0,
+        socket_timeout=1.0,
+        health_check_interval=30,
+    )
+
+
+class RedisUsageAccumulator:
+    """Counts shared by every API process; any process's flusher drains them."""
+
+    def __init__(self, client: Any | None = None) -> None:
+        self._client = client
+
+    def _redis(self) -> Any:
+        if self._client is None:
+            url = str(getattr(settings, "REDIS_URL", "") or "").strip()
+            if not url:
+                raise RuntimeError("Redis API key usage backend requires REDIS_URL")
+            self._client = _redis_client(url)
+        return self._client
+
+    def record(self, key_id: str, used_at: datetime, count: int = 1) -> None:
+        self._redis().eval(
+            _REDIS_RECORD_SCRIPT, 2, _REDIS_COUNTS, _REDIS_LAST_USED, key_id, count, used_at.isoformat(timespec="microseconds")
+        )
+
+    def drain(self) -> PendingUsage:
+        counts, last_used = self._redis().eval(_REDIS_DRAIN_SCRIPT, 2, _REDIS_COUNTS, _REDIS_LAST_USED)
+        counts = dict(zip(counts[::2], counts[1::2]))
+        last_used = dict(zip(last_used[::2], last_used[1::2]))
+        now = datetime.utcnow()
+        return {
+            key_id: (int(count), datetime.fromisoformat(last_used[key_id]) if key_id in last_used else now)
+            for key_id, count in counts.items()
+        }
+
+    def restore(self, pending: PendingUsage) -> None:
+        pipe = self._redis().pipeline(transaction=False)
+        for key_id, (count, used_at) in pending.items():
+            pipe.eval(
+                _REDIS_RECORD_SCRIPT, 2, _REDIS_COUNTS, _REDIS_LAST_USED, key_id, count, used_at.isoformat(timespec="microseconds")
+            )
+        pipe.execute()
+
+
+_MEMORY_ACCUMULATOR = MemoryUsageAccumulator()
+_scheduler: AsyncIOScheduler | None = None
+
+
+def _accumulator() -> MemoryUsageAccumulator | RedisUsageAccumulator:
+    if str(getattr(settings, "API_KEY_USAGE_BACKEND", "memory")).strip().lower() == "redis":
+        return RedisUsageAccumulator()
+    return _MEMORY_ACCUMULATOR
+
+
+def write_usage(db: Session, pending: PendingUsage) -> int:
+    """Add ``pending`` to the stored usage columns and commit; returns rows updated."""
+    if not pending:
+        return 0
+    rows = (
+        db.query(APIKey)
+        .filter(APIKey.id.in_(list(pending)))
+        .order_by(APIKey.id)
+        .with_for_update()
+        .all()
+    )
+    for row in rows:
+        count, used_at = pending[row.id]
+        row.usage_count = str(int(row.usage_count or "0") + count)
+        if row.last_used_at is None or row.last_used_at < used_at:
+            row.last_used_at = used_at
+    db.commit()
+    return len(rows)
+
+
+def record_api_key_use(db: Session, key: APIKey) -> None:
+    """Count one authenticated use of ``key``."""
+    used_at = datetime.utcnow()
+    if _scheduler is None:
+        write_usage(db, {key.id: (1, used_at)})
+        return
+    try:
+        _accumulator().record(key.id, used_at)
+    except Exception:  # noqa: BLE001 - usage tracking must never fail authentication
+        logger.exception("API key usage could not be recorded")
+
+
+def flush_api_key_usage() -> int:
+    """Write accumulated usage in one transaction on a fresh session."""
+    accumulator = _accumulator()
+    try:
+        pending = accumulator.drain()
+    except Exception:  # noqa: BLE001 - a flusher tick must never crash the loop
+        logger.exception("API key usage could not be drained")
+        return 0
+    if not pending:
+        return 0
+    db = SessionLocal()
+    try:
+        return write_usage(db, pending)
+    except Exception:  # noqa: BLE001 - keep the counts for the next tick
+        db.rollback()
+        logger.exception("API key usage flush failed; retrying next interval")
+        accumulator.restore(pending)
+        return 0
+    finally:
+        db.close()
+
+
+def start_api_key_usage_flusher() -> AsyncIOScheduler:
+    global _scheduler
+    if _scheduler is not None:
+        return _scheduler
+    interval = int(getattr(settings, "API_KEY_USAGE_FLUSH_SECONDS", 30))
+    _scheduler = AsyncIOScheduler()
+    _scheduler.add_job(
+        flush_api_key_usage,
+        trigger=IntervalTrigger(seconds=interval),
+        id="api_key_usage_flush",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    _scheduler.start()
+    logger.info("API key usage flusher started (interval=%ss)", interval)
+    return _scheduler
+
+
+def stop_api_key_usage_flusher() -> None:
+    """Stop the interval job and write whatever is still pending."""
+    global _scheduler
+    if _scheduler is not None:
+        try:
+            _scheduler.shutdown(wait=False)
+        finally:
+            _scheduler = None
+    flush_api_key_usage()
@@ -0,0 +1,107 @@
+"""Per-block water-state + forecast computation, inline or in a process pool.
+
+WaterStateEngine.estimate and ForecastEngine.forecast are pure functions of
+a FeatureSet and a CropSoilProfile, so the scheduler can ship batches of
+tasks to worker processes and keep every database write in the parent.
+
+Results always come back in task order regardless of which worker finished
+first. With ``workers <= 1`` everything runs inline in the calling process.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from app.services.crop_soil_profile import CropSoilProfile
+from app.services.feature_builder import FeatureSet
+from app.services.forecast_engine import ForecastEngine, VWCForecast
+from app.services.water_state_engine import WaterStateEngine, WaterStateEstimate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockComputeTask:
+    """Inputs for one block; must stay picklable."""
+    block_id: str
+    features: FeatureSet
+    profile: CropSoilProfile
+
+
+@dataclass
+class BlockComputeResult:
+    """Engine outputs for one block. Errors are captured, not raised."""
+    block_id: str
+    estimate: Optional[WaterStateEstimate] = None
+    forecast: Optional[VWCForecast] = None
+    estimate_error: Optional[str] = None
+    forecast_error: Optional[str] = None
+    estimate_seconds: float = 0.0
+    forecast_seconds: float = 0.0
+
+
+def compute_block(
+    task: BlockComputeTask,
+    water_engine: Optional[WaterStateEngine] = None,
+    forecast_engine: Optional[ForecastEngine] = None,
+) -> BlockComputeResult:
+    """Run both engines for one block, isolating failures per engine."""
+    water_engine = water_engine or WaterStateEngine()
+    forecast_engine = forecast_engine or ForecastEngine()
+    result = BlockComputeResult(block_id=task.block_id)
+
+    started = time.perf_counter()
+    try:
+        result.estimate = water_engine.estimate(task.features)
+    except Exception as e:
+        result.estimate_error = f"{type(e).__name__}: {e}"
+    result.estimate_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        result.forecast = forecast_engine.forecast(task.features, task.profile)
+    except Exception as e:
+        result.forecast_error = f"{type(e).__name__}: {e}"
+    result.forecast_seconds = time.perf_counter() - started
+
+    return result
+
+
+def compute_batch(tasks: Sequence[BlockComputeTask]) -> List[BlockComputeResult]:
+    """Worker entry point: compute a batch of blocks in order."""
+    water_engine = WaterStateEngine()
+    forecast_engine = ForecastEngine()
+    return [compute_block(task, water_engine, forecast_engine) for task in tasks]
+
+
+def run_block_compute(
+    tasks: Sequence[BlockComputeTask],
+    workers: int = 1,
+    batch_size: int = 200,
+) -> List[BlockComputeResult]:
+    """Compute all tasks and return results in the same order as ``tasks``.
+
+    ``workers > 1`` fans batches of ``batch_size`` tasks out to a process
+    pool; ``executor.map`` yields batches in submission order, so output
+    order is deterministic. A single batch runs inline, and a broken pool
+    falls back to inline execution.
+    """
+    tasks = list(tasks)
+    batch_size = max(1, batch_size)
+    if workers <= 1 or len(tasks) <= batch_size:
+        return compute_batch(tasks)
+
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            results: List[BlockComputeResult] = []
+            for batch_results in executor.map(compute_batch, batches):
+                results.extend(batch_results)
+            return results
+    except BrokenProcessPool as e:
+        logger.warning("Block compute pool failed, running inline: %s", e)
+        return compute_batch(tasks)
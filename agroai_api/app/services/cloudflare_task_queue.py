@@ -8,6 +8,10 @@ import httpx
 from app.core.config import settings
 
 
+# Cloudflare Queues accepts at most 100 messages per sendBatch call.
+CLOUDFLARE_BATCH_LIMIT = 100
+
+
 class CloudflareTaskQueuePublisher:
     def __init__(
         self,
@@ -31,22 +35,21 @@ class CloudflareTaskQueuePublisher:
         self.client = client
         self.timeout_seconds = timeout_seconds
 
-    def enqueue(self, job_id: str, tenant_id: str, task_type: str) -> str:
-        payload = {
-            "job_id": str(job_id),
-            "tenant_id": str(tenant_id),
-            "task_type": str(task_type),
-        }
+    @property
+    def batch_url(self) -> str:
+        return f"{self.endpoint_url.rstrip('/')}/batch"
+
+    def _post(self, url: str, payload: dict[str, Any]) -> dict[str, Any]:
         headers = {
             "authorization": f"Bearer {self.token}",
             "content-type": "application/json",
             "accept": "application/json",
         }
         if self.client is not None:
-            response = self.client.post(self.endpoint_url, json=payload, headers=headers)
+            response = self.client.post(url, json=payload, headers=headers)
         else:
             with httpx.Client(timeout=self.timeout_seconds, follow_redirects=False) as client:
-                response = client.post(self.endpoint_url, json=payload, headers=headers)
+                response = client.post(url, json=payload, headers=headers)
         if response.status_code != 202:
             body = (getattr(response, "text", "") or "")[:500]
             raise RuntimeError(f"Cloudflare queue publish failed status={response.status_code} body={body}")
@@ -56,8 +59,52 @@ class CloudflareTaskQueuePublisher:
             raise RuntimeError("Cloudflare queue publish returned invalid JSON") from exc
         if data.get("status") != "queued":
             raise RuntimeError("Cloudflare queue publish response did not confirm enqueue")
+        return data
+
+    def enqueue(self, job_id: str, tenant_id: str, task_type: str) -> str:
+        payload = {
+            "job_id": str(job_id),
+            "tenant_id": str(tenant_id),
+            "task_type": str(task_type),
+        }
+        data = self._post(self.endpoint_url, payload)
         return str(data.get("job_id") or job_id)
 
+    def enqueue_many(self, tasks: list[tuple[str, str, str]]) -> list[str | Exception]:
+        """Send tasks through the edge batch route, up to 100 per request.
+
+        The edge validates each task and sends the valid ones, reporting the
+        rest by index; those become per-task errors. A failed request fails
+        every task in its chunk.
+        """
+        results: list[str | Exception] = []
+        for start in range(0, len(tasks), CLOUDFLARE_BATCH_LIMIT):
+            chunk = tasks[start:start + CLOUDFLARE_BATCH_LIMIT]
+            payload = {
+                "tasks": [
+                    {"job_id": str(job_id), "tenant_id": str(tenant_id), "task_type": str(task_type)}
+                    for job_id, tenant_id, task_type in chunk
+                ]
+            }
+            try:
+                data = self._post(self.batch_url, payload)
+                rejected = {
+                    int(item["index"]): str(item.get("error") or "rejected")
+                    for item in data.get("rejected") or []
+                    if isinstance(item, dict) and 0 <= int(item.get("index", -1)) < len(chunk)
+                }
+                if int(data.get("count") or 0) != len(chunk) - len(rejected):
+                    raise RuntimeError("Cloudflare queue batch response did not confirm every task")
+            except Exception as exc:
+                results.extend([exc] * len(chunk))
+                continue
+            for index, (job_id, _tenant_id, task_type) in enumerate(chunk):
+                if index in rejected:
+                    results.append(RuntimeError(f"Cloudflare queue rejected task_type={task_type}: {rejected[index]}"))
+                else:
+                    results.append(str(job_id))
+        return results
+
 
 def cloudflare_queue_configured() -> bool:
     backend = getattr(settings, "TASK_QUEUE_BACKEND", "disabled").strip().lower()
@@ -3,10 +3,10 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-from app.api.v1.connector_hub import ingest_upload
+from app.api.v1.connector_hub import ingest_spooled_upload
 from app.db.base import SessionLocal
 from app.models.operational_records import ConnectorConnection
-from app.services.ingestion_stream import StreamedUpload, read_spooled_bytes
+from app.services.ingestion_stream import StreamedUpload
 
 
 def ingest_streamed_receipt(
@@ -28,14 +28,13 @@ def ingest_streamed_receipt(
         if not connection or connection.tenant_id != tenant_id:
             raise RuntimeError("connector connection is unavailable for ingestion")
 
-        data = read_spooled_bytes(receipt)
-        result = ingest_upload(
+        result = ingest_spooled_upload(
             db,
             tenant_id=tenant_id,
             connection=connection,
             filename=receipt.filename,
             content_type=receipt.content_type,
-            data=data,
+            receipt=receipt,
         )
         result["upload_receipt"] = {
             "size_bytes": receipt.size_bytes,
@@ -10,13 +10,21 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from sqlalchemy import and_, desc
 from sqlalchemy.orm import Session
 
 from app.models.telemetry import Telemetry
 from app.models.schedule import Schedule
+from app.services.feature_columns import (
+    DRIFT_VWC_DELTA,
+    NUMPY_AVAILABLE,
+    SoilColumns,
+    SoilFeatureArrays,
+    compute_soil_features,
+    load_soil_columns,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -114,12 +122,25 @@ DEFAULT_DEPTH_WEIGHTS = {
     60: 0.10,   # 60 inches — deep storage
 }
 
+# Weight for depths not listed above
+DEFAULT_DEPTH_WEIGHT = 0.1
+
 # Expected number of depth sensors
 EXPECTED_DEPTHS = 5
 
 # Stale data threshold
 STALE_DATA_HOURS = 2.0
 
+# Soil profile lookback (latest reading per depth within this window)
+SOIL_PROFILE_LOOKBACK_HOURS = 24.0
+
+# ET0 / rainfall and irrigation history lookbacks
+ET_WEATHER_LOOKBACK_DAYS = 3
+IRRIGATION_LOOKBACK_DAYS = 7
+
+# Max block ids per IN (...) clause in build_many range scans
+BUILD_MANY_CHUNK_SIZE = 500
+
 
 class FeatureBuilder:
     """Builds a FeatureSet for a block from Telemetry + Schedule data."""
@@ -148,6 +169,134 @@ class FeatureBuilder:
 
         return fs
 
+    def build_many(
+        self,
+        db: Session,
+        block_ids: Sequence[str],
+        now: Optional[datetime] = None,
+        columnar: Optional[bool] = None,
+    ) -> Dict[str, FeatureSet]:
+        """Build features for many blocks with a handful of range scans.
+
+        Loads soil VWC, ET0/weather and schedule rows for all requested
+        blocks at once (chunked ``block_id IN (...)`` scans over
+        ``ix_telemetry_lookup``), partitions them per block in memory and
+        runs the same derivations as :meth:`build`. Returns a dict keyed by
+        block id, in the order the ids were given.
+
+        With ``columnar`` (the default when NumPy is installed) soil rows are
+        loaded as plain tuples and the profile, trend and soil quality flags
+        are computed for all blocks at once by ``feature_columns``.
+        """
+        if now is None:
+            now = datetime.utcnow()
+        use_columnar = NUMPY_AVAILABLE and (columnar is None or columnar)
+
+        unique_ids = list(dict.fromkeys(block_ids))
+        results: Dict[str, FeatureSet] = {
+            block_id: FeatureSet(block_id=block_id, computed_at=now)
+            for block_id in unique_ids
+        }
+        if not unique_ids:
+            return results
+
+        soil_lookback = now - timedelta(hours=max(
+            SOIL_PROFILE_LOOKBACK_HOURS, FeatureSet.trend_window_hours,
+        ))
+        weather_lookback = now - timedelta(days=ET_WEATHER_LOOKBACK_DAYS)
+        irrigation_lookback = now - timedelta(days=IRRIGATION_LOOKBACK_DAYS)
+
+        soil_by_block: Dict[str, List[Telemetry]] = {b: [] for b in unique_ids}
+        et0_by_block: Dict[str, List[Telemetry]] = {b: [] for b in unique_ids}
+        weather_by_block: Dict[str, List[Telemetry]] = {b: [] for b in unique_ids}
+        schedules_by_block: Dict[str, List[Schedule]] = {b: [] for b in unique_ids}
+
+        for chunk in _chunks(unique_ids, BUILD_MANY_CHUNK_SIZE):
+            if not use_columnar:
+                soil_rows = (
+                    db.query(Telemetry)
+                    .filter(
+                        and_(
+                            Telemetry.block_id.in_(chunk),
+                            Telemetry.type == "soil_vwc",
+                            Telemetry.timestamp >= soil_lookback,
+                        )
+                    )
+                    .order_by(Telemetry.block_id, Telemetry.timestamp)
+                    .all()
+                )
+                for r in soil_rows:
+                    soil_by_block[r.block_id].append(r)
+
+            weather_rows = (
+                db.query(Telemetry)
+                .filter(
+                    and_(
+                        Telemetry.block_id.in_(chunk),
+                        Telemetry.type.in_(["et0", "weather"]),
+                        Telemetry.timestamp >= weather_lookback,
+                    )
+                )
+                .all()
+            )
+            for r in weather_rows:
+                target = et0_by_block if r.type == "et0" else weather_by_block
+                target[r.block_id].append(r)
+
+            schedule_rows = (
+                db.query(Schedule)
+                .filter(
+                    and_(
+                        Schedule.block_id.in_(chunk),
+                        Schedule.start_time >= irrigation_lookback,
+                        Schedule.status.in_(["completed", "active"]),
+                    )
+                )
+                .order_by(desc(Schedule.start_time))
+                .all()
+            )
+            for s in schedule_rows:
+                schedules_by_block[s.block_id].append(s)
+
+        columns: Optional[SoilColumns] = None
+        soil_arrays: Optional[SoilFeatureArrays] = None
+        if use_columnar:
+            columns = load_soil_columns(db, unique_ids, soil_lookback, now)
+            soil_arrays = compute_soil_features(
+                columns,
+                depth_weights=DEFAULT_DEPTH_WEIGHTS,
+                default_weight=DEFAULT_DEPTH_WEIGHT,
+                expected_depths=EXPECTED_DEPTHS,
+                stale_hours=STALE_DATA_HOURS,
+                profile_window_hours=SOIL_PROFILE_LOOKBACK_HOURS,
+                trend_window_hours=FeatureSet.trend_window_hours,
+            )
+
+        for index, (block_id, fs) in enumerate(results.items()):
+            if soil_arrays is not None:
+                self._apply_soil_arrays(fs, columns, soil_arrays, index)
+            else:
+                soil_asc = soil_by_block[block_id]
+                profile_cutoff = now - timedelta(hours=SOIL_PROFILE_LOOKBACK_HOURS)
+                trend_cutoff = now - timedelta(hours=fs.trend_window_hours)
+                self._apply_soil_profile(
+                    fs, [r for r in reversed(soil_asc) if r.timestamp >= profile_cutoff]
+                )
+                self._apply_soil_trend(
+                    fs, [r for r in soil_asc if r.timestamp >= trend_cutoff]
+                )
+            self._apply_et_weather(
+                fs, et0_by_block[block_id], weather_by_block[block_id]
+            )
+            self._apply_irrigation_history(fs, schedules_by_block[block_id])
+            if soil_arrays is not None:
+                self._apply_soil_quality_flags(fs, soil_arrays, index)
+                self._check_unexpected_refill(now, fs)
+            else:
+                self._assess_data_quality(now, fs)
+
+        return results
+
     # ------------------------------------------------------------------
     # Soil moisture profile
     # ------------------------------------------------------------------
@@ -156,7 +305,7 @@ class FeatureBuilder:
         self, db: Session, block_id: str, now: datetime, fs: FeatureSet
     ) -> None:
         """Get the latest reading at each depth."""
-        lookback = now - timedelta(hours=24)
+        lookback = now - timedelta(hours=SOIL_PROFILE_LOOKBACK_HOURS)
 
         soil_readings = (
             db.query(Telemetry)
@@ -170,7 +319,12 @@ class FeatureBuilder:
             .order_by(desc(Telemetry.timestamp))
             .all()
         )
+        self._apply_soil_profile(fs, soil_readings)
 
+    def _apply_soil_profile(
+        self, fs: FeatureSet, soil_readings: Iterable[Telemetry]
+    ) -> None:
+        """Derive the depth profile from soil VWC rows, newest first."""
         # Group by depth, keep latest per depth
         latest_by_depth: Dict[float, Telemetry] = {}
         for r in soil_readings:
@@ -207,7 +361,7 @@ class FeatureBuilder:
         total_weight = 0.0
         weighted_sum = 0.0
         for dr in fs.depth_readings:
-            w = DEFAULT_DEPTH_WEIGHTS.get(int(dr.depth_inches), 0.1)
+            w = DEFAULT_DEPTH_WEIGHTS.get(int(dr.depth_inches), DEFAULT_DEPTH_WEIGHT)
             weighted_sum += dr.vwc * w
             total_weight += w
         if total_weight > 0:
@@ -235,7 +389,12 @@ class FeatureBuilder:
             .order_by(Telemetry.timestamp)
             .all()
         )
+        self._apply_soil_trend(fs, readings)
 
+    def _apply_soil_trend(
+        self, fs: FeatureSet, readings: Sequence[Telemetry]
+    ) -> None:
+        """Fit the VWC slope over soil VWC rows, oldest first."""
         fs.readings_count_24h = len(readings)
 
         if len(readings) < 4:
@@ -259,6 +418,52 @@ class FeatureBuilder:
         slope = (n * sum_xy - sum_x * sum_y) / denom
         fs.vwc_trend_pct_per_hour = slope
 
+    # ------------------------------------------------------------------
+    # Columnar soil features (see feature_columns)
+    # ------------------------------------------------------------------
+
+    def _apply_soil_arrays(
+        self,
+        fs: FeatureSet,
+        columns: SoilColumns,
+        arrays: SoilFeatureArrays,
+        index: int,
+    ) -> None:
+        """Copy one block's row of the columnar soil features into ``fs``."""
+        for column, row in enumerate(arrays.latest_rows[index].tolist()):
+            if row < 0:
+                continue
+            fs.depth_readings.append(DepthReading(
+                depth_inches=float(arrays.depth_columns[column]),
+                vwc=float(columns.values[row]),
+                timestamp=columns.timestamps[row],
+                source_measure_id=columns.measure_ids[row],
+            ))
+
+        fs.readings_count_24h = int(arrays.readings_count[index])
+        fs.vwc_trend_pct_per_hour = _optional_float(arrays.trend_slope[index])
+        if not fs.depth_readings:
+            return
+        fs.mean_vwc = _optional_float(arrays.mean_vwc[index])
+        fs.min_vwc = _optional_float(arrays.min_vwc[index])
+        fs.max_vwc = _optional_float(arrays.max_vwc[index])
+        fs.weighted_root_zone_vwc = _optional_float(arrays.weighted_root_zone_vwc[index])
+
+    def _apply_soil_quality_flags(
+        self, fs: FeatureSet, arrays: SoilFeatureArrays, index: int
+    ) -> None:
+        """Columnar counterpart of the soil checks in _assess_data_quality."""
+        fs.data_age_hours = _optional_float(arrays.data_age_hours[index])
+        if arrays.no_soil_data[index]:
+            fs.anomalies.append("no_soil_data")
+        fs.depth_coverage = float(arrays.depth_coverage[index])
+        if arrays.stale_data[index]:
+            fs.anomalies.append("stale_data")
+        if arrays.missing_depth[index]:
+            fs.anomalies.append("missing_depth")
+        if arrays.sensor_drift[index]:
+            fs.anomalies.append("sensor_drift")
+
     # ------------------------------------------------------------------
     # ET and weather
     # ------------------------------------------------------------------
@@ -267,7 +472,7 @@ class FeatureBuilder:
         self, db: Session, block_id: str, now: datetime, fs: FeatureSet
     ) -> None:
         """Get recent ET0 and rainfall."""
-        lookback_3d = now - timedelta(days=3)
+        lookback_3d = now - timedelta(days=ET_WEATHER_LOOKBACK_DAYS)
 
         # ET0
         et0_readings = (
@@ -281,8 +486,6 @@ class FeatureBuilder:
             )
             .all()
         )
-        if et0_readings:
-            fs.et_demand_mm_day = sum(r.value for r in et0_readings) / len(et0_readings)
 
         # Rainfall (stored as weather type with rainfall variable in metadata)
         rain_readings = (
@@ -296,6 +499,18 @@ class FeatureBuilder:
             )
             .all()
         )
+        self._apply_et_weather(fs, et0_readings, rain_readings)
+
+    def _apply_et_weather(
+        self,
+        fs: FeatureSet,
+        et0_readings: Sequence[Telemetry],
+        rain_readings: Iterable[Telemetry],
+    ) -> None:
+        """Average ET0 and total rainfall over the lookback rows."""
+        if et0_readings:
+            fs.et_demand_mm_day = sum(r.value for r in et0_readings) / len(et0_readings)
+
         fs.recent_rainfall_mm = sum(
             r.value for r in rain_readings
             if r.meta_data and r.meta_data.get("variable") == "rainfall"
@@ -309,7 +524,7 @@ class FeatureBuilder:
         self, db: Session, block_id: str, now: datetime, fs: FeatureSet
     ) -> None:
         """Get recent irrigation events from Schedule table."""
-        lookback_7d = now - timedelta(days=7)
+        lookback_7d = now - timedelta(days=IRRIGATION_LOOKBACK_DAYS)
 
         schedules = (
             db.query(Schedule)
@@ -323,7 +538,12 @@ class FeatureBuilder:
             .order_by(desc(Schedule.start_time))
             .all()
         )
+        self._apply_irrigation_history(fs, schedules)
 
+    def _apply_irrigation_history(
+        self, fs: FeatureSet, schedules: Sequence[Schedule]
+    ) -> None:
+        """Summarize irrigation events, newest first."""
         fs.irrigations_last_7d = len(schedules)
         fs.total_irrigation_volume_7d_m3 = sum(
             s.volume_m3 or 0 for s in schedules
@@ -362,13 +582,26 @@ class FeatureBuilder:
         # Check for sensor drift: if adjacent depths differ by >0.3 VWC
         for i in range(len(fs.depth_readings) - 1):
             diff = abs(fs.depth_readings[i].vwc - fs.depth_readings[i + 1].vwc)
-            if diff > 0.3:
+            if diff > DRIFT_VWC_DELTA:
                 fs.anomalies.append("sensor_drift")
                 break
 
-        # Check for unexpected refill without irrigation
+        self._check_unexpected_refill(now, fs)
+
+    def _check_unexpected_refill(self, now: datetime, fs: FeatureSet) -> None:
+        """Flag a rising VWC trend with no recent irrigation or rain."""
         if (fs.vwc_trend_pct_per_hour and fs.vwc_trend_pct_per_hour > 0.005
                 and fs.last_irrigation_at
                 and (now - fs.last_irrigation_at).total_seconds() > 48 * 3600
                 and fs.recent_rainfall_mm < 5):
             fs.anomalies.append("unexpected_refill")
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if value != value else value
@@ -0,0 +1,291 @@
+"""Columnar soil-moisture features computed with NumPy.
+
+The scalar FeatureBuilder path hydrates one ``Telemetry`` object per reading
+and walks them in Python to find the latest reading per depth and fit the
+24h VWC slope. This module pulls ``(block_id, timestamp, value, meta_data)``
+tuples instead, lays them out as a padded 2-D matrix (blocks × readings) and
+computes slope, depth aggregates, coverage and soil anomaly flags for every
+block at once.
+
+NumPy is optional: when it is not installed ``NUMPY_AVAILABLE`` is False and
+callers stay on the scalar path.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.telemetry import Telemetry
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Max block ids per IN (...) clause when loading columns
+COLUMN_CHUNK_SIZE = 500
+
+# Adjacent-depth VWC difference that counts as sensor drift
+DRIFT_VWC_DELTA = 0.3
+
+SoilRow = Tuple[str, datetime, float, Optional[Dict[str, Any]]]
+
+
+@dataclass
+class SoilColumns:
+    """Soil VWC readings for many blocks, sorted by block then timestamp.
+
+    ``offsets[i]:offsets[i + 1]`` slices the rows belonging to
+    ``block_ids[i]``. ``hours`` are offsets relative to ``now`` (negative
+    in the past); depths are NaN where the reading carries no depth.
+    """
+    block_ids: List[str]
+    now: datetime
+    timestamps: List[datetime]
+    hours: Any
+    values: Any
+    depths: Any
+    measure_ids: List[Optional[str]]
+    offsets: Any
+
+    @classmethod
+    def from_rows(
+        cls,
+        block_ids: Sequence[str],
+        rows: Iterable[SoilRow],
+        now: datetime,
+    ) -> "SoilColumns":
+        """Build columns from tuples already sorted by (block_id, timestamp)."""
+        position = {block_id: i for i, block_id in enumerate(block_ids)}
+        counts = [0] * len(block_ids)
+        timestamps: List[datetime] = []
+        hours: List[float] = []
+        values: List[float] = []
+        depths: List[float] = []
+        measure_ids: List[Optional[str]] = []
+        block_index: List[int] = []
+
+        for block_id, timestamp, value, meta in rows:
+            idx = position.get(block_id)
+            if idx is None:
+                continue
+            depth = None
+            measure_id = None
+            if meta and isinstance(meta, dict):
+                depth = meta.get("depth_inches")
+                measure_id = meta.get("measure_id")
+            block_index.append(idx)
+            timestamps.append(timestamp)
+            hours.append((timestamp - now).total_seconds() / 3600.0)
+            values.append(value)
+            depths.append(float(depth) if depth is not None else float("nan"))
+            measure_ids.append(measure_id)
+            counts[idx] += 1
+
+        order = np.argsort(np.asarray(block_index, dtype=np.int64), kind="stable")
+        offsets = np.zeros(len(block_ids) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(counts, dtype=np.int64), out=offsets[1:])
+        order_list = order.tolist()
+        return cls(
+            block_ids=list(block_ids),
+            now=now,
+            timestamps=[timestamps[i] for i in order_list],
+            hours=np.asarray(hours, dtype=np.float64)[order],
+            values=np.asarray(values, dtype=np.float64)[order],
+            depths=np.asarray(depths, dtype=np.float64)[order],
+            measure_ids=[measure_ids[i] for i in order_list],
+            offsets=offsets,
+        )
+
+    def to_matrix(self, array: Any, fill: float = float("nan")) -> Any:
+        """Pad a per-row array into a (blocks × max readings) matrix."""
+        counts = np.diff(self.offsets)
+        width = int(counts.max()) if counts.size else 0
+        matrix = np.full((len(self.block_ids), width), fill, dtype=np.float64)
+        if array.size:
+            row = np.repeat(np.arange(len(self.block_ids)), counts)
+            col = np.arange(array.size) - np.repeat(self.offsets[:-1], counts)
+            matrix[row, col] = array
+        return matrix
+
+
+@dataclass
+class SoilFeatureArrays:
+    """Per-block soil features; index ``i`` belongs to ``block_ids[i]``."""
+    block_ids: List[str]
+    depth_columns: Any          # (D,) sorted distinct depths
+    latest_vwc: Any             # (B, D) NaN where the depth has no reading
+    latest_hours: Any           # (B, D) hours relative to now
+    latest_rows: Any            # (B, D) row index into the columns, -1 if absent
+    mean_vwc: Any
+    min_vwc: Any
+    max_vwc: Any
+    weighted_root_zone_vwc: Any
+    trend_slope: Any            # NaN where no trend can be fitted
+    readings_count: Any
+    data_age_hours: Any
+    depth_coverage: Any
+    no_soil_data: Any
+    stale_data: Any
+    missing_depth: Any
+    sensor_drift: Any
+
+
+def load_soil_columns(
+    db: Session,
+    block_ids: Sequence[str],
+    since: datetime,
+    now: datetime,
+) -> SoilColumns:
+    """Fetch soil VWC tuples for ``block_ids`` without hydrating ORM rows."""
+    rows: List[SoilRow] = []
+    for start in range(0, len(block_ids), COLUMN_CHUNK_SIZE):
+        chunk = list(block_ids[start:start + COLUMN_CHUNK_SIZE])
+        rows.extend(
+            db.query(
+                Telemetry.block_id,
+                Telemetry.timestamp,
+                Telemetry.value,
+                Telemetry.meta_data,
+            )
+            .filter(
+                and_(
+                    Telemetry.block_id.in_(chunk),
+                    Telemetry.type == "soil_vwc",
+                    Telemetry.timestamp >= since,
+                )
+            )
+            .order_by(Telemetry.block_id, Telemetry.timestamp)
+            .all()
+        )
+    return SoilColumns.from_rows(block_ids, rows, now)
+
+
+def compute_soil_features(
+    columns: SoilColumns,
+    *,
+    depth_weights: Dict[int, float],
+    default_weight: float,
+    expected_depths: int,
+    stale_hours: float,
+    profile_window_hours: float,
+    trend_window_hours: float,
+) -> SoilFeatureArrays:
+    """Compute soil features for every block in ``columns`` at once."""
+    n_blocks = len(columns.block_ids)
+
+    # -- latest reading per (block, depth) within the profile window ----
+    counts = np.diff(columns.offsets)
+    block_of_row = np.repeat(np.arange(n_blocks), counts)
+    has_depth = ~np.isnan(columns.depths) & (columns.hours >= -profile_window_hours)
+    depth_columns = np.unique(columns.depths[has_depth])
+    n_depths = depth_columns.size
+
+    latest_vwc = np.full((n_blocks, n_depths), np.nan)
+    latest_hours = np.full((n_blocks, n_depths), np.nan)
+    latest_rows = np.full((n_blocks, n_depths), -1, dtype=np.int64)
+    if n_depths:
+        rows_idx = np.nonzero(has_depth)[0]
+        depth_idx = np.searchsorted(depth_columns, columns.depths[rows_idx])
+        key = block_of_row[rows_idx] * n_depths + depth_idx
+        # Rows are time-ordered within a block; the last occurrence of each
+        # (block, depth) key is the latest reading for that depth.
+        _, last_rev = np.unique(key[::-1], return_index=True)
+        last = rows_idx[rows_idx.size - 1 - last_rev]
+        b = block_of_row[last]
+        d = np.searchsorted(depth_columns, columns.depths[last])
+        latest_vwc[b, d] = columns.values[last]
+        latest_hours[b, d] = columns.hours[last]
+        latest_rows[b, d] = last
+
+    present = ~np.isnan(latest_vwc)
+    present_count = present.sum(axis=1)
+    any_present = present_count > 0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_vwc = np.where(
+            any_present, np.nansum(latest_vwc, axis=1) / np.maximum(present_count, 1), np.nan
+        )
+        min_vwc = np.where(any_present, np.min(np.where(present, latest_vwc, np.inf), axis=1, initial=np.inf), np.nan)
+        max_vwc = np.where(any_present, np.max(np.where(present, latest_vwc, -np.inf), axis=1, initial=-np.inf), np.nan)
+
+        weights = np.array(
+            [depth_weights.get(int(d), default_weight) for d in depth_columns.tolist()],
+            dtype=np.float64,
+        )
+        w = np.where(present, weights[np.newaxis, :], 0.0)
+        total_weight = w.sum(axis=1)
+        weighted_root_zone_vwc = np.where(
+            total_weight > 0,
+            np.nansum(np.where(present, latest_vwc, 0.0) * w, axis=1) / total_weight,
+            np.nan,
+        )
+
+        newest = np.max(np.where(present, latest_hours, -np.inf), axis=1, initial=-np.inf)
+        data_age_hours = np.where(any_present, -newest, np.nan)
+
+    # -- trend regression over the padded (blocks × readings) matrix ----
+    x = columns.to_matrix(columns.hours)
+    y = columns.to_matrix(columns.values)
+    in_window = ~np.isnan(x) & (x >= -trend_window_hours)
+    readings_count = in_window.sum(axis=1)
+    first_x = np.min(np.where(in_window, x, np.inf), axis=1, initial=np.inf)
+    first_x = np.where(np.isfinite(first_x), first_x, 0.0)
+    xs = np.where(in_window, x - first_x[:, np.newaxis], 0.0)
+    ys = np.where(in_window, y, 0.0)
+    n = readings_count.astype(np.float64)
+    sum_x = xs.sum(axis=1)
+    sum_y = ys.sum(axis=1)
+    sum_xy = (xs * ys).sum(axis=1)
+    sum_x2 = (xs * xs).sum(axis=1)
+    denom = n * sum_x2 - sum_x * sum_x
+    fit = (readings_count >= 4) & (np.abs(denom) >= 1e-10)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trend_slope = np.where(fit, (n * sum_xy - sum_x * sum_y) / np.where(fit, denom, 1.0), np.nan)
+
+    # -- data quality flags --------------------------------------------
+    depth_coverage = present_count / float(expected_depths)
+    no_soil_data = ~any_present
+    stale_data = any_present & (data_age_hours > stale_hours)
+    missing_depth = depth_coverage < 0.6
+
+    # Compare each present depth with the previous *present* depth, the
+    # same adjacency the scalar path gets from its compacted list.
+    sensor_drift = np.zeros(n_blocks, dtype=bool)
+    if n_depths > 1:
+        col = np.arange(n_depths)[np.newaxis, :]
+        last_seen = np.maximum.accumulate(np.where(present, col, -1), axis=1)
+        prev_idx = np.concatenate(
+            [np.full((n_blocks, 1), -1), last_seen[:, :-1]], axis=1
+        )
+        prev_vwc = np.take_along_axis(latest_vwc, np.maximum(prev_idx, 0), axis=1)
+        adjacent = present & (prev_idx >= 0)
+        with np.errstate(invalid="ignore"):
+            sensor_drift = np.any(adjacent & (np.abs(latest_vwc - prev_vwc) > DRIFT_VWC_DELTA), axis=1)
+
+    return SoilFeatureArrays(
+        block_ids=columns.block_ids,
+        depth_columns=depth_columns,
+        latest_vwc=latest_vwc,
+        latest_hours=latest_hours,
+        latest_rows=latest_rows,
+        mean_vwc=mean_vwc,
+        min_vwc=min_vwc,
+        max_vwc=max_vwc,
+        weighted_root_zone_vwc=weighted_root_zone_vwc,
+        trend_slope=trend_slope,
+        readings_count=readings_count,
+        data_age_hours=data_age_hours,
+        depth_coverage=depth_coverage,
+        no_soil_data=no_soil_data,
+        stale_data=stale_data,
+        missing_depth=missing_depth,
+        sensor_drift=sensor_drift,
+    )
+
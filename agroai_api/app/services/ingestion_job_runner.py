@@ -1,17 +1,15 @@
 from __future__ import annotations
 
-import hashlib
 import logging
 import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Iterator
 
 from sqlalchemy import and_, or_, update
 from sqlalchemy.orm import Session
 
-from app.api.v1.connector_hub import ingest_upload
+from app.api.v1.connector_hub import ingest_parsed_upload, parse_upload
 from app.core.config import settings
 from app.db.base import SessionLocal
 from app.models.hardened_records import DataSourceIdentity, IngestionJobState
@@ -219,15 +217,6 @@ def _fail_or_retry(db: Session, job_id: str, exc: Exception, *, worker_id: str)
     return status
 
 
-def _remove_transient_copy(path_value: str | None, durable_uri: str) -> None:
-    if not path_value or path_value == durable_uri or "://" in path_value:
-        return
-    try:
-        Path(path_value).unlink(missing_ok=True)
-    except OSError:
-        return
-
-
 def _delete_redundant_object(*, uri: str, tenant_id: str, connection_id: str) -> bool:
     try:
         get_object_store().delete(uri, tenant_id=tenant_id, connection_id=connection_id)
@@ -307,27 +296,38 @@ def process_ingestion_job(db: Session, *, job_id: str, tenant_id: str, worker_id
                 )
 
             store = get_object_store()
-            data = store.read_bytes(
-                durable_uri,
-                max_bytes=int(settings.CONNECTOR_MAX_UPLOAD_BYTES),
-                tenant_id=tenant_id,
-                connection_id=connection.id,
+            filename = str(payload.get("filename") or "upload")
+
+            def open_stream():
+                # Size and sha256 are verified as chunks arrive; the parser
+                # drains the stream before anything is written.
+                return store.stream_verified(
+                    durable_uri,
+                    expected_sha256=content_sha256,
+                    expected_size=expected_size,
+                    max_bytes=int(settings.CONNECTOR_MAX_UPLOAD_BYTES),
+                    tenant_id=tenant_id,
+                    connection_id=connection.id,
+                )
+
+            parsed = parse_upload(
+                connection,
+                filename=filename,
+                content_type=payload.get("content_type"),
+                open_stream=open_stream,
             )
-            if len(data) != expected_size:
-                raise RuntimeError("connector object size differs from the queued job contract")
-            if hashlib.sha256(data).hexdigest() != content_sha256:
-                raise RuntimeError("connector object checksum differs from the queued job contract")
             if heartbeat.lost:
                 db.rollback()
                 return "deferred"
 
-            result = ingest_upload(
+            result = ingest_parsed_upload(
                 db,
                 tenant_id=tenant_id,
                 connection=connection,
-                filename=str(payload.get("filename") or "upload"),
+                filename=filename,
                 content_type=payload.get("content_type"),
-                data=data,
+                parsed=parsed,
+                storage_path=durable_uri,
             )
             if heartbeat.lost:
                 db.rollback()
@@ -341,12 +341,9 @@ def process_ingestion_job(db: Session, *, job_id: str, tenant_id: str, worker_id
                     identity_row.content_sha256 = content_sha256
                     identity_row.object_size_bytes = expected_size
                 if source_row is not None:
-                    transient_path = source_row.storage_path
-                    source_row.storage_path = durable_uri
                     metadata = dict(source_row.metadata_json or {})
                     metadata.update({"durable_object_uri": durable_uri, "content_sha256": content_sha256})
                     source_row.metadata_json = metadata
-                    _remove_transient_copy(transient_path, durable_uri)
             job = db.get(IngestionJobState, job_id)
             if job is None:
                 raise RuntimeError("ingestion job disappeared during processing")
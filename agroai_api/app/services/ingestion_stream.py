@@ -6,6 +6,7 @@ import re
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 from fastapi import HTTPException, UploadFile
 
@@ -106,7 +107,7 @@ async def stream_upload_to_spool(
     )
 
 
-def read_spooled_bytes(receipt: StreamedUpload) -> bytes:
+def _checked_spool_path(receipt: StreamedUpload) -> Path:
     path = Path(receipt.path)
     if not path.is_file():
         raise FileNotFoundError(receipt.path)
@@ -115,6 +116,42 @@ def read_spooled_bytes(receipt: StreamedUpload) -> bytes:
         raise RuntimeError("spooled upload size changed before ingestion")
     if size > max_upload_bytes():
         raise RuntimeError("spooled upload exceeds configured ingestion bound")
+    return path
+
+
+def iter_spooled_chunks(receipt: StreamedUpload, *, chunk_size: int | None = None) -> Iterator[bytes]:
+    """Yield a spooled upload in chunks, verifying size and sha256 on the way.
+
+    Only one chunk is held at a time. The checksum is compared once the file
+    is exhausted, so consumers must drain the iterator before trusting or
+    persisting anything derived from it.
+    """
+    path = _checked_spool_path(receipt)
+    chunk_size = chunk_size or stream_chunk_bytes()
+    digest = hashlib.sha256()
+    total = 0
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > receipt.size_bytes:
+                raise RuntimeError("spooled upload size changed before ingestion")
+            digest.update(chunk)
+            yield chunk
+    if total != receipt.size_bytes:
+        raise RuntimeError("spooled upload size changed before ingestion")
+    if digest.hexdigest() != receipt.sha256:
+        raise RuntimeError("spooled upload checksum mismatch")
+
+
+def read_spooled_bytes(receipt: StreamedUpload) -> bytes:
+    """Buffered read for callers that need the whole upload as ``bytes``.
+
+    Prefer :func:`iter_spooled_chunks` for anything that can parse a stream.
+    """
+    path = _checked_spool_path(receipt)
     data = path.read_bytes()
     if hashlib.sha256(data).hexdigest() != receipt.sha256:
         raise RuntimeError("spooled upload checksum mismatch")
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.api.deps import require_workspace_access
 from app.models.saas import Organization, User, Workspace
 from app.schemas.ai import EvidenceContext, ToolCitation
+from app.services.ai_response_cache import evidence_fingerprint
 from app.services.commercial_billing_lifecycle import install_commercial_billing_lifecycle
 from app.services.commercial_control import require_feature
 from app.services.intelligence_policy import PROFILE_BASE
@@ -70,7 +71,7 @@ def _source_rows(ctx: Any, source_limit: int) -> tuple[list[dict[str, Any]], lis
 
     for source in ctx.sources[:source_limit]:
         excerpt_limit = min(PER_SOURCE_TEXT_CHARS, max(0, remaining))
-        excerpt = source_content_excerpt(source, max_chars=excerpt_limit) if excerpt_limit else ""
+        excerpt = source_content_excerpt(source, max_chars=excerpt_limit, db=getattr(ctx, "db", None)) if excerpt_limit else ""
         remaining -= len(excerpt)
         preview = _redact(parsed_rows_preview(source, limit=12))
         rows.append(
@@ -207,6 +208,7 @@ def build_intelligence_context(
         "sample_mode": evidence_summary["sample_mode"],
         "evidence_summary": evidence_summary,
         "evidence_context": evidence_context,
+        "evidence_fingerprint": evidence_fingerprint(cockpit.evidence, cockpit.sources),
         "citations": citations,
         "commercial_intelligence": {
             "profile": commercial_profile,
@@ -0,0 +1,207 @@
+"""Latency and success tracking for AI lanes, and hedged lane execution.
+
+Every attempt on a lane (``hosted``, ``edge``, ``local``) and on a model
+within a lane updates two exponentially weighted moving averages: latency
+and error rate. The successful latencies of the last attempts are also kept
+so that a p90 can be read.
+
+* :meth:`LaneLatencyTracker.order` reorders lanes by the expected time to a
+  successful answer, which is EWMA latency divided by the success rate.
+  Lanes with fewer than AI_LANE_MIN_SAMPLES attempts keep their configured
+  position. Until then the configured order, for example remote-first for
+  reasoning, is the only evidence.
+* :meth:`LaneLatencyTracker.order_models` moves models that keep failing to
+  the end of a lane's candidate list. Otherwise it keeps the configured
+  quality order.
+* :func:`hedged` starts one lane at a time. The next lane starts when the
+  running lane fails or exceeds its observed p90. Callers no longer race
+  every lane from the start and pay for duplicate provider calls. A lane
+  with too few attempts to have a p90 is not hedged at all, unless the
+  caller passes ``hedge_cold=True`` to hedge after
+  AI_HEDGE_DEFAULT_DELAY_SECONDS instead. A
+  cancelled because another lane won records its elapsed time as a latency
+  lower bound, so a lane that has turned slow loses its place.
+
+Stats are per process and start empty. Metrics:
+``agroai_ai_lane_latency_seconds`` is labelled by lane and outcome.
+``agroai_ai_lane_hedges_total`` counts the lanes started because an earlier
+lane was slow.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Sequence, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import ai_lane_hedges, ai_lane_latency
+
+
+_WINDOW = 64
+
+T = TypeVar("T")
+
+
+def _alpha() -> float:
+    return min(1.0, max(0.01, float(getattr(settings, "AI_LANE_EWMA_ALPHA", 0.2))))
+
+
+def _min_samples() -> int:
+    return max(1, int(getattr(settings, "AI_LANE_MIN_SAMPLES", 5)))
+
+
+@dataclass
+class LaneStats:
+    latency: float = 0.0
+    error_rate: float = 0.0
+    samples: int = 0
+    recent: deque = field(default_factory=lambda: deque(maxlen=_WINDOW))
+
+    def observe(self, elapsed: float, ok: bool | None, alpha: float) -> None:
+        """Add one attempt; ``ok=None`` is a cancelled attempt whose elapsed time is a lower bound."""
+        first = self.samples == 0
+        self.latency = elapsed if first else alpha * elapsed + (1 - alpha) * self.latency
+        if ok is not None:
+            failed = 0.0 if ok else 1.0
+            self.error_rate = failed if first else alpha * failed + (1 - alpha) * self.error_rate
+        self.samples += 1
+        if ok is not False:
+            self.recent.append(elapsed)
+
+    def p90(self) -> float | None:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[max(0, math.ceil(0.9 * len(ordered)) - 1)]
+
+    def expected_seconds(self) -> float:
+        return self.latency / max(0.05, 1.0 - self.error_rate)
+
+
+class LaneLatencyTracker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str, str | None], LaneStats] = {}
+
+    def record(self, lane: str, elapsed: float, ok: bool | None, *, model: str | None = None) -> None:
+        """Add one attempt of ``lane``, or of ``model`` within ``lane`` when given."""
+        with self._lock:
+            self._stats.setdefault((lane, model or None), LaneStats()).observe(elapsed, ok, _alpha())
+
+    def stats(self, lane: str, *, model: str | None = None) -> LaneStats | None:
+        with self._lock:
+            current = self._stats.get((lane, model))
+            return None if current is None else LaneStats(current.latency, current.error_rate, current.samples, deque(current.recent, maxlen=_WINDOW))
+
+    def _warm(self, lane: str, model: str | None = None) -> LaneStats | None:
+        current = self.stats(lane, model=model)
+        return current if current is not None and current.samples >= _min_samples() else None
+
+    def order(self, lanes: Sequence[Hashable], *, key: Callable[[Hashable], str] = str) -> list:
+        """``lanes`` with the measured ones sorted by expected time to success, in the slots they held."""
+        measured = {index: self._warm(key(lane)) for index, lane in enumerate(lanes)}
+        slots = [index for index, current in measured.items() if current is not None]
+        ranked = sorted(slots, key=lambda index: measured[index].expected_seconds())
+        ordered = list(lanes)
+        for slot, index in zip(slots, ranked):
+            ordered[slot] = lanes[index]
+        return ordered
+
+    def order_models(self, lane: str, models: Sequence[str]) -> list[str]:
+        threshold = float(getattr(settings, "AI_LANE_MODEL_DEMOTE_ERROR_RATE", 0.5))
+        failing = set()
+        for model in models:
+            current = self._warm(lane, model)
+            if current is not None and current.error_rate >= threshold:
+                failing.add(model)
+        return [model for model in models if model not in failing] + [model for model in models if model in failing]
+
+    def hedge_delay(self, lane: str, *, hedge_cold: bool = False) -> float:
+        """Seconds to wait on ``lane`` before starting the next one.
+
+        A lane without a p90 yet is never hedged unless ``hedge_cold`` is set,
+        in which case it waits AI_HEDGE_DEFAULT_DELAY_SECONDS.
+        """
+        if not bool(getattr(settings, "AI_HEDGE_ENABLED", True)):
+            return math.inf
+        current = self._warm(lane)
+        observed = current.p90() if current is not None else None
+        if observed is None and not hedge_cold:
+            return math.inf
+        low = max(0.0, float(getattr(settings, "AI_HEDGE_MIN_DELAY_SECONDS", 0.5)))
+        high = max(low, float(getattr(settings, "AI_HEDGE_MAX_DELAY_SECONDS", 30.0)))
+        delay = observed if observed is not None else float(getattr(settings, "AI_HEDGE_DEFAULT_DELAY_SECONDS", 8.0))
+        return min(high, max(low, delay))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+LANE_LATENCY = LaneLatencyTracker()
+
+
+async def hedged(
+    attempts: Sequence[tuple[str, Callable[[], Awaitable[T | None]]]],
+    *,
+    accept: Callable[[T], bool] = bool,
+    tracker: LaneLatencyTracker | None = None,
+    hedge_cold: bool = False,
+) -> tuple[T | None, list[T]]:
+    """Run lane attempts in order, hedging only past each lane's p90.
+
+    Returns the first accepted result, or ``None``, and the results that were
+    rejected. An attempt returns ``None`` when its lane could not answer.
+    Attempts still running when a result is accepted are cancelled.
+    ``hedge_cold`` is passed on to :meth:`LaneLatencyTracker.hedge_delay`.
+    """
+    tracker = tracker or LANE_LATENCY
+    loop = asyncio.get_running_loop()
+    queue = list(attempts)
+    running: dict[asyncio.Future, tuple[str, float]] = {}
+    rejected: list[T] = []
+    deadline = math.inf
+
+    def start() -> None:
+        nonlocal deadline
+        lane, attempt = queue.pop(0)
+        if running:
+            ai_lane_hedges.labels(lane=lane).inc()
+        running[asyncio.ensure_future(attempt())] = (lane, loop.time())
+        deadline = loop.time() + tracker.hedge_delay(lane, hedge_cold=hedge_cold)
+
+    try:
+        if queue:
+            start()
+        while running:
+            wait = None if not queue or math.isinf(deadline) else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                lane, started = running.pop(task)
+                elapsed = loop.time() - started
+                if task.exception() is not None:
+                    tracker.record(lane, elapsed, False)
+                    ai_lane_latency.labels(lane=lane, outcome="failed").observe(elapsed)
+                    raise task.exception()
+                value = task.result()
+                ok = value is not None and accept(value)
+                tracker.record(lane, elapsed, ok)
+                ai_lane_latency.labels(lane=lane, outcome="ok" if ok else "failed").observe(elapsed)
+                if ok:
+                    return value, rejected
+                if value is not None:
+                    rejected.append(value)
+            if queue and (not running or loop.time() >= deadline):
+                start()
+        return None, rejected
+    finally:
+        for task, (lane, started) in running.items():
+            task.cancel()
+            elapsed = loop.time() - started
+            tracker.record(lane, elapsed, None)
+            ai_lane_latency.labels(lane=lane, outcome="cancelled").observe(elapsed)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -4,6 +4,7 @@ import ipaddress
 import json
 import os
 import re
+import time
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlparse
@@ -11,7 +12,9 @@ from urllib.parse import urlparse
 import httpx
 
 from app.core.config import settings
+from app.services.ai_http_clients import ai_http_client, ai_timeout
 from app.services.language import language_matches_target, resolve_language
+from app.services.lane_latency import LANE_LATENCY, hedged
 from app.services.operational_invariants import check_operational_invariants
 
 
@@ -34,6 +37,7 @@ _VALID_ROUTING_MODES = {
     "edge_only",
     "local_only",
 }
+_TRACKED_LANES = {"remote": "hosted", "edge": "edge", "local": "local"}
 
 
 @dataclass
@@ -242,8 +246,10 @@ class LiveIntelligence:
             headers["X-Title"] = "AGRO-AI Enterprise Portal"
         tokens = 4200 if profile == "deep" else 3200 if profile == "report" else 2200 if profile == "reasoning" else 900
         timeout = 58 if profile == "deep" else 55 if profile == "report" else 38 if profile == "reasoning" else 20
-        async with httpx.AsyncClient(timeout=max(8, min(timeout, self.timeout + 30))) as client:
-            for model in models[:8]:
+        request_timeout = ai_timeout(max(8, min(timeout, self.timeout + 30)))
+        async with ai_http_client(endpoint, lane="hosted") as client:
+            for model in LANE_LATENCY.order_models("hosted", models[:8]):
+                started = time.perf_counter()
                 try:
                     response = await client.post(
                         f"{endpoint}/chat/completions",
@@ -254,17 +260,18 @@ class LiveIntelligence:
                             "temperature": self.remote_temperature(model, profile),
                             "max_tokens": tokens,
                         },
+                        timeout=request_timeout,
                     )
                     if response.status_code in {401, 402, 403}:
                         return None
-                    if response.status_code >= 400:
-                        continue
-                    answer = self.content(response.json())
+                    answer = self.content(response.json()) if response.status_code < 400 else ""
+                    LANE_LATENCY.record("hosted", time.perf_counter() - started, bool(answer), model=model)
                     if answer:
                         return answer, model
                 except (httpx.HTTPError, ValueError, KeyError):
+                    LANE_LATENCY.record("hosted", time.perf_counter() - started, False, model=model)
                     continue
-        return None
+            return None
 
     async def run_local(self, model: str, messages: list[dict[str, str]], profile: str) -> tuple[str, str] | None:
         if not self.local_base:
@@ -297,14 +304,15 @@ class LiveIntelligence:
             },
         }
         try:
-            async with httpx.AsyncClient(timeout=self.local_timeout) as client:
+            async with ai_http_client(self.local_base, lane="local") as client:
                 response = await client.post(
                     f"{self.local_base}/api/chat",
                     headers=self.local_access_headers(),
                     json=payload,
+                    timeout=ai_timeout(self.local_timeout),
                 )
-                response.raise_for_status()
-                body = response.json()
+            response.raise_for_status()
+            body = response.json()
             answer = _ollama_compatible_answer(body)
             return (answer, model) if answer else None
         except (httpx.HTTPError, ValueError, KeyError, TypeError):
@@ -324,14 +332,15 @@ class LiveIntelligence:
             },
         }
         try:
-            async with httpx.AsyncClient(timeout=self.edge_timeout) as client:
+            async with ai_http_client(base_url, lane="edge") as client:
                 response = await client.post(
                     f"{base_url}/api/chat",
                     headers=self.edge_auth_headers(),
                     json=payload,
+                    timeout=ai_timeout(self.edge_timeout),
                 )
-                response.raise_for_status()
-                body = response.json()
+            response.raise_for_status()
+            body = response.json()
             answer = _ollama_compatible_answer(body)
             return (answer, model) if answer else None
         except (httpx.HTTPError, ValueError, KeyError, TypeError):
@@ -448,6 +457,10 @@ class LiveIntelligence:
             return ["local", "edge", "remote"]
         return ["edge", "local", "remote"] if profile == "fast" else ["remote", "edge", "local"]
 
+    def lane_order(self, profile: str) -> list[str]:
+        """``auto_order`` with lanes that have enough samples reordered by observed latency and error rate."""
+        return LANE_LATENCY.order(self.auto_order(profile), key=_TRACKED_LANES.__getitem__)
+
     async def run(self, task: str, question: str, messages: list[dict[str, str]], preferred_language: str | None) -> LiveResult:
         route, clean_question = self.parse_test_route(question)
         language = resolve_language(preferred_language, clean_question)
@@ -493,33 +506,33 @@ class LiveIntelligence:
                 return LiveResult("unavailable", "", remote[2], candidates[0], language.response_code, profile, f"The forced {route} model did not complete the request.")
             return await self.finish_remote(remote, result[0], result[1], language.response_code, language.response_name, profile)
 
-        last_failure: LiveResult | None = None
-        for lane in self.auto_order(profile):
-            if lane == "remote" and remote:
-                candidates = self.models(profile, remote[2])
-                if candidates:
-                    result = await self.run_remote(remote, candidates, prepared, profile)
-                    if result:
-                        finished = await self.finish_remote(remote, result[0], result[1], language.response_code, language.response_name, profile)
-                        if finished.status == "ok":
-                            return finished
-                        last_failure = finished
-            if lane == "edge" and edge:
-                edge_result = await self.run_edge(edge, prepared, profile)
-                if edge_result:
-                    finished = await self.finish_lane(edge_result[0], edge_result[1], "cloudflare_workers_ai", language.response_code, language.response_name, profile, remote, allow_remote_repair=True)
-                    if finished.status == "ok":
-                        return finished
-                    last_failure = finished
-            if lane == "local" and local_model:
-                local = await self.run_local(local_model, prepared, profile)
-                if local:
-                    finished = await self.finish_lane(local[0], local[1], "ollama", language.response_code, language.response_name, profile, remote, allow_remote_repair=True)
-                    if finished.status == "ok":
-                        return finished
-                    last_failure = finished
-
-        if last_failure is not None:
-            return last_failure
+        async def remote_lane() -> LiveResult | None:
+            candidates = self.models(profile, remote[2])
+            result = await self.run_remote(remote, candidates, prepared, profile) if candidates else None
+            if not result:
+                return None
+            return await self.finish_remote(remote, result[0], result[1], language.response_code, language.response_name, profile)
+
+        async def edge_lane() -> LiveResult | None:
+            edge_result = await self.run_edge(edge, prepared, profile)
+            if not edge_result:
+                return None
+            return await self.finish_lane(edge_result[0], edge_result[1], "cloudflare_workers_ai", language.response_code, language.response_name, profile, remote, allow_remote_repair=True)
+
+        async def local_lane() -> LiveResult | None:
+            local = await self.run_local(local_model, prepared, profile)
+            if not local:
+                return None
+            return await self.finish_lane(local[0], local[1], "ollama", language.response_code, language.response_name, profile, remote, allow_remote_repair=True)
+
+        available = {"remote": remote_lane if remote else None, "edge": edge_lane if edge else None, "local": local_lane if local_model else None}
+        lanes = [(_TRACKED_LANES[lane], available[lane]) for lane in self.lane_order(profile) if available[lane]]
+        # These lanes used to run strictly in turn, so a lane is only hedged
+        # once it has an observed p90.
+        finished, failures = await hedged(lanes, accept=lambda result: result.status == "ok")
+        if finished is not None:
+            return finished
+        if failures:
+            return failures[-1]
         provider = remote[2] if remote else "cloudflare_workers_ai" if edge else "ollama" if local_model else self.provider or "unconfigured"
         return LiveResult("unavailable", "", provider, None, language.response_code, profile, "No live model provider completed the request.")
@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import os
 import re
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 
 from app.core.config import settings
-from app.services.ai_gateway import AIGateway, AIGatewayResult
+from app.services.ai_gateway import AIGateway, AIGatewayResult, AIStreamEvent
+from app.services.ai_response_cache import ResponseCacheScope, through_response_cache
 from app.services.hosted_ui_translation import run_hosted_ui_translation
 from app.services.live_intelligence import LiveIntelligence
 from app.services.local_ui_translation import run_local_ui_translation
@@ -194,7 +196,20 @@ class ModelRouter:
                 model = local or None
         return ModelSelection(task=task, profile=profile, model=model or None)
 
-    async def run(self, *, task: str, messages: list[dict[str, str]], temperature: float = 0.2, response_format: dict[str, Any] | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None, max_model_attempts: int | None = None) -> tuple[AIGatewayResult, ModelSelection]:
+    async def run(self, *, task: str, messages: list[dict[str, str]], temperature: float = 0.2, response_format: dict[str, Any] | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None, max_model_attempts: int | None = None, cache_scope: ResponseCacheScope | None = None) -> tuple[AIGatewayResult, ModelSelection]:
+        """Run ``task``; with a ``cache_scope`` a live answer is reused for the same evidence and prompt."""
+        kwargs: dict[str, Any] = {"task": task, "messages": messages, "temperature": temperature, "response_format": response_format, "max_tokens": max_tokens, "timeout_seconds": timeout_seconds, "max_model_attempts": max_model_attempts}
+        return await through_response_cache(
+            cache_scope,
+            route="model_router",
+            task=task,
+            messages=messages,
+            params={"temperature": temperature, "response_format": response_format, "max_tokens": max_tokens},
+            call=lambda: self._run(**kwargs),
+            cacheable=lambda value: value[0].status == "ok" and not value[0].demo_fallback and bool(value[0].content.strip()),
+        )
+
+    async def _run(self, *, task: str, messages: list[dict[str, str]], temperature: float = 0.2, response_format: dict[str, Any] | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None, max_model_attempts: int | None = None) -> tuple[AIGatewayResult, ModelSelection]:
         selection = self.select(task)
         if task == "ui_translation" and response_format is not None and self.mode() == "ollama":
             hosted_configured = bool((os.getenv("OPENROUTER_API_KEY") or settings.AI_API_KEY or "").strip())
@@ -260,3 +275,14 @@ class ModelRouter:
         if timeout_seconds is not None: kwargs["timeout_seconds"] = timeout_seconds
         if max_model_attempts is not None: kwargs["max_model_attempts"] = max_model_attempts
         return await self.gateway.chat(messages, **kwargs), selection
+
+    async def stream(self, *, task: str, messages: list[dict[str, str]], temperature: float = 0.2, response_format: dict[str, Any] | None = None, max_tokens: int | None = None, timeout_seconds: int | None = None) -> AsyncIterator[AIStreamEvent]:
+        """Stream ``task`` through the gateway with the task's selected model."""
+        selection = self.select(task)
+        kwargs: dict[str, Any] = {"temperature": temperature, "response_format": response_format}
+        if selection.model and self.mode() != "offline": kwargs["model_override"] = selection.model
+        if max_tokens is not None: kwargs["max_tokens"] = max_tokens
+        if timeout_seconds is not None: kwargs["timeout_seconds"] = timeout_seconds
+        async with aclosing(self.gateway.chat_stream(messages, **kwargs)) as events:
+            async for event in events:
+                yield event
@@ -7,7 +7,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, BinaryIO
+from typing import Any, BinaryIO, Iterator
 from urllib.parse import urlparse
 
 from app.core.config import settings
@@ -50,6 +50,23 @@ def _file_sha256(path: Path) -> str:
     return digest.hexdigest()
 
 
+def _iter_body(body: Any, chunk_size: int) -> Iterator[bytes]:
+    # The finally block guarantees the S3/R2 body (and its pooled HTTP
+    # connection) is released on normal completion, on error, and on
+    # client cancellation (GeneratorExit via StreamingResponse close).
+    try:
+        while True:
+            chunk = body.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        try:
+            body.close()
+        except Exception:  # noqa: BLE001 - releasing is best-effort
+            pass
+
+
 def _build_default_s3_client():
     try:
         import boto3
@@ -362,11 +379,21 @@ class S3ObjectStore:
         if len(data) > max_bytes:
             raise RuntimeError("connector object exceeded worker read limit while streaming")
         metadata = response.get("Metadata") or {}
+        expected = self._checked_metadata_sha256(metadata, tenant_id=tenant_id, connection_id=connection_id)
+        if hashlib.sha256(data).hexdigest() != expected:
+            raise RuntimeError("connector object checksum mismatch")
+        return data
+
+    @staticmethod
+    def _checked_metadata_sha256(
+        metadata: dict,
+        *,
+        tenant_id: str | None,
+        connection_id: str | None,
+    ) -> str:
         expected = str(metadata.get("sha256") or "").strip().lower()
         if not _SHA256.fullmatch(expected):
             raise RuntimeError("connector object checksum metadata is unavailable")
-        if hashlib.sha256(data).hexdigest() != expected:
-            raise RuntimeError("connector object checksum mismatch")
         if tenant_id is not None:
             expected_tenant_scope = _scope_component(tenant_id, fallback="tenant")
             if metadata.get("tenant-scope") != expected_tenant_scope:
@@ -375,7 +402,62 @@ class S3ObjectStore:
             expected_connection_scope = _scope_component(connection_id, fallback="connection")
             if metadata.get("connection-scope") != expected_connection_scope:
                 raise RuntimeError("connector object connection metadata mismatch")
-        return data
+        return expected
+
+    def stream_verified(
+        self,
+        uri: str,
+        *,
+        expected_sha256: str,
+        expected_size: int,
+        max_bytes: int,
+        tenant_id: str | None = None,
+        connection_id: str | None = None,
+        chunk_size: int = 256 * 1024,
+    ) -> Iterator[bytes]:
+        """Stream an object while verifying its size and sha256 incrementally.
+
+        Scope and checksum metadata are checked before the first chunk is
+        yielded; size is enforced as bytes arrive and the digest is compared
+        when the body is exhausted. A consumer must treat everything it read
+        as untrusted until the iterator finishes without raising.
+        """
+        expected_sha256 = expected_sha256.strip().lower()
+        if not _SHA256.fullmatch(expected_sha256):
+            raise RuntimeError("expected connector checksum is invalid")
+        limit = min(int(max_bytes), int(expected_size))
+        key = self._validated_key(uri, tenant_id=tenant_id, connection_id=connection_id)
+        response = self.client.get_object(Bucket=self.bucket, Key=key)
+        body = response["Body"]
+        try:
+            length = int(response.get("ContentLength") or 0)
+            if length > max_bytes:
+                raise RuntimeError("connector object exceeds worker read limit")
+            metadata = response.get("Metadata") or {}
+            stored = self._checked_metadata_sha256(metadata, tenant_id=tenant_id, connection_id=connection_id)
+            if stored != expected_sha256:
+                raise RuntimeError("connector object checksum differs from the queued job contract")
+        except Exception:
+            body.close()
+            raise
+
+        def _iterator() -> Iterator[bytes]:
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in _iter_body(body, chunk_size):
+                size += len(chunk)
+                if size > limit:
+                    if size > max_bytes:
+                        raise RuntimeError("connector object exceeded worker read limit while streaming")
+                    raise RuntimeError("connector object size differs from the queued job contract")
+                digest.update(chunk)
+                yield chunk
+            if size != expected_size:
+                raise RuntimeError("connector object size differs from the queued job contract")
+            if digest.hexdigest() != expected_sha256:
+                raise RuntimeError("connector object checksum differs from the queued job contract")
+
+        return _iterator()
 
     def delete(
         self,
@@ -413,25 +495,7 @@ class S3ObjectStore:
         if byte_range is not None:
             kwargs["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
         response = self.client.get_object(**kwargs)
-        body = response["Body"]
-
-        def _iterator():
-            # The finally block guarantees the S3/R2 body (and its pooled HTTP
-            # connection) is released on normal completion, on error, and on
-            # client cancellation (GeneratorExit via StreamingResponse close).
-            try:
-                while True:
-                    chunk = body.read(chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-            finally:
-                try:
-                    body.close()
-                except Exception:  # noqa: BLE001 - releasing is best-effort
-                    pass
-
-        return _iterator()
+        return _iter_body(response["Body"], chunk_size)
 
 
 def object_storage_configured() -> bool:
@@ -0,0 +1,117 @@
+"""Shared batch relay from transactional outboxes to the task queue.
+
+Each outbox publisher claims a batch of due rows (``SKIP LOCKED`` where the
+database supports it), then hands the batch to :func:`relay_outbox_batch`.
+The relay publishes the batch in one round trip: a Redis pipeline, or one
+Cloudflare batch request per 100 tasks. It then records every row's outcome
+in a single commit. Publishers without ``enqueue_many`` fall back to one
+``enqueue`` per task.
+
+Each pass also sets ``agroai_task_outbox_publish_lag_seconds`` to the age of
+the oldest unpublished row, including rows backing off after a failed
+publish, so relays can be scaled on a real signal.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.metrics import task_outbox_publish_lag
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RelayTask:
+    job_id: str
+    tenant_id: str
+    task_type: str
+
+
+def enqueue_batch(publisher: Any, tasks: Sequence[RelayTask]) -> list[Exception | None]:
+    """Publish ``tasks``; returns ``None`` for each accepted task and the error otherwise."""
+    if not tasks:
+        return []
+    enqueue_many = getattr(publisher, "enqueue_many", None)
+    if enqueue_many is not None:
+        try:
+            results = list(enqueue_many([(task.job_id, task.tenant_id, task.task_type) for task in tasks]))
+        except Exception as exc:
+            return [exc] * len(tasks)
+        return [result if isinstance(result, Exception) else None for result in results]
+    outcomes: list[Exception | None] = []
+    for task in tasks:
+        try:
+            publisher.enqueue(task.job_id, task.tenant_id, task.task_type)
+        except Exception as exc:
+            outcomes.append(exc)
+        else:
+            outcomes.append(None)
+    return outcomes
+
+
+def relay_outbox_batch(
+    db: Session,
+    rows: Sequence[Any],
+    *,
+    get_publisher: Callable[[], Any],
+    task: Callable[[Any], RelayTask],
+    published: Callable[[Any, datetime], None] | None = None,
+    failed: Callable[[Any, Exception, datetime], None] | None = None,
+    apply: Callable[[Session, list[tuple[Any, Exception | None]], datetime], None] | None = None,
+) -> dict[str, int]:
+    """Publish claimed ``rows`` and apply their outcomes in one commit.
+
+    ``published`` and ``failed`` update a row in the session. Outboxes whose
+    claim can be taken over by another drainer pass ``apply`` instead, which
+    writes every ``(row, error)`` outcome with statements guarded by the claim.
+    If no publisher can be built, every row fails and is retried later. If the
+    final commit fails, every row counts as failed; rows already accepted by
+    the queue may then be published again, so consumers stay idempotent.
+    """
+    if not rows:
+        return {"published": 0, "failed": 0}
+    try:
+        publisher = get_publisher()
+    except Exception as exc:
+        outcomes: list[Exception | None] = [exc] * len(rows)
+    else:
+        outcomes = enqueue_batch(publisher, [task(row) for row in rows])
+    now = datetime.utcnow()
+    results = list(zip(rows, outcomes))
+    failed_count = sum(1 for _row, error in results if error is not None)
+    published_count = len(results) - failed_count
+    try:
+        if apply is not None:
+            apply(db, results, now)
+        else:
+            for row, error in results:
+                if error is None:
+                    published(row, now)
+                else:
+                    failed(row, error, now)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("outbox batch outcome commit failed rows=%s", len(rows))
+        return {"published": 0, "failed": len(rows)}
+    return {"published": published_count, "failed": failed_count}
+
+
+def record_publish_lag(db: Session, outbox: str, created_at, *criteria) -> float:
+    """Set the publish-lag gauge for ``outbox`` from its oldest row matching ``criteria``."""
+    try:
+        oldest = db.query(func.min(created_at)).filter(*criteria).scalar()
+    except Exception:
+        db.rollback()
+        logger.exception("outbox publish lag query failed outbox=%s", outbox)
+        return 0.0
+    lag = max(0.0, (datetime.utcnow() - oldest).total_seconds()) if oldest is not None else 0.0
+    task_outbox_publish_lag.labels(outbox=outbox).set(lag)
+    return lag
@@ -0,0 +1,119 @@
+"""Bounded, rate-limit-aware concurrency for calls to one external provider.
+
+Provider syncs are I/O-bound: most of their wall time is remote latency on
+a shared ``httpx.AsyncClient``. ``ProviderConcurrencyLimiter.run`` lets many
+coroutines fan out against one provider while capping in-flight requests.
+
+When the provider answers with a rate-limit error the limiter halves its
+concurrency, parks every caller until a shared cool-down passes (exponential
+backoff with jitter) and retries. Successful calls grow the limit back by
+one slot per ``limit`` successes (additive increase, multiplicative decrease).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProviderConcurrencyLimiter:
+    """Caps in-flight calls to one provider and backs off on rate limits."""
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int,
+        rate_limit_errors: Tuple[Type[BaseException], ...],
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+        max_retries: int = 4,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limit = self.max_concurrency
+        self.rate_limit_errors = rate_limit_errors
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_retries = max_retries
+        self.rate_limited_total = 0
+        self._sleep = sleep
+        self._clock = clock
+        self._active = 0
+        self._successes = 0
+        self._cooldown_until = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Await ``call()`` within the concurrency cap, retrying rate limits."""
+        attempt = 0
+        while True:
+            await self._acquire()
+            try:
+                await self._wait_cooldown()
+                result = await call()
+            except self.rate_limit_errors:
+                attempt += 1
+                self._on_rate_limited(attempt)
+                if attempt > self.max_retries:
+                    raise
+                continue
+            finally:
+                await self._release()
+            self._on_success()
+            return result
+
+    # ------------------------------------------------------------------
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def _release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._active -= 1
+            condition.notify_all()
+
+    async def _wait_cooldown(self) -> None:
+        delay = self._cooldown_until - self._clock()
+        if delay > 0:
+            await self._sleep(delay)
+
+    def _on_rate_limited(self, attempt: int) -> None:
+        self.rate_limited_total += 1
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** (attempt - 1)))
+        delay *= 1.0 + random.random() * 0.25
+        self._cooldown_until = max(self._cooldown_until, self._clock() + delay)
+        logger.warning(
+            "%s rate limited; concurrency=%d, backing off %.1fs (attempt %d)",
+            self.provider, self.limit, delay, attempt,
+        )
+
+    def _on_success(self) -> None:
+        if self.limit >= self.max_concurrency:
+            return
+        self._successes += 1
+        if self._successes >= self.limit:
+            self.limit += 1
+            self._successes = 0
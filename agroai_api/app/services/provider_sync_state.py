@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Dict
+
 from sqlalchemy.orm import Session
 
 from app.models.operational_records import ConnectorConnection
-from app.models.provider_sync import ConnectorSyncCursor
+from app.models.provider_sync import ConnectorSyncCursor, ProviderMeasureWatermark
 
 
 def get_sync_cursor(db: Session, *, connection: ConnectorConnection) -> ConnectorSyncCursor:
@@ -22,3 +25,57 @@ def get_sync_cursor(db: Session, *, connection: ConnectorConnection) -> Connecto
         db.add(row)
         db.flush()
     return row
+
+
+def load_measure_watermarks(
+    db: Session, *, tenant_id: str, provider: str, connection_key: str
+) -> Dict[str, datetime]:
+    """Return ``{measure_id: high_water_mark}`` for one provider connection."""
+    rows = db.query(
+        ProviderMeasureWatermark.measure_id,
+        ProviderMeasureWatermark.high_water_mark,
+    ).filter(
+        ProviderMeasureWatermark.tenant_id == tenant_id,
+        ProviderMeasureWatermark.provider == provider,
+        ProviderMeasureWatermark.connection_key == connection_key,
+    ).all()
+    return {measure_id: mark for measure_id, mark in rows}
+
+
+def advance_measure_watermark(
+    db: Session,
+    *,
+    tenant_id: str,
+    provider: str,
+    connection_key: str,
+    measure_id: str,
+    timestamp: datetime,
+) -> ProviderMeasureWatermark:
+    """Move a measure's high-water mark forward to ``timestamp``.
+
+    Never moves it backwards, so backfills of older windows leave the
+    incremental position intact. The caller commits.
+    """
+    row = db.query(ProviderMeasureWatermark).filter(
+        ProviderMeasureWatermark.tenant_id == tenant_id,
+        ProviderMeasureWatermark.provider == provider,
+        ProviderMeasureWatermark.connection_key == connection_key,
+        ProviderMeasureWatermark.measure_id == measure_id,
+    ).first()
+    now = datetime.utcnow()
+    if row is None:
+        row = ProviderMeasureWatermark(
+            tenant_id=tenant_id,
+            provider=provider,
+            connection_key=connection_key,
+            measure_id=measure_id,
+            high_water_mark=timestamp,
+            last_synced_at=now,
+        )
+        db.add(row)
+        db.flush()
+        return row
+    if timestamp > row.high_water_mark:
+        row.high_water_mark = timestamp
+    row.last_synced_at = now
+    return row
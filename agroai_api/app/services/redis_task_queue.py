@@ -52,33 +52,105 @@ class RedisTaskQueue:
             )
         )
 
-    def read(self, consumer: str, *, block_ms: int = 5000) -> list[QueueMessage]:
+    def enqueue_many(self, tasks: list[tuple[str, str, str]]) -> list[str | Exception]:
+        """XADD ``(job_id, tenant_id, task_type)`` tasks in one pipeline.
+
+        Entries are returned in order: the stream id, or the exception for an
+        entry Redis rejected.
+        """
+        if not tasks:
+            return []
         self.ensure_group()
-        response = self.client.xreadgroup(self.group, consumer, {self.stream: ">"}, count=5, block=max(100, block_ms))
-        result: list[QueueMessage] = []
-        for _stream, entries in response or []:
-            for message_id, fields in entries:
-                if fields.get("job_id") and fields.get("tenant_id") and fields.get("task_type"):
-                    result.append(QueueMessage(str(message_id), str(fields["job_id"]), str(fields["tenant_id"]), str(fields["task_type"])))
-                else:
-                    self.ack(str(message_id))
-        return result
+        pipe = self.client.pipeline(transaction=False)
+        for job_id, tenant_id, task_type in tasks:
+            pipe.xadd(
+                self.stream,
+                {"job_id": job_id, "tenant_id": tenant_id, "task_type": task_type},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        return [
+            result if isinstance(result, Exception) else str(result)
+            for result in pipe.execute(raise_on_error=False)
+        ]
 
-    def claim_stale(self, consumer: str, *, min_idle_ms: int = 120000) -> list[QueueMessage]:
-        self.ensure_group()
-        response = self.client.xautoclaim(self.stream, self.group, consumer, min_idle_time=max(1000, min_idle_ms), start_id="0-0", count=10)
-        entries = response[1] if response and len(response) > 1 else []
+    def _messages(self, entries) -> list[QueueMessage]:
         result: list[QueueMessage] = []
-        for message_id, fields in entries:
-            if fields.get("job_id") and fields.get("tenant_id") and fields.get("task_type"):
+        malformed: list[str] = []
+        for message_id, fields in entries or []:
+            if fields and fields.get("job_id") and fields.get("tenant_id") and fields.get("task_type"):
                 result.append(QueueMessage(str(message_id), str(fields["job_id"]), str(fields["tenant_id"]), str(fields["task_type"])))
             else:
-                self.ack(str(message_id))
+                malformed.append(str(message_id))
+        if malformed:
+            self.ack_many(malformed)
         return result
 
+    def read(self, consumer: str, *, block_ms: int = 5000, count: int = 5) -> list[QueueMessage]:
+        self.ensure_group()
+        response = self.client.xreadgroup(self.group, consumer, {self.stream: ">"}, count=max(1, count), block=max(100, block_ms))
+        entries = []
+        for _stream, stream_entries in response or []:
+            entries.extend(stream_entries)
+        return self._messages(entries)
+
+    def claim_stale(
+        self,
+        consumer: str,
+        *,
+        min_idle_ms: int = 120000,
+        count: int = 10,
+        start_id: str = "0-0",
+    ) -> list[QueueMessage]:
+        return self.claim_stale_page(consumer, min_idle_ms=min_idle_ms, count=count, start_id=start_id)[1]
+
+    def claim_stale_page(
+        self,
+        consumer: str,
+        *,
+        min_idle_ms: int = 120000,
+        count: int = 10,
+        start_id: str = "0-0",
+    ) -> tuple[str, list[QueueMessage]]:
+        """Claim one XAUTOCLAIM page; returns the cursor to continue from ("0-0" when done)."""
+        self.ensure_group()
+        response = self.client.xautoclaim(
+            self.stream,
+            self.group,
+            consumer,
+            min_idle_time=max(1000, min_idle_ms),
+            start_id=start_id,
+            count=max(1, count),
+        )
+        cursor = str(response[0]) if response else "0-0"
+        entries = response[1] if response and len(response) > 1 else []
+        return cursor, self._messages(entries)
+
     def ack(self, message_id: str) -> int:
         return int(self.client.xack(self.stream, self.group, message_id))
 
+    def ack_many(self, message_ids: list[str]) -> int:
+        """Acknowledge a batch with a single XACK."""
+        if not message_ids:
+            return 0
+        return int(self.client.xack(self.stream, self.group, *message_ids))
+
+    def settle(self, consumer: str, *, ack_ids: list[str], hold_ids: list[str]) -> None:
+        """Ack finished messages and reset the idle time of held ones in one round trip.
+
+        Held (deferred) messages stay pending for ``consumer``; re-claiming
+        them with JUSTID restarts their idle clock so other workers' stale
+        scans leave them alone while this worker retries them.
+        """
+        if not ack_ids and not hold_ids:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        if ack_ids:
+            pipe.xack(self.stream, self.group, *ack_ids)
+        if hold_ids:
+            pipe.xclaim(self.stream, self.group, consumer, 0, hold_ids, justid=True)
+        pipe.execute()
+
     def pending_count(self) -> int:
         self.ensure_group()
         summary = self.client.xpending(self.stream, self.group)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import os
+import time
 from typing import Iterable
 
 import httpx
 
 from app.core.config import settings
+from app.services.ai_http_clients import ai_http_client, ai_timeout
+from app.services.ai_response_cache import ResponseCacheScope, through_response_cache
+from app.services.lane_latency import LANE_LATENCY, hedged
 from app.services.language import language_matches_target, resolve_language
 from app.services.live_intelligence import LiveIntelligence, LiveResult
 
@@ -105,10 +108,12 @@ async def _run_openrouter(
     timeout = 65 if profile in {"deep", "report"} else 45
     paid_blocked = False
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for model in models[:10]:
+    request_timeout = ai_timeout(timeout)
+    async with ai_http_client(_OPENROUTER_BASE, lane="hosted") as client:
+        for model in LANE_LATENCY.order_models("hosted", models[:10]):
             if paid_blocked and not _is_free_model(model):
                 continue
+            started = time.perf_counter()
             try:
                 response = await client.post(
                     f"{_OPENROUTER_BASE}/chat/completions",
@@ -119,12 +124,16 @@ async def _run_openrouter(
                         "temperature": 1.0 if model.startswith(("z-ai/glm-5", "deepseek/deepseek-v4")) else 0.2,
                         "max_tokens": max_tokens,
                     },
+                    timeout=request_timeout,
                 )
             except httpx.HTTPError as exc:
+                LANE_LATENCY.record("hosted", time.perf_counter() - started, False, model=model)
                 logger.warning("ai_resilience hosted_transport model=%s error=%s", model, exc.__class__.__name__)
                 continue
 
             status = response.status_code
+            if status >= 400:
+                LANE_LATENCY.record("hosted", time.perf_counter() - started, False, model=model)
             if status in {401, 403}:
                 logger.error("ai_resilience hosted_auth_failed status=%s model=%s", status, model)
                 return None
@@ -140,12 +149,13 @@ async def _run_openrouter(
             try:
                 answer = _message_content(response.json())
             except (ValueError, KeyError, TypeError):
+                answer = None
                 logger.warning("ai_resilience hosted_invalid_json model=%s", model)
-                continue
+            LANE_LATENCY.record("hosted", time.perf_counter() - started, bool(answer), model=model)
             if answer:
                 return answer, model
 
-    return None
+        return None
 
 
 async def _run_edge(
@@ -160,7 +170,7 @@ async def _run_edge(
     num_predict = 2000 if profile in {"deep", "report"} else 1400 if profile == "reasoning" else 700
 
     try:
-        async with httpx.AsyncClient(timeout=max(20, int(settings.AI_EDGE_TIMEOUT_SECONDS or 45))) as client:
+        async with ai_http_client(base, lane="edge") as client:
             response = await client.post(
                 f"{base}/api/chat",
                 headers=headers,
@@ -171,6 +181,7 @@ async def _run_edge(
                     "think": False,
                     "options": {"temperature": 0.2, "num_predict": num_predict},
                 },
+                timeout=ai_timeout(max(20, int(settings.AI_EDGE_TIMEOUT_SECONDS or 45))),
             )
     except httpx.HTTPError as exc:
         logger.warning("ai_resilience edge_transport error=%s", exc.__class__.__name__)
@@ -206,13 +217,33 @@ async def run_resilient_intelligence(
     question: str,
     messages: list[dict[str, str]],
     preferred_language: str | None,
+    cache_scope: ResponseCacheScope | None = None,
 ) -> LiveResult:
     """Race independent edge and hosted recovery paths, then use real local Ollama.
 
     This deliberately does not call the normal router first. The normal router is
     exactly the path that returned `model_status=unavailable` in production, and
     repeating it would double provider timeouts before recovery even starts.
+    With a ``cache_scope`` an answer is reused for the same evidence and prompt.
     """
+    return await through_response_cache(
+        cache_scope,
+        route="resilient",
+        task=task,
+        messages=messages,
+        params={"preferred_language": preferred_language},
+        call=lambda: _run_lanes(task=task, question=question, messages=messages, preferred_language=preferred_language),
+        cacheable=lambda result: result.status == "ok" and bool(result.content.strip()),
+    )
+
+
+async def _run_lanes(
+    *,
+    task: str,
+    question: str,
+    messages: list[dict[str, str]],
+    preferred_language: str | None,
+) -> LiveResult:
     runtime = LiveIntelligence()
     language = resolve_language(preferred_language, question)
     profile = runtime.profile(task, question)
@@ -225,23 +256,18 @@ async def run_resilient_intelligence(
         result = await _run_openrouter(messages=messages, profile=profile)
         return (result[0], result[1], "openrouter") if result else None
 
-    tasks = [asyncio.create_task(edge_lane()), asyncio.create_task(hosted_lane())]
-    try:
-        for completed in asyncio.as_completed(tasks):
-            lane = await completed
-            if not lane:
-                continue
-            answer, model, provider = lane
-            if language_matches_target(answer, language.response_code):
-                for pending in tasks:
-                    if not pending.done():
-                        pending.cancel()
-                return LiveResult("ok", answer, provider, model, language.response_code, profile)
-    finally:
-        for pending in tasks:
-            if not pending.done():
-                pending.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
+    # Start the lane expected to answer first and hedge onto the other only
+    # once it fails or runs past its observed p90. These lanes used to race
+    # from the start, so a lane with no p90 yet hedges after the default delay.
+    lanes = {"edge": edge_lane, "hosted": hosted_lane}
+    winner, _rejected = await hedged(
+        [(lane, lanes[lane]) for lane in LANE_LATENCY.order(["edge", "hosted"])],
+        accept=lambda lane: language_matches_target(lane[0], language.response_code),
+        hedge_cold=True,
+    )
+    if winner is not None:
+        answer, model, provider = winner
+        return LiveResult("ok", answer, provider, model, language.response_code, profile)
 
     # Third lane: actual local Ollama, only when a real local origin is configured
     # and, for a public hostname, Cloudflare Access credentials are present.
@@ -101,8 +101,8 @@ class ScheduleMatchRunner:
         schedule_lookup = {s.id: s for s in candidate_schedules}
         matched = 0
 
-        for dr in unmatched_runs:
-            target = MatchTarget(
+        targets = [
+            MatchTarget(
                 decision_run_id=dr.id,
                 block_id=dr.block_id,
                 planned_start=dr.planned_start,
@@ -110,12 +110,15 @@ class ScheduleMatchRunner:
                 planned_volume_m3=dr.planned_volume_m3,
                 provider_event_id=dr.provider_event_id,
             )
-            result = self._matcher.match(target, candidates)
+            for dr in unmatched_runs
+        ]
+        # match_many consumes each unambiguously matched schedule, so later
+        # runs cannot claim it
+        results = self._matcher.match_many(targets, candidates)
 
+        for dr, result in zip(unmatched_runs, results):
             if result.matched and not result.ambiguous:
                 self._apply_match(dr, schedule_lookup[result.schedule_id], result)
-                # Remove matched schedule from candidates for subsequent runs
-                candidates = [c for c in candidates if c.schedule_id != result.schedule_id]
                 matched += 1
             elif result.ambiguous:
                 logger.info(
@@ -14,9 +14,10 @@ No side effects in the matching logic itself — the caller persists.
 from __future__ import annotations
 
 import logging
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +91,35 @@ class ScheduleMatcher:
         if not active_candidates:
             return MatchResult(matched=False, reason="all_candidates_cancelled")
 
+        return self._best_match(target, active_candidates)
+
+    def match_many(
+        self,
+        targets: Sequence[MatchTarget],
+        candidates: List[MatchCandidate],
+    ) -> List[MatchResult]:
+        """Greedily match targets in order, consuming matched candidates.
+
+        Equivalent to calling :meth:`match` for each target and dropping a
+        candidate once it is matched unambiguously, but each target only
+        scores candidates from its own block within the time window (plus
+        exact provider-ID hits), via a :class:`CandidateIndex`.
+        """
+        index = CandidateIndex(candidates)
+        results: List[MatchResult] = []
+        for target in targets:
+            result = index.match(self, target)
+            if result.matched and not result.ambiguous:
+                index.remove(result.schedule_id)
+            results.append(result)
+        return results
+
+    def _best_match(
+        self,
+        target: MatchTarget,
+        active_candidates: Iterable[MatchCandidate],
+    ) -> MatchResult:
+        """Rank active same-block candidates; ties keep candidate order."""
         scored: List[Tuple[float, str, str, MatchCandidate]] = []
 
         for cand in active_candidates:
@@ -175,3 +205,80 @@ class ScheduleMatcher:
         if planned == 0:
             return None
         return ((actual - planned) / planned) * 100.0
+
+
+def _bucket(when: datetime, width_seconds: float) -> int:
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((when - datetime(1970, 1, 1)).total_seconds() // width_seconds)
+
+
+class CandidateIndex:
+    """Unmatched candidates keyed by (block_id, start-time bucket).
+
+    Buckets are TIME_WINDOW_HOURS wide, so every candidate within the window
+    of a target sits in the target's bucket or a neighbour. Exact provider-ID
+    matches score regardless of time and get their own lookup. Removal is
+    O(1) per schedule; original list positions are kept so ranking ties break
+    exactly as in :meth:`ScheduleMatcher.match`.
+    """
+
+    def __init__(self, candidates: Iterable[MatchCandidate]):
+        self._width = TIME_WINDOW_HOURS * 3600.0
+        self._by_schedule: Dict[str, List[Tuple[int, MatchCandidate]]] = {}
+        self._buckets: Dict[Tuple[str, int], Dict[int, MatchCandidate]] = {}
+        self._by_provider_id: Dict[Tuple[str, str], Dict[int, MatchCandidate]] = {}
+        self._block_total: Counter = Counter()
+        self._block_active: Counter = Counter()
+        self._total = 0
+        for position, cand in enumerate(candidates):
+            self._by_schedule.setdefault(cand.schedule_id, []).append((position, cand))
+            self._total += 1
+            self._block_total[cand.block_id] += 1
+            if cand.status == "cancelled":
+                continue
+            self._block_active[cand.block_id] += 1
+            key = (cand.block_id, _bucket(cand.start_time, self._width))
+            self._buckets.setdefault(key, {})[position] = cand
+            if cand.provider_schedule_id:
+                pid_key = (cand.block_id, str(cand.provider_schedule_id))
+                self._by_provider_id.setdefault(pid_key, {})[position] = cand
+
+    def __len__(self) -> int:
+        return self._total
+
+    def remove(self, schedule_id: str) -> None:
+        """Drop every candidate carrying ``schedule_id``."""
+        for position, cand in self._by_schedule.pop(schedule_id, []):
+            self._total -= 1
+            self._block_total[cand.block_id] -= 1
+            if cand.status == "cancelled":
+                continue
+            self._block_active[cand.block_id] -= 1
+            key = (cand.block_id, _bucket(cand.start_time, self._width))
+            self._buckets[key].pop(position, None)
+            if cand.provider_schedule_id:
+                pid_key = (cand.block_id, str(cand.provider_schedule_id))
+                self._by_provider_id[pid_key].pop(position, None)
+
+    def nearby(self, target: MatchTarget) -> List[MatchCandidate]:
+        """Active same-block candidates that can score, in original order."""
+        found: Dict[int, MatchCandidate] = {}
+        center = _bucket(target.planned_start, self._width)
+        for bucket in (center - 1, center, center + 1):
+            found.update(self._buckets.get((target.block_id, bucket), {}))
+        if target.provider_event_id:
+            found.update(self._by_provider_id.get(
+                (target.block_id, str(target.provider_event_id)), {}
+            ))
+        return [found[position] for position in sorted(found)]
+
+    def match(self, matcher: ScheduleMatcher, target: MatchTarget) -> MatchResult:
+        """Same result as ``matcher.match(target, <remaining candidates>)``."""
+        if self._total == 0:
+            return MatchResult(matched=False, reason="no_candidates")
+        if self._block_total[target.block_id] == 0:
+            return MatchResult(matched=False, reason="no_candidates_for_block")
+        if self._block_active[target.block_id] == 0:
+            return MatchResult(matched=False, reason="all_candidates_cancelled")
+        return matcher._best_match(target, self.nearby(target))
@@ -1,18 +1,34 @@
+"""Bounded text of customer-owned sources for intelligence context.
+
+PDF text is extracted once, by the connector worker, when a PDF source is
+ingested. Pages are stored in ``data_source_text_pages`` keyed by tenant and
+content hash, so re-uploads of the same document reuse them.
+:func:`source_text` called with a session reads only those stored pages, in
+page order, until the requested length is reached. A PDF queued for
+extraction contributes no text until the worker finishes. PDFs uploaded
+before extraction ran on ingest have no ``text_extraction`` state and are
+still downloaded and parsed on demand until they are backfilled.
+"""
 from __future__ import annotations
 
 import base64
+import hashlib
 import re
 import zlib
 from io import BytesIO
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy.orm import Session
+
 from app.core.config import settings
-from app.models.operational_records import DataSource
+from app.models.operational_records import DataSource, DataSourceTextPage
 from app.services.object_storage import get_object_store
 
 
 DEFAULT_EXCERPT_CHARS = 4_000
+MAX_EXTRACTED_CHARS = 200_000
+MAX_PDF_PAGES = 200
 MAX_SOURCE_BYTES = min(int(getattr(settings, "CONNECTOR_MAX_UPLOAD_BYTES", 25_000_000) or 25_000_000), 25_000_000)
 
 
@@ -51,28 +67,50 @@ def _read_source_bytes(source: DataSource) -> bytes | None:
         return None
 
 
-def _extract_pdf_text(data: bytes) -> str:
+def _bounded_pages(pages: list[tuple[int, str]]) -> list[tuple[int, str]]:
+    bounded: list[tuple[int, str]] = []
+    total = 0
+    for number, text in pages:
+        if not text:
+            continue
+        text = text[: MAX_EXTRACTED_CHARS - total]
+        bounded.append((number, text))
+        total += len(text)
+        if total >= MAX_EXTRACTED_CHARS:
+            break
+    return bounded
+
+
+def _extract_pdf_pages(data: bytes) -> list[tuple[int, str]]:
+    """``(page_number, text)`` for the non-empty pages of a PDF, bounded in total length."""
     try:
         from pypdf import PdfReader
 
         reader = PdfReader(BytesIO(data), strict=False)
-        parts: list[str] = []
+        pages: list[tuple[int, str]] = []
         total = 0
-        for page in reader.pages[:200]:
+        for number, page in enumerate(reader.pages[:MAX_PDF_PAGES], start=1):
             text = (page.extract_text() or "").strip()
-            if not text:
-                continue
-            parts.append(text)
+            pages.append((number, text))
             total += len(text)
-            if total >= 200_000:
+            if total >= MAX_EXTRACTED_CHARS:
                 break
-        return "\n\n".join(parts)[:200_000]
+        return _bounded_pages(pages)
     except Exception:
-        return _extract_pdf_text_fallback(data)
+        # Without a parser, each decoded content stream stands in for a page.
+        return _bounded_pages(list(enumerate(_extract_pdf_stream_texts(data), start=1)))
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    return "\n\n".join(text for _number, text in _extract_pdf_pages(data))[:MAX_EXTRACTED_CHARS]
 
 
 def _extract_pdf_text_fallback(data: bytes) -> str:
     """Best-effort bounded text extraction when optional PDF deps are absent."""
+    return "\n\n".join(_extract_pdf_stream_texts(data))[:MAX_EXTRACTED_CHARS]
+
+
+def _extract_pdf_stream_texts(data: bytes) -> list[str]:
     parts: list[str] = []
     for match in re.finditer(rb"stream\r?\n(.*?)endstream", data, flags=re.DOTALL):
         stream = match.group(1).strip()[:MAX_SOURCE_BYTES]
@@ -82,9 +120,9 @@ def _extract_pdf_text_fallback(data: bytes) -> str:
         text = _literal_pdf_text(decoded)
         if text:
             parts.append(text)
-        if sum(len(part) for part in parts) >= 200_000:
+        if sum(len(part) for part in parts) >= MAX_EXTRACTED_CHARS:
             break
-    return "\n\n".join(parts)[:200_000]
+    return parts
 
 
 def _decode_pdf_stream(stream: bytes) -> bytes:
@@ -127,25 +165,113 @@ def _literal_pdf_text(decoded: bytes) -> str:
     return "\n".join(values)
 
 
-def source_text(source: DataSource) -> str:
+def needs_text_extraction(source: DataSource) -> bool:
+    """Whether the source's usable text lives only in its stored PDF."""
+    current = str(source.raw_text or "")
+    return _is_pdf(source) and bool(source.storage_path) and (not current.strip() or _looks_binary(current))
+
+
+def text_extraction_state(source: DataSource) -> dict[str, Any]:
+    metadata = source.metadata_json if isinstance(source.metadata_json, dict) else {}
+    state = metadata.get("text_extraction")
+    return state if isinstance(state, dict) else {}
+
+
+def _known_content_sha256(source: DataSource) -> str | None:
+    metadata = source.metadata_json if isinstance(source.metadata_json, dict) else {}
+    value = str(source.content_sha256 or metadata.get("content_sha256") or "").strip().lower()
+    return value if len(value) == 64 else None
+
+
+def _stored_pages_exist(db: Session, tenant_id: str, content_sha256: str) -> bool:
+    return db.query(DataSourceTextPage.id).filter(
+        DataSourceTextPage.tenant_id == tenant_id,
+        DataSourceTextPage.content_sha256 == content_sha256,
+    ).first() is not None
+
+
+def extract_source_text(db: Session, source: DataSource) -> dict[str, Any]:
+    """Store the page text of a PDF source once per tenant and content hash.
+
+    Runs in the connector worker. A source whose content hash already has
+    stored pages is pointed at them without downloading the object. The
+    caller commits.
+    """
+    if not needs_text_extraction(source):
+        return {"status": "not_required", "data_source_id": source.id}
+    content_sha256 = _known_content_sha256(source)
+    data = None
+    if content_sha256 is None or not _stored_pages_exist(db, source.tenant_id, content_sha256):
+        data = _read_source_bytes(source)
+        if data is None:
+            raise RuntimeError("stored source object is unavailable for text extraction")
+        content_sha256 = content_sha256 or hashlib.sha256(data).hexdigest()
+    reused = _stored_pages_exist(db, source.tenant_id, content_sha256)
+    if reused:
+        page_count = db.query(DataSourceTextPage).filter(
+            DataSourceTextPage.tenant_id == source.tenant_id,
+            DataSourceTextPage.content_sha256 == content_sha256,
+        ).count()
+    else:
+        pages = _extract_pdf_pages(data)
+        for number, text in pages:
+            db.add(DataSourceTextPage(tenant_id=source.tenant_id, content_sha256=content_sha256, page_number=number, text=text))
+        page_count = len(pages)
+    state = {"status": "ready" if page_count else "empty", "content_sha256": content_sha256, "page_count": page_count, "reused": reused}
+    metadata = dict(source.metadata_json or {})
+    metadata["text_extraction"] = state
+    source.metadata_json = metadata
+    return {**state, "data_source_id": source.id}
+
+
+def stored_source_text(db: Session, source: DataSource, *, max_chars: int = MAX_EXTRACTED_CHARS) -> str:
+    """Stored page text of a PDF source, reading only as many pages as ``max_chars`` needs."""
+    state = text_extraction_state(source)
+    if state.get("status") != "ready" or not state.get("content_sha256") or max_chars <= 0:
+        return ""
+    rows = (
+        db.query(DataSourceTextPage.text)
+        .filter(
+            DataSourceTextPage.tenant_id == source.tenant_id,
+            DataSourceTextPage.content_sha256 == state["content_sha256"],
+        )
+        .order_by(DataSourceTextPage.page_number.asc())
+        .yield_per(8)
+    )
+    parts: list[str] = []
+    total = 0
+    for (text,) in rows:
+        parts.append(text)
+        total += len(text) + 2
+        if total >= max_chars:
+            break
+    return "\n\n".join(parts)[:max_chars]
+
+
+def source_text(source: DataSource, db: Session | None = None, *, max_chars: int = MAX_EXTRACTED_CHARS) -> str:
     """Return bounded, customer-owned source text suitable for intelligence context.
 
     Uploaded bytes remain in durable storage. This helper only materializes a
     bounded text representation and never exposes the storage URI to the model or
-    customer-facing API.
+    customer-facing API. With a session, PDF text comes only from the pages the
+    worker stored, and a PDF still queued for extraction has no text yet.
+    Without a session, or for a PDF uploaded before worker extraction existed
+    (no extraction state), the stored object is parsed on demand.
     """
     current = str(source.raw_text or "")
-    if _is_pdf(source) and (not current.strip() or _looks_binary(current)):
+    if needs_text_extraction(source):
+        if db is not None and text_extraction_state(source):
+            return stored_source_text(db, source, max_chars=max_chars)
         data = _read_source_bytes(source)
         if data:
             extracted = _extract_pdf_text(data)
             if extracted:
-                return extracted
-    return current if not _looks_binary(current) else ""
+                return extracted[:max_chars]
+    return current[:max_chars] if not _looks_binary(current) else ""
 
 
-def source_content_excerpt(source: DataSource, *, max_chars: int = DEFAULT_EXCERPT_CHARS) -> str:
-    text = source_text(source).replace("\x00", " ").strip()
+def source_content_excerpt(source: DataSource, *, max_chars: int = DEFAULT_EXCERPT_CHARS, db: Session | None = None) -> str:
+    text = source_text(source, db, max_chars=max(0, max_chars)).replace("\x00", " ").strip()
     return text[: max(0, max_chars)]
 
 
@@ -164,5 +290,7 @@ def content_available(source: DataSource) -> bool:
         return True
     if parsed_rows_preview(source, limit=1):
         return True
-    # A stored PDF is extractable on demand by source_text() for intelligence.
-    return _is_pdf(source) and bool(source.storage_path)
+    # A stored PDF is ready once the worker has extracted its page text. One
+    # with no extraction state predates worker extraction and is parsed on demand.
+    state = text_extraction_state(source)
+    return _is_pdf(source) and bool(source.storage_path) and (not state or state.get("status") == "ready")
@@ -9,10 +9,11 @@ from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 
 from app.api.deps import AuthContext
-from app.models.operational_records import DataSource, EvidenceRecord, IngestionJob
+from app.models.operational_records import DataSource, DataSourceTextPage, EvidenceRecord, IngestionJob
 from app.models.saas import UsageEvent
 from app.models.task_outbox import TaskOutbox
 from app.services.object_storage import get_object_store
+from app.services.source_content import text_extraction_state
 
 
 _SOURCE_WRITE_ROLES = {"owner", "admin", "manager", "operator"}
@@ -128,6 +129,36 @@ def _record_delete_event(
     )
 
 
+def _source_text_hashes(source: DataSource) -> set[str]:
+    metadata = source.metadata_json if isinstance(source.metadata_json, dict) else {}
+    candidates = (source.content_sha256, metadata.get("content_sha256"), text_extraction_state(source).get("content_sha256"))
+    return {str(value).strip().lower() for value in candidates if value and len(str(value).strip()) == 64}
+
+
+def _delete_orphaned_text_pages(db: Session, *, tenant_id: str, source: DataSource) -> int:
+    """Delete extracted text pages that no other source in the tenant still points at."""
+    deleted = 0
+    for content_sha256 in _source_text_hashes(source):
+        shared = db.query(DataSource.id).filter(
+            DataSource.tenant_id == tenant_id,
+            DataSource.id != source.id,
+            or_(
+                DataSource.content_sha256 == content_sha256,
+                DataSource.metadata_json["content_sha256"].as_string() == content_sha256,
+                DataSource.metadata_json[("text_extraction", "content_sha256")].as_string() == content_sha256,
+            ),
+        ).first()
+        if shared is not None:
+            continue
+        deleted += int(
+            db.query(DataSourceTextPage)
+            .filter(DataSourceTextPage.tenant_id == tenant_id, DataSourceTextPage.content_sha256 == content_sha256)
+            .delete(synchronize_session=False)
+            or 0
+        )
+    return deleted
+
+
 def _delete_completed_source(db: Session, *, auth: AuthContext, source: DataSource) -> dict[str, Any]:
     tenant_id = _organization_id(auth)
     if source.tenant_id != tenant_id:
@@ -159,6 +190,7 @@ def _delete_completed_source(db: Session, *, auth: AuthContext, source: DataSour
     if job_ids:
         db.query(TaskOutbox).filter(TaskOutbox.job_id.in_(job_ids)).delete(synchronize_session=False)
         db.query(IngestionJob).filter(IngestionJob.id.in_(job_ids)).delete(synchronize_session=False)
+    _delete_orphaned_text_pages(db, tenant_id=tenant_id, source=source)
     db.delete(source)
     _record_delete_event(
         db,
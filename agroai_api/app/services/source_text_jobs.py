@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.operational_records import DataSource, IngestionJob
+from app.models.task_outbox import TaskOutbox
+from app.services.source_content import needs_text_extraction, text_extraction_state
+
+
+TASK_TYPE = "source_text_extract"
+
+
+def queue_source_text_extraction(
+    db: Session,
+    *,
+    source: DataSource,
+    commit: bool = True,
+) -> tuple[IngestionJob | None, bool]:
+    """Queue worker-side PDF text extraction for ``source``; ``(None, False)`` when none is needed."""
+    if not needs_text_extraction(source) or text_extraction_state(source).get("status") in {"ready", "empty"}:
+        return None, False
+
+    existing = db.query(IngestionJob).filter(
+        IngestionJob.tenant_id == source.tenant_id,
+        IngestionJob.data_source_id == source.id,
+        IngestionJob.job_type == TASK_TYPE,
+        IngestionJob.status.in_(["queued", "running", "retrying"]),
+    ).order_by(IngestionJob.created_at.desc()).first()
+    if not text_extraction_state(source):
+        # Marks the source as waiting on the worker rather than parsed on demand.
+        source.metadata_json = {**(source.metadata_json or {}), "text_extraction": {"status": "queued"}}
+    if existing is not None:
+        return existing, True
+
+    now = datetime.utcnow()
+    request_id = uuid.uuid4().hex
+    identity = hashlib.sha256(
+        f"{source.tenant_id}|{source.id}|{TASK_TYPE}|{request_id}".encode("utf-8")
+    ).hexdigest()
+    job = IngestionJob(
+        tenant_id=source.tenant_id,
+        workspace_id=source.workspace_id,
+        connector_connection_id=source.connector_connection_id,
+        data_source_id=source.id,
+        job_type=TASK_TYPE,
+        status="queued",
+        input_json={"data_source_id": source.id},
+        output_json={},
+        idempotency_key=identity,
+        attempt_count=0,
+        max_attempts=int(getattr(settings, "TASK_QUEUE_MAX_ATTEMPTS", 5) or 5),
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    db.flush()
+    db.add(
+        TaskOutbox(
+            job_id=job.id,
+            tenant_id=source.tenant_id,
+            task_type=TASK_TYPE,
+            payload_json={"job_id": job.id, "data_source_id": source.id},
+            status="pending",
+            publish_attempts=0,
+            created_at=now,
+            updated_at=now,
+        )
+    )
+    if commit:
+        db.commit()
+        db.refresh(job)
+    return job, False
+
+
+def queue_missing_source_text(db: Session, *, tenant_id: str | None = None, limit: int = 500) -> int:
+    """Queue extraction for PDF sources ingested before worker-side extraction existed.
+
+    Sources are checked newest first in batches of ``limit``, paging on
+    ``(created_at, id)`` until every PDF source has been seen.
+    """
+    query = db.query(DataSource).filter(
+        DataSource.storage_path.is_not(None),
+        or_(
+            DataSource.source_type == "pdf_document",
+            DataSource.content_type == "application/pdf",
+            func.lower(DataSource.filename).like("%.pdf"),
+        ),
+    )
+    if tenant_id:
+        query = query.filter(DataSource.tenant_id == tenant_id)
+    queued = 0
+    last: DataSource | None = None
+    while True:
+        page = query
+        if last is not None:
+            page = page.filter(
+                or_(
+                    DataSource.created_at < last.created_at,
+                    and_(DataSource.created_at == last.created_at, DataSource.id < last.id),
+                )
+            )
+        sources = page.order_by(DataSource.created_at.desc(), DataSource.id.desc()).limit(max(1, limit)).all()
+        if not sources:
+            break
+        for source in sources:
+            job, existing = queue_source_text_extraction(db, source=source, commit=False)
+            if job is not None and not existing:
+                queued += 1
+        last = sources[-1]
+        db.commit()
+    return queued
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from app.models.operational_records import DataSource, IngestionJob
+from app.services.ingestion_job_runner import _claim, _complete, _fail_or_retry, job_lease_heartbeat
+from app.services.source_content import extract_source_text
+from app.services.source_text_jobs import TASK_TYPE
+
+
+def process_source_text_job(
+    db: Session,
+    *,
+    job_id: str,
+    tenant_id: str,
+    worker_id: str,
+) -> str:
+    job = _claim(db, job_id=job_id, tenant_id=tenant_id, worker_id=worker_id)
+    if job is None:
+        return "deferred"
+    if job.status in {"succeeded", "failed", "cancelled"}:
+        return job.status
+    if job.job_type != TASK_TYPE:
+        return _fail_or_retry(db, job_id, RuntimeError("worker task type mismatch"), worker_id=worker_id)
+
+    source_id = job.data_source_id
+    with job_lease_heartbeat(job_id=job_id, tenant_id=tenant_id, worker_id=worker_id) as heartbeat:
+        try:
+            source = db.get(DataSource, source_id)
+            if source is None or source.tenant_id != tenant_id:
+                raise RuntimeError("data source is unavailable for text extraction")
+            output = extract_source_text(db, source)
+            if heartbeat.lost:
+                db.rollback()
+                return "deferred"
+            job = db.get(IngestionJob, job_id)
+            if job is None:
+                raise RuntimeError("text extraction job disappeared during processing")
+            return _complete(db, job, output, worker_id=worker_id)
+        except Exception as exc:
+            return _fail_or_retry(db, job_id, exc, worker_id=worker_id)
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
-from sqlalchemy import and_, or_, update
+from sqlalchemy import and_, bindparam, or_, update
 from sqlalchemy.orm import Session
 
 from app.db.base import SessionLocal
 from app.models.operational_records import IngestionJob
 from app.models.task_outbox import TaskOutbox
+from app.services.outbox_relay import RelayTask, record_publish_lag, relay_outbox_batch
 from app.services.redis_task_queue import get_task_publisher
 
 
@@ -67,76 +68,113 @@ def recover_stale_published_ingestion_jobs(
     return len(rows)
 
 
-def publish_pending_outbox(db: Session, *, limit: int = 50) -> dict[str, int]:
+def _claim_outbox_batch(db: Session, *, limit: int) -> list[TaskOutbox]:
+    """Move a batch of due rows to ``publishing`` in one short transaction."""
     now = datetime.utcnow()
-    rows = (
-        db.query(TaskOutbox)
+    candidates = [
+        row_id
+        for (row_id,) in db.query(TaskOutbox.id)
         .filter(_claimable_outbox(now))
         .order_by(TaskOutbox.created_at.asc())
+        .with_for_update(skip_locked=True)
         .limit(max(1, min(limit, 200)))
         .all()
+    ]
+    if not candidates:
+        db.rollback()
+        return []
+    claimed = db.execute(
+        update(TaskOutbox)
+        .where(TaskOutbox.id.in_(candidates), _claimable_outbox(now))
+        .values(status="publishing", updated_at=now)
+        .returning(TaskOutbox.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
+    if not claimed:
+        return []
+    return (
+        db.query(TaskOutbox)
+        .filter(TaskOutbox.id.in_(claimed))
+        .order_by(TaskOutbox.created_at.asc())
+        .populate_existing()
+        .all()
+    )
+
+
+def _outcome_values(row: TaskOutbox, exc: Exception | None, now: datetime) -> dict:
+    values = {"row_id": row.id, "claimed_at": row.updated_at, "updated_at": now}
+    if exc is None:
+        return {
+            **values,
+            "status": "published",
+            "published_at": now,
+            "publish_attempts": int(row.publish_attempts or 0),
+            "next_attempt_at": None,
+            "last_error": None,
+        }
+    attempts = int(row.publish_attempts or 0) + 1
+    return {
+        **values,
+        "status": "pending",
+        "published_at": None,
+        "publish_attempts": attempts,
+        "next_attempt_at": now + timedelta(seconds=min(300, 2 ** min(attempts, 8))),
+        "last_error": f"{exc.__class__.__name__}: {str(exc)[:500]}",
+    }
+
+
+def _apply_outcomes(db: Session, results: list[tuple[TaskOutbox, Exception | None]], now: datetime) -> None:
+    """Write every outcome in one UPDATE that only matches rows still under this claim.
+
+    A claim that timed out may have been taken over by another drainer, which
+    moves ``updated_at``; that drainer's outcome is then left untouched.
+    """
+    table = TaskOutbox.__table__
+    db.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam("row_id"),
+            table.c.status == "publishing",
+            table.c.updated_at == bindparam("claimed_at"),
+        )
+        .values(
+            status=bindparam("status"),
+            published_at=bindparam("published_at"),
+            publish_attempts=bindparam("publish_attempts"),
+            next_attempt_at=bindparam("next_attempt_at"),
+            last_error=bindparam("last_error"),
+            updated_at=bindparam("updated_at"),
+        ),
+        [_outcome_values(row, exc, now) for row, exc in results],
     )
-    if not rows:
-        return {"published": 0, "failed": 0}
-
-    queue = get_task_publisher()
-    published = 0
-    failed = 0
-    for candidate in rows:
-        claim_time = datetime.utcnow()
-        claim = db.execute(
-            update(TaskOutbox)
-            .where(TaskOutbox.id == candidate.id, _claimable_outbox(claim_time))
-            .values(status="publishing", updated_at=claim_time)
+
+
+def publish_pending_outbox(db: Session, *, limit: int = 50) -> dict[str, int]:
+    """Claim a batch of due rows, publish it in one round trip and record it in one commit.
+
+    The claim commits before any network I/O, so concurrent drainers skip
+    rows that are being published. A crashed publisher leaves a stale claim
+    that is retried after the claim timeout.
+    """
+    rows = _claim_outbox_batch(db, limit=limit)
+    result = {"published": 0, "failed": 0}
+    if rows:
+        result = relay_outbox_batch(
+            db,
+            rows,
+            get_publisher=get_task_publisher,
+            task=lambda row: RelayTask(row.job_id, row.tenant_id, row.task_type),
+            apply=_apply_outcomes,
         )
-        db.commit()
-        if claim.rowcount != 1:
-            continue
-
-        db.refresh(candidate)
-        try:
-            queue.enqueue(candidate.job_id, candidate.tenant_id, candidate.task_type)
-            completed_at = datetime.utcnow()
-            result = db.execute(
-                update(TaskOutbox)
-                .where(TaskOutbox.id == candidate.id, TaskOutbox.status == "publishing")
-                .values(
-                    status="published",
-                    published_at=completed_at,
-                    next_attempt_at=None,
-                    last_error=None,
-                    updated_at=completed_at,
-                )
-            )
-            db.commit()
-            if result.rowcount == 1:
-                published += 1
-        except Exception as exc:
-            db.rollback()
-            db.refresh(candidate)
-            attempts = int(candidate.publish_attempts or 0) + 1
-            retry_at = datetime.utcnow() + timedelta(seconds=min(300, 2 ** min(attempts, 8)))
-            result = db.execute(
-                update(TaskOutbox)
-                .where(TaskOutbox.id == candidate.id, TaskOutbox.status == "publishing")
-                .values(
-                    status="pending",
-                    publish_attempts=attempts,
-                    next_attempt_at=retry_at,
-                    last_error=f"{exc.__class__.__name__}: {str(exc)[:500]}",
-                    updated_at=datetime.utcnow(),
-                )
-            )
-            db.commit()
-            if result.rowcount == 1:
-                failed += 1
-    return {"published": published, "failed": failed}
+    record_publish_lag(db, "task", TaskOutbox.created_at, TaskOutbox.status.in_(["pending", "publishing"]))
+    return result
 
 
 def drain_pending_outbox(*, limit: int = 50) -> dict[str, int]:
     """Drain publishable rows in a thread-owned database session.
 
-    Each row is atomically moved to ``publishing`` before network I/O so
+    Each batch is atomically moved to ``publishing`` before network I/O so
     concurrent drainers do not intentionally enqueue the same job. A crashed
     publisher leaves a recoverable stale claim; after the bounded claim timeout
     another drain may retry it. A crash after remote acceptance but before the
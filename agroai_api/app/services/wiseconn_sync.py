@@ -6,15 +6,20 @@ AGRO-AI's domain models (Block, Telemetry, Recommendation, Schedule).
 """
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.adapters.wiseconn import WiseConnAdapter, WiseConnError
+from app.adapters.wiseconn import WiseConnAdapter, WiseConnError, WiseConnRateLimitError
+from app.core.config import settings
 from app.models.block import Block
 from app.models.schedule import Schedule
 from app.models.telemetry import Telemetry
@@ -27,6 +32,11 @@ from app.schemas.wiseconn import (
     CanonicalZone,
     ExecutionStatus,
 )
+from app.services.provider_concurrency import ProviderConcurrencyLimiter
+from app.services.provider_sync_state import (
+    advance_measure_watermark,
+    load_measure_watermarks,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +44,43 @@ logger = logging.getLogger(__name__)
 DEMO_TENANT_ID = "wiseconn-demo"
 
 
+async def _gather_or_cancel(*coros: Any) -> List[Any]:
+    """Run coroutines concurrently and return results in argument order.
+
+    If one fails the rest are cancelled and the first failure is re-raised
+    as-is (not wrapped in an ExceptionGroup).
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except ExceptionGroup as group_error:
+        raise group_error.exceptions[0]
+    return [task.result() for task in tasks]
+
+
 class WiseConnSyncService:
     """Orchestrates WiseConn data flow into AGRO-AI."""
 
-    def __init__(self, adapter: WiseConnAdapter, db: Optional[Session] = None):
+    def __init__(
+        self,
+        adapter: WiseConnAdapter,
+        db: Optional[Session] = None,
+        limiter: Optional[ProviderConcurrencyLimiter] = None,
+        connection_key: str = "wiseconn",
+    ):
         self.adapter = adapter
         self.db = db
+        # Scopes per-measure sync watermarks to this provider account
+        self.connection_key = connection_key
+
+        # Bounds in-flight WiseConn requests across all concurrent fetches
+        self.limiter = limiter or ProviderConcurrencyLimiter(
+            "wiseconn",
+            max_concurrency=settings.WISECONN_MAX_CONCURRENCY,
+            rate_limit_errors=(WiseConnRateLimitError,),
+            backoff_seconds=settings.WISECONN_RATE_LIMIT_BACKOFF_SECONDS,
+            max_retries=settings.WISECONN_RATE_LIMIT_MAX_RETRIES,
+        )
 
         # Cache for discovered entities (avoids repeated API calls)
         self._farms: List[CanonicalFarm] = []
@@ -121,14 +162,25 @@ class WiseConnSyncService:
         start_time: datetime,
         end_time: datetime,
         tenant_id: str = DEMO_TENANT_ID,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """Ingest telemetry for a zone's measures into AGRO-AI Telemetry table.
 
+        Measures are fetched concurrently (bounded by ``self.limiter``) and
+        handed to a single persister through a bounded queue, so fetching
+        overlaps with DB writes without buffering the whole zone.
+
+        Every persisted measure advances its high-water mark. With
+        ``incremental=True`` a measure that already has one is only fetched
+        from ``mark - SYNC_WATERMARK_OVERLAP_MINUTES``; ``start_time`` still
+        applies to measures that have never been synced.
+
         Returns ingestion summary.
         """
         result: Dict[str, Any] = {
             "zone_id": zone_id,
             "measures_processed": 0,
+            "measures_incremental": 0,
             "points_ingested": 0,
             "points_skipped": 0,
             "errors": [],
@@ -138,34 +190,71 @@ class WiseConnSyncService:
         if not measures:
             # Try to discover measures on the fly
             try:
-                raw = await self.adapter.list_measures(zone_id)
+                raw = await self.limiter.run(lambda: self.adapter.list_measures(zone_id))
                 measures = [self.adapter.map_measure(m, zone_id) for m in raw]
                 self._measures[zone_id] = measures
             except WiseConnError as e:
                 result["errors"].append(f"Measure discovery failed: {e}")
                 return result
 
-        for measure in measures:
+        watermarks: Dict[str, datetime] = {}
+        if incremental and self.db:
+            watermarks = load_measure_watermarks(
+                self.db,
+                tenant_id=tenant_id,
+                provider="wiseconn",
+                connection_key=self.connection_key,
+            )
+        overlap = timedelta(minutes=settings.SYNC_WATERMARK_OVERLAP_MINUTES)
+
+        queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max(1, settings.WISECONN_PERSIST_QUEUE_SIZE)
+        )
+        errors: List[Tuple[int, str]] = []
+
+        async def fetch(index: int, measure: CanonicalMeasure) -> None:
+            measure_start = start_time
+            mark = watermarks.get(measure.provider_id)
+            if mark is not None and mark - overlap > start_time:
+                measure_start = mark - overlap
+                result["measures_incremental"] += 1
             try:
-                raw_data = await self.adapter.get_measure_data(
-                    measure.provider_id, start_time, end_time
+                raw_data = await self.limiter.run(
+                    lambda: self.adapter.get_measure_data(
+                        measure.provider_id, measure_start, end_time
+                    )
                 )
                 points = self.adapter.map_data_points(raw_data, measure)
+            except WiseConnError as e:
+                await queue.put((index, measure, e))
+                return
+            await queue.put((index, measure, points))
+
+        async def persist() -> None:
+            for _ in range(len(measures)):
+                index, measure, payload = await queue.get()
+                if isinstance(payload, WiseConnError):
+                    errors.append(
+                        (index, f"Data fetch failed for measure {measure.name}: {payload}")
+                    )
+                    continue
                 result["measures_processed"] += 1
-
                 if self.db:
                     ingested, skipped = self._persist_data_points(
-                        points, zone_id, tenant_id
+                        payload, zone_id, tenant_id
                     )
                     result["points_ingested"] += ingested
                     result["points_skipped"] += skipped
+                    self._advance_watermark(measure, payload, tenant_id)
                 else:
-                    result["points_ingested"] += len(points)
+                    result["points_ingested"] += len(payload)
 
-            except WiseConnError as e:
-                result["errors"].append(
-                    f"Data fetch failed for measure {measure.name}: {e}"
-                )
+        await _gather_or_cancel(
+            persist(),
+            *(fetch(index, measure) for index, measure in enumerate(measures)),
+        )
+
+        result["errors"].extend(message for _, message in sorted(errors))
 
         logger.info(
             "Telemetry ingestion for zone %s: %d measures, %d points ingested, %d skipped",
@@ -192,11 +281,17 @@ class WiseConnSyncService:
         zone_id: str,
         days: int = 14,
         tenant_id: str = DEMO_TENANT_ID,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
-        """Ingest historical data (default: last 14 days)."""
+        """Ingest historical data (default: last 14 days).
+
+        With ``incremental=True`` measures resume from their watermark and
+        ``days`` only bounds measures that have never been synced.
+        """
         now = datetime.utcnow()
         return await self.ingest_telemetry(
-            zone_id, now - timedelta(days=days), now, tenant_id
+            zone_id, now - timedelta(days=days), now, tenant_id,
+            incremental=incremental,
         )
 
     # ------------------------------------------------------------------
@@ -224,8 +319,8 @@ class WiseConnSyncService:
         }
 
         try:
-            raw_irrigations = await self.adapter.list_irrigations(
-                zone_id, start_time, end_time
+            raw_irrigations = await self.limiter.run(
+                lambda: self.adapter.list_irrigations(zone_id, start_time, end_time)
             )
             irrigations = [
                 self.adapter.map_irrigation(i, zone_id) for i in raw_irrigations
@@ -388,9 +483,13 @@ class WiseConnSyncService:
         self,
         tenant_id: str = DEMO_TENANT_ID,
         days: int = 14,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """Run a full sync: discover → ingest telemetry → ingest irrigations.
 
+        ``incremental`` is passed through to telemetry ingestion; leave it
+        off to (re)fetch the whole ``days`` window, e.g. for a backfill.
+
         Returns a comprehensive summary.
         """
         report: Dict[str, Any] = {
@@ -408,28 +507,36 @@ class WiseConnSyncService:
         if discovery["errors"]:
             report["errors"].extend(discovery["errors"])
 
-        # Step 2: Ensure blocks exist and ingest per zone
-        for farm in self._farms:
-            zones = self._zones.get(farm.provider_id, [])
-            for zone in zones:
-                # Create/ensure block
-                block_id = self.ensure_block_exists(zone, farm, tenant_id)
-                if block_id:
-                    report["blocks_created"].append(
-                        {"block_id": block_id, "zone": zone.name}
-                    )
+        # Step 2: Ensure blocks exist and ingest per zone. Zones run
+        # concurrently; self.limiter bounds the total in-flight requests.
+        async def sync_zone(farm: CanonicalFarm, zone: CanonicalZone):
+            # Create/ensure block
+            block_id = self.ensure_block_exists(zone, farm, tenant_id)
 
-                # Ingest telemetry
-                telem = await self.ingest_historical(
-                    zone.provider_id, days=days, tenant_id=tenant_id
-                )
-                report["telemetry"].append(telem)
+            # Ingest telemetry
+            telem = await self.ingest_historical(
+                zone.provider_id, days=days, tenant_id=tenant_id,
+                incremental=incremental,
+            )
 
-                # Ingest irrigation history
-                irr = await self.ingest_irrigations(
-                    zone.provider_id, tenant_id=tenant_id
+            # Ingest irrigation history
+            irr = await self.ingest_irrigations(
+                zone.provider_id, tenant_id=tenant_id
+            )
+            return zone, block_id, telem, irr
+
+        zone_results = await _gather_or_cancel(*(
+            sync_zone(farm, zone)
+            for farm in self._farms
+            for zone in self._zones.get(farm.provider_id, [])
+        ))
+        for zone, block_id, telem, irr in zone_results:
+            if block_id:
+                report["blocks_created"].append(
+                    {"block_id": block_id, "zone": zone.name}
                 )
-                report["irrigations"].append(irr)
+            report["telemetry"].append(telem)
+            report["irrigations"].append(irr)
 
         report["completed_at"] = datetime.utcnow().isoformat()
         return report
@@ -443,49 +550,102 @@ class WiseConnSyncService:
         points: List[CanonicalDataPoint],
         zone_id: str,
         tenant_id: str,
+        chunk_size: Optional[int] = None,
     ) -> Tuple[int, int]:
-        """Persist data points to Telemetry table. Returns (ingested, skipped)."""
+        """Persist data points to Telemetry table. Returns (ingested, skipped).
+
+        Dedup ids are computed for the whole batch up front. Rows are then
+        inserted in chunks via Core executemany: Postgres and SQLite use
+        ``INSERT ... ON CONFLICT (id) DO NOTHING RETURNING id`` so the
+        ingested count is exact even under concurrent syncs; other dialects
+        resolve existing ids with one ``IN`` query per chunk first.
+        """
         if not self.db:
             return (0, 0)
 
         block_id = f"wc-{zone_id}"
-        ingested = 0
-        skipped = 0
+        chunk_size = max(1, chunk_size or settings.WISECONN_PERSIST_CHUNK_SIZE)
 
+        rows: Dict[str, Dict[str, Any]] = {}
         for pt in points:
-            # Idempotency: hash of (block, type, variable, timestamp, depth)
-            dedup_key = hashlib.sha256(
-                f"{block_id}:{pt.variable}:{pt.timestamp.isoformat()}:{pt.depth_inches}".encode()
-            ).hexdigest()[:16]
-
-            telemetry_id = f"wc-{dedup_key}"
-            existing = self.db.query(Telemetry).filter(Telemetry.id == telemetry_id).first()
-            if existing:
-                skipped += 1
+            telemetry_id = self._telemetry_id(block_id, pt)
+            if telemetry_id in rows:
                 continue
-
-            telemetry = Telemetry(
-                id=telemetry_id,
-                tenant_id=tenant_id,
-                block_id=block_id,
-                type=pt.variable,
-                timestamp=pt.timestamp,
-                value=pt.value,
-                unit=pt.unit,
-                source=f"wiseconn:{pt.source_measure_id}",
-                meta_data={
+            rows[telemetry_id] = {
+                "id": telemetry_id,
+                "tenant_id": tenant_id,
+                "block_id": block_id,
+                "type": pt.variable,
+                "timestamp": pt.timestamp,
+                "value": pt.value,
+                "unit": pt.unit,
+                "source": f"wiseconn:{pt.source_measure_id}",
+                "meta_data": {
                     "provider": "wiseconn",
                     "depth_inches": pt.depth_inches,
                     "measure_id": pt.source_measure_id,
                 },
-            )
-            self.db.add(telemetry)
-            ingested += 1
+            }
+
+        pending = list(rows.values())
+        ingested = 0
+        for start in range(0, len(pending), chunk_size):
+            ingested += self._insert_telemetry_chunk(pending[start:start + chunk_size])
 
         if ingested > 0:
             self.db.commit()
 
-        return (ingested, skipped)
+        return (ingested, len(points) - ingested)
+
+    def _advance_watermark(
+        self,
+        measure: CanonicalMeasure,
+        points: List[CanonicalDataPoint],
+        tenant_id: str,
+    ) -> None:
+        """Record the newest fetched point of a measure once it is stored."""
+        if not self.db or not points:
+            return
+        advance_measure_watermark(
+            self.db,
+            tenant_id=tenant_id,
+            provider="wiseconn",
+            connection_key=self.connection_key,
+            measure_id=measure.provider_id,
+            timestamp=max(pt.timestamp for pt in points),
+        )
+        self.db.commit()
+
+    @staticmethod
+    def _telemetry_id(block_id: str, pt: CanonicalDataPoint) -> str:
+        # Idempotency: hash of (block, type, variable, timestamp, depth)
+        dedup_key = hashlib.sha256(
+            f"{block_id}:{pt.variable}:{pt.timestamp.isoformat()}:{pt.depth_inches}".encode()
+        ).hexdigest()[:16]
+        return f"wc-{dedup_key}"
+
+    def _insert_telemetry_chunk(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert one chunk of telemetry rows, skipping existing ids."""
+        table = Telemetry.__table__
+        dialect = self.db.get_bind().dialect.name
+        if dialect in {"postgresql", "sqlite"}:
+            dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+            statement = (
+                dialect_insert(table)
+                .on_conflict_do_nothing(index_elements=["id"])
+                .returning(table.c.id)
+            )
+            return len(self.db.execute(statement, rows).all())
+
+        existing = set(
+            self.db.execute(
+                select(table.c.id).where(table.c.id.in_([row["id"] for row in rows]))
+            ).scalars()
+        )
+        fresh = [row for row in rows if row["id"] not in existing]
+        if fresh:
+            self.db.execute(insert(table), fresh)
+        return len(fresh)
 
     def _persist_irrigation(
         self,
@@ -0,0 +1,396 @@
+"""Supervised connector worker: concurrent task slots under one consumer group.
+
+Provider syncs are mostly network waits, so they run as coroutines on the
+supervisor's event loop. Their database work (the claim, the commits, the
+bulk telemetry writes) is still blocking SQLAlchemy and stalls that loop,
+and every other running sync with it, while it runs. The provider sync
+limit is kept low for that reason; raise it through
+CONNECTOR_WORKER_TASK_LIMITS_JSON only where the database answers quickly.
+The other I/O-bound task types run on threads. Ingestion parsing
+and PDF text extraction are CPU-bound and run on a process pool of
+CONNECTOR_WORKER_PROCESSES.
+CONNECTOR_WORKER_SLOTS bounds the tasks running in the supervisor.
+CONNECTOR_WORKER_TASK_LIMITS_JSON bounds each task type. Every message is
+read, acked and held through the same Redis consumer, so the stream still
+sees a single consumer per worker.
+
+Messages whose task type is at its limit wait in a local backlog. Backlogged
+and long-running messages have their idle time reset before the stale-claim
+lease runs out, so no other worker claims them. Each running job keeps its
+database lease through its ``JobLeaseHeartbeat``. On SIGTERM the supervisor
+stops reading, settles what has finished and waits up to
+CONNECTOR_WORKER_DRAIN_SECONDS for in-flight jobs. Messages that never
+started stay pending and are claimed by another worker once their lease ends.
+
+    CONNECTOR_WORKER_MODE=supervised python -m app.workers.connector_worker
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from app.core.config import settings
+from app.core.metrics import connector_tasks_in_flight
+from app.db.base import SessionLocal, engine
+from app.platform_api.jobs import PLATFORM_OPERATION_TASK_TYPE
+from app.platform_api.stripe_metering import STRIPE_METER_TASK_TYPE
+from app.platform_api.webhook_delivery import WEBHOOK_TASK_TYPE
+from app.services.connector_task_processor import process_connector_task
+from app.services.durable_ingestion_staging import TASK_TYPE as INGESTION_TASK_TYPE
+from app.services.provider_sync_jobs import TASK_TYPE as PROVIDER_SYNC_TASK_TYPE
+from app.services.provider_sync_runner import process_provider_sync_job
+from app.services.redis_task_queue import QueueMessage, RedisTaskQueue
+from app.services.source_text_jobs import TASK_TYPE as SOURCE_TEXT_TASK_TYPE
+from app.workers.connector_worker import _ACKED_STATUSES, WorkerTimers, _Deferred, _publish_outbox, _worker_id
+
+
+logger = logging.getLogger(__name__)
+
+PROCESS_TASK_TYPES = frozenset({INGESTION_TASK_TYPE, SOURCE_TEXT_TASK_TYPE})
+_DEFAULT_TASK_LIMITS = {
+    # Provider syncs share one loop that blocks on their database calls.
+    PROVIDER_SYNC_TASK_TYPE: 4,
+    INGESTION_TASK_TYPE: 2,
+    SOURCE_TEXT_TASK_TYPE: 2,
+    WEBHOOK_TASK_TYPE: 8,
+    PLATFORM_OPERATION_TASK_TYPE: 4,
+    STRIPE_METER_TASK_TYPE: 2,
+}
+# While tasks are running, reads block briefly so freed slots are refilled promptly.
+_BUSY_BLOCK_MS = 250
+
+
+def task_limits() -> dict[str, int]:
+    limits = dict(_DEFAULT_TASK_LIMITS)
+    raw = str(getattr(settings, "CONNECTOR_WORKER_TASK_LIMITS_JSON", "") or "").strip()
+    if not raw:
+        return limits
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning("ignoring malformed CONNECTOR_WORKER_TASK_LIMITS_JSON")
+        return limits
+    if isinstance(parsed, dict):
+        for task_type, value in parsed.items():
+            try:
+                limit = int(value)
+            except (TypeError, ValueError):
+                continue
+            if limit > 0:
+                limits[str(task_type)] = limit
+    return limits
+
+
+def _init_process() -> None:
+    # The supervisor owns shutdown: children finish their job instead of dying mid-parse.
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    engine.dispose(close=False)
+
+
+def _process_pool(processes: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_process,
+    )
+
+
+@dataclass
+class _Running:
+    message: QueueMessage
+    task: asyncio.Task
+    touched: float
+
+
+class SupervisedConnectorWorker:
+    def __init__(
+        self,
+        queue: RedisTaskQueue,
+        *,
+        worker_id: str | None = None,
+        slots: int | None = None,
+        processes: int | None = None,
+        limits: dict[str, int] | None = None,
+        process_pool: Executor | None = None,
+        publish_outbox: Callable[[], None] = _publish_outbox,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.queue = queue
+        self.worker_id = worker_id or _worker_id()
+        self.slots = max(1, int(slots or getattr(settings, "CONNECTOR_WORKER_SLOTS", 32)))
+        self.processes = max(1, int(processes or getattr(settings, "CONNECTOR_WORKER_PROCESSES", 2)))
+        self.limits = limits if limits is not None else task_limits()
+        for task_type in PROCESS_TASK_TYPES:
+            self.limits[task_type] = min(self.limits.get(task_type, 1), self.processes)
+        self._process_pool = process_pool or _process_pool(self.processes)
+        self._publish_outbox = publish_outbox
+        self._clock = clock
+        self.lease_ms = int(getattr(settings, "TASK_QUEUE_LEASE_SECONDS", 120) or 120) * 1000
+        self.block_ms = int(getattr(settings, "TASK_QUEUE_BLOCK_MS", 5000) or 5000)
+        self.read_batch = max(1, int(getattr(settings, "TASK_QUEUE_READ_BATCH", 16) or 16))
+        self.claim_batch = max(1, int(getattr(settings, "TASK_QUEUE_CLAIM_BATCH", 32) or 32))
+        self.defer_seconds = min(
+            max(0.0, float(getattr(settings, "TASK_QUEUE_DEFER_SECONDS", 2.0))),
+            self.lease_ms / 2000,
+        )
+        self.drain_seconds = max(0.0, float(getattr(settings, "CONNECTOR_WORKER_DRAIN_SECONDS", 90.0)))
+        self.timers = WorkerTimers(
+            outbox_seconds=max(0.1, float(getattr(settings, "TASK_QUEUE_OUTBOX_INTERVAL_SECONDS", 2.0))),
+            claim_seconds=max(1.0, float(getattr(settings, "TASK_QUEUE_CLAIM_INTERVAL_SECONDS", 15.0))),
+        )
+        self._running: dict[str, _Running] = {}
+        self._counts: Counter[str] = Counter()
+        self._backlog: deque[tuple[QueueMessage, float]] = deque()
+        self._deferred: list[_Deferred] = []
+        self._ack_ids: list[str] = []
+        self._hold_ids: list[str] = []
+
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    def backlog(self) -> int:
+        return len(self._backlog)
+
+    def _limit(self, task_type: str) -> int:
+        return self.limits.get(task_type, 1)
+
+    def _has_slot(self, task_type: str) -> bool:
+        if self._counts[task_type] >= self._limit(task_type):
+            return False
+        if task_type in PROCESS_TASK_TYPES:
+            return True
+        local = sum(count for kind, count in self._counts.items() if kind not in PROCESS_TASK_TYPES)
+        return local < self.slots
+
+    def _capacity(self) -> int:
+        return self.slots + self.processes - len(self._running) - len(self._backlog)
+
+    async def _execute(self, message: QueueMessage) -> str:
+        if message.task_type == PROVIDER_SYNC_TASK_TYPE:
+            db = SessionLocal()
+            try:
+                return await process_provider_sync_job(
+                    db,
+                    job_id=message.job_id,
+                    tenant_id=message.tenant_id,
+                    worker_id=self.worker_id,
+                )
+            finally:
+                db.close()
+        call = partial(
+            process_connector_task,
+            job_id=message.job_id,
+            tenant_id=message.tenant_id,
+            task_type=message.task_type,
+            worker_id=self.worker_id,
+        )
+        if message.task_type in PROCESS_TASK_TYPES:
+            pool = self._process_pool
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, call)
+            except BrokenProcessPool as e:
+                # A child died (for example OOM on a large PDF); every pending call
+                # on that pool fails, so rebuild it once and retry the work later.
+                logger.warning("connector process pool broke on job_id=%s, rebuilding: %s", message.job_id, e)
+                self._rebuild_process_pool(pool)
+                return "deferred"
+        return await asyncio.to_thread(call)
+
+    def _rebuild_process_pool(self, broken: Executor) -> None:
+        if self._process_pool is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._process_pool = _process_pool(self.processes)
+
+    async def _work(self, message: QueueMessage) -> None:
+        connector_tasks_in_flight.labels(task_type=message.task_type).inc()
+        try:
+            status = await self._execute(message)
+        except Exception:
+            logger.exception("worker crashed while handling job_id=%s", message.job_id)
+            status = "retrying"
+        finally:
+            connector_tasks_in_flight.labels(task_type=message.task_type).dec()
+            self._running.pop(message.message_id, None)
+            self._counts[message.task_type] -= 1
+            if self._counts[message.task_type] <= 0:
+                del self._counts[message.task_type]
+        if status in _ACKED_STATUSES:
+            self._ack_ids.append(message.message_id)
+        elif status == "deferred":
+            self._hold_ids.append(message.message_id)
+            heapq.heappush(self._deferred, _Deferred(self._clock() + self.defer_seconds, message))
+
+    def _start(self, message: QueueMessage) -> None:
+        self._counts[message.task_type] += 1
+        task = asyncio.create_task(self._work(message), name=f"connector-task-{message.job_id[:12]}")
+        self._running[message.message_id] = _Running(message, task, self._clock())
+
+    def _admit(self, message: QueueMessage) -> None:
+        if message.message_id in self._running:
+            return
+        if self._has_slot(message.task_type):
+            self._start(message)
+        else:
+            self._backlog.append((message, self._clock()))
+
+    def _start_backlog(self) -> None:
+        waiting = len(self._backlog)
+        for _ in range(waiting):
+            message, touched = self._backlog.popleft()
+            if self._has_slot(message.task_type):
+                self._start(message)
+            else:
+                self._backlog.append((message, touched))
+
+    def _refresh_leases(self, now: float) -> None:
+        """Reset the idle time of messages held here for more than half a lease."""
+        stale_before = now - self.lease_ms / 2000
+        for running in self._running.values():
+            if running.touched <= stale_before:
+                self._hold_ids.append(running.message.message_id)
+                running.touched = now
+        for index, (message, touched) in enumerate(self._backlog):
+            if touched <= stale_before:
+                self._hold_ids.append(message.message_id)
+                self._backlog[index] = (message, now)
+
+    async def _settle(self) -> None:
+        if not self._ack_ids and not self._hold_ids:
+            return
+        ack_ids, self._ack_ids = self._ack_ids, []
+        hold_ids, self._hold_ids = list(dict.fromkeys(self._hold_ids)), []
+        try:
+            await asyncio.to_thread(self.queue.settle, self.worker_id, ack_ids=ack_ids, hold_ids=hold_ids)
+        except Exception:
+            # Unacked messages stay pending and are retried after their lease.
+            logger.exception("connector worker could not settle %s messages", len(ack_ids) + len(hold_ids))
+
+    async def _run_timers(self, now: float) -> list[QueueMessage]:
+        timers = self.timers
+        if now >= timers.next_outbox:
+            await asyncio.to_thread(self._publish_outbox)
+            timers.next_outbox = now + timers.outbox_seconds
+        if now < timers.next_claim:
+            return []
+        self._refresh_leases(now)
+        if self._capacity() <= 0:
+            timers.next_claim = now + timers.claim_seconds
+            return []
+        timers.claim_cursor, messages = await asyncio.to_thread(
+            self.queue.claim_stale_page,
+            self.worker_id,
+            min_idle_ms=self.lease_ms,
+            count=min(self.claim_batch, self._capacity()),
+            start_id=timers.claim_cursor,
+        )
+        timers.next_claim = now if timers.claim_cursor != "0-0" else now + timers.claim_seconds
+        return messages
+
+    def _due_deferred(self, now: float) -> list[QueueMessage]:
+        due: list[QueueMessage] = []
+        while self._deferred and self._deferred[0].due <= now:
+            due.append(heapq.heappop(self._deferred).message)
+        return due
+
+    def _block_ms(self, now: float) -> int:
+        wake = min(self.timers.next_outbox, self.timers.next_claim)
+        if self._deferred:
+            wake = min(wake, self._deferred[0].due)
+        block = min(self.block_ms, int((wake - now) * 1000))
+        if self._running or self._backlog:
+            block = min(block, _BUSY_BLOCK_MS)
+        return max(100, block)
+
+    async def run_once(self) -> int:
+        """Admit one round of messages; returns how many were admitted."""
+        now = self._clock()
+        messages = await self._run_timers(now) + self._due_deferred(now)
+        for message in messages:
+            self._admit(message)
+        self._start_backlog()
+        capacity = self._capacity()
+        if capacity > 0:
+            read = await asyncio.to_thread(
+                self.queue.read,
+                self.worker_id,
+                block_ms=self._block_ms(now),
+                count=min(self.read_batch, capacity),
+            )
+            for message in read:
+                self._admit(message)
+            messages.extend(read)
+        elif self._running:
+            await asyncio.wait(
+                [running.task for running in self._running.values()],
+                timeout=_BUSY_BLOCK_MS / 1000,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        # Yield once so tasks that finished during a blocking read record their outcome.
+        await asyncio.sleep(0)
+        await self._settle()
+        return len(messages)
+
+    async def drain(self) -> int:
+        """Wait for in-flight tasks within the drain budget; returns how many were left running."""
+        if self._backlog:
+            logger.info("connector worker releasing %s backlogged messages", len(self._backlog))
+            self._backlog.clear()
+        self._deferred.clear()
+        deadline = self._clock() + self.drain_seconds
+        while self._running:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            await asyncio.wait(
+                [running.task for running in self._running.values()],
+                timeout=min(remaining, self.lease_ms / 4000),
+            )
+            self._refresh_leases(self._clock())
+            await self._settle()
+        await self._settle()
+        left = len(self._running)
+        if left:
+            logger.warning("connector worker drain timed out with %s tasks running", left)
+        return left
+
+    async def run(self, stop: threading.Event) -> None:
+        # Room for every thread slot plus the blocking stream read.
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=self.slots + 2, thread_name_prefix="connector-task")
+        )
+        try:
+            while not stop.is_set():
+                await self.run_once()
+            await self.drain()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        # Jobs still running after the drain keep their leases until they finish or expire.
+        self._process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_supervised(queue: RedisTaskQueue, stop: threading.Event) -> None:
+    worker = SupervisedConnectorWorker(queue)
+    logger.info(
+        "supervised connector worker started worker_id=%s slots=%s processes=%s",
+        worker.worker_id,
+        worker.slots,
+        worker.processes,
+    )
+    asyncio.run(worker.run(stop))
+    logger.info("supervised connector worker stopped worker_id=%s", worker.worker_id)
@@ -1,26 +1,31 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import os
 import signal
 import socket
+import threading
 import time
 import uuid
+from dataclasses import dataclass, field
+from typing import Callable
 
 from app.core.config import settings
 from app.db.base import SessionLocal
 from app.services.connector_task_processor import process_connector_task
-from app.services.redis_task_queue import QueueMessage, get_task_queue
+from app.services.redis_task_queue import QueueMessage, RedisTaskQueue, get_task_queue
 from app.services.task_outbox_service import publish_pending_outbox
 
 
 logger = logging.getLogger(__name__)
-_STOP = False
+_STOP = threading.Event()
+# "delivered": a webhook row another worker (e.g. the webhook worker) already delivered.
+_ACKED_STATUSES = frozenset({"succeeded", "failed", "cancelled", "delivered"})
 
 
 def _stop(*_args) -> None:
-    global _STOP
-    _STOP = True
+    _STOP.set()
 
 
 def _worker_id() -> str:
@@ -47,38 +52,139 @@ def _publish_outbox() -> None:
         db.close()
 
 
-def run_forever() -> None:
-    signal.signal(signal.SIGTERM, _stop)
-    signal.signal(signal.SIGINT, _stop)
-    worker_id = _worker_id()
-    queue = get_task_queue()
-    queue.ensure_group()
-    if not queue.ping():
-        raise RuntimeError("Redis task queue is unavailable")
-    lease_ms = int(getattr(settings, "TASK_QUEUE_LEASE_SECONDS", 120) or 120) * 1000
-    block_ms = int(getattr(settings, "TASK_QUEUE_BLOCK_MS", 5000) or 5000)
-    logger.info("connector worker started worker_id=%s", worker_id)
-
-    while not _STOP:
-        _publish_outbox()
-        messages = queue.claim_stale(worker_id, min_idle_ms=lease_ms)
+@dataclass
+class WorkerTimers:
+    """Intervals for work that does not need to run on every loop iteration."""
+
+    outbox_seconds: float = 2.0
+    claim_seconds: float = 15.0
+    next_outbox: float = 0.0
+    next_claim: float = 0.0
+    claim_cursor: str = "0-0"
+
+
+@dataclass(order=True)
+class _Deferred:
+    due: float
+    message: QueueMessage = field(compare=False)
+
+
+class ConnectorWorker:
+    """Batched Redis Streams consumer for connector tasks.
+
+    Each iteration handles one batch (a stale-claim page, due deferred jobs
+    or one XREADGROUP of up to TASK_QUEUE_READ_BATCH messages) and settles
+    it in one round trip: finished messages are acked with a single XACK and
+    deferred ones have their idle time reset. Deferred jobs are retried
+    after TASK_QUEUE_DEFER_SECONDS without blocking the loop. Outbox
+    publication and stale-claim scans run on their own timers.
+    """
+
+    def __init__(
+        self,
+        queue: RedisTaskQueue,
+        *,
+        worker_id: str | None = None,
+        handle: Callable[..., str] = _handle,
+        publish_outbox: Callable[[], None] = _publish_outbox,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.queue = queue
+        self.worker_id = worker_id or _worker_id()
+        self._handle = handle
+        self._publish_outbox = publish_outbox
+        self._clock = clock
+        self.lease_ms = int(getattr(settings, "TASK_QUEUE_LEASE_SECONDS", 120) or 120) * 1000
+        self.block_ms = int(getattr(settings, "TASK_QUEUE_BLOCK_MS", 5000) or 5000)
+        self.read_batch = max(1, int(getattr(settings, "TASK_QUEUE_READ_BATCH", 16) or 16))
+        self.claim_batch = max(1, int(getattr(settings, "TASK_QUEUE_CLAIM_BATCH", 32) or 32))
+        # Retry a deferred job well inside its lease so no other worker claims it meanwhile.
+        self.defer_seconds = min(
+            max(0.0, float(getattr(settings, "TASK_QUEUE_DEFER_SECONDS", 2.0))),
+            self.lease_ms / 2000,
+        )
+        self.timers = WorkerTimers(
+            outbox_seconds=max(0.1, float(getattr(settings, "TASK_QUEUE_OUTBOX_INTERVAL_SECONDS", 2.0))),
+            claim_seconds=max(1.0, float(getattr(settings, "TASK_QUEUE_CLAIM_INTERVAL_SECONDS", 15.0))),
+        )
+        self._deferred: list[_Deferred] = []
+
+    def _run_timers(self, now: float) -> list[QueueMessage]:
+        timers = self.timers
+        if now >= timers.next_outbox:
+            self._publish_outbox()
+            timers.next_outbox = now + timers.outbox_seconds
+        if now < timers.next_claim:
+            return []
+        timers.claim_cursor, messages = self.queue.claim_stale_page(
+            self.worker_id,
+            min_idle_ms=self.lease_ms,
+            count=self.claim_batch,
+            start_id=timers.claim_cursor,
+        )
+        # Keep paging through the pending list while it has more; otherwise wait for the timer.
+        timers.next_claim = now if timers.claim_cursor != "0-0" else now + timers.claim_seconds
+        return messages
+
+    def _due_deferred(self, now: float) -> list[QueueMessage]:
+        due: list[QueueMessage] = []
+        while self._deferred and self._deferred[0].due <= now and len(due) < self.read_batch:
+            due.append(heapq.heappop(self._deferred).message)
+        return due
+
+    def _block_ms(self, now: float) -> int:
+        wake = min(self.timers.next_outbox, self.timers.next_claim)
+        if self._deferred:
+            wake = min(wake, self._deferred[0].due)
+        return max(100, min(self.block_ms, int((wake - now) * 1000)))
+
+    def run_once(self) -> int:
+        """Handle one batch; returns how many messages were handled."""
+        now = self._clock()
+        messages = self._run_timers(now) or self._due_deferred(now)
         if not messages:
-            messages = queue.read(worker_id, block_ms=block_ms)
-        if not messages:
-            continue
+            messages = self.queue.read(self.worker_id, block_ms=self._block_ms(now), count=self.read_batch)
+        ack_ids: list[str] = []
+        hold_ids: list[str] = []
+        handled = 0
         for message in messages:
-            if _STOP:
+            if _STOP.is_set():
                 break
             try:
-                status = _handle(message, worker_id=worker_id)
+                status = self._handle(message, worker_id=self.worker_id)
             except Exception:
                 logger.exception("worker crashed while handling job_id=%s", message.job_id)
                 status = "retrying"
-            if status in {"succeeded", "failed", "cancelled"}:
-                queue.ack(message.message_id)
+            handled += 1
+            if status in _ACKED_STATUSES:
+                ack_ids.append(message.message_id)
             elif status == "deferred":
-                time.sleep(0.1)
-    logger.info("connector worker stopped worker_id=%s", worker_id)
+                hold_ids.append(message.message_id)
+                heapq.heappush(self._deferred, _Deferred(self._clock() + self.defer_seconds, message))
+        self.queue.settle(self.worker_id, ack_ids=ack_ids, hold_ids=hold_ids)
+        return handled
+
+    def run(self) -> None:
+        while not _STOP.is_set():
+            self.run_once()
+
+
+def run_forever() -> None:
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    queue = get_task_queue()
+    queue.ensure_group()
+    if not queue.ping():
+        raise RuntimeError("Redis task queue is unavailable")
+    if str(getattr(settings, "CONNECTOR_WORKER_MODE", "serial")).strip().lower() == "supervised":
+        from app.workers.connector_supervisor import run_supervised
+
+        run_supervised(queue, _STOP)
+        return
+    worker = ConnectorWorker(queue, worker_id=_worker_id())
+    logger.info("connector worker started worker_id=%s", worker.worker_id)
+    worker.run()
+    logger.info("connector worker stopped worker_id=%s", worker.worker_id)
 
 
 if __name__ == "__main__":
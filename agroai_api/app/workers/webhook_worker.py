@@ -0,0 +1,177 @@
+"""Dedicated Platform API webhook delivery worker.
+
+Delivers webhook outbox rows straight from the database on a thread pool
+that shares the pooled, address-pinned HTTP clients of ``webhook_delivery``.
+At most PLATFORM_API_WEBHOOK_ENDPOINT_CONCURRENCY deliveries per endpoint
+run at once, so one slow receiver cannot occupy every slot. Due pending and
+retrying rows are marked queued in one commit per batch. Rows already
+queued through the task queue are picked up too; the claim in
+``process_webhook_delivery`` makes sure the connector worker and this one
+never deliver the same row twice.
+
+    python -m app.workers.webhook_worker
+"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import platform_webhook_deliveries_in_flight, platform_webhook_delivery_latency
+from app.db.base import SessionLocal
+from app.platform_api.webhook_delivery import (
+    close_webhook_clients,
+    lock_due_webhook_deliveries,
+    process_webhook_delivery,
+)
+
+
+logger = logging.getLogger(__name__)
+_STOP = threading.Event()
+
+
+def _stop(*_args) -> None:
+    _STOP.set()
+
+
+def _worker_id() -> str:
+    return f"webhook-worker:{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class WebhookDeliveryWorker:
+    def __init__(
+        self,
+        *,
+        worker_id: str | None = None,
+        concurrency: int | None = None,
+        endpoint_concurrency: int | None = None,
+        session_factory=SessionLocal,
+    ) -> None:
+        self.worker_id = worker_id or _worker_id()
+        self.concurrency = max(1, int(concurrency or getattr(settings, "PLATFORM_API_WEBHOOK_WORKER_CONCURRENCY", 32)))
+        self.endpoint_concurrency = max(
+            1, int(endpoint_concurrency or getattr(settings, "PLATFORM_API_WEBHOOK_ENDPOINT_CONCURRENCY", 4))
+        )
+        self._session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="webhook-delivery")
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, str] = {}
+        self._per_endpoint: Counter[str] = Counter()
+        self._slot_freed = threading.Event()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def tick(self) -> int:
+        """Start due deliveries up to the free slots; returns how many were started."""
+        if not bool(getattr(settings, "PLATFORM_API_WEBHOOK_DELIVERY_ENABLED", False)):
+            return 0
+        with self._lock:
+            free = self.concurrency - len(self._in_flight)
+            busy = set(self._in_flight)
+            per_endpoint = Counter(self._per_endpoint)
+        if free <= 0:
+            return 0
+        saturated = [endpoint for endpoint, count in per_endpoint.items() if count >= self.endpoint_concurrency]
+        db: Session = self._session_factory()
+        try:
+            rows = lock_due_webhook_deliveries(db, limit=free * self.endpoint_concurrency, exclude_endpoint_ids=saturated)
+            selected = []
+            for row in rows:
+                if len(selected) >= free:
+                    break
+                if row.id in busy or per_endpoint[row.endpoint_id] >= self.endpoint_concurrency:
+                    continue
+                per_endpoint[row.endpoint_id] += 1
+                selected.append(row)
+            now = datetime.utcnow()
+            for row in selected:
+                if row.status in {"pending", "retrying"}:
+                    row.status = "queued"
+                    row.updated_at = now
+            jobs = [(row.id, row.organization_id, row.endpoint_id) for row in selected]
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("webhook worker could not select due deliveries")
+            return 0
+        finally:
+            db.close()
+        with self._lock:
+            for outbox_id, _organization_id, endpoint_id in jobs:
+                self._in_flight[outbox_id] = endpoint_id
+                self._per_endpoint[endpoint_id] += 1
+        for outbox_id, organization_id, endpoint_id in jobs:
+            self._executor.submit(self._deliver, outbox_id, organization_id, endpoint_id)
+        return len(jobs)
+
+    def _deliver(self, outbox_id: str, organization_id: str, endpoint_id: str) -> str:
+        started = time.perf_counter()
+        outcome = "error"
+        platform_webhook_deliveries_in_flight.inc()
+        db: Session = self._session_factory()
+        try:
+            outcome = process_webhook_delivery(
+                db,
+                outbox_id=outbox_id,
+                organization_id=organization_id,
+                worker_id=self.worker_id,
+            )
+        except Exception:
+            db.rollback()
+            logger.exception("webhook delivery crashed outbox_id=%s", outbox_id)
+        finally:
+            db.close()
+            platform_webhook_deliveries_in_flight.dec()
+            platform_webhook_delivery_latency.labels(outcome=outcome).observe(time.perf_counter() - started)
+            with self._lock:
+                self._in_flight.pop(outbox_id, None)
+                self._per_endpoint[endpoint_id] -= 1
+                if self._per_endpoint[endpoint_id] <= 0:
+                    del self._per_endpoint[endpoint_id]
+            self._slot_freed.set()
+        return outcome
+
+    def run(self, stop: threading.Event) -> None:
+        poll = max(0.05, float(getattr(settings, "PLATFORM_API_WEBHOOK_WORKER_POLL_SECONDS", 1.0)))
+        while not stop.is_set():
+            self._slot_freed.clear()
+            if self.tick() == 0 or self.in_flight() >= self.concurrency:
+                # Sleep until the next poll, or sooner when a delivery frees a slot.
+                self._slot_freed.wait(poll)
+        self.close()
+
+    def close(self) -> None:
+        """Let running deliveries finish, then close pooled connections."""
+        self._executor.shutdown(wait=True)
+        close_webhook_clients()
+
+
+def run_forever() -> None:
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    worker = WebhookDeliveryWorker()
+    logger.info(
+        "webhook worker started worker_id=%s concurrency=%s endpoint_concurrency=%s",
+        worker.worker_id,
+        worker.concurrency,
+        worker.endpoint_concurrency,
+    )
+    worker.run(_STOP)
+    logger.info("webhook worker stopped worker_id=%s", worker.worker_id)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=getattr(logging, str(settings.LOG_LEVEL).upper(), logging.INFO))
+    run_forever()
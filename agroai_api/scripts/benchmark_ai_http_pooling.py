@@ -0,0 +1,148 @@
+"""Measure AI lane time-to-first-byte with a fresh client per call vs the pooled registry.
+
+Starts a local stub chat server (HTTPS with a throwaway self-signed
+certificate by default, so TLS handshakes are part of the cost) that
+answers after --server-ms. It then sends --requests sequential chat calls
+twice: once opening a new httpx.AsyncClient per call, as the AI lanes used
+to, and once through app.services.ai_http_clients. Time to first byte is
+measured from send to response headers.
+
+Usage: python scripts/benchmark_ai_http_pooling.py [--requests 200] [--server-ms 5] [--plain-http]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as dt
+import ipaddress
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+import httpx  # noqa: E402
+
+from app.services.ai_http_clients import AIClientRegistry, ai_timeout  # noqa: E402
+
+
+def _handler(server_ms: float):
+    class Chat(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("content-length") or 0))
+            time.sleep(server_ms / 1000)
+            body = b'{"message": {"content": "ok"}}'
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Chat
+
+
+def _self_signed(directory: Path) -> tuple[Path, Path]:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = dt.datetime.now(dt.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(minutes=1))
+        .not_valid_after(now + dt.timedelta(hours=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "stub.crt", directory / "stub.key"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    return cert_path, key_path
+
+
+async def _fresh(url: str, requests: int, verify) -> list[float]:
+    samples = []
+    for _ in range(requests):
+        async with httpx.AsyncClient(verify=verify) as client:
+            started = time.perf_counter()
+            async with client.stream("POST", url, json={"messages": []}, timeout=ai_timeout(10)) as response:
+                samples.append((time.perf_counter() - started) * 1000)
+                await response.aread()
+    return samples
+
+
+async def _pooled(url: str, requests: int, verify) -> list[float]:
+    registry = AIClientRegistry(verify=verify)
+    samples = []
+    try:
+        for _ in range(requests):
+            client = registry.client(url, lane="edge")
+            started = time.perf_counter()
+            async with client.stream("POST", url, json={"messages": []}, timeout=ai_timeout(10)) as response:
+                samples.append((time.perf_counter() - started) * 1000)
+                await response.aread()
+    finally:
+        await registry.aclose()
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<8} n={len(samples):<5} mean={statistics.mean(samples):7.2f}ms p50={statistics.median(samples):7.2f}ms p95={p95:7.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--server-ms", type=float, default=5.0)
+    parser.add_argument("--plain-http", action="store_true", help="skip TLS on the stub server")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(args.server_ms))
+    verify: bool | ssl.SSLContext = True
+    scheme = "http"
+    with tempfile.TemporaryDirectory() as directory:
+        if not args.plain_http:
+            cert_path, key_path = _self_signed(Path(directory))
+            server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            server_context.load_cert_chain(cert_path, key_path)
+            server.socket = server_context.wrap_socket(server.socket, server_side=True)
+            verify = ssl.create_default_context(cafile=str(cert_path))
+            scheme = "https"
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"{scheme}://127.0.0.1:{server.server_address[1]}/api/chat"
+        try:
+            print(f"stub={url} server_ms={args.server_ms} requests={args.requests}")
+            _report("fresh", asyncio.run(_fresh(url, args.requests, verify)))
+            _report("pooled", asyncio.run(_pooled(url, args.requests, verify)))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
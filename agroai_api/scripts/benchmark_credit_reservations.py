@@ -0,0 +1,211 @@
+"""Measure Platform API credit reservation throughput, locked vs sharded.
+
+Seeds one organization with a large allowance and has W concurrent workers
+reserve credits for it, each holding its transaction open for --hold-ms to
+stand in for the request work done before the reservation is committed.
+The locked path serializes every worker on the organization row; the
+sharded path lets up to PLATFORM_API_CREDIT_SHARDS reservations proceed at
+once. Row locks need PostgreSQL, so the script requires a Postgres URL and
+removes everything it seeded when it finishes.
+
+Usage: python scripts/benchmark_credit_reservations.py --database-url postgresql://... [--workers 1,4,16,32] [--reservations 400] [--hold-ms 5] [--shards 8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.platform_api import ApiProject  # noqa: E402
+from app.models.platform_product import (  # noqa: E402
+    PlatformApiOperationCost,
+    PlatformApiPlan,
+    PlatformApiSubscription,
+)
+from app.models.saas import Organization, User, Workspace  # noqa: E402
+from app.platform_api.credits import reserve_credits  # noqa: E402
+from app.platform_api.principal import PlatformPrincipal  # noqa: E402
+
+
+def seed(Session, catalog: str) -> dict:
+    db = Session()
+    suffix = uuid.uuid4().hex
+    user = User(
+        email=f"credit-benchmark-{suffix}@example.com",
+        password_hash="x",
+        email_verification_status="verified",
+        email_verified_at=datetime.utcnow(),
+    )
+    db.add(user)
+    db.flush()
+    organization = Organization(
+        name="Credit benchmark",
+        slug=f"credit-benchmark-{suffix}",
+        owner_user_id=user.id,
+        plan="enterprise",
+        subscription_status="active",
+    )
+    db.add(organization)
+    db.flush()
+    workspace = Workspace(organization_id=organization.id, name="Benchmark", mode="evaluation")
+    db.add(workspace)
+    db.flush()
+    project = ApiProject(
+        organization_id=organization.id,
+        workspace_id=workspace.id,
+        name="Benchmark",
+        slug=f"benchmark-{suffix}",
+        environment="test",
+        status="active",
+        default_rate_limit_policy={},
+        created_by_user_id=user.id,
+    )
+    plan = PlatformApiPlan(
+        catalog_version=catalog,
+        plan_identifier="benchmark",
+        display_name="Benchmark",
+        status="test",
+        active=True,
+        currency="USD",
+        included_credits=1_000_000_000,
+        overages_allowed=False,
+        limits_json={},
+        support_tier="test",
+    )
+    cost = PlatformApiOperationCost(
+        catalog_version=catalog,
+        operation_id="benchmark_operation",
+        operation_class="test",
+        environment="test",
+        credits=1,
+        active=True,
+        description="Credit reservation benchmark",
+    )
+    db.add_all([project, plan, cost])
+    db.flush()
+    db.add(
+        PlatformApiSubscription(
+            organization_id=organization.id,
+            plan_id=plan.id,
+            status="active",
+            status_slot="active",
+            billing_mode="none",
+        )
+    )
+    db.commit()
+    ids = {
+        "user": user.id,
+        "organization": organization.id,
+        "workspace": workspace.id,
+        "project": project.id,
+        "plan": plan.id,
+        "cost": cost.id,
+    }
+    db.close()
+    return ids
+
+
+def cleanup(Session, ids: dict) -> None:
+    db = Session()
+    try:
+        db.query(Workspace).filter(Workspace.id == ids["workspace"]).delete()
+        db.query(Organization).filter(Organization.id == ids["organization"]).delete()
+        db.query(PlatformApiPlan).filter(PlatformApiPlan.id == ids["plan"]).delete()
+        db.query(PlatformApiOperationCost).filter(PlatformApiOperationCost.id == ids["cost"]).delete()
+        db.query(User).filter(User.id == ids["user"]).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(Session, ids: dict, *, workers: int, reservations: int, hold_seconds: float) -> float:
+    principal = PlatformPrincipal(
+        authentication_type="platform_api_key",
+        organization_id=ids["organization"],
+        workspace_id=ids["workspace"],
+        api_project_id=ids["project"],
+        environment="test",
+        request_id="req-credit-benchmark",
+    )
+    run_id = uuid.uuid4().hex
+
+    def reserve(index: int) -> None:
+        session = Session()
+        try:
+            reserve_credits(
+                session,
+                principal=principal,
+                operation_id="benchmark_operation",
+                logical_operation_id=f"{run_id}-{index}",
+            )
+            time.sleep(hold_seconds)
+            session.commit()
+        finally:
+            session.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(reserve, range(reservations)))
+    return reservations / (time.perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("PLATFORM_API_POSTGRES_TEST_URL", ""))
+    parser.add_argument("--workers", default="1,4,16,32")
+    parser.add_argument("--reservations", type=int, default=400)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument("--shards", type=int, default=8)
+    args = parser.parse_args()
+    if not args.database_url.startswith("postgresql"):
+        print("a PostgreSQL --database-url (or PLATFORM_API_POSTGRES_TEST_URL) is required", file=sys.stderr)
+        return 2
+
+    worker_counts = [int(value) for value in args.workers.split(",") if value.strip()]
+    engine = create_engine(args.database_url, pool_size=max(worker_counts) + 2, pool_pre_ping=True)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    catalog = f"credit-benchmark-{uuid.uuid4().hex}"
+    settings.PLATFORM_API_OPERATION_COST_CATALOG_VERSION = catalog
+    settings.PLATFORM_API_USAGE_METERING_ENFORCEMENT_ENABLED = True
+    settings.PLATFORM_API_CREDIT_SHARDS = args.shards
+    ids = seed(Session, catalog)
+    try:
+        print(f"reservations={args.reservations} hold_ms={args.hold_ms} shards={args.shards}")
+        print(f"{'workers':>8} {'locked/s':>10} {'sharded/s':>10} {'speedup':>8}")
+        for workers in worker_counts:
+            rates = {}
+            for mode in ("locked", "sharded"):
+                settings.PLATFORM_API_CREDIT_ACCOUNTING = mode
+                rates[mode] = run(
+                    Session,
+                    ids,
+                    workers=workers,
+                    reservations=args.reservations,
+                    hold_seconds=args.hold_ms / 1000.0,
+                )
+            print(
+                f"{workers:>8} {rates['locked']:>10.1f} {rates['sharded']:>10.1f} "
+                f"{rates['sharded'] / rates['locked']:>7.2f}x"
+            )
+    finally:
+        cleanup(Session, ids)
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+"""Compare scalar and columnar (NumPy) soil feature computation.
+
+Generates synthetic 15-minute soil VWC readings at five depths for N blocks,
+runs the scalar FeatureBuilder derivations block by block and the columnar
+``feature_columns`` path for all blocks at once, checks that both agree
+within float tolerance and prints timings.
+
+Usage: python scripts/benchmark_feature_builder.py [--blocks 2000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from app.services.feature_builder import (  # noqa: E402
+    DEFAULT_DEPTH_WEIGHT,
+    DEFAULT_DEPTH_WEIGHTS,
+    EXPECTED_DEPTHS,
+    FeatureBuilder,
+    FeatureSet,
+    SOIL_PROFILE_LOOKBACK_HOURS,
+    STALE_DATA_HOURS,
+)
+from app.services.feature_columns import (  # noqa: E402
+    NUMPY_AVAILABLE,
+    SoilColumns,
+    compute_soil_features,
+)
+
+
+DEPTHS = (12, 24, 36, 48, 60)
+SAMPLES_PER_DAY = 96
+
+
+def synthetic_rows(block_count: int, now: datetime, seed: int = 7):
+    rng = random.Random(seed)
+    rows = []
+    for b in range(block_count):
+        block_id = f"block-{b:05d}"
+        base = rng.uniform(0.15, 0.40)
+        slope = rng.uniform(-0.0008, 0.0004)
+        for step in reversed(range(SAMPLES_PER_DAY)):
+            ts = now - timedelta(minutes=15 * step)
+            for depth in DEPTHS:
+                rows.append((
+                    block_id,
+                    ts,
+                    base - depth * 0.0005 + slope * (SAMPLES_PER_DAY - step) + rng.gauss(0, 0.002),
+                    {"depth_inches": depth, "measure_id": f"{block_id}-{depth}"},
+                ))
+    return rows
+
+
+def run_scalar(builder: FeatureBuilder, rows, now: datetime):
+    by_block = {}
+    for block_id, ts, value, meta in rows:
+        by_block.setdefault(block_id, []).append(
+            SimpleNamespace(timestamp=ts, value=value, meta_data=meta)
+        )
+    results = {}
+    for block_id, readings in by_block.items():
+        fs = FeatureSet(block_id=block_id, computed_at=now)
+        builder._apply_soil_profile(fs, list(reversed(readings)))
+        builder._apply_soil_trend(fs, readings)
+        builder._assess_data_quality(now, fs)
+        results[block_id] = fs
+    return results
+
+
+def run_columnar(block_ids, rows, now: datetime):
+    columns = SoilColumns.from_rows(block_ids, rows, now)
+    return compute_soil_features(
+        columns,
+        depth_weights=DEFAULT_DEPTH_WEIGHTS,
+        default_weight=DEFAULT_DEPTH_WEIGHT,
+        expected_depths=EXPECTED_DEPTHS,
+        stale_hours=STALE_DATA_HOURS,
+        profile_window_hours=SOIL_PROFILE_LOOKBACK_HOURS,
+        trend_window_hours=FeatureSet.trend_window_hours,
+    )
+
+
+def check_parity(block_ids, scalar, arrays) -> None:
+    for index, block_id in enumerate(block_ids):
+        fs = scalar[block_id]
+        pairs = (
+            (fs.weighted_root_zone_vwc, arrays.weighted_root_zone_vwc[index]),
+            (fs.mean_vwc, arrays.mean_vwc[index]),
+            (fs.vwc_trend_pct_per_hour, arrays.trend_slope[index]),
+            (fs.depth_coverage, arrays.depth_coverage[index]),
+        )
+        for expected, actual in pairs:
+            if expected is None:
+                assert math.isnan(actual), block_id
+            else:
+                assert math.isclose(expected, float(actual), rel_tol=1e-9, abs_tol=1e-12), block_id
+        assert ("sensor_drift" in fs.anomalies) == bool(arrays.sensor_drift[index]), block_id
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy is not installed; the columnar path is unavailable")
+        return 1
+
+    now = datetime(2026, 6, 1, 12, 0, 0)
+    rows = synthetic_rows(args.blocks, now)
+    block_ids = sorted({row[0] for row in rows})
+    builder = FeatureBuilder()
+
+    scalar_best = columnar_best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        scalar = run_scalar(builder, rows, now)
+        scalar_best = min(scalar_best, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        arrays = run_columnar(block_ids, rows, now)
+        columnar_best = min(columnar_best, time.perf_counter() - started)
+
+    check_parity(block_ids, scalar, arrays)
+    print(f"blocks={args.blocks} readings={len(rows)}")
+    print(f"scalar   best of {args.repeat}: {scalar_best * 1000:.1f} ms")
+    print(f"columnar best of {args.repeat}: {columnar_best * 1000:.1f} ms")
+    print(f"speedup: {scalar_best / columnar_best:.1f}x (parity ok)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
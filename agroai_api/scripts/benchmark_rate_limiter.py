@@ -0,0 +1,123 @@
+"""Measure per-check cost of the process-local Platform API rate limiter.
+
+Spreads checks over N distinct principals for a simulated span of time and
+compares the previous string-keyed, never-evicting bucket dict against
+``MemoryRateLimiter`` in fixed and sliding mode. Reports the mean cost per
+check and how many counters each one holds at the end, and checks that the
+fixed-window decisions are identical.
+
+Usage: python scripts/benchmark_rate_limiter.py [--principals 10000] [--checks 200000] [--minutes 180]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+
+API_ROOT = Path(__file__).resolve().parents[1]
+if str(API_ROOT) not in sys.path:
+    sys.path.insert(0, str(API_ROOT))
+
+from app.platform_api.principal import PlatformPrincipal  # noqa: E402
+from app.platform_api.rate_limits import (  # noqa: E402
+    MemoryRateLimiter,
+    RateLimitDecision,
+    _bucket_key,
+    _policy_windows,
+    _rate_limit_subjects,
+)
+
+
+def legacy_check(buckets: dict, principal: PlatformPrincipal, *, cost: int, now: int) -> RateLimitDecision:
+    """The pre-eviction implementation, kept here for comparison."""
+    allowed = True
+    selected_limit = 0
+    selected_remaining = None
+    selected_reset = 0
+    retry_after = 0
+    environment = principal.environment or "unknown-env"
+    for subject, value in _rate_limit_subjects(principal):
+        for window in _policy_windows(principal):
+            key, reset = _bucket_key(subject, value, environment=environment, window=window, now=now)
+            used, _reset = buckets.get(key, (0, reset))
+            next_used = used + cost
+            buckets[key] = (next_used, reset)
+            remaining = window.limit - next_used
+            if selected_remaining is None or remaining < selected_remaining:
+                selected_remaining = remaining
+                selected_limit = window.limit
+                selected_reset = reset
+            if next_used > window.limit:
+                allowed = False
+                retry_after = max(retry_after, reset - now)
+    return RateLimitDecision(
+        allowed=allowed,
+        limit=selected_limit,
+        remaining=max(0, selected_remaining or 0),
+        reset_epoch=selected_reset,
+        retry_after=max(1, retry_after) if not allowed else 0,
+        backend="memory",
+    )
+
+
+def workload(principal_count: int, checks: int, minutes: int, seed: int = 11):
+    rng = random.Random(seed)
+    principals = [
+        PlatformPrincipal(
+            authentication_type="platform_api_key",
+            organization_id=f"org-{index % 500}",
+            api_project_id=f"project-{index % 2000}",
+            api_key_id=f"key-{index}",
+            environment="test" if index % 4 else "live",
+        )
+        for index in range(principal_count)
+    ]
+    start = 1_800_000_000
+    span = minutes * 60
+    return [
+        (principals[rng.randrange(principal_count)], rng.choice((1, 1, 1, 2, 3)), start + (i * span) // checks)
+        for i in range(checks)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--principals", type=int, default=10000)
+    parser.add_argument("--checks", type=int, default=200000)
+    parser.add_argument("--minutes", type=int, default=180)
+    args = parser.parse_args()
+
+    calls = workload(args.principals, args.checks, args.minutes)
+
+    legacy_buckets: dict = {}
+    started = time.perf_counter()
+    legacy = [legacy_check(legacy_buckets, p, cost=c, now=now) for p, c, now in calls]
+    legacy_seconds = time.perf_counter() - started
+
+    results = {}
+    for algorithm in ("fixed", "sliding"):
+        clock = [0]
+        limiter = MemoryRateLimiter(clock=lambda: clock[0])
+        decisions = []
+        started = time.perf_counter()
+        for principal, cost, now in calls:
+            clock[0] = now
+            decisions.append(limiter.check(principal, cost=cost, algorithm=algorithm))
+        results[algorithm] = (time.perf_counter() - started, len(limiter), decisions)
+
+    assert results["fixed"][2] == legacy, "fixed-window decisions diverged from the legacy limiter"
+
+    per_check = lambda seconds: seconds / len(calls) * 1e6  # noqa: E731
+    print(f"principals={args.principals} checks={len(calls)} simulated_minutes={args.minutes}")
+    print(f"legacy dict    : {per_check(legacy_seconds):6.2f} us/check, {len(legacy_buckets):8d} counters retained")
+    for algorithm, (seconds, retained, _decisions) in results.items():
+        print(f"memory {algorithm:<8}: {per_check(seconds):6.2f} us/check, {retained:8d} counters retained")
+    print("fixed-window parity ok")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
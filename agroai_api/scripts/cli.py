@@ -165,5 +165,100 @@ def list_models(model_name, status):
         db.close()
 
 
+@cli.group()
+def wiseconn():
+    """WiseConn sync operations."""
+    pass
+
+
+@wiseconn.command("backfill")
+@click.option("--tenant-id", default="wiseconn-demo", help="Tenant ID")
+@click.option("--days", type=int, default=14, help="Days back from now to refetch")
+@click.option("--end-days-ago", type=int, default=0, help="Stop this many days before now")
+@click.option("--zone-id", multiple=True, help="WiseConn zone ID (repeatable; default all)")
+def backfill_wiseconn(tenant_id, days, end_days_ago, zone_id):
+    """Refetch a telemetry window, ignoring incremental watermarks.
+
+    Use this to fill gaps the incremental scheduler will not revisit.
+    Existing points are skipped and watermarks only move forward.
+    """
+    import asyncio
+    from datetime import datetime, timedelta
+
+    from app.adapters.registry import AdapterRegistry
+    from app.services.wiseconn_sync import WiseConnSyncService
+
+    end_time = datetime.utcnow() - timedelta(days=end_days_ago)
+    start_time = datetime.utcnow() - timedelta(days=days)
+    if start_time >= end_time:
+        console.print("[red]✗ --days must be greater than --end-days-ago[/red]")
+        return
+
+    async def run(db):
+        service = WiseConnSyncService(adapter=AdapterRegistry.get_wiseconn(), db=db)
+        zone_ids = list(zone_id)
+        if not zone_ids:
+            discovery = await service.discover_all()
+            for error in discovery["errors"]:
+                console.print(f"[yellow]⚠ {error}[/yellow]")
+            zone_ids = [z.provider_id for zones in service._zones.values() for z in zones]
+        return [
+            await service.ingest_telemetry(z, start_time, end_time, tenant_id)
+            for z in zone_ids
+        ]
+
+    db = SessionLocal()
+    try:
+        results = asyncio.run(run(db))
+
+        table = Table(title=f"WiseConn backfill {start_time:%Y-%m-%d} → {end_time:%Y-%m-%d}")
+        table.add_column("Zone", style="cyan")
+        table.add_column("Measures")
+        table.add_column("Ingested", style="green")
+        table.add_column("Skipped")
+        table.add_column("Errors", style="red")
+        for r in results:
+            table.add_row(
+                r["zone_id"],
+                str(r["measures_processed"]),
+                str(r["points_ingested"]),
+                str(r["points_skipped"]),
+                str(len(r["errors"])),
+            )
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]✗ Error: {e}[/red]")
+    finally:
+        db.close()
+
+
+@cli.group()
+def sources():
+    """Uploaded source operations."""
+    pass
+
+
+@sources.command("backfill-text")
+@click.option("--tenant-id", help="Tenant ID (default all tenants)")
+@click.option("--limit", type=int, default=500, help="PDF sources checked per batch")
+def backfill_source_text(tenant_id, limit):
+    """Queue worker text extraction for PDFs uploaded before it ran on ingest.
+
+    Until they are queued, these PDFs are downloaded and parsed each time they
+    are used as Ask AGRO-AI context.
+    """
+    from app.services.source_text_jobs import queue_missing_source_text
+
+    db = SessionLocal()
+    try:
+        queued = queue_missing_source_text(db, tenant_id=tenant_id, limit=limit)
+        console.print(f"[green]✓ Queued text extraction for {queued} PDF source(s)[/green]")
+    except Exception as e:
+        console.print(f"[red]✗ Error: {e}[/red]")
+    finally:
+        db.close()
+
+
 if __name__ == "__main__":
     cli()
@@ -32,6 +32,26 @@ def pytest_pyfunc_call(pyfuncitem):
     return True
 
 
+@pytest.fixture(autouse=True)
+def _isolated_ai_response_cache():
+    """Model answers cached by one test must not satisfy another's fake provider."""
+    from app.services.ai_response_cache import clear_memory_cache
+
+    clear_memory_cache()
+    yield
+    clear_memory_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_lane_latency():
+    """Lane timings from one test must not reorder another test's lanes."""
+    from app.services.lane_latency import LANE_LATENCY
+
+    LANE_LATENCY.reset()
+    yield
+    LANE_LATENCY.reset()
+
+
 @pytest.fixture(scope="function")
 def db(tmp_path):
     """Create test database and session."""
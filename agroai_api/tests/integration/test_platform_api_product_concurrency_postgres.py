@@ -25,6 +25,7 @@ from app.models.platform_product import (
     PlatformApiSubscription,
     PlatformCheckoutIdempotency,
     PlatformCreditReservation,
+    PlatformCreditShard,
     PlatformStripeMeterOutbox,
 )
 from app.models.saas import Organization, User, Workspace
@@ -196,6 +197,101 @@ def test_credit_reservations_use_two_sessions_and_cannot_oversubscribe(monkeypat
         engine.dispose()
 
 
+def test_sharded_credit_reservations_cannot_oversubscribe(monkeypatch):
+    engine, Session = _sessions()
+    user_id, organization_id, workspace_id, project_id = _seed_project(Session)
+    db = Session()
+    catalog = f"sharded-{uuid.uuid4().hex}"
+    plan = PlatformApiPlan(
+        catalog_version=catalog,
+        plan_identifier="sharded",
+        display_name="Sharded",
+        status="test",
+        active=True,
+        currency="USD",
+        included_credits=20,
+        overages_allowed=False,
+        limits_json={},
+        support_tier="test",
+    )
+    cost = PlatformApiOperationCost(
+        catalog_version=catalog,
+        operation_id="sharded_operation",
+        operation_class="test",
+        environment="test",
+        credits=3,
+        active=True,
+        description="Sharded concurrency proof",
+    )
+    db.add_all([plan, cost])
+    db.flush()
+    db.add(
+        PlatformApiSubscription(
+            organization_id=organization_id,
+            plan_id=plan.id,
+            status="active",
+            status_slot="active",
+            billing_mode="none",
+        )
+    )
+    db.commit()
+    plan_id, cost_id = plan.id, cost.id
+    db.close()
+    monkeypatch.setattr(settings, "PLATFORM_API_OPERATION_COST_CATALOG_VERSION", catalog)
+    monkeypatch.setattr(settings, "PLATFORM_API_USAGE_METERING_ENFORCEMENT_ENABLED", True)
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_ACCOUNTING", "sharded")
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_SHARDS", 4)
+    barrier = threading.Barrier(12)
+
+    def reserve(index: int) -> str:
+        session = Session()
+        principal = PlatformPrincipal(
+            authentication_type="platform_api_key",
+            organization_id=organization_id,
+            workspace_id=workspace_id,
+            api_project_id=project_id,
+            environment="test",
+            request_id=f"req-shard-{index}",
+        )
+        try:
+            barrier.wait()
+            try:
+                reserve_credits(
+                    session,
+                    principal=principal,
+                    operation_id="sharded_operation",
+                    logical_operation_id=f"logical-{index}",
+                )
+                session.commit()
+                return "reserved"
+            except HTTPException as exc:
+                session.rollback()
+                assert exc.status_code == 429
+                return "denied"
+        finally:
+            session.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            results = list(pool.map(reserve, range(12)))
+        verify = Session()
+        assert results.count("reserved") == 6
+        assert verify.query(PlatformCreditReservation).filter_by(organization_id=organization_id).count() == 6
+        used = sum(row.used_credits for row in verify.query(PlatformCreditShard).filter_by(organization_id=organization_id))
+        assert used == 18
+        verify.close()
+    finally:
+        _cleanup(
+            Session,
+            user_id=user_id,
+            organization_id=organization_id,
+            workspace_id=workspace_id,
+            plan_id=plan_id,
+            cost_id=cost_id,
+        )
+        engine.dispose()
+
+
 def test_checkout_idempotency_claim_is_atomic_across_two_sessions():
     engine, Session = _sessions()
     user_id, organization_id, workspace_id, _project_id = _seed_project(Session)
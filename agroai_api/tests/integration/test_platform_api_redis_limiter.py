@@ -111,3 +111,42 @@ def test_real_redis_sustained_window_is_enforced_atomically(redis_limiters, monk
     assert denied.limit == 61
     assert denied.remaining == 0
     assert denied.retry_after >= 1
+
+
+def test_real_redis_sliding_window_matches_memory_limiter(redis_limiters, monkeypatch):
+    from app.platform_api import rate_limits
+    from app.platform_api.rate_limits import MemoryRateLimiter
+
+    limiter_a, _limiter_b, _client = redis_limiters
+    start = 1_800_000_000 - (1_800_000_000 % 3600) + 30
+    now = [start]
+    monkeypatch.setattr(rate_limits.time, "time", lambda: now[0])
+    memory = MemoryRateLimiter(clock=lambda: now[0])
+    principal = _principal()
+
+    for offset, cost in ((0, 40), (10, 15), (60, 20), (75, 10), (80, 5), (95, 3)):
+        now[0] = start + offset
+        redis_decision = limiter_a.check(principal, cost=cost, algorithm="sliding")
+        memory_decision = memory.check(principal, cost=cost, algorithm="sliding")
+        assert (redis_decision.allowed, redis_decision.remaining, redis_decision.retry_after) == (
+            memory_decision.allowed,
+            memory_decision.remaining,
+            memory_decision.retry_after,
+        )
+
+
+def test_real_redis_lease_mode_never_exceeds_the_global_limit(redis_limiters):
+    from app.platform_api.rate_limits import RedisLeaseRateLimiter
+
+    _limiter_a, _limiter_b, client = redis_limiters
+    processes = [RedisLeaseRateLimiter(client=client, lease_size=20) for _ in range(2)]
+    principal = _principal()
+
+    def check(index: int) -> bool:
+        return processes[index % 2].check(principal, cost=1).allowed
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        decisions = list(pool.map(check, range(100)))
+
+    assert 50 <= sum(decisions) <= 60
+    assert processes[0].refills + processes[1].refills < 100
@@ -0,0 +1,102 @@
+"""Pooled AI lane HTTP clients reuse connections per lane and origin on the bound loop."""
+import asyncio
+import gc
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.metrics import ai_http_connections_opened, ai_http_requests
+from app.services.ai_http_clients import AIClientRegistry, ai_timeout
+
+
+class _Chat(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length") or 0))
+        body = b'{"message": {"content": "ok"}}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Chat)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _count(metric, lane):
+    return metric.labels(lane=lane)._value.get()
+
+
+def test_requests_on_one_loop_share_a_keep_alive_connection(stub_url):
+    registry = AIClientRegistry()
+    opened = _count(ai_http_connections_opened, "edge")
+    sent = _count(ai_http_requests, "edge")
+
+    async def scenario():
+        registry.bind()
+        first = registry.client(f"{stub_url}/api", lane="edge")
+        for _ in range(3):
+            async with registry.borrow(stub_url, lane="edge") as client:
+                response = await client.post(f"{stub_url}/api/chat", json={}, timeout=ai_timeout(5))
+            assert client is first
+            assert response.json()["message"]["content"] == "ok"
+        assert not first.is_closed
+        assert registry.client(stub_url, lane="local") is not first
+        await registry.aclose()
+        assert first.is_closed
+
+    asyncio.run(scenario())
+    assert _count(ai_http_requests, "edge") - sent == 3
+    assert _count(ai_http_connections_opened, "edge") - opened == 1
+    assert len(registry) == 0
+
+
+def test_unbound_loops_close_their_client_and_hold_nothing(stub_url):
+    registry = AIClientRegistry()
+
+    async def call(lane="hosted"):
+        async with registry.borrow(stub_url, lane=lane) as client:
+            response = await client.post(f"{stub_url}/api/chat", json={}, timeout=ai_timeout(5))
+        assert response.json()["message"]["content"] == "ok"
+        return client
+
+    clients = [asyncio.run(call()) for _ in range(20)]
+    assert all(client.is_closed for client in clients)
+    assert len(registry) == 0
+    # Nothing in the registry keeps a finished loop's client, loop or sockets alive.
+    refs = [weakref.ref(client) for client in clients]
+    del clients
+    gc.collect()
+    assert [ref for ref in refs if ref() is not None] == []
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_borrow_pooled(registry, stub_url))
+    with pytest.raises(ValueError):
+        asyncio.run(call("unknown"))
+
+
+async def _borrow_pooled(registry, url):
+    return registry.client(url, lane="hosted")
+
+
+def test_lane_timeout_keeps_connect_short():
+    timeout = ai_timeout(90)
+    assert timeout.read == 90
+    assert timeout.connect == 5.0
+    assert ai_timeout(2).connect == 2.0
@@ -0,0 +1,157 @@
+"""Ask AGRO-AI response cache: keys, bounds, tenant safety and evidence invalidation."""
+import asyncio
+from datetime import datetime
+
+from app.core.metrics import ai_response_cache, ai_response_cache_saved_seconds
+from app.models.operational_records import EvidenceRecord
+from app.services import ai_response_cache as cache_module
+from app.services.ai_gateway import AIGatewayResult
+from app.services.ai_response_cache import (
+    MemoryResponseCache,
+    ResponseCacheScope,
+    evidence_fingerprint,
+    through_response_cache,
+)
+from app.services.model_router import ModelRouter
+
+
+SCOPE = ResponseCacheScope(tenant_id="org-1", workspace_id="ws-1", evidence_fingerprint="f" * 64)
+
+
+def _messages(question):
+    return [{"role": "system", "content": "Use only supplied context."}, {"role": "user", "content": question}]
+
+
+def _ask(scope, question, calls, *, content="Irrigate block 4 tonight."):
+    async def call():
+        calls.append(question)
+        return AIGatewayResult(status="ok", content=content, provider="mock", model="m", raw={"n": len(calls)})
+
+    return asyncio.run(
+        through_response_cache(
+            scope,
+            route="model_router",
+            task="chat",
+            messages=_messages(question),
+            params={"temperature": 0.2},
+            call=call,
+            cacheable=lambda result: result.status == "ok",
+        )
+    )
+
+
+def test_near_identical_questions_share_an_answer_within_one_scope():
+    calls = []
+    hits = ai_response_cache.labels(route="model_router", outcome="hit")._value.get()
+    saved = ai_response_cache_saved_seconds.labels(route="model_router")._value.get()
+
+    first = _ask(SCOPE, "What should I irrigate today?", calls)
+    second = _ask(SCOPE, "  what should   I irrigate TODAY ", calls)
+    second.raw["n"] = 99
+
+    assert calls == ["What should I irrigate today?"]
+    assert second.content == first.content
+    assert _ask(SCOPE, "What should I irrigate today?", calls).raw == {"n": 1}
+    assert ai_response_cache.labels(route="model_router", outcome="hit")._value.get() - hits == 2
+    assert ai_response_cache_saved_seconds.labels(route="model_router")._value.get() >= saved
+
+    _ask(SCOPE, "What should I irrigate tomorrow?", calls)
+    _ask(ResponseCacheScope("org-2", "ws-1", SCOPE.evidence_fingerprint), "What should I irrigate today?", calls)
+    _ask(ResponseCacheScope("org-1", "ws-1", "e" * 64), "What should I irrigate today?", calls)
+    _ask(None, "What should I irrigate today?", calls)
+    assert len(calls) == 5
+
+
+def test_unavailable_answers_are_not_cached():
+    calls = []
+
+    async def unavailable():
+        calls.append(1)
+        return AIGatewayResult(status="unavailable", content="", provider="mock", model=None)
+
+    for _ in range(2):
+        asyncio.run(
+            through_response_cache(
+                SCOPE,
+                route="model_router",
+                task="chat",
+                messages=_messages("Status?"),
+                params=None,
+                call=unavailable,
+                cacheable=lambda result: result.status == "ok",
+            )
+        )
+    assert len(calls) == 2
+
+
+def test_memory_cache_is_bounded_by_entries_bytes_and_ttl(monkeypatch):
+    now = [0.0]
+    cache = MemoryResponseCache(clock=lambda: now[0])
+    monkeypatch.setattr(cache_module.settings, "AI_RESPONSE_CACHE_MAX_ENTRIES", 3)
+    monkeypatch.setattr(cache_module.settings, "AI_RESPONSE_CACHE_MAX_BYTES", 100)
+
+    for index in range(4):
+        cache.put(f"k{index}", tenant_id="org-1", value=index, elapsed_seconds=1.0, size=10, ttl_seconds=60)
+    assert len(cache) == 3
+    assert cache.get("k0", tenant_id="org-1") is None
+
+    cache.put("big", tenant_id="org-1", value="x", elapsed_seconds=1.0, size=80, ttl_seconds=60)
+    assert cache.size_bytes <= 100
+    assert cache.get("k1", tenant_id="org-1") is None
+    cache.put("huge", tenant_id="org-1", value="x", elapsed_seconds=1.0, size=101, ttl_seconds=60)
+    assert cache.get("huge", tenant_id="org-1") is None
+
+    assert cache.get("big", tenant_id="org-2") is None
+    cache.put("big", tenant_id="org-1", value="x", elapsed_seconds=1.0, size=80, ttl_seconds=60)
+    now[0] = 61.0
+    assert cache.get("big", tenant_id="org-1") is None
+
+
+def test_evidence_changes_invalidate_the_tenant_and_the_fingerprint(db):
+    record = EvidenceRecord(
+        id="evidence-1",
+        tenant_id="org-1",
+        evidence_type="field_context",
+        title="Field note",
+        summary="Pressure swing on block 4.",
+        value_json={},
+        citation_label="Field note",
+        metadata_json={},
+        occurred_at=datetime(2026, 5, 1),
+    )
+    db.add(record)
+    db.commit()
+    before = evidence_fingerprint([record], [])
+
+    calls = []
+    _ask(SCOPE, "What changed?", calls)
+    _ask(SCOPE, "What changed?", calls)
+    assert len(calls) == 1
+
+    record.summary = "Pressure restored on block 4."
+    db.commit()
+    assert evidence_fingerprint([record], []) != before
+    _ask(SCOPE, "What changed?", calls)
+    assert len(calls) == 2
+
+
+def test_model_router_reuses_a_live_answer_for_the_same_scope(monkeypatch):
+    calls = []
+
+    async def fake_run(self, **kwargs):
+        calls.append(kwargs["task"])
+        return AIGatewayResult(status="ok", content='{"summary":"ok"}', provider="mock", model="m"), None
+
+    monkeypatch.setattr(ModelRouter, "_run", fake_run)
+
+    async def scenario():
+        router = ModelRouter()
+        for question in ("Is block 4 ready?", "is block 4 ready"):
+            result, _selection = await router.run(
+                task="chat", messages=_messages(question), response_format={"type": "json_object"}, cache_scope=SCOPE
+            )
+            assert result.content == '{"summary":"ok"}'
+        await router.run(task="chat", messages=_messages("Is block 4 ready?"), response_format={"type": "json_object"})
+
+    asyncio.run(scenario())
+    assert calls == ["chat", "chat"]
@@ -0,0 +1,150 @@
+"""Streamed chat completions: SSE and NDJSON parsing, reasoning filtering and the SSE chat route."""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.security import create_access_token
+from app.services.ai_gateway import AIGateway, AIGatewayResult, AIStreamEvent, ThinkingFilter
+from app.services.model_router import ModelRouter
+
+
+class _Provider(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list[dict] = []
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("content-type", content_type)
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("content-length") or 0)))
+        type(self).requests.append(payload)
+        if self.path.endswith("/chat/completions"):
+            if payload["model"] == "busy-model":
+                self._send(503, b'{"error":"overloaded"}', "application/json")
+                return
+            chunks = ["<think>weigh", "ing</think>Irrigate ", "block 4 ", "tonight."]
+            lines = [": keep-alive"] + [
+                "data: " + json.dumps({"choices": [{"delta": {"content": chunk}}]}) for chunk in chunks
+            ] + ["data: [DONE]"]
+            self._send(200, ("\n\n".join(lines) + "\n\n").encode(), "text/event-stream")
+            return
+        lines = [
+            {"model": payload["model"], "message": {"content": "Hold "}, "done": False},
+            {"model": payload["model"], "message": {"content": "irrigation."}, "done": False},
+            {"model": payload["model"], "message": {"content": ""}, "done": True},
+        ]
+        self._send(200, "\n".join(json.dumps(line) for line in lines).encode(), "application/x-ndjson")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider_url():
+    _Provider.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Provider)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _collect(events):
+    async def run():
+        return [event async for event in events]
+
+    return asyncio.run(run())
+
+
+def test_thinking_filter_handles_tags_split_across_chunks():
+    visible = ThinkingFilter()
+    chunks = ["Hel", "lo <thi", "nk>private</th", "ink> wor", "ld <"]
+    streamed = "".join(visible.feed(chunk) for chunk in chunks) + visible.flush()
+    assert streamed == "Hello  world <"
+
+    unfinished = ThinkingFilter()
+    assert unfinished.feed("Answer<think>never closed") == "Answer"
+    assert unfinished.flush() == ""
+
+
+def test_openai_compatible_stream_falls_back_before_the_first_delta(provider_url, monkeypatch):
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_PROVIDER", "openai_compatible")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_BASE_URL", f"{provider_url}/v1")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_MODEL", "busy-model")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_MODEL_FALLBACKS", "stream-model")
+
+    events = _collect(AIGateway().chat_stream([{"role": "user", "content": "What now?"}]))
+
+    assert "".join(event.delta for event in events) == "Irrigate block 4 tonight."
+    assert [event.result for event in events[:-1]] == [None] * (len(events) - 1)
+    result = events[-1].result
+    assert result.status == "ok"
+    assert result.model == "stream-model"
+    assert result.content == "Irrigate block 4 tonight."
+    assert [request["model"] for request in _Provider.requests] == ["busy-model", "stream-model"]
+    assert all(request["stream"] is True for request in _Provider.requests)
+
+
+def test_ollama_stream_reads_ndjson_lines(provider_url, monkeypatch):
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_PROVIDER", "ollama")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_BASE_URL", provider_url)
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_MODEL", "llama3")
+
+    events = _collect(AIGateway().chat_stream([{"role": "user", "content": "QUESTION: irrigate?"}]))
+
+    assert [event.delta for event in events if event.delta] == ["Hold ", "irrigation."]
+    assert events[-1].result.content == "Hold irrigation."
+    assert events[-1].result.provider == "ollama"
+    assert _Provider.requests[0]["stream"] is True
+
+
+def test_stream_reports_unavailable_when_the_provider_is_unreachable(monkeypatch):
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_PROVIDER", "ollama")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_BASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setattr("app.services.ai_gateway.settings.AI_MODEL", "llama3")
+
+    events = _collect(AIGateway().chat_stream([{"role": "user", "content": "hi"}]))
+
+    assert len(events) == 1
+    assert events[0].result.status == "unavailable"
+
+
+def test_chat_stream_route_emits_deltas_then_a_verified_response(client, test_block, monkeypatch):
+    async def fake_stream(self, **kwargs):
+        for delta in ("Check the field ", "moisture and water data first."):
+            yield AIStreamEvent(delta=delta)
+        yield AIStreamEvent(
+            result=AIGatewayResult(status="ok", content="Check the field moisture and water data first.", provider="mock", model="m")
+        )
+
+    monkeypatch.setattr(ModelRouter, "stream", fake_stream)
+    token = create_access_token({"tenant_id": "test-tenant"})
+
+    response = client.post(
+        "/v1/ai/chat/stream",
+        json={"message": "What should I do?", "block_id": test_block.id, "preferred_language": "en"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    events = [(frame.split("\n")[0][len("event: "):], json.loads(frame.split("\n")[1][len("data: "):])) for frame in frames]
+    assert [name for name, _ in events] == ["delta", "delta", "done"]
+    assert "".join(data["text"] for name, data in events if name == "delta") == "Check the field moisture and water data first."
+    done = events[-1][1]
+    assert done["status"] == "ok"
+    assert done["output"] == "Check the field moisture and water data first."
+    assert done["verification"]["status"] in {"verified", "partial"}
+    assert all(citation["tenant_id"] in {None, "test-tenant"} for citation in done["citations"])
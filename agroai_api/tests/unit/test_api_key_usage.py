@@ -0,0 +1,144 @@
+"""Write-behind usage tracking for tenant API keys."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.api_key import APIKey
+from app.services import api_key_usage
+from app.services.api_key_service import APIKeyService
+from app.services.api_key_usage import MemoryUsageAccumulator, RedisUsageAccumulator
+
+
+@pytest.fixture
+def api_key(db, test_tenant):
+    row, plaintext = APIKeyService.create_api_key(db, tenant_id=test_tenant.id, name="usage", role="analyst")
+    return row, plaintext
+
+
+@pytest.fixture
+def running_flusher(db, monkeypatch):
+    accumulator = MemoryUsageAccumulator()
+    monkeypatch.setattr(api_key_usage, "_scheduler", object())
+    monkeypatch.setattr(api_key_usage, "_MEMORY_ACCUMULATOR", accumulator)
+    monkeypatch.setattr(api_key_usage, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    return accumulator
+
+
+def test_without_flusher_usage_is_written_through(db, api_key):
+    row, plaintext = api_key
+
+    assert APIKeyService.verify_api_key(db, plaintext).id == row.id
+
+    db.expire_all()
+    stored = db.get(APIKey, row.id)
+    assert stored.usage_count == "1"
+    assert stored.last_used_at is not None
+
+
+def test_verification_defers_usage_until_flush(db, api_key, running_flusher, monkeypatch):
+    row, plaintext = api_key
+    commits = []
+    original_commit = db.commit
+
+    def counting_commit():
+        commits.append(True)
+        original_commit()
+
+    monkeypatch.setattr(db, "commit", counting_commit)
+    for _ in range(3):
+        assert APIKeyService.verify_api_key(db, plaintext) is not None
+
+    assert commits == []
+    db.expire_all()
+    assert db.get(APIKey, row.id).usage_count == "0"
+
+    assert api_key_usage.flush_api_key_usage() == 1
+
+    db.expire_all()
+    stored = db.get(APIKey, row.id)
+    assert stored.usage_count == "3"
+    assert stored.last_used_at is not None
+    assert api_key_usage.flush_api_key_usage() == 0
+
+
+def test_flush_adds_to_existing_counts_and_keeps_latest_use(db, api_key, running_flusher):
+    row, _plaintext = api_key
+    later = datetime.utcnow()
+    row.usage_count = "40"
+    row.last_used_at = later
+    db.commit()
+
+    running_flusher.record(row.id, later - timedelta(minutes=5))
+    running_flusher.record(row.id, later - timedelta(minutes=1))
+    api_key_usage.flush_api_key_usage()
+
+    db.expire_all()
+    stored = db.get(APIKey, row.id)
+    assert stored.usage_count == "42"
+    assert stored.last_used_at == later
+
+
+def test_failed_flush_keeps_pending_usage(db, api_key, running_flusher, monkeypatch):
+    row, _plaintext = api_key
+    running_flusher.record(row.id, datetime.utcnow())
+
+    def broken_write(_db, _pending):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(api_key_usage, "write_usage", broken_write)
+    assert api_key_usage.flush_api_key_usage() == 0
+
+    assert running_flusher.drain()[row.id][0] == 1
+
+
+def test_stop_flushes_pending_usage(db, api_key, running_flusher):
+    row, _plaintext = api_key
+    running_flusher.record(row.id, datetime.utcnow())
+    api_key_usage._scheduler = None
+
+    api_key_usage.stop_api_key_usage_flusher()
+
+    db.expire_all()
+    assert db.get(APIKey, row.id).usage_count == "1"
+
+
+class _ScriptedRedis:
+    """Runs the accumulator's record script the way Redis would."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def eval(self, _script, numkeys, *keys_and_args):
+        (counts, last_used), (key_id, count, used_at) = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        counts = self.hashes.setdefault(counts, {})
+        counts[key_id] = int(counts.get(key_id, 0)) + int(count)
+        last_used = self.hashes.setdefault(last_used, {})
+        if key_id not in last_used or last_used[key_id] < used_at:
+            last_used[key_id] = used_at
+
+    def pipeline(self, transaction=False):
+        redis, calls = self, []
+
+        class Pipeline:
+            def eval(self, *args):
+                calls.append(args)
+
+            def execute(self):
+                return [redis.eval(*args) for args in calls]
+
+        return Pipeline()
+
+
+def test_redis_restore_never_moves_last_used_backwards():
+    redis = _ScriptedRedis()
+    accumulator = RedisUsageAccumulator(client=redis)
+    drained_at = datetime(2026, 10, 18, 12, 0, 0)
+    newer = datetime(2026, 10, 18, 12, 0, 0, 500000)
+
+    accumulator.record("key-1", newer)
+    accumulator.restore({"key-1": (3, drained_at)})
+
+    counts, last_used = redis.hashes[api_key_usage._REDIS_COUNTS], redis.hashes[api_key_usage._REDIS_LAST_USED]
+    assert counts["key-1"] == 4
+    assert datetime.fromisoformat(last_used["key-1"]) == newer
@@ -57,3 +57,52 @@ def test_publisher_rejects_unconfirmed_enqueue():
     )
     with pytest.raises(RuntimeError, match="status=200"):
         publisher.enqueue("job-1", "tenant-1", "connector_provider_sync")
+
+
+def test_batch_publish_chunks_to_the_edge_batch_route(monkeypatch):
+    monkeypatch.setattr("app.services.cloudflare_task_queue.CLOUDFLARE_BATCH_LIMIT", 2)
+
+    class BatchClient(FakeClient):
+        def post(self, url, *, json, headers):
+            super().post(url, json=json, headers=headers)
+            if len(self.calls) == 2:
+                return FakeResponse(status_code=503, text="queue unavailable")
+            return FakeResponse(payload={"status": "queued", "count": len(json["tasks"])})
+
+    client = BatchClient()
+    publisher = CloudflareTaskQueuePublisher(
+        endpoint_url="https://api.agroai-pilot.com/v1/internal/edge/connector-tasks",
+        token="test-publish-value",
+        client=client,
+    )
+    results = publisher.enqueue_many([(f"job-{index}", "tenant-1", "connector_provider_sync") for index in range(5)])
+
+    assert [call["url"] for call in client.calls] == [
+        "https://api.agroai-pilot.com/v1/internal/edge/connector-tasks/batch"
+    ] * 3
+    assert [len(call["json"]["tasks"]) for call in client.calls] == [2, 2, 1]
+    assert results[:2] == ["job-0", "job-1"]
+    assert all(isinstance(result, RuntimeError) for result in results[2:4])
+    assert results[4] == "job-4"
+
+
+def test_batch_publish_maps_edge_rejections_to_their_tasks():
+    class BatchClient(FakeClient):
+        def post(self, url, *, json, headers):
+            super().post(url, json=json, headers=headers)
+            return FakeResponse(payload={"status": "queued", "count": 2, "rejected": [{"index": 1, "error": "invalid_connector_task"}]})
+
+    publisher = CloudflareTaskQueuePublisher(
+        endpoint_url="https://api.agroai-pilot.com/v1/internal/edge/connector-tasks",
+        token="test-publish-value",
+        client=BatchClient(),
+    )
+    results = publisher.enqueue_many([
+        ("job-0", "tenant-1", "connector_ingest_object"),
+        ("job-1", "tenant-1", "unknown_task"),
+        ("job-2", "tenant-1", "platform_webhook_delivery"),
+    ])
+
+    assert results[0] == "job-0"
+    assert isinstance(results[1], RuntimeError) and "unknown_task" in str(results[1])
+    assert results[2] == "job-2"
@@ -0,0 +1,205 @@
+"""Supervised connector worker: per-type slots, lease refresh and SIGTERM draining."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+from app.services.redis_task_queue import QueueMessage
+from app.workers import connector_supervisor
+from app.workers.connector_supervisor import SupervisedConnectorWorker, task_limits
+from tests.unit.test_connector_worker import FakeQueue
+
+SYNC = "connector_provider_sync"
+INGEST = "connector_ingest_object"
+
+
+def _message(index, task_type):
+    return QueueMessage(f"{index}-0", f"job-{index}", "tenant", task_type)
+
+
+class Jobs:
+    """Provider syncs wait on an asyncio event; ingestion blocks its pool thread."""
+
+    def __init__(self, monkeypatch):
+        self.sync_release: asyncio.Event | None = None
+        self.ingest_release = threading.Event()
+        self.started = []
+        self.statuses = {}
+
+        async def provider_sync(db, *, job_id, tenant_id, worker_id):
+            self.started.append(job_id)
+            await self.sync_release.wait()
+            return self.statuses.get(job_id, "succeeded")
+
+        def connector_task(*, job_id, tenant_id, task_type, worker_id):
+            self.started.append(job_id)
+            self.ingest_release.wait(5)
+            return self.statuses.get(job_id, "succeeded")
+
+        monkeypatch.setattr(connector_supervisor, "process_provider_sync_job", provider_sync)
+        monkeypatch.setattr(connector_supervisor, "process_connector_task", connector_task)
+
+
+def _worker(queue, clock, **kwargs):
+    return SupervisedConnectorWorker(
+        queue,
+        worker_id="supervisor-test",
+        slots=kwargs.pop("slots", 4),
+        processes=kwargs.pop("processes", 1),
+        process_pool=ThreadPoolExecutor(max_workers=2),
+        publish_outbox=lambda: None,
+        clock=lambda: clock[0],
+        **kwargs,
+    )
+
+
+def test_task_limits_merge_overrides_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "CONNECTOR_WORKER_TASK_LIMITS_JSON", '{"connector_provider_sync": 40, "x": 0}')
+    limits = task_limits()
+    assert limits[SYNC] == 40
+    assert limits[INGEST] == 2
+    assert "x" not in limits
+
+    monkeypatch.setattr(settings, "CONNECTOR_WORKER_TASK_LIMITS_JSON", "{not json")
+    assert task_limits()[SYNC] == 4
+
+
+def test_slots_are_bounded_per_task_type_and_backlog_runs_when_freed(monkeypatch):
+    jobs = Jobs(monkeypatch)
+    batch = [_message(1, SYNC), _message(2, SYNC), _message(3, SYNC), _message(4, INGEST), _message(5, INGEST)]
+    queue = FakeQueue(batches=[batch])
+    clock = [100.0]
+    worker = _worker(queue, clock, processes=2, limits={SYNC: 2, INGEST: 1})
+
+    async def scenario():
+        jobs.sync_release = asyncio.Event()
+        assert await worker.run_once() == 5
+        await asyncio.sleep(0.05)
+        assert worker.in_flight() == 3
+        assert worker.backlog() == 2
+        assert sorted(jobs.started) == ["job-1", "job-2", "job-4"]
+        # Five messages are held against six slots, so only one more is read.
+        await worker.run_once()
+        assert queue.reads[-1][1] == 1
+
+        jobs.sync_release.set()
+        jobs.ingest_release.set()
+        for _ in range(20):
+            await worker.run_once()
+            if not worker.in_flight() and not worker.backlog():
+                break
+            await asyncio.sleep(0.01)
+        # A task can finish after the last round settled; settle it before checking acks.
+        assert await worker.drain() == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        worker.close()
+    assert sorted(jobs.started) == ["job-1", "job-2", "job-3", "job-4", "job-5"]
+    acked = sorted(message_id for ack_ids, _holds in queue.settled for message_id in ack_ids)
+    assert acked == ["1-0", "2-0", "3-0", "4-0", "5-0"]
+
+
+def test_long_running_and_backlogged_messages_keep_their_stream_lease(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_QUEUE_LEASE_SECONDS", 60)
+    monkeypatch.setattr(settings, "TASK_QUEUE_CLAIM_INTERVAL_SECONDS", 15.0)
+    jobs = Jobs(monkeypatch)
+    queue = FakeQueue(batches=[[_message(1, SYNC), _message(2, SYNC)]])
+    clock = [100.0]
+    worker = _worker(queue, clock, limits={SYNC: 1})
+
+    async def scenario():
+        jobs.sync_release = asyncio.Event()
+        await worker.run_once()
+        assert worker.backlog() == 1
+        clock[0] += 31.0
+        await worker.run_once()
+        assert sorted(queue.settled[-1][1]) == ["1-0", "2-0"]
+        jobs.sync_release.set()
+        await worker.drain()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        worker.close()
+
+
+def test_drain_waits_for_in_flight_jobs_and_settles_them(monkeypatch):
+    jobs = Jobs(monkeypatch)
+    jobs.statuses["job-2"] = "retrying"
+    queue = FakeQueue(batches=[[_message(1, SYNC), _message(2, INGEST)]])
+    clock = [100.0]
+    worker = _worker(queue, clock)
+    stop = threading.Event()
+
+    async def scenario():
+        jobs.sync_release = asyncio.Event()
+        await worker.run_once()
+        assert worker.in_flight() == 2
+        stop.set()
+        asyncio.get_running_loop().call_later(0.05, jobs.sync_release.set)
+        asyncio.get_running_loop().call_later(0.05, jobs.ingest_release.set)
+        await worker.run(stop)
+
+    asyncio.run(scenario())
+    assert worker.in_flight() == 0
+    assert queue.settled[-1] == (["1-0"], [])
+    assert len(queue.reads) == 1
+
+
+def test_drain_gives_up_after_its_budget(monkeypatch):
+    monkeypatch.setattr(settings, "CONNECTOR_WORKER_DRAIN_SECONDS", 0.0)
+    jobs = Jobs(monkeypatch)
+    queue = FakeQueue(batches=[[_message(1, SYNC), _message(2, SYNC)]])
+    clock = [100.0]
+    worker = _worker(queue, clock, limits={SYNC: 1})
+
+    async def scenario():
+        jobs.sync_release = asyncio.Event()
+        await worker.run_once()
+        assert await worker.drain() == 1
+        assert worker.backlog() == 0
+        jobs.sync_release.set()
+        await asyncio.sleep(0)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        worker.close()
+
+
+def test_broken_process_pool_is_rebuilt_and_the_message_deferred(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_QUEUE_DEFER_SECONDS", 2.0)
+    jobs = Jobs(monkeypatch)
+    jobs.ingest_release.set()
+    queue = FakeQueue(batches=[[_message(1, INGEST)]])
+    clock = [100.0]
+    worker = _worker(queue, clock)
+    broken = worker._process_pool
+
+    def child_died(*args, **kwargs):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+    monkeypatch.setattr(broken, "submit", child_died)
+    rebuilt = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(connector_supervisor, "_process_pool", lambda processes: rebuilt)
+
+    async def scenario():
+        await worker.run_once()
+        await asyncio.sleep(0.05)
+        await worker.run_once()
+        assert worker._process_pool is rebuilt
+        assert queue.settled[-1] == ([], ["1-0"])
+        clock[0] += 2.0
+        await worker.run_once()
+        assert await worker.drain() == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        worker.close()
+    assert jobs.started == ["job-1"]
+    acked = [message_id for ack_ids, _holds in queue.settled for message_id in ack_ids]
+    assert acked == ["1-0"]
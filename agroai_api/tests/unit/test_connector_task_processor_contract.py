@@ -1,3 +1,6 @@
+import re
+from pathlib import Path
+
 import pytest
 
 from app.services import connector_task_processor as processor
@@ -30,4 +33,11 @@ def test_supported_task_type_set_is_exact():
         "platform_api_operation",
         "platform_stripe_meter_export",
         "platform_webhook_delivery",
+        "source_text_extract",
     }
+
+
+def test_edge_gateway_allows_every_supported_task_type():
+    source = (Path(__file__).resolve().parents[3] / "cloudflare" / "edge-gateway" / "src" / "index.ts").read_text()
+    allowlist = re.search(r"ALLOWED_TASK_TYPES = new Set<ConnectorTaskType>\(\[(.*?)\]\)", source).group(1)
+    assert set(re.findall(r'"([a-z_]+)"', allowlist)) == processor.SUPPORTED_TASK_TYPES
@@ -0,0 +1,66 @@
+"""Streaming upload parsing matches the buffered parse_rows contract."""
+import json
+
+import pytest
+
+from app.api.v1.connectors import (
+    UPLOAD_PREVIEW_ROWS,
+    ParsedUpload,
+    parse_rows,
+    parse_upload_stream,
+)
+
+
+def _chunked(data: bytes, size: int):
+    opened = []
+
+    def open_stream():
+        opened.append(True)
+        return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+    return open_stream, opened
+
+
+CASES = {
+    "csv": ("flow.csv", "text/csv", b"block,flow_gpm,note\nA,12.5,ok\nB,7,\"two\nlines\"\r\nC,3,x,extra\n"),
+    "semicolon": ("export.csv", None, "﻿zone;mm\nZ1;4\nZ2;5\n".encode("utf-8")),
+    "latin1": ("stations.csv", "text/csv", "station,temp\nNu\xf1oa,21\nJa\xe9n,19\n".encode("latin-1")),
+    "notes": ("notes.txt", "text/plain", b"only a header\n\n\n"),
+    "notes_padded": ("notes.txt", "text/plain", b"  pump ran early \x0c valve 3 stuck  \n   \n"),
+    "empty": ("empty.csv", "text/csv", b""),
+    "json": ("rows.json", "application/json", json.dumps({"records": [{"a": 1}, {"b": 2}]}).encode()),
+}
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_stream_parse_matches_buffered_parse(case, chunk_size):
+    filename, content_type, data = CASES[case]
+    open_stream, _ = _chunked(data, chunk_size)
+
+    streamed = parse_upload_stream(filename, content_type, open_stream)
+
+    assert streamed == ParsedUpload.from_rows(*parse_rows(filename, content_type, data))
+
+
+def test_stream_parse_keeps_only_bounded_prefix_of_large_files():
+    body = "".join(f"B{i},{i * 0.5}\n" for i in range(UPLOAD_PREVIEW_ROWS * 3))
+    data = ("block,flow\n" + body).encode()
+    open_stream, opened = _chunked(data, 4096)
+
+    parsed = parse_upload_stream("big.csv", "text/csv", open_stream)
+
+    assert parsed.rows_parsed == UPLOAD_PREVIEW_ROWS * 3
+    assert len(parsed.preview_rows) == UPLOAD_PREVIEW_ROWS
+    assert parsed.preview_rows[-1] == {"block": f"B{UPLOAD_PREVIEW_ROWS - 1}", "flow": str((UPLOAD_PREVIEW_ROWS - 1) * 0.5)}
+    assert parsed.columns == ["block", "flow"]
+    assert len(opened) == 1
+
+
+def test_stream_parse_drains_stream_so_verification_errors_surface():
+    def open_stream():
+        yield b"block,flow\nA,1\n"
+        raise RuntimeError("connector object checksum differs from the queued job contract")
+
+    with pytest.raises(RuntimeError, match="checksum differs"):
+        parse_upload_stream("flow.csv", "text/csv", open_stream)
@@ -0,0 +1,105 @@
+"""Batched connector worker loop: settling, timers and deferred jobs."""
+from app.core.config import settings
+from app.services.redis_task_queue import QueueMessage
+from app.workers.connector_worker import ConnectorWorker
+
+
+class FakeQueue:
+    def __init__(self, batches=None, stale=None):
+        self.batches = list(batches or [])
+        self.stale = list(stale or [])
+        self.reads = []
+        self.claims = []
+        self.settled = []
+
+    def read(self, consumer, *, block_ms, count):
+        self.reads.append((block_ms, count))
+        return self.batches.pop(0) if self.batches else []
+
+    def claim_stale_page(self, consumer, *, min_idle_ms, count, start_id):
+        self.claims.append((count, start_id))
+        return self.stale.pop(0) if self.stale else ("0-0", [])
+
+    def settle(self, consumer, *, ack_ids, hold_ids):
+        self.settled.append((list(ack_ids), list(hold_ids)))
+
+
+def _message(index):
+    return QueueMessage(f"{index}-0", f"job-{index}", "tenant", "connector_ingest_object")
+
+
+def _worker(queue, statuses, clock, publishes=None):
+    handled = []
+
+    def handle(message, *, worker_id):
+        handled.append(message.job_id)
+        return statuses.get(message.job_id, "succeeded")
+
+    worker = ConnectorWorker(
+        queue,
+        worker_id="worker-test",
+        handle=handle,
+        publish_outbox=lambda: publishes.append(clock[0]) if publishes is not None else None,
+        clock=lambda: clock[0],
+    )
+    return worker, handled
+
+
+def test_batch_is_read_with_configured_count_and_acked_once(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_QUEUE_READ_BATCH", 3)
+    queue = FakeQueue(batches=[[_message(1), _message(2), _message(3)]])
+    clock = [100.0]
+    worker, handled = _worker(queue, {"job-2": "retrying"}, clock)
+
+    assert worker.run_once() == 3
+
+    assert handled == ["job-1", "job-2", "job-3"]
+    assert queue.reads[0][1] == 3
+    assert queue.settled == [(["1-0", "3-0"], [])]
+
+
+def test_outbox_and_stale_claims_run_on_their_own_timers(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_QUEUE_OUTBOX_INTERVAL_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "TASK_QUEUE_CLAIM_INTERVAL_SECONDS", 15.0)
+    queue = FakeQueue(stale=[("5-0", [_message(4)]), ("0-0", [_message(6)])])
+    clock = [100.0]
+    publishes = []
+    worker, handled = _worker(queue, {}, clock, publishes)
+
+    worker.run_once()
+    clock[0] += 0.5
+    worker.run_once()
+    clock[0] += 0.5
+    worker.run_once()
+    assert publishes == [100.0]
+    assert queue.claims == [(32, "0-0"), (32, "5-0")]
+    assert handled == ["job-4", "job-6"]
+
+    clock[0] += 1.5
+    worker.run_once()
+    assert publishes == [100.0, 102.5]
+    assert len(queue.claims) == 2
+    # An idle read blocks only until the next timer is due.
+    assert queue.reads[-1][0] == 2000
+
+
+def test_deferred_jobs_are_held_and_retried_without_blocking(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_QUEUE_DEFER_SECONDS", 2.0)
+    queue = FakeQueue(batches=[[_message(1), _message(2)]])
+    clock = [100.0]
+    statuses = {"job-1": "deferred"}
+    worker, handled = _worker(queue, statuses, clock)
+
+    worker.run_once()
+    assert queue.settled[-1] == (["2-0"], ["1-0"])
+
+    clock[0] += 1.0
+    worker.run_once()
+    assert handled == ["job-1", "job-2"]
+    assert queue.reads[-1][0] == 1000
+
+    clock[0] += 1.0
+    statuses["job-1"] = "succeeded"
+    worker.run_once()
+    assert handled == ["job-1", "job-2", "job-1"]
+    assert queue.settled[-1] == (["1-0"], [])
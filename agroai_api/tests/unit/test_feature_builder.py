@@ -0,0 +1,133 @@
+"""Unit tests for FeatureBuilder — per-block and batched paths agree."""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Block, Telemetry, Tenant
+from app.models.schedule import Schedule
+from app.services.feature_builder import FeatureBuilder
+from app.services.feature_columns import NUMPY_AVAILABLE
+
+NOW = datetime(2026, 6, 1, 12, 0, 0)
+DEPTHS = (12, 24, 36, 48, 60)
+
+
+def _seed_block(db, tenant_id: str, block_id: str, base_vwc: float, slope: float) -> None:
+    db.add(Block(id=block_id, tenant_id=tenant_id, name=block_id, area_ha=4.0))
+    # 30h of 30-minute soil readings so the 24h window trims the oldest rows
+    for step in range(60):
+        ts = NOW - timedelta(minutes=30 * step)
+        for depth in DEPTHS:
+            db.add(Telemetry(
+                id=str(uuid.uuid4()),
+                tenant_id=tenant_id,
+                block_id=block_id,
+                type="soil_vwc",
+                timestamp=ts,
+                value=base_vwc - depth * 0.001 - slope * step,
+                meta_data={"depth_inches": depth, "measure_id": f"m-{depth}"},
+            ))
+    for day in range(5):
+        ts = NOW - timedelta(days=day, hours=1)
+        db.add(Telemetry(
+            id=str(uuid.uuid4()), tenant_id=tenant_id, block_id=block_id,
+            type="et0", timestamp=ts, value=5.0 + day,
+        ))
+        db.add(Telemetry(
+            id=str(uuid.uuid4()), tenant_id=tenant_id, block_id=block_id,
+            type="weather", timestamp=ts, value=1.5,
+            meta_data={"variable": "rainfall"},
+        ))
+    for day, status in ((1, "completed"), (3, "active"), (4, "cancelled"), (9, "completed")):
+        db.add(Schedule(
+            id=str(uuid.uuid4()), tenant_id=tenant_id, block_id=block_id,
+            start_time=NOW - timedelta(days=day), duration_min=45.0,
+            volume_m3=20.0 + day, status=status,
+        ))
+
+
+@pytest.fixture
+def seeded_db(db):
+    db.add(Tenant(id="tenant-fb", name="FB", email="fb@example.com", tier="enterprise", active=True))
+    _seed_block(db, "tenant-fb", "block-a", 0.34, 0.0005)
+    _seed_block(db, "tenant-fb", "block-b", 0.28, -0.0002)
+    db.add(Block(id="block-empty", tenant_id="tenant-fb", name="empty", area_ha=1.0))
+    _seed_gappy_block(db, "tenant-fb", "block-gappy")
+    db.commit()
+    return db
+
+
+def _seed_gappy_block(db, tenant_id: str, block_id: str) -> None:
+    """Two non-adjacent depths that drift apart, stale, plus depthless rows."""
+    db.add(Block(id=block_id, tenant_id=tenant_id, name=block_id, area_ha=2.0))
+    for step in range(6):
+        ts = NOW - timedelta(hours=3 + step)
+        for depth, value in ((12, 0.45), (36, 0.10)):
+            db.add(Telemetry(
+                id=str(uuid.uuid4()), tenant_id=tenant_id, block_id=block_id,
+                type="soil_vwc", timestamp=ts, value=value + 0.01 * step,
+                meta_data={"depth_inches": depth},
+            ))
+        db.add(Telemetry(
+            id=str(uuid.uuid4()), tenant_id=tenant_id, block_id=block_id,
+            type="soil_vwc", timestamp=ts, value=0.2,
+        ))
+
+
+def _count_queries(db):
+    statements = []
+
+    def before(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before)
+
+
+@pytest.mark.parametrize("columnar", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")),
+])
+def test_build_many_matches_per_block_build(seeded_db, columnar):
+    builder = FeatureBuilder()
+    block_ids = ["block-a", "block-b", "block-empty", "block-gappy"]
+
+    batched = builder.build_many(seeded_db, block_ids, now=NOW, columnar=columnar)
+
+    assert list(batched) == block_ids
+    for block_id in block_ids:
+        single = builder.build(seeded_db, block_id, now=NOW)
+        expected = single.to_dict()
+        actual = batched[block_id].to_dict()
+        for key in ("mean_vwc", "weighted_root_zone_vwc", "vwc_trend_pct_per_hour",
+                    "et_demand_mm_day", "recent_rainfall_mm"):
+            if expected[key] is None:
+                assert actual[key] is None
+            else:
+                assert actual[key] == pytest.approx(expected[key])
+            expected.pop(key)
+            actual.pop(key)
+        assert actual == expected
+
+    assert "sensor_drift" in batched["block-gappy"].anomalies
+    assert "stale_data" in batched["block-gappy"].anomalies
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_build_many_uses_constant_number_of_queries(seeded_db, columnar):
+    builder = FeatureBuilder()
+    statements, stop = _count_queries(seeded_db)
+    try:
+        builder.build_many(
+            seeded_db, ["block-a", "block-b", "block-empty"], now=NOW, columnar=columnar
+        )
+    finally:
+        stop()
+    assert len(statements) == 3
+
+
+def test_build_many_empty_input(seeded_db):
+    assert FeatureBuilder().build_many(seeded_db, [], now=NOW) == {}
@@ -16,7 +16,7 @@ from app.db.base import Base, get_db
 from app.main import app
 from app.models.operational_records import IngestionJob
 from app.models.saas import Organization, User
-from app.services.ingestion_stream import read_spooled_bytes, stream_upload_to_spool
+from app.services.ingestion_stream import iter_spooled_chunks, read_spooled_bytes, stream_upload_to_spool
 
 
 def _upload(name: str, data: bytes) -> UploadFile:
@@ -78,6 +78,30 @@ def test_checksum_change_fails_closed(tmp_path, monkeypatch):
         read_spooled_bytes(receipt)
 
 
+def test_spooled_chunks_verify_incrementally_without_buffering(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "CONNECTOR_UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setenv("CONNECTOR_MAX_UPLOAD_BYTES", "1048576")
+    payload = b"timestamp,value\n" + b"2026-07-05,1\n" * 100
+    receipt = asyncio.run(
+        stream_upload_to_spool(
+            _upload("telemetry.csv", payload),
+            tenant_id="tenant-1",
+            connection_id="connection-1",
+        )
+    )
+
+    chunks = list(iter_spooled_chunks(receipt, chunk_size=64))
+    assert b"".join(chunks) == payload
+    assert max(len(chunk) for chunk in chunks) == 64
+
+    # Same size, different bytes: only the trailing digest check can catch it
+    Path(receipt.path).write_bytes(payload[:-2] + b"2\n")
+    stream = iter_spooled_chunks(receipt, chunk_size=64)
+    with pytest.raises(RuntimeError, match="checksum mismatch"):
+        for _chunk in stream:
+            pass
+
+
 def _testing_db():
     engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -138,6 +162,10 @@ def test_stream_upload_route_uses_worker_owned_session(tmp_path, monkeypatch):
     assert body["upload_receipt"]["streamed"] is True
     assert body["rows_parsed"] == 1
     assert body["evidence_records_created"] == 1
+    # The spool is removed; the stored copy is a link or copy of it
+    stored = [path for path in tmp_path.rglob("*sample.csv") if path.is_file()]
+    assert len(stored) == 1
+    assert stored[0].read_bytes().endswith(b"North,42\n")
 
 
 def test_ingestion_job_status_receipt_is_tenant_scoped():
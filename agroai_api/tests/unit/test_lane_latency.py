@@ -0,0 +1,153 @@
+"""Lane latency tracking: EWMA ordering, model demotion and p90-gated hedging."""
+import asyncio
+
+from app.core.metrics import ai_lane_hedges
+from app.services import lane_latency as lane_module
+from app.services.lane_latency import LANE_LATENCY, LaneLatencyTracker, hedged
+from app.services.live_intelligence import LiveIntelligence, LiveResult
+
+
+def _warm(tracker, lane, elapsed, ok=True, times=5, model=None):
+    for _ in range(times):
+        tracker.record(lane, elapsed, ok, model=model)
+
+
+def test_order_only_moves_lanes_with_enough_samples():
+    tracker = LaneLatencyTracker()
+    lanes = ["remote", "edge", "local"]
+    assert tracker.order(lanes) == lanes
+
+    _warm(tracker, "remote", 6.0)
+    _warm(tracker, "local", 0.5, times=4)
+    assert tracker.order(lanes) == lanes
+
+    _warm(tracker, "edge", 1.0)
+    assert tracker.order(lanes) == ["edge", "remote", "local"]
+
+    # A fast lane that mostly fails is expected to take longer to a success.
+    _warm(tracker, "edge", 1.0, ok=False, times=20)
+    assert tracker.order(lanes) == lanes
+
+
+def test_failing_models_move_to_the_end_of_their_lane():
+    tracker = LaneLatencyTracker()
+    models = ["primary", "challenger", "free"]
+    _warm(tracker, "hosted", 0.2, ok=False, model="primary")
+    _warm(tracker, "hosted", 9.0, model="challenger")
+
+    assert tracker.order_models("hosted", models) == ["challenger", "free", "primary"]
+    assert tracker.stats("hosted") is None
+
+
+def test_hedge_delay_uses_the_observed_p90_within_bounds(monkeypatch):
+    tracker = LaneLatencyTracker()
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_DEFAULT_DELAY_SECONDS", 8.0)
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_MIN_DELAY_SECONDS", 0.5)
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_MAX_DELAY_SECONDS", 30.0)
+    # A cold lane is not hedged unless the caller opts into the default delay.
+    assert tracker.hedge_delay("edge") == float("inf")
+    assert tracker.hedge_delay("edge", hedge_cold=True) == 8.0
+
+    for elapsed in (1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 90.0):
+        tracker.record("edge", elapsed, True)
+    assert tracker.hedge_delay("edge") == 2.0
+
+    _warm(tracker, "hosted", 0.01)
+    assert tracker.hedge_delay("hosted") == 0.5
+
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_ENABLED", False)
+    assert tracker.hedge_delay("edge") == float("inf")
+
+
+def test_hedged_starts_the_second_lane_only_after_the_first_is_slow(monkeypatch):
+    tracker = LaneLatencyTracker()
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    _warm(tracker, "edge", 0.05)
+    started = []
+
+    def lane(name, delay, answer):
+        async def attempt():
+            started.append(name)
+            await asyncio.sleep(delay)
+            return answer
+
+        return name, attempt
+
+    hedges = ai_lane_hedges.labels(lane="hosted")._value.get()
+    winner, rejected = asyncio.run(hedged([lane("edge", 0.01, "edge answer"), lane("hosted", 0.01, "hosted answer")], tracker=tracker))
+    assert (winner, rejected, started) == ("edge answer", [], ["edge"])
+
+    started.clear()
+    winner, _ = asyncio.run(hedged([lane("edge", 5.0, "late"), lane("hosted", 0.01, "hosted answer")], tracker=tracker))
+    assert winner == "hosted answer"
+    assert started == ["edge", "hosted"]
+    assert ai_lane_hedges.labels(lane="hosted")._value.get() - hedges == 1
+    # The cancelled edge attempt still counts as a lower bound on its latency.
+    assert tracker.stats("edge").samples == 7
+
+    started.clear()
+    winner, rejected = asyncio.run(
+        hedged([lane("edge", 0.0, "wrong language"), lane("hosted", 0.0, None)], accept=lambda answer: answer != "wrong language", tracker=tracker)
+    )
+    assert (winner, rejected, started) == (None, ["wrong language"], ["edge", "hosted"])
+
+
+def test_hedged_waits_on_a_cold_lane_unless_asked_to_hedge_it(monkeypatch):
+    tracker = LaneLatencyTracker()
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(lane_module.settings, "AI_HEDGE_DEFAULT_DELAY_SECONDS", 0.01)
+    started = []
+
+    def lane(name, delay, answer):
+        async def attempt():
+            started.append(name)
+            await asyncio.sleep(delay)
+            return answer
+
+        return name, attempt
+
+    winner, _ = asyncio.run(hedged([lane("edge", 0.1, "edge answer"), lane("hosted", 0.0, "hosted answer")], tracker=tracker))
+    assert (winner, started) == ("edge answer", ["edge"])
+
+    started.clear()
+    winner, _ = asyncio.run(
+        hedged([lane("local", 5.0, "late"), lane("hosted", 0.0, "hosted answer")], tracker=tracker, hedge_cold=True)
+    )
+    assert (winner, started) == ("hosted answer", ["local", "hosted"])
+
+
+def test_live_intelligence_prefers_the_lane_that_has_been_answering_faster(monkeypatch):
+    _warm(LANE_LATENCY, "edge", 0.5)
+    _warm(LANE_LATENCY, "hosted", 12.0)
+    calls = []
+
+    async def fake_remote(self, cfg, models, messages, profile):
+        calls.append("remote")
+        return "Remote answer with the field water plan.", models[0]
+
+    async def fake_edge(self, cfg, messages, profile):
+        calls.append("edge")
+        return "Edge answer with the field water plan.", "edge-model"
+
+    async def finish(self, answer, model, provider, code, name, profile, remote=None, allow_remote_repair=True):
+        return LiveResult("ok", answer, provider, model, code, profile)
+
+    async def finish_remote(self, remote, answer, model, code, name, profile):
+        return LiveResult("ok", answer, remote[2], model, code, profile)
+
+    monkeypatch.setattr(LiveIntelligence, "remote", lambda self: ("https://openrouter.ai/api/v1", "key", "openrouter"))
+    monkeypatch.setattr(LiveIntelligence, "edge", lambda self: ("https://edge.example", "edge-model"))
+    monkeypatch.setattr(LiveIntelligence, "ollama_model", lambda self: None)
+    monkeypatch.setattr(LiveIntelligence, "models", lambda self, profile, provider, route=None: ["primary"])
+    monkeypatch.setattr(LiveIntelligence, "run_remote", fake_remote)
+    monkeypatch.setattr(LiveIntelligence, "run_edge", fake_edge)
+    monkeypatch.setattr(LiveIntelligence, "finish_lane", finish)
+    monkeypatch.setattr(LiveIntelligence, "finish_remote", finish_remote)
+
+    runtime = LiveIntelligence()
+    assert runtime.auto_order("reasoning") == ["remote", "edge", "local"]
+    assert runtime.lane_order("reasoning") == ["edge", "remote", "local"]
+
+    result = asyncio.run(runtime.run("chat", "Explain the water plan for block 4 in detail.", [], "en"))
+    assert result.provider == "cloudflare_workers_ai"
+    assert calls == ["edge"]
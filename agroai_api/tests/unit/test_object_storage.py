@@ -213,3 +213,57 @@ def test_durable_store_rejects_spool_mutation_before_upload(tmp_path):
             expected_sha256=hashlib.sha256(payload).hexdigest(),
             expected_size=len(payload),
         )
+
+
+def test_stream_verified_yields_payload_and_checks_digest_at_end(tmp_path):
+    payload, store, stored, client = _stored(tmp_path)
+    expected = hashlib.sha256(payload).hexdigest()
+
+    chunks = list(store.stream_verified(
+        stored.uri,
+        expected_sha256=expected,
+        expected_size=len(payload),
+        max_bytes=1024,
+        tenant_id="org-one",
+        connection_id="conn-one",
+        chunk_size=4,
+    ))
+    assert b"".join(chunks) == payload
+    assert max(len(chunk) for chunk in chunks) == 4
+
+    _body, metadata = client.items[(store.bucket, stored.key)]
+    tampered = payload.replace(b"42", b"43")
+    client.items[(store.bucket, stored.key)] = (tampered, metadata)
+    stream = store.stream_verified(
+        stored.uri,
+        expected_sha256=expected,
+        expected_size=len(payload),
+        max_bytes=1024,
+        tenant_id="org-one",
+        connection_id="conn-one",
+        chunk_size=4,
+    )
+    with pytest.raises(RuntimeError, match="checksum differs"):
+        for _chunk in stream:
+            pass
+
+
+def test_stream_verified_rejects_size_drift_and_scope_before_reading(tmp_path):
+    payload, store, stored, client = _stored(tmp_path)
+    expected = hashlib.sha256(payload).hexdigest()
+
+    with pytest.raises(RuntimeError, match="size differs"):
+        list(store.stream_verified(
+            stored.uri, expected_sha256=expected, expected_size=len(payload) - 1,
+            max_bytes=1024, tenant_id="org-one", connection_id="conn-one",
+        ))
+    with pytest.raises(RuntimeError, match="exceeds worker read limit"):
+        store.stream_verified(
+            stored.uri, expected_sha256=expected, expected_size=len(payload),
+            max_bytes=8, tenant_id="org-one", connection_id="conn-one",
+        )
+    with pytest.raises(RuntimeError, match="checksum differs"):
+        store.stream_verified(
+            stored.uri, expected_sha256="0" * 64, expected_size=len(payload),
+            max_bytes=1024, tenant_id="org-one", connection_id="conn-one",
+        )
@@ -0,0 +1,145 @@
+"""Sharded Platform API credit accounting."""
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models.platform_product import (
+    PlatformApiOperationCost,
+    PlatformApiPlan,
+    PlatformApiSubscription,
+    PlatformCreditReservation,
+    PlatformCreditShard,
+)
+from app.platform_api.credits import commit_credits, release_credits, reserve_credits
+from app.platform_api.principal import PlatformPrincipal
+from tests.unit.test_platform_api_foundation import _project_and_key
+
+
+@pytest.fixture
+def account(db, monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_ACCOUNTING", "sharded")
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_SHARDS", 4)
+    _user, organization, _workspace, project, _service_account, key, _plaintext = _project_and_key(db)
+    plan = PlatformApiPlan(
+        catalog_version=settings.PLATFORM_API_PLAN_CATALOG_VERSION,
+        plan_identifier="sharded",
+        display_name="Sharded",
+        status="test",
+        active=True,
+        currency="USD",
+        included_credits=10,
+        overages_allowed=False,
+        limits_json={},
+        support_tier="test",
+    )
+    db.add(plan)
+    db.add(
+        PlatformApiOperationCost(
+            catalog_version=settings.PLATFORM_API_OPERATION_COST_CATALOG_VERSION,
+            operation_id="fields.create",
+            operation_class="metadata_write",
+            environment="test",
+            credits=2,
+            active=True,
+            description="test",
+        )
+    )
+    db.flush()
+    db.add(
+        PlatformApiSubscription(
+            organization_id=organization.id,
+            plan_id=plan.id,
+            status="active",
+            status_slot="active",
+            billing_mode="none",
+        )
+    )
+    db.commit()
+    principal = PlatformPrincipal(
+        authentication_type="platform_api_key",
+        organization_id=organization.id,
+        api_project_id=project.id,
+        api_key_id=key.id,
+        environment="test",
+        request_id="req_shard_test",
+    )
+    return principal, plan
+
+
+def _reserve(db, principal, logical_id):
+    return reserve_credits(db, principal=principal, operation_id="fields.create", logical_operation_id=logical_id)
+
+
+def _shard_total(db, principal):
+    rows = db.query(PlatformCreditShard).filter_by(organization_id=principal.organization_id).all()
+    return sum(row.used_credits for row in rows)
+
+
+def test_shards_split_the_allowance_and_replays_do_not_double_count(db, account):
+    principal, _plan = account
+
+    first = _reserve(db, principal, "logical-1")
+    assert _reserve(db, principal, "logical-1").id == first.id
+    db.commit()
+
+    shards = db.query(PlatformCreditShard).filter_by(organization_id=principal.organization_id).all()
+    assert sorted(row.shard for row in shards) == [-1, 0, 1, 2, 3]
+    assert sum(row.capacity_credits for row in shards) == 10
+    assert _shard_total(db, principal) == 2
+    assert sum(first.metadata_json["credit_shards"].values()) == 2
+
+
+def test_quota_is_enforced_exactly_across_shards(db, account):
+    principal, _plan = account
+
+    reserved = [_reserve(db, principal, f"logical-{index}") for index in range(5)]
+    with pytest.raises(HTTPException) as denied:
+        _reserve(db, principal, "logical-over")
+
+    assert denied.value.status_code == 429
+    assert denied.value.detail["code"] == "api_credit_quota_exceeded"
+    assert all(row.overage_credits == 0 for row in reserved)
+    assert _shard_total(db, principal) == 10
+
+
+def test_overage_plans_record_overage_like_the_locked_path(db, account):
+    principal, plan = account
+    plan.overages_allowed = True
+    db.commit()
+
+    rows = [_reserve(db, principal, f"logical-{index}") for index in range(6)]
+
+    assert [row.overage_credits for row in rows] == [0, 0, 0, 0, 0, 2]
+    overflow = db.query(PlatformCreditShard).filter_by(organization_id=principal.organization_id, shard=-1).one()
+    assert overflow.used_credits == 2
+
+
+def test_release_returns_capacity_and_commit_keeps_it(db, account):
+    principal, _plan = account
+    rows = [_reserve(db, principal, f"logical-{index}") for index in range(5)]
+    commit_credits(db, rows[0], principal=principal, status_code=201)
+    release_credits(db, rows[1], reason="http_500")
+    db.commit()
+
+    assert _shard_total(db, principal) == 8
+    assert _reserve(db, principal, "logical-after-release").overage_credits == 0
+    with pytest.raises(HTTPException):
+        _reserve(db, principal, "logical-over")
+
+
+def test_shards_are_seeded_from_existing_reservations(db, account, monkeypatch):
+    principal, _plan = account
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_ACCOUNTING", "locked")
+    for index in range(3):
+        _reserve(db, principal, f"locked-{index}")
+    db.commit()
+    assert db.query(PlatformCreditShard).count() == 0
+
+    monkeypatch.setattr(settings, "PLATFORM_API_CREDIT_ACCOUNTING", "sharded")
+    _reserve(db, principal, "sharded-1")
+    _reserve(db, principal, "sharded-2")
+    with pytest.raises(HTTPException):
+        _reserve(db, principal, "sharded-3")
+
+    assert _shard_total(db, principal) == 10
+    assert db.query(PlatformCreditReservation).count() == 5
@@ -0,0 +1,137 @@
+"""Verified Platform API key cache: hits, invalidation and bounds."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.platform_api import key_cache
+from app.platform_api.key_cache import MemoryKeyCache, VerifiedPlatformKey
+from app.platform_api.keys import rotate_platform_key, verify_platform_key
+from tests.unit.test_platform_api_foundation import _project_and_key
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_TTL_SECONDS", 30)
+    key_cache.clear_memory_cache()
+    yield
+    key_cache.clear_memory_cache()
+
+
+def _count_queries(db):
+    statements = []
+
+    def before(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before)
+
+
+def test_cached_verification_skips_database(db):
+    *_items, key, plaintext = _project_and_key(db)
+    db.commit()
+    first = verify_platform_key(db, plaintext)
+
+    statements, stop = _count_queries(db)
+    try:
+        second = verify_platform_key(db, plaintext)
+    finally:
+        stop()
+
+    assert statements == []
+    assert second == first
+    assert second.key.id == key.id
+    assert second.project.status == "active"
+
+
+def test_disabled_cache_always_queries(db, monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_BACKEND", "disabled")
+    *_items, _key, plaintext = _project_and_key(db)
+    db.commit()
+    verify_platform_key(db, plaintext)
+
+    statements, stop = _count_queries(db)
+    try:
+        assert verify_platform_key(db, plaintext) is not None
+    finally:
+        stop()
+    assert statements
+
+
+def test_auto_backend_shares_through_redis_or_stays_off(monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_BACKEND", "auto")
+    monkeypatch.setattr(settings, "PLATFORM_API_REDIS_URL", "")
+    monkeypatch.setattr(settings, "REDIS_URL", "")
+    assert key_cache._backend() == "disabled"
+
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://cache.internal:6379/0")
+    assert key_cache._backend() == "redis"
+
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_TTL_SECONDS", 0)
+    assert key_cache._backend() == "disabled"
+
+
+@pytest.mark.parametrize("change", ["revoke", "project", "service_account", "organization"])
+def test_row_changes_invalidate_cached_verification(db, change):
+    _user, org, _workspace, project, service_account, key, plaintext = _project_and_key(db)
+    db.commit()
+    assert verify_platform_key(db, plaintext) is not None
+
+    if change == "revoke":
+        key.status = "revoked"
+        key.revoked_at = datetime.utcnow()
+    elif change == "project":
+        project.status = "disabled"
+    elif change == "service_account":
+        service_account.status = "disabled"
+    else:
+        org.verification_status = "rejected"
+    db.commit()
+
+    assert verify_platform_key(db, plaintext) is None
+
+
+def test_rotation_invalidates_old_key_entry(db):
+    user, _org_row, _workspace, _project, _service_account, old_key, old_plaintext = _project_and_key(db)
+    db.commit()
+    assert verify_platform_key(db, old_plaintext).key.overlap_expires_at is None
+
+    new_key, new_plaintext = rotate_platform_key(db, old_key=old_key, overlap_minutes=0, rotated_by_user_id=user.id)
+    db.commit()
+
+    assert verify_platform_key(db, old_plaintext) is None
+    assert verify_platform_key(db, new_plaintext).key.id == new_key.id
+
+
+def test_snapshot_json_round_trip(db):
+    *_items, _key, plaintext = _project_and_key(db)
+    db.commit()
+    verified = verify_platform_key(db, plaintext)
+
+    assert VerifiedPlatformKey.from_json(verified.to_json()) == verified
+    assert f"key:{verified.key.id}" in verified.tags()
+    assert f"organization:{verified.key.organization_id}" in verified.tags()
+
+
+def test_memory_cache_is_bounded_and_expires(db, monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_KEY_CACHE_MAX_ENTRIES", 2)
+    *_items, _key, plaintext = _project_and_key(db)
+    db.commit()
+    verified = verify_platform_key(db, plaintext)
+    now = [100.0]
+    cache = MemoryKeyCache(clock=lambda: now[0])
+
+    cache.put("a", verified, 10)
+    cache.put("b", verified, 10)
+    assert cache.get("a") is verified
+    cache.put("c", verified, 10)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    now[0] = 111.0
+    assert cache.get("a") is None
+    assert cache.get("c") is None
@@ -0,0 +1,154 @@
+"""Lease mode for the Redis Platform API rate limiter."""
+import pytest
+
+from app.core.config import settings
+from app.platform_api import rate_limits
+from app.platform_api.principal import PlatformPrincipal
+from app.platform_api.rate_limits import RedisLeaseRateLimiter, check_rate_limit
+
+NOW = 1_800_000_000 - (1_800_000_000 % 3600) + 5
+
+
+class LeaseFakeRedis:
+    """Evaluates the lease script's contract in Python, like SharedFakeRedis."""
+
+    def __init__(self):
+        self.values = {}
+        self.calls = 0
+
+    def eval(self, _script, numkeys, *keys_and_args):
+        self.calls += 1
+        keys = list(keys_and_args[:numkeys])
+        args = [int(value) for value in keys_and_args[numkeys:]]
+        now, counter_count, divisor = args[0], args[1], args[2]
+        allowed, retry_after, grants, used = 1, 0, [], []
+        for index in range(counter_count):
+            limit, _seconds, reset, cost, want = args[3 + index * 5: 8 + index * 5]
+            current = self.values.get(keys[index], 0)
+            grant = 0
+            if want > 0:
+                if limit - current < cost:
+                    allowed = 0
+                    retry_after = max(retry_after, reset - now)
+                else:
+                    grant = min(want, max(cost, (limit - current) // divisor))
+            grants.append(grant)
+            used.append(current)
+        if allowed:
+            for index, grant in enumerate(grants):
+                if grant:
+                    self.values[keys[index]] = used[index] = used[index] + grant
+        else:
+            retry_after = max(1, retry_after)
+        result = [allowed, retry_after]
+        for grant, value in zip(grants, used):
+            result.extend([grant, value])
+        return result
+
+    def pipeline(self, transaction=False):
+        fake = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def decrby(self, key, amount):
+                self.ops.append((key, amount))
+
+            def execute(self):
+                for key, amount in self.ops:
+                    fake.values[key] = fake.values.get(key, 0) - amount
+
+        return _Pipe()
+
+
+def _principal(key: str = "key") -> PlatformPrincipal:
+    return PlatformPrincipal(
+        authentication_type="platform_api_key",
+        organization_id="org",
+        api_project_id="project",
+        api_key_id=key,
+        environment="test",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_TEST_BURST_LIMIT", 60)
+    monkeypatch.setattr(settings, "PLATFORM_API_TEST_SUSTAINED_LIMIT", 6000)
+
+
+def test_lease_spends_locally_between_refills(monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_API_TEST_BURST_LIMIT", 100000)
+    monkeypatch.setattr(settings, "PLATFORM_API_TEST_SUSTAINED_LIMIT", 100000)
+    fake = LeaseFakeRedis()
+    limiter = RedisLeaseRateLimiter(client=fake, lease_size=20, clock=lambda: NOW)
+
+    decisions = [limiter.check(_principal(), cost=1) for _ in range(400)]
+
+    assert all(decision.allowed for decision in decisions)
+    assert fake.calls == 20
+    assert decisions[-1].backend == "redis"
+
+
+def test_leases_never_exceed_the_global_limit_across_processes():
+    fake = LeaseFakeRedis()
+    processes = [RedisLeaseRateLimiter(client=fake, lease_size=20, clock=lambda: NOW) for _ in range(3)]
+
+    allowed = sum(processes[i % 3].check(_principal(), cost=1).allowed for i in range(300))
+
+    assert 50 <= allowed <= 60
+    assert max(fake.values.values()) <= 60
+
+
+def test_denied_refill_reserves_nothing_and_reports_retry_after():
+    fake = LeaseFakeRedis()
+    limiter = RedisLeaseRateLimiter(client=fake, lease_size=20, clock=lambda: NOW)
+    while limiter.check(_principal(), cost=1).allowed:
+        pass
+    before = dict(fake.values)
+
+    denied = limiter.check(_principal(), cost=1)
+
+    assert denied.allowed is False
+    assert denied.remaining == 0
+    assert denied.retry_after == 55
+    assert fake.values == before
+
+
+def test_release_returns_unspent_capacity():
+    fake = LeaseFakeRedis()
+    limiter = RedisLeaseRateLimiter(client=fake, lease_size=20, clock=lambda: NOW)
+    limiter.check(_principal(), cost=2)
+    assert max(fake.values.values()) > 2
+
+    limiter.release()
+
+    assert set(fake.values.values()) == {2}
+
+
+def test_lease_rejects_sliding_algorithm():
+    limiter = RedisLeaseRateLimiter(client=LeaseFakeRedis(), lease_size=20)
+    with pytest.raises(RuntimeError):
+        limiter.check(_principal(), cost=1, algorithm="sliding")
+
+
+def test_lease_mode_is_opt_in(monkeypatch):
+    fake = LeaseFakeRedis()
+    url = "redis://lease-test:6379/0"
+    monkeypatch.setattr(settings, "PLATFORM_API_RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setattr(settings, "PLATFORM_API_REDIS_URL", url)
+    monkeypatch.setitem(rate_limits._LEASE_LIMITERS, url, RedisLeaseRateLimiter(client=fake, lease_size=20))
+    exact_calls = []
+    monkeypatch.setattr(
+        rate_limits.RedisRateLimiter,
+        "check",
+        lambda self, principal, **kwargs: exact_calls.append(principal) or rate_limits.RateLimitDecision(True, 60, 59, NOW, backend="redis"),
+    )
+
+    check_rate_limit(_principal(), route_id="platform.me")
+    assert len(exact_calls) == 1 and fake.calls == 0
+
+    monkeypatch.setattr(settings, "PLATFORM_API_RATE_LIMIT_MODE", "lease")
+    assert check_rate_limit(_principal(), route_id="platform.me").allowed
+    assert len(exact_calls) == 1 and fake.calls == 1
@@ -0,0 +1,91 @@
+"""Process-local Platform API rate limiter: eviction, ceiling and parity."""
+import dataclasses
+import random
+
+from app.core.config import settings
+from app.platform_api import rate_limits
+from app.platform_api.principal import PlatformPrincipal
+from app.platform_api.rate_limits import MemoryRateLimiter, RedisRateLimiter, check_rate_limit
+from tests.unit.test_platform_api_foundation import SharedFakeRedis
+
+WINDOW_START = 1_800_000_000 - (1_800_000_000 % 3600)
+
+
+def _principal(index: int, environment: str = "test") -> PlatformPrincipal:
+    return PlatformPrincipal(
+        authentication_type="platform_api_key",
+        organization_id=f"org-{index % 3}",
+        api_project_id=f"project-{index % 5}",
+        api_key_id=f"key-{index}",
+        environment=environment,
+    )
+
+
+def test_closed_windows_are_evicted_as_time_passes():
+    now = [WINDOW_START + 10]
+    limiter = MemoryRateLimiter(clock=lambda: now[0])
+    for index in range(20):
+        limiter.check(_principal(index), cost=1)
+    populated = len(limiter)
+
+    now[0] += 120
+    limiter.check(_principal(0), cost=1)
+    assert len(limiter) < populated
+
+    now[0] += 3700
+    limiter.check(_principal(0), cost=1)
+    assert len(limiter) == 6
+
+
+def test_counter_ceiling_is_never_exceeded():
+    limiter = MemoryRateLimiter(max_counters=50, clock=lambda: WINDOW_START + 10)
+    for index in range(500):
+        limiter.check(_principal(index), cost=1)
+        assert len(limiter) <= 50
+
+
+def test_fixed_window_decisions_match_redis_script(monkeypatch):
+    monkeypatch.setattr(rate_limits.time, "time", lambda: WINDOW_START + 42)
+    memory = MemoryRateLimiter(clock=lambda: WINDOW_START + 42)
+    redis_limiter = RedisRateLimiter(client=SharedFakeRedis())
+    rng = random.Random(13)
+
+    for _ in range(400):
+        principal = _principal(rng.randrange(12), environment=rng.choice(["test", "live"]))
+        cost = rng.choice([1, 1, 2, 3, 5])
+        expected = dataclasses.replace(redis_limiter.check(principal, cost=cost), backend="memory")
+        assert memory.check(principal, cost=cost) == expected
+
+
+def test_sliding_window_weights_the_previous_window():
+    now = [WINDOW_START + 30]
+    fixed = MemoryRateLimiter(clock=lambda: now[0])
+    sliding = MemoryRateLimiter(clock=lambda: now[0])
+    principal = _principal(1)
+    assert fixed.check(principal, cost=60).allowed
+    assert sliding.check(principal, cost=60, algorithm="sliding").allowed
+
+    # Halfway through the next minute half of the previous minute still counts.
+    now[0] = WINDOW_START + 90
+    assert fixed.check(principal, cost=31).allowed
+    decision = sliding.check(principal, cost=30, algorithm="sliding")
+    assert decision.allowed
+    assert decision.remaining == 0
+    denied = sliding.check(principal, cost=1, algorithm="sliding")
+    assert not denied.allowed
+    assert denied.retry_after == 30
+
+
+def test_check_rate_limit_uses_configured_algorithm(monkeypatch):
+    rate_limits._MEMORY_BUCKETS.clear()
+    now = [WINDOW_START + 59]
+    monkeypatch.setattr(rate_limits._MEMORY_BUCKETS, "_clock", lambda: now[0])
+    monkeypatch.setattr(settings, "PLATFORM_API_RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setattr(settings, "PLATFORM_API_RATE_LIMIT_ALGORITHM", "sliding")
+    monkeypatch.setattr(settings, "APP_ENV", "test")
+    principal = _principal(7)
+
+    assert check_rate_limit(principal, route_id="weighted", cost=60).allowed
+    now[0] += 1
+    assert not check_rate_limit(principal, route_id="weighted", cost=1).allowed
+    rate_limits._MEMORY_BUCKETS.clear()
@@ -0,0 +1,157 @@
+"""Per-endpoint webhook circuit breaker."""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.platform_api import PlatformWebhookEndpointHealth, PlatformWebhookOutbox
+from app.platform_api.webhook_delivery import emit_webhook_event, lock_due_webhook_deliveries, process_webhook_delivery
+from app.platform_api.webhook_health import CIRCUIT_OPEN_ERROR, admit_delivery
+from tests.unit.test_platform_api_enterprise_hardening import _create_encrypted_endpoint
+
+
+@pytest.fixture
+def endpoint(db, monkeypatch):
+    org, project, endpoint, _plaintext = _create_encrypted_endpoint(db, monkeypatch)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_DELIVERY_ENABLED", True)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_CIRCUIT_COOLDOWN_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_RECOVERY_BATCH_SECONDS", 5.0)
+    monkeypatch.setattr(
+        "socket.getaddrinfo",
+        lambda *args, **kwargs: [(None, None, None, None, ("93.184.216.34", 443))],
+    )
+    return org, project, endpoint
+
+
+class Receiver:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        return httpx.Response(self.status_code)
+
+
+def _rows(db, org, project, endpoint, count):
+    for index in range(count):
+        emit_webhook_event(
+            db,
+            organization_id=org.id,
+            api_project_id=project.id,
+            event_type="action.approval_required",
+            payload={"resource_id": f"field-{index}"},
+        )
+    db.commit()
+    return (
+        db.query(PlatformWebhookOutbox)
+        .filter_by(endpoint_id=endpoint.id)
+        .order_by(PlatformWebhookOutbox.created_at)
+        .all()
+    )
+
+
+def _deliver(db, row, org, receiver):
+    row.status = "queued"
+    db.commit()
+    client = httpx.Client(transport=httpx.MockTransport(receiver))
+    try:
+        return process_webhook_delivery(db, outbox_id=row.id, organization_id=org.id, worker_id="worker", client=client)
+    finally:
+        client.close()
+
+
+def _health(db, endpoint):
+    db.expire_all()
+    return db.get(PlatformWebhookEndpointHealth, endpoint.id)
+
+
+def _cool_down(db, endpoint):
+    health = _health(db, endpoint)
+    health.open_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_failures_open_the_circuit_and_park_without_an_attempt(db, endpoint):
+    org, project, endpoint = endpoint
+    rows = _rows(db, org, project, endpoint, 3)
+    down = Receiver(503)
+
+    assert _deliver(db, rows[0], org, down) == "retrying"
+    assert _health(db, endpoint).state == "closed"
+    assert _deliver(db, rows[1], org, down) == "retrying"
+    health = _health(db, endpoint)
+    assert health.state == "open"
+    assert health.open_until > datetime.utcnow() + timedelta(seconds=25)
+
+    assert _deliver(db, rows[2], org, down) == "parked"
+    assert down.calls == 2
+    parked = db.get(PlatformWebhookOutbox, rows[2].id)
+    assert parked.attempt_count == 0
+    assert parked.status == "pending"
+    assert parked.last_error == CIRCUIT_OPEN_ERROR
+    assert parked.next_attempt_at == health.open_until
+
+
+def test_single_probe_closes_the_circuit_and_releases_backlog_in_batches(db, endpoint):
+    org, project, endpoint = endpoint
+    rows = _rows(db, org, project, endpoint, 2)
+    for row in rows:
+        _deliver(db, row, org, Receiver(500))
+    backlog = _rows(db, org, project, endpoint, 5)[2:]
+    assert {row.last_error for row in backlog} == {CIRCUIT_OPEN_ERROR}
+    _cool_down(db, endpoint)
+
+    probe, waiting = backlog[0], backlog[1]
+    probe.status = "queued"
+    db.commit()
+    assert admit_delivery(db, endpoint_id=endpoint.id, outbox_id=probe.id).probe
+    db.commit()
+    assert _deliver(db, waiting, org, Receiver(200)) == "parked"
+    assert _health(db, endpoint).state == "half_open"
+
+    assert _deliver(db, probe, org, Receiver(200)) == "succeeded"
+    health = _health(db, endpoint)
+    assert health.state == "closed"
+    assert health.consecutive_failures == 0
+    released = (
+        db.query(PlatformWebhookOutbox)
+        .filter(PlatformWebhookOutbox.id.in_([row.id for row in backlog[1:]]))
+        .order_by(PlatformWebhookOutbox.created_at)
+        .all()
+    )
+    assert all(row.last_error is None for row in released)
+    assert released[2].next_attempt_at - released[0].next_attempt_at == timedelta(seconds=5)
+
+
+def test_failed_probe_reopens_with_a_longer_cooldown(db, endpoint):
+    org, project, endpoint = endpoint
+    rows = _rows(db, org, project, endpoint, 3)
+    for row in rows[:2]:
+        _deliver(db, row, org, Receiver(500))
+    _cool_down(db, endpoint)
+
+    assert _deliver(db, rows[2], org, Receiver(500)) == "retrying"
+
+    health = _health(db, endpoint)
+    assert health.state == "open"
+    assert health.open_count == 2
+    assert health.open_until > datetime.utcnow() + timedelta(seconds=55)
+
+
+def test_open_circuit_does_not_hold_back_other_endpoints(db, endpoint, monkeypatch):
+    org, project, endpoint = endpoint
+    for row in _rows(db, org, project, endpoint, 2):
+        _deliver(db, row, org, Receiver(500))
+    other_org, other_project, other_endpoint, _plaintext = _create_encrypted_endpoint(db, monkeypatch)
+    _rows(db, org, project, endpoint, 1)
+    healthy = _rows(db, other_org, other_project, other_endpoint, 1)
+    db.query(PlatformWebhookOutbox).filter_by(endpoint_id=endpoint.id).update({"next_attempt_at": datetime.utcnow()})
+    db.commit()
+
+    due = lock_due_webhook_deliveries(db, limit=50)
+
+    assert [row.id for row in due] == [healthy[0].id]
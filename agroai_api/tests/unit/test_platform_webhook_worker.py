@@ -0,0 +1,147 @@
+"""Pooled webhook clients, batched publishing and the dedicated delivery worker."""
+import threading
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import platform_webhook_deliveries_in_flight
+from app.models.platform_api import PlatformWebhookOutbox
+from app.platform_api import webhook_delivery
+from app.platform_api.webhook_delivery import WebhookClientPool, emit_webhook_event, publish_pending_webhook_outbox
+from app.workers import webhook_worker
+from app.workers.webhook_worker import WebhookDeliveryWorker
+from tests.unit.test_platform_api_enterprise_hardening import _create_encrypted_endpoint
+
+
+def _emit(db, org, project, count):
+    for index in range(count):
+        emit_webhook_event(
+            db,
+            organization_id=org.id,
+            api_project_id=project.id,
+            event_type="action.approval_required",
+            payload={"resource_id": f"field-{index}"},
+        )
+    db.commit()
+
+
+def _mock_pool(monkeypatch, handler):
+    created = []
+
+    def new_client(self):
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(WebhookClientPool, "_new_client", new_client)
+    pool = WebhookClientPool()
+    monkeypatch.setattr(webhook_delivery, "_CLIENT_POOL", pool)
+    return pool, created
+
+
+def test_pool_keys_clients_by_address_and_sni_host(monkeypatch):
+    pool, created = _mock_pool(monkeypatch, lambda request: httpx.Response(200))
+
+    with pool.lease("93.184.216.34", 443, "hooks.example.com") as first:
+        pass
+    with pool.lease("93.184.216.34", 443, "hooks.example.com") as again:
+        pass
+    with pool.lease("93.184.216.34", 443, "other.example.com") as other:
+        pass
+
+    assert first is again
+    assert other is not first
+    assert len(created) == 2
+
+
+def test_pool_eviction_never_closes_a_lent_client(monkeypatch):
+    _pool, created = _mock_pool(monkeypatch, lambda request: httpx.Response(200))
+    pool = WebhookClientPool(max_clients=1)
+
+    with pool.lease("10.0.0.1", 443, "a.example.com") as lent:
+        with pool.lease("10.0.0.2", 443, "b.example.com"):
+            assert not lent.is_closed
+        with pool.lease("10.0.0.3", 443, "c.example.com"):
+            pass
+    assert created[1].is_closed
+    assert not lent.is_closed
+
+    with pool.lease("10.0.0.3", 443, "c.example.com"):
+        pass
+    assert len(pool) == 1
+    assert lent.is_closed
+
+
+def test_publishing_commits_once_per_batch(db, monkeypatch):
+    org, project, _endpoint, _plaintext = _create_encrypted_endpoint(db, monkeypatch)
+    _emit(db, org, project, 3)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_DELIVERY_ENABLED", True)
+    failing = db.query(PlatformWebhookOutbox).order_by(PlatformWebhookOutbox.created_at).first().id
+
+    class Publisher:
+        def enqueue(self, job_id, tenant_id, task_type):
+            if job_id == failing:
+                raise RuntimeError("queue unavailable")
+            return job_id
+
+    monkeypatch.setattr(webhook_delivery, "get_task_publisher", lambda: Publisher())
+    commits = []
+    original_commit = db.commit
+    monkeypatch.setattr(db, "commit", lambda: commits.append(True) or original_commit())
+
+    assert publish_pending_webhook_outbox(db) == {"published": 2, "failed": 1, "disabled": 0}
+    assert len(commits) == 1
+    statuses = {row.id: row.status for row in db.query(PlatformWebhookOutbox)}
+    assert statuses.pop(failing) == "pending"
+    assert set(statuses.values()) == {"queued"}
+
+
+def test_worker_bounds_concurrency_per_endpoint(db, monkeypatch):
+    org, project, endpoint, _plaintext = _create_encrypted_endpoint(db, monkeypatch)
+    _emit(db, org, project, 5)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_DELIVERY_ENABLED", True)
+    release = threading.Event()
+    running = []
+
+    def blocking_delivery(_db, *, outbox_id, organization_id, worker_id):
+        running.append(outbox_id)
+        release.wait(5)
+        return "succeeded"
+
+    monkeypatch.setattr(webhook_worker, "process_webhook_delivery", blocking_delivery)
+    worker = WebhookDeliveryWorker(
+        concurrency=8,
+        endpoint_concurrency=2,
+        session_factory=sessionmaker(bind=db.get_bind()),
+    )
+    try:
+        assert worker.tick() == 2
+        assert worker.tick() == 0
+        assert worker.in_flight() == 2
+    finally:
+        release.set()
+        worker.close()
+    assert worker.in_flight() == 0
+    db.expire_all()
+    assert db.query(PlatformWebhookOutbox).filter_by(endpoint_id=endpoint.id, status="queued").count() == 2
+
+
+def test_worker_delivers_pending_rows_over_pooled_clients(db, monkeypatch):
+    org, project, _endpoint, _plaintext = _create_encrypted_endpoint(db, monkeypatch)
+    _emit(db, org, project, 3)
+    monkeypatch.setattr(settings, "PLATFORM_API_WEBHOOK_DELIVERY_ENABLED", True)
+    monkeypatch.setattr(
+        "socket.getaddrinfo",
+        lambda *args, **kwargs: [(None, None, None, None, ("93.184.216.34", 443))],
+    )
+    _pool, created = _mock_pool(monkeypatch, lambda request: httpx.Response(204))
+    worker = WebhookDeliveryWorker(concurrency=4, session_factory=sessionmaker(bind=db.get_bind()))
+
+    assert worker.tick() == 3
+    worker.close()
+
+    db.expire_all()
+    assert {row.status for row in db.query(PlatformWebhookOutbox)} == {"delivered"}
+    assert len(created) == 1
+    assert platform_webhook_deliveries_in_flight._value.get() == 0
@@ -0,0 +1,108 @@
+"""Unit tests for ProviderConcurrencyLimiter."""
+import asyncio
+
+import pytest
+
+from app.services.provider_concurrency import ProviderConcurrencyLimiter
+
+
+class RateLimited(Exception):
+    pass
+
+
+def _limiter(**overrides):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        await asyncio.sleep(0)
+
+    options = dict(
+        provider="test",
+        max_concurrency=3,
+        rate_limit_errors=(RateLimited,),
+        backoff_seconds=1.0,
+        max_retries=2,
+        sleep=fake_sleep,
+    )
+    options.update(overrides)
+    return ProviderConcurrencyLimiter(**options), sleeps
+
+
+@pytest.mark.asyncio
+async def test_caps_in_flight_calls():
+    limiter, _ = _limiter()
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    results = await asyncio.gather(*(limiter.run(call) for _ in range(10)))
+
+    assert results == ["ok"] * 10
+    assert peak == 3
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_halves_concurrency_backs_off_and_retries():
+    limiter, sleeps = _limiter(max_concurrency=4)
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RateLimited()
+        return attempts
+
+    assert await limiter.run(call) == 2
+    assert limiter.limit == 2
+    assert limiter.rate_limited_total == 1
+    assert len(sleeps) == 1 and 1.0 <= sleeps[0] <= 1.25
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_gives_up_after_max_retries():
+    limiter, _ = _limiter(max_retries=1)
+
+    async def call():
+        raise RateLimited()
+
+    with pytest.raises(RateLimited):
+        await limiter.run(call)
+    assert limiter.rate_limited_total == 2
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_successes_grow_limit_back_to_max():
+    limiter, _ = _limiter(max_concurrency=4)
+    limiter.limit = 1
+
+    async def call():
+        return None
+
+    for _ in range(1 + 2 + 3):
+        await limiter.run(call)
+
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_other_errors_propagate_without_retry():
+    limiter, sleeps = _limiter()
+
+    async def call():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await limiter.run(call)
+    assert sleeps == []
+    assert limiter.limit == 3
@@ -55,3 +55,70 @@ def test_redis_stream_queue_enqueue_read_claim_ack_and_lag(monkeypatch):
     assert queue.pending_count() == 0
     assert fake.acked == ["1-0"]
     assert queue.ping() is True
+
+
+class PipelineFakeRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+
+    def xautoclaim(self, stream, group, consumer, min_idle_time, start_id="0-0", count=10):
+        self.commands.append(("xautoclaim", start_id, count))
+        return ("7-0", list(self.messages[:count]), [])
+
+    def pipeline(self, transaction=False):
+        fake = self
+
+        class _Pipe:
+            def xack(self, stream, group, *ids):
+                fake.commands.append(("xack", ids))
+
+            def xclaim(self, stream, group, consumer, min_idle_time, message_ids, justid=False):
+                fake.commands.append(("xclaim", tuple(message_ids), min_idle_time, justid))
+
+            def xadd(self, stream, fields, **kwargs):
+                fake.commands.append(("xadd", fields["job_id"]))
+
+            def execute(self, raise_on_error=True):
+                fake.commands.append(("execute",))
+                return [
+                    ResponseError("OOM") if command[1] == "job-bad" else f"{index}-0"
+                    for index, command in enumerate(fake.commands)
+                    if command[0] == "xadd"
+                ]
+
+        return _Pipe()
+
+
+def test_claim_pages_and_settle_batches_in_one_round_trip():
+    fake = PipelineFakeRedis()
+    queue = RedisTaskQueue(fake)
+    queue.enqueue("job-1", "tenant-1", "connector_ingest_object")
+
+    cursor, messages = queue.claim_stale_page("worker-a", min_idle_ms=1000, count=25, start_id="3-0")
+    queue.settle("worker-a", ack_ids=["1-0", "2-0"], hold_ids=["4-0"])
+    queue.settle("worker-a", ack_ids=[], hold_ids=[])
+
+    assert cursor == "7-0"
+    assert messages[0].job_id == "job-1"
+    assert fake.commands == [
+        ("xautoclaim", "3-0", 25),
+        ("xack", ("1-0", "2-0")),
+        ("xclaim", ("4-0",), 0, True),
+        ("execute",),
+    ]
+
+
+def test_enqueue_many_pipelines_xadds_and_reports_rejected_entries():
+    fake = PipelineFakeRedis()
+    queue = RedisTaskQueue(fake)
+
+    results = queue.enqueue_many([
+        ("job-1", "tenant-1", "connector_ingest_object"),
+        ("job-bad", "tenant-1", "connector_ingest_object"),
+        ("job-3", "tenant-1", "connector_ingest_object"),
+    ])
+
+    assert fake.commands == [("xadd", "job-1"), ("xadd", "job-bad"), ("xadd", "job-3"), ("execute",)]
+    assert results[0] == "0-0" and results[2] == "2-0"
+    assert isinstance(results[1], ResponseError)
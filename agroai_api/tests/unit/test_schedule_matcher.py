@@ -233,3 +233,84 @@ class TestBestSelection:
             ],
         )
         assert result.schedule_id == "id-match"
+
+
+# ------------------------------------------------------------------
+# Batch matching
+# ------------------------------------------------------------------
+
+def _sequential(matcher, targets, candidates):
+    """Reference greedy loop: match, then drop the matched candidate."""
+    results = []
+    for target in targets:
+        result = matcher.match(target, candidates)
+        if result.matched and not result.ambiguous:
+            candidates = [c for c in candidates if c.schedule_id != result.schedule_id]
+        results.append(result)
+    return results
+
+
+class TestMatchMany:
+    def test_matches_sequential_greedy_on_random_workload(self, matcher):
+        import random
+
+        rng = random.Random(11)
+        base = datetime(2026, 4, 1)
+        blocks = [f"block-{i}" for i in range(6)]
+        candidates = [
+            _candidate(
+                schedule_id=f"sched-{i}",
+                block_id=rng.choice(blocks),
+                start=base + timedelta(minutes=rng.randrange(0, 7 * 24 * 60, 15)),
+                duration=rng.choice([30.0, 45.0, 60.0, 90.0]),
+                volume=rng.choice([None, 20.0, 50.0]),
+                status=rng.choice(["completed", "completed", "active", "cancelled"]),
+                provider_schedule_id=rng.choice([None, None, f"evt-{i}"]),
+            )
+            for i in range(400)
+        ]
+        targets = [
+            MatchTarget(
+                decision_run_id=f"dr-{i}",
+                block_id=rng.choice(blocks + ["block-none"]),
+                planned_start=base + timedelta(minutes=rng.randrange(0, 7 * 24 * 60, 5)),
+                planned_duration_min=rng.choice([30.0, 60.0, 90.0]),
+                planned_volume_m3=rng.choice([0.0, 25.0, 50.0]),
+                provider_event_id=rng.choice([None, None, None, f"evt-{rng.randrange(400)}"]),
+            )
+            for i in range(300)
+        ]
+
+        expected = _sequential(matcher, targets, list(candidates))
+
+        assert matcher.match_many(targets, candidates) == expected
+        assert sum(r.matched and not r.ambiguous for r in expected) > 50
+
+    def test_reports_same_reasons_as_match(self, matcher):
+        candidates = [
+            _candidate("sched-a", block_id="block-001"),
+            _candidate("sched-b", block_id="block-002", status="cancelled"),
+        ]
+        targets = [
+            _target(block_id="block-001"),
+            _target(block_id="block-002"),
+            _target(block_id="block-003"),
+            _target(block_id="block-001"),
+        ]
+
+        results = matcher.match_many(targets, candidates)
+
+        assert results[0].matched and results[0].schedule_id == "sched-a"
+        assert [r.reason for r in results[1:]] == [
+            "all_candidates_cancelled",
+            "no_candidates_for_block",
+            "no_candidates_for_block",
+        ]
+
+    def test_provider_id_match_found_outside_time_buckets(self, matcher):
+        far = _candidate(
+            "sched-far", start=datetime(2026, 4, 5, 6, 0, 0), provider_schedule_id="evt-77",
+        )
+        results = matcher.match_many([_target(provider_event_id="evt-77")], [far])
+        assert results[0].schedule_id == "sched-far"
+        assert results[0].method == "provider_id"
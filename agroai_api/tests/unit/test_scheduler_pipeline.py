@@ -0,0 +1,177 @@
+"""Unit tests for the scheduler's single-pass water-state + forecast stage."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from app.core import scheduler
+from app.models import Block, Telemetry, Tenant
+from app.models.forecast import Forecast
+from app.models.water_state import WaterState
+from app.services.block_compute import BlockComputeTask, run_block_compute
+from app.services.crop_soil_profile import get_profile
+from app.services.feature_builder import FeatureBuilder
+from app.services.water_state_engine import WaterStateEngine
+
+
+def _seed(db, block_count: int = 3) -> None:
+    db.add(Tenant(id="tenant-pipe", name="Pipe", email="pipe@example.com", tier="enterprise", active=True))
+    now = datetime.utcnow()
+    for b in range(block_count):
+        block_id = f"pipe-block-{b}"
+        db.add(Block(
+            id=block_id, tenant_id="tenant-pipe", name=block_id, area_ha=3.0,
+            crop_type="almonds", soil_type="loam",
+        ))
+        for step in range(12):
+            for depth in (12, 24, 36):
+                db.add(Telemetry(
+                    id=str(uuid.uuid4()), tenant_id="tenant-pipe", block_id=block_id,
+                    type="soil_vwc", timestamp=now - timedelta(minutes=30 * step),
+                    value=0.30 - 0.001 * step, meta_data={"depth_inches": depth},
+                ))
+    db.commit()
+
+
+def test_pipeline_builds_features_once_and_inserts_both_tables(db, monkeypatch):
+    _seed(db)
+    build_calls = []
+    original_build_many = FeatureBuilder.build_many
+
+    def counting_build_many(self, *args, **kwargs):
+        build_calls.append(args)
+        return original_build_many(self, *args, **kwargs)
+
+    commits = []
+    original_commit = db.commit
+
+    def counting_commit():
+        commits.append(True)
+        original_commit()
+
+    def per_block_build(*args, **kwargs):
+        raise AssertionError("pipeline must not fall back to per-block builds")
+
+    monkeypatch.setattr(FeatureBuilder, "build_many", counting_build_many)
+    monkeypatch.setattr(FeatureBuilder, "build", per_block_build)
+    monkeypatch.setattr(db, "commit", counting_commit)
+
+    summary = scheduler._run_block_pipeline(db, "tenant-pipe")
+
+    assert len(build_calls) == 1
+    assert len(commits) == 1
+    assert summary["blocks"] == 3
+    assert summary["water_states"] == 3
+    assert summary["forecasts"] == 3
+    assert set(summary["timings_ms"]) == {"features", "compute", "water_state", "forecast", "persist"}
+    assert db.query(WaterState).filter(WaterState.tenant_id == "tenant-pipe").count() == 3
+    forecasts = db.query(Forecast).filter(Forecast.tenant_id == "tenant-pipe").all()
+    assert len(forecasts) == 3
+    assert all(f.created_at is not None for f in forecasts)
+
+
+def test_pipeline_skips_failing_block_without_losing_others(db, monkeypatch):
+    _seed(db, block_count=2)
+    original_estimate = WaterStateEngine.estimate
+
+    def flaky_estimate(self, fs):
+        if fs.block_id == "pipe-block-0":
+            raise ValueError("boom")
+        return original_estimate(self, fs)
+
+    monkeypatch.setattr(WaterStateEngine, "estimate", flaky_estimate)
+
+    summary = scheduler._run_block_pipeline(db, "tenant-pipe")
+
+    assert summary["water_states"] == 1
+    assert summary["forecasts"] == 2
+
+
+def test_pipeline_without_blocks_is_a_no_op(db):
+    summary = scheduler._run_block_pipeline(db, "missing-tenant")
+    assert summary == {"blocks": 0, "water_states": 0, "forecasts": 0, "timings_ms": {}}
+
+
+def test_process_pool_results_match_inline_and_keep_order(db):
+    _seed(db, block_count=7)
+    block_ids = [f"pipe-block-{b}" for b in (6, 2, 0, 5, 1, 4, 3)]
+    features = FeatureBuilder().build_many(db, block_ids)
+    tasks = [
+        BlockComputeTask(block_id=b, features=features[b], profile=get_profile("almonds", "loam"))
+        for b in block_ids
+    ]
+
+    inline = run_block_compute(tasks, workers=1)
+    pooled = run_block_compute(tasks, workers=3, batch_size=2)
+
+    assert [r.block_id for r in pooled] == block_ids
+    assert [r.block_id for r in inline] == block_ids
+    for a, b in zip(inline, pooled):
+        assert a.estimate.root_zone_vwc == b.estimate.root_zone_vwc
+        assert a.forecast.to_dict() == b.forecast.to_dict()
+
+
+def test_pipeline_uses_configured_worker_count(db, monkeypatch):
+    _seed(db, block_count=2)
+    seen = {}
+
+    def fake_run(tasks, workers, batch_size):
+        seen["workers"] = workers
+        seen["batch_size"] = batch_size
+        return run_block_compute(tasks, workers=1)
+
+    monkeypatch.setattr(scheduler.settings, "SCHEDULER_COMPUTE_WORKERS", 4)
+    monkeypatch.setattr(scheduler.settings, "SCHEDULER_COMPUTE_BATCH_SIZE", 50)
+    monkeypatch.setattr(scheduler, "run_block_compute", fake_run)
+
+    summary = scheduler._run_block_pipeline(db, "tenant-pipe")
+
+    assert seen == {"workers": 4, "batch_size": 50}
+    assert summary["water_states"] == 2
+
+
+def test_sync_keeps_matching_and_tracking_when_the_pipeline_fails(db, monkeypatch):
+    ran = []
+
+    class FakeSyncService:
+        def __init__(self, adapter, db):
+            pass
+
+        async def full_sync(self, **kwargs):
+            return {"discovery": {"farms": []}, "blocks_created": [], "errors": []}
+
+    class FakeRegistry:
+        def get_wiseconn(self):
+            return object()
+
+    def failing_build_many(self, *args, **kwargs):
+        raise RuntimeError("feature store unavailable")
+
+    class FakeMatchRunner:
+        def run(self, db, tenant_id):
+            ran.append("match")
+            return {"forward_matched": 2, "retroactive_created": 0}
+
+    class FakeTracker:
+        def run(self, db, tenant_id):
+            ran.append("outcomes")
+            return 1
+
+    _seed(db, block_count=1)
+    monkeypatch.setattr(scheduler.settings, "WISECONN_API_KEY", "test-key")
+    monkeypatch.setattr(scheduler.settings, "SCHEDULER_COMPUTE_WORKERS", 1)
+    monkeypatch.setattr(scheduler, "SessionLocal", lambda: db)
+    monkeypatch.setattr(db, "close", lambda: None)
+    monkeypatch.setattr(scheduler, "AdapterRegistry", FakeRegistry)
+    monkeypatch.setattr(scheduler, "WiseConnSyncService", FakeSyncService)
+    monkeypatch.setattr(FeatureBuilder, "build_many", failing_build_many)
+    monkeypatch.setattr(scheduler, "ScheduleMatchRunner", FakeMatchRunner)
+    monkeypatch.setattr(scheduler, "RecommendationOutcomeTracker", FakeTracker)
+
+    asyncio.run(scheduler.run_wiseconn_sync())
+
+    result = scheduler.get_last_sync_result()
+    assert result["status"] == "success"
+    assert result["summary"]["water_states_estimated"] == 0
+    assert result["summary"]["schedules_matched"] == 2
+    assert result["summary"]["verifications_processed"] == 1
+    assert ran == ["match", "outcomes"]
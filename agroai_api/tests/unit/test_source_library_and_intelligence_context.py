@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
 from io import BytesIO
 from types import SimpleNamespace
 
@@ -10,10 +11,18 @@ from sqlalchemy.pool import StaticPool
 
 from app.api.v1.source_library import list_source_library, source_public
 from app.db.base import Base
-from app.models.operational_records import DataSource, EvidenceRecord, IngestionJob
+from app.models.operational_records import DataSource, DataSourceTextPage, EvidenceRecord, IngestionJob
 from app.models.saas import Organization, User
+from app.models.task_outbox import TaskOutbox
+from app.services import source_content
 from app.services.intelligence_context import _source_rows
-from app.services.source_content import source_content_excerpt
+from app.services.source_content import extract_source_text, source_content_excerpt
+from app.services.source_text_jobs import (
+    TASK_TYPE as SOURCE_TEXT_TASK_TYPE,
+    queue_missing_source_text,
+    queue_source_text_extraction,
+)
+from app.services.source_text_runner import process_source_text_job
 
 
 def _session():
@@ -190,3 +199,123 @@ def test_intelligence_source_context_contains_bounded_uploaded_content():
     assert rows[0]["parsed_rows_preview"][0]["field"] == "North"
     assert citations[0].source_id == "source-context"
     assert citations[0].title == "field-log.csv"
+
+
+def _two_page_pdf(path):
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(72, 720, "North field irrigation allocation is 42 acre-feet")
+    pdf.showPage()
+    pdf.drawString(72, 720, "South field allocation is 37 acre-feet")
+    pdf.save()
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def _pdf_source(source_id, path):
+    return DataSource(
+        id=source_id,
+        tenant_id="org-source-test",
+        provider="manual_csv",
+        source_type="pdf_document",
+        filename="allocation.pdf",
+        content_type="application/pdf",
+        storage_path=str(path),
+        raw_text="%PDF binary placeholder",
+        metadata_json={},
+        status="parsed_with_warnings",
+    )
+
+
+def test_pdf_pages_are_extracted_once_per_content_hash_and_read_without_downloading(tmp_path, monkeypatch):
+    db = _session()
+    try:
+        path = _two_page_pdf(tmp_path / "allocation.pdf")
+        first = _pdf_source("source-pdf-first", path)
+        db.add(first)
+        db.flush()
+
+        state = extract_source_text(db, first)
+        db.commit()
+        assert state["status"] == "ready"
+        assert state["page_count"] == 2
+        assert state["reused"] is False
+        assert [row.page_number for row in db.query(DataSourceTextPage).order_by(DataSourceTextPage.page_number)] == [1, 2]
+
+        # The same document uploaded again reuses the stored pages without a download.
+        second = _pdf_source("source-pdf-second", tmp_path / "deleted.pdf")
+        second.content_sha256 = state["content_sha256"]
+        db.add(second)
+        db.flush()
+        assert extract_source_text(db, second)["reused"] is True
+        db.commit()
+        assert db.query(DataSourceTextPage).count() == 2
+
+        # A PDF uploaded before worker extraction has no state and is still parsed on demand.
+        legacy = _pdf_source("source-pdf-legacy", path)
+        assert "South field allocation" in source_content_excerpt(legacy, db=db)
+        assert source_public(legacy)["intelligence_ready"] is True
+
+        def no_download(_source):
+            raise AssertionError("intelligence context must not download source objects")
+
+        monkeypatch.setattr(source_content, "_read_source_bytes", no_download)
+        ctx = SimpleNamespace(db=db, sources=[second], organization_id="org-source-test", workspace_id=None)
+        rows, _citations = _source_rows(ctx, source_limit=5)
+        assert "North field irrigation allocation" in rows[0]["content_excerpt"]
+        assert "South field allocation is 37 acre-feet" in rows[0]["content_excerpt"]
+        assert source_content_excerpt(second, max_chars=20, db=db) == "North field irrigati"
+        assert source_public(second)["intelligence_ready"] is True
+
+        pending = _pdf_source("source-pdf-pending", path)
+        pending.metadata_json = {"text_extraction": {"status": "queued"}}
+        assert source_content_excerpt(pending, db=db) == ""
+        assert source_public(pending)["intelligence_ready"] is False
+    finally:
+        db.close()
+
+
+def test_queued_extraction_runs_in_the_worker(tmp_path):
+    db = _session()
+    try:
+        source = _pdf_source("source-pdf-queued", _two_page_pdf(tmp_path / "allocation.pdf"))
+        db.add(source)
+        db.commit()
+
+        job, existing = queue_source_text_extraction(db, source=source)
+        assert existing is False
+        assert source.metadata_json["text_extraction"] == {"status": "queued"}
+        assert source_public(source)["intelligence_ready"] is False
+        assert queue_source_text_extraction(db, source=source) == (job, True)
+        assert db.query(TaskOutbox).filter(TaskOutbox.job_id == job.id).one().task_type == SOURCE_TEXT_TASK_TYPE
+
+        assert process_source_text_job(db, job_id=job.id, tenant_id="org-source-test", worker_id="worker-1") == "succeeded"
+        db.expire_all()
+        assert db.get(IngestionJob, job.id).output_json["page_count"] == 2
+        refreshed = db.get(DataSource, source.id)
+        assert refreshed.metadata_json["text_extraction"]["status"] == "ready"
+        assert queue_source_text_extraction(db, source=refreshed) == (None, False)
+    finally:
+        db.close()
+
+
+def test_backfill_reaches_pdfs_older_than_one_batch(tmp_path):
+    db = _session()
+    try:
+        path = _two_page_pdf(tmp_path / "allocation.pdf")
+        started = datetime(2026, 1, 1)
+        for index in range(5):
+            source = _pdf_source(f"source-pdf-backfill-{index}", path)
+            source.created_at = started + timedelta(days=index)
+            if index >= 3:
+                source.metadata_json = {"text_extraction": {"status": "ready"}}
+            db.add(source)
+        db.commit()
+
+        # The two newest PDFs are already extracted; the older three still get queued.
+        assert queue_missing_source_text(db, limit=2) == 3
+        queued = {job.data_source_id for job in db.query(IngestionJob).filter(IngestionJob.job_type == SOURCE_TEXT_TASK_TYPE)}
+        assert queued == {f"source-pdf-backfill-{index}" for index in range(3)}
+        assert queue_missing_source_text(db, limit=2) == 0
+    finally:
+        db.close()
@@ -10,7 +10,7 @@ from sqlalchemy.pool import StaticPool
 from app.api.deps import AuthContext, get_auth_context
 from app.db.base import Base, get_db
 from app.main import app
-from app.models.operational_records import ConnectorConnection, DataSource, EvidenceRecord, IngestionJob
+from app.models.operational_records import ConnectorConnection, DataSource, DataSourceTextPage, EvidenceRecord, IngestionJob
 from app.models.saas import Organization, OrganizationMembership, UsageEvent, User, Workspace
 from app.models.task_outbox import TaskOutbox
 
@@ -171,6 +171,46 @@ def test_completed_source_delete_removes_object_evidence_jobs_and_allows_reuploa
         _cleanup_overrides()
 
 
+def test_source_delete_removes_extracted_text_once_no_source_shares_it(monkeypatch):
+    Session, _auth = _runtime()
+    monkeypatch.setattr("app.services.source_deletion.get_object_store", lambda: FakeObjectStore())
+    content_sha256 = "c" * 64
+    with Session() as db:
+        for source_id in ("source-pdf-a", "source-pdf-b"):
+            db.add(
+                DataSource(
+                    id=source_id,
+                    tenant_id="source-org",
+                    workspace_id="source-workspace",
+                    connector_connection_id="source-connection",
+                    provider="manual_csv",
+                    source_type="pdf_document",
+                    filename=f"{source_id}.pdf",
+                    content_type="application/pdf",
+                    storage_path=f"s3://agroai-test/agroai/tenants/source/raw/{source_id}.pdf",
+                    metadata_json={"text_extraction": {"status": "ready", "content_sha256": content_sha256, "page_count": 2}},
+                    status="parsed",
+                    content_sha256=content_sha256 if source_id == "source-pdf-a" else None,
+                )
+            )
+        for page_number in (1, 2):
+            db.add(DataSourceTextPage(tenant_id="source-org", content_sha256=content_sha256, page_number=page_number, text=f"Page {page_number}"))
+        db.commit()
+
+    def pages():
+        with Session() as db:
+            return db.query(DataSourceTextPage).filter(DataSourceTextPage.content_sha256 == content_sha256).count()
+
+    try:
+        client = TestClient(app)
+        assert client.delete("/v1/source-library/source-pdf-a").status_code == 200
+        assert pages() == 2
+        assert client.delete("/v1/source-library/source-pdf-b").status_code == 200
+        assert pages() == 0
+    finally:
+        _cleanup_overrides()
+
+
 def test_pending_upload_can_be_cancelled_and_deleted(monkeypatch):
     Session, _auth = _runtime()
     fake = FakeObjectStore()
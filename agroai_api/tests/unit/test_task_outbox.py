@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.metrics import task_outbox_publish_lag
 from app.db.base import Base
 from app.models.hardened_records import IngestionJobState
 from app.models.task_outbox import TaskOutbox
@@ -135,3 +136,87 @@ def test_stale_published_job_is_rearmed_for_delivery():
     assert row.published_at is None
     assert row.next_attempt_at is not None
     assert "automatically re-armed" in row.last_error
+
+
+def test_batch_is_published_in_one_call_and_recorded_in_one_commit(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rows = [_pending_row(db)[1] for _ in range(3)]
+    rows[0].created_at = datetime.utcnow() - timedelta(seconds=90)
+    db.commit()
+
+    class BatchQueue:
+        def __init__(self):
+            self.batches = []
+
+        def enqueue_many(self, tasks):
+            self.batches.append(list(tasks))
+            return [RuntimeError("stream full"), "2-0", "3-0"]
+
+    queue = BatchQueue()
+    monkeypatch.setattr("app.services.task_outbox_service.get_task_publisher", lambda: queue)
+    commits = []
+    original_commit = db.commit
+    monkeypatch.setattr(db, "commit", lambda: commits.append(True) or original_commit())
+
+    assert publish_pending_outbox(db) == {"published": 2, "failed": 1}
+
+    # One commit claims the batch and one records every outcome.
+    assert len(commits) == 2
+    assert len(queue.batches) == 1 and len(queue.batches[0]) == 3
+    statuses = {row.id: (row.status, row.publish_attempts) for row in db.query(TaskOutbox)}
+    assert statuses[rows[0].id] == ("pending", 1)
+    assert statuses[rows[1].id] == ("published", 0)
+    # The failed row is backing off but still unpublished, so it keeps the lag up.
+    assert task_outbox_publish_lag.labels(outbox="task")._value.get() >= 90
+
+
+def test_outcome_does_not_overwrite_a_claim_taken_over_by_another_drainer(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    _job, row = _pending_row(db)
+
+    class SlowQueue(FakeQueue):
+        def enqueue(self, job_id, tenant_id, task_type):
+            # The claim timed out; another drainer re-claimed and published the row.
+            with Session() as other:
+                other.query(TaskOutbox).filter(TaskOutbox.id == row.id).update(
+                    {"status": "published", "published_at": datetime.utcnow(), "updated_at": datetime.utcnow() + timedelta(seconds=1)}
+                )
+                other.commit()
+            raise RuntimeError("publish timed out")
+
+    monkeypatch.setattr("app.services.task_outbox_service.get_task_publisher", lambda: SlowQueue())
+    publish_pending_outbox(db)
+    db.refresh(row)
+
+    assert row.status == "published"
+    assert row.publish_attempts == 0
+    assert row.last_error is None
+
+
+def test_publish_lag_reports_the_oldest_due_row(monkeypatch):
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    _job, row = _pending_row(db)
+    row.created_at = datetime.utcnow() - timedelta(seconds=120)
+    db.commit()
+
+    def unavailable():
+        raise RuntimeError("external task queue is not configured")
+
+    monkeypatch.setattr("app.services.task_outbox_service.get_task_publisher", unavailable)
+    assert publish_pending_outbox(db) == {"published": 0, "failed": 1}
+    db.refresh(row)
+    assert row.status == "pending"
+    assert "not configured" in row.last_error
+
+    row.next_attempt_at = None
+    db.commit()
+    monkeypatch.setattr("app.services.task_outbox_service._claim_outbox_batch", lambda db, limit: [])
+    publish_pending_outbox(db)
+    assert task_outbox_publish_lag.labels(outbox="task")._value.get() >= 120
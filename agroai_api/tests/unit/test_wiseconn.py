@@ -387,3 +387,203 @@ class TestEndToEndMocked:
         assert len(measures) == 2
         cm = adapter.map_measure(measures[0], "101")
         assert cm.variable == "soil_vwc"
+
+
+# ---------------------------------------------------------------------------
+# Bulk telemetry persistence
+# ---------------------------------------------------------------------------
+
+class TestPersistDataPoints:
+    """Bulk ingestion keeps (ingested, skipped) exact."""
+
+    @pytest.fixture
+    def service(self, db, adapter):
+        from app.models import Block, Tenant
+        from app.services.wiseconn_sync import WiseConnSyncService
+
+        db.add(Tenant(id="wiseconn-demo", name="WiseConn Demo", tier="standard", active=True))
+        db.add(Block(id="wc-101", tenant_id="wiseconn-demo", name="Zone 1", area_ha=1.0))
+        db.commit()
+        return WiseConnSyncService(adapter=adapter, db=db)
+
+    @staticmethod
+    def _points(count, start=datetime(2024, 3, 15, 0, 0, 0)):
+        from app.schemas.wiseconn import CanonicalDataPoint
+
+        return [
+            CanonicalDataPoint(
+                timestamp=start + timedelta(minutes=15 * i),
+                value=30.0 + i * 0.1,
+                unit="%",
+                variable="soil_vwc",
+                depth_inches=12.0,
+                source_measure_id="201",
+            )
+            for i in range(count)
+        ]
+
+    def test_counts_are_exact_across_repeated_batches(self, service, db):
+        from app.models import Telemetry
+
+        assert service._persist_data_points(self._points(25), "101", "wiseconn-demo", chunk_size=7) == (25, 0)
+        assert service._persist_data_points(self._points(40), "101", "wiseconn-demo", chunk_size=7) == (15, 25)
+        assert db.query(Telemetry).count() == 40
+        row = db.query(Telemetry).first()
+        assert row.ingested_at is not None
+        assert row.meta_data["measure_id"] == "201"
+
+    def test_duplicates_within_one_batch_are_skipped(self, service):
+        points = self._points(5)
+        assert service._persist_data_points(points + points[:2], "101", "wiseconn-demo") == (5, 2)
+
+    def test_generic_dialect_path_resolves_existing_ids_with_in_query(self, service, db, monkeypatch):
+        service._persist_data_points(self._points(10), "101", "wiseconn-demo")
+        monkeypatch.setattr(db.get_bind().dialect, "name", "generic")
+        assert service._persist_data_points(self._points(12), "101", "wiseconn-demo", chunk_size=5) == (2, 10)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent measure fetching
+# ---------------------------------------------------------------------------
+
+class TestConcurrentIngestion:
+    """ingest_telemetry fans out measure fetches under the provider limiter."""
+
+    @pytest.mark.asyncio
+    async def test_measures_fetched_concurrently_with_bounded_fan_out(self, adapter):
+        import asyncio
+
+        from app.adapters.wiseconn import WiseConnServerError
+        from app.services.provider_concurrency import ProviderConcurrencyLimiter
+        from app.services.wiseconn_sync import WiseConnSyncService
+
+        in_flight = 0
+        peak = 0
+
+        async def get_measure_data(measure_id, start, end):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if measure_id == "m-3":
+                raise WiseConnServerError("Server error 503")
+            return [{"time": "2024-03-15T10:00:00", "value": "35.2"}]
+
+        adapter.get_measure_data = get_measure_data
+        limiter = ProviderConcurrencyLimiter(
+            "wiseconn", max_concurrency=4, rate_limit_errors=(),
+        )
+        svc = WiseConnSyncService(adapter=adapter, limiter=limiter)
+        svc._measures["101"] = [
+            CanonicalMeasure(
+                provider_id=f"m-{i}", name=f"Measure {i}", zone_provider_id="101",
+                variable="soil_vwc", unit="%",
+            )
+            for i in range(12)
+        ]
+
+        now = datetime(2024, 3, 16)
+        result = await svc.ingest_telemetry("101", now - timedelta(days=1), now)
+
+        assert peak == 4
+        assert result["measures_processed"] == 11
+        assert result["points_ingested"] == 11
+        assert result["errors"] == ["Data fetch failed for measure Measure 3: Server error 503"]
+
+
+# ---------------------------------------------------------------------------
+# Incremental sync watermarks
+# ---------------------------------------------------------------------------
+
+class TestIncrementalWatermarks:
+    """Per-measure high-water marks narrow the requested window."""
+
+    @pytest.fixture
+    def service(self, db, adapter):
+        from app.models import Block, Tenant
+        from app.services.wiseconn_sync import WiseConnSyncService
+
+        db.add(Tenant(id="wiseconn-demo", name="WiseConn Demo", tier="standard", active=True))
+        db.add(Block(id="wc-101", tenant_id="wiseconn-demo", name="Zone 1", area_ha=1.0))
+        db.commit()
+        svc = WiseConnSyncService(adapter=adapter, db=db)
+        svc._measures["101"] = [
+            CanonicalMeasure(
+                provider_id=measure_id, name=measure_id, zone_provider_id="101",
+                variable="soil_vwc", unit="%", depth_inches=depth,
+            )
+            for measure_id, depth in (("m-a", 12.0), ("m-b", 24.0))
+        ]
+        return svc
+
+    @staticmethod
+    def _fake_provider(adapter, latest):
+        """Serve 15-minute points up to ``latest[measure_id]``, recording requests."""
+        requests = []
+
+        async def get_measure_data(measure_id, start, end):
+            requests.append((measure_id, start, end))
+            points = []
+            ts = start.replace(minute=0, second=0, microsecond=0)
+            while ts <= min(end, latest[measure_id]):
+                if ts >= start:
+                    points.append({"time": ts.isoformat(), "value": "30.0"})
+                ts += timedelta(minutes=15)
+            return points
+
+        adapter.get_measure_data = get_measure_data
+        return requests
+
+    @pytest.mark.asyncio
+    async def test_second_cycle_only_requests_data_after_watermark(self, service, adapter, db, monkeypatch):
+        from app.models.provider_sync import ProviderMeasureWatermark
+        from app.services import wiseconn_sync
+
+        monkeypatch.setattr(wiseconn_sync.settings, "SYNC_WATERMARK_OVERLAP_MINUTES", 30)
+        latest = {"m-a": datetime(2024, 3, 15, 12, 0), "m-b": datetime(2024, 3, 15, 6, 0)}
+        requests = self._fake_provider(adapter, latest)
+        start = datetime(2024, 3, 14)
+
+        first = await service.ingest_telemetry("101", start, datetime(2024, 3, 15, 12), incremental=True)
+        assert first["measures_incremental"] == 0
+        assert {r[1] for r in requests} == {start}
+        marks = {
+            w.measure_id: w.high_water_mark
+            for w in db.query(ProviderMeasureWatermark).all()
+        }
+        assert marks == latest
+
+        requests.clear()
+        latest["m-a"] = datetime(2024, 3, 15, 13, 0)
+        second = await service.ingest_telemetry("101", start, datetime(2024, 3, 15, 13), incremental=True)
+
+        assert second["measures_incremental"] == 2
+        assert sorted(r[:2] for r in requests) == [
+            ("m-a", datetime(2024, 3, 15, 11, 30)),
+            ("m-b", datetime(2024, 3, 15, 5, 30)),
+        ]
+        # Only the four new m-a points are stored; the overlap is deduplicated
+        assert second["points_ingested"] == 4
+        assert second["points_skipped"] == 6
+        mark = db.query(ProviderMeasureWatermark).filter_by(measure_id="m-a").one()
+        assert mark.high_water_mark == datetime(2024, 3, 15, 13, 0)
+
+    @pytest.mark.asyncio
+    async def test_backfill_refetches_full_window_without_regressing_watermark(self, service, adapter, db):
+        from app.models.provider_sync import ProviderMeasureWatermark
+
+        latest = {"m-a": datetime(2024, 3, 15, 12, 0), "m-b": datetime(2024, 3, 15, 12, 0)}
+        requests = self._fake_provider(adapter, latest)
+        await service.ingest_telemetry(
+            "101", datetime(2024, 3, 15), datetime(2024, 3, 15, 12), incremental=True,
+        )
+
+        requests.clear()
+        backfill = await service.ingest_telemetry("101", datetime(2024, 3, 10), datetime(2024, 3, 11))
+
+        assert {r[1] for r in requests} == {datetime(2024, 3, 10)}
+        assert backfill["measures_incremental"] == 0
+        assert backfill["points_ingested"] == 2 * 97
+        marks = {w.high_water_mark for w in db.query(ProviderMeasureWatermark).all()}
+        assert marks == {datetime(2024, 3, 15, 12, 0)}
@@ -11,7 +11,7 @@ export interface Env {
   CONNECTOR_TASKS: Queue<ConnectorTaskEnvelope>;
 }
 
-export type ConnectorTaskType = "connector_ingest_object" | "connector_provider_sync" | "platform_webhook_delivery" | "platform_api_operation" | "platform_stripe_meter_export";
+export type ConnectorTaskType = "connector_ingest_object" | "connector_provider_sync" | "platform_webhook_delivery" | "platform_api_operation" | "platform_stripe_meter_export" | "source_text_extract";
 
 export interface ConnectorTaskEnvelope {
   job_id: string;
@@ -29,10 +29,12 @@ const DEFAULT_ALLOWED_ORIGINS = [
 ];
 const PAGES_ORIGIN = /^https:\/\/(?:[a-z0-9-]+\.)?(?:agroai-portal|lamine-github-io|agroai-command-center-v2-preview)\.pages\.dev$/i;
 const TRANSIENT_UPSTREAM_STATUS = new Set([408, 429, 502, 503, 504]);
-const ALLOWED_TASK_TYPES = new Set<ConnectorTaskType>(["connector_ingest_object", "connector_provider_sync", "platform_webhook_delivery", "platform_api_operation", "platform_stripe_meter_export"]);
+const ALLOWED_TASK_TYPES = new Set<ConnectorTaskType>(["connector_ingest_object", "connector_provider_sync", "platform_webhook_delivery", "platform_api_operation", "platform_stripe_meter_export", "source_text_extract"]);
 const SAFE_REQUEST_ID = /^[A-Za-z0-9._:-]{1,128}$/;
 const EDGE_VERSION = "cloudflare-edge-v1";
 const MAX_TASK_FIELD_LENGTH = 256;
+// Queue sendBatch accepts at most 100 messages per call.
+const MAX_TASK_BATCH = 100;
 
 export function configuredOrigins(env: Pick<Env, "ALLOWED_ORIGINS">): Set<string> {
   const configured = (env.ALLOWED_ORIGINS || "")
@@ -229,6 +231,42 @@ async function enqueueTask(request: Request, env: Env): Promise<Response> {
   return json({ status: "queued", job_id: task.job_id }, 202);
 }
 
+export async function enqueueTaskBatch(request: Request, env: Env): Promise<Response> {
+  if (!matchesConfiguredToken(bearerToken(request), env.QUEUE_PUBLISH_TOKEN, env.QUEUE_PUBLISH_TOKEN_PREVIOUS)) {
+    return json({ error: "unauthorized" }, 401);
+  }
+  let payload: unknown;
+  try {
+    payload = await request.json();
+  } catch {
+    return json({ error: "invalid_json" }, 400);
+  }
+  const items = (payload as { tasks?: unknown } | null)?.tasks;
+  if (!Array.isArray(items) || items.length === 0 || items.length > MAX_TASK_BATCH) {
+    return json({ error: "invalid_connector_task_batch" }, 400);
+  }
+  // Invalid items are reported by index so one bad row does not hold back the rest of the batch.
+  const enqueuedAt = new Date().toISOString();
+  const tasks: ConnectorTaskEnvelope[] = [];
+  const rejected: { index: number; error: string }[] = [];
+  items.forEach((item, index) => {
+    if (!validTask(item)) {
+      rejected.push({ index, error: "invalid_connector_task" });
+      return;
+    }
+    tasks.push({
+      job_id: item.job_id.trim(),
+      tenant_id: item.tenant_id.trim(),
+      task_type: item.task_type.trim() as ConnectorTaskType,
+      enqueued_at: enqueuedAt,
+      attempt: 0,
+    });
+  });
+  if (tasks.length === 0) return json({ error: "invalid_connector_task", rejected }, 400);
+  await env.CONNECTOR_TASKS.sendBatch(tasks.map((body) => ({ body, contentType: "json" as const })));
+  return json({ status: "queued", count: tasks.length, job_ids: tasks.map((task) => task.job_id), rejected }, 202);
+}
+
 export async function consumeTask(message: Message<ConnectorTaskEnvelope>, env: Env): Promise<void> {
   const task = message.body;
   if (!validTask(task)) {
@@ -323,6 +361,11 @@ async function handleFetch(request: Request, env: Env): Promise<Response> {
     return mergeCors(json({ status: "ok", service: "agroai-api-edge", version: EDGE_VERSION, environment: env.EDGE_ENVIRONMENT || "unknown" }), origin, env, id);
   }
 
+  if (url.pathname === "/v1/internal/edge/connector-tasks/batch" && request.method === "POST") {
+    const response = await enqueueTaskBatch(request, env);
+    return mergeCors(response, origin, env, id);
+  }
+
   if (url.pathname === "/v1/internal/edge/connector-tasks" && request.method === "POST") {
     const response = await enqueueTask(request, env);
     return mergeCors(response, origin, env, id);
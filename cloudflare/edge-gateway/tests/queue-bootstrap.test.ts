@@ -1,5 +1,5 @@
 import { describe, expect, it, vi } from "vitest";
-import { consumeTask, type ConnectorTaskEnvelope, type Env } from "../src/index";
+import { consumeTask, enqueueTaskBatch, validTask, type ConnectorTaskEnvelope, type Env } from "../src/index";
 
 describe("queue bootstrap safety", () => {
   it("retries and never acknowledges when consumer custody is absent", async () => {
@@ -28,3 +28,83 @@ describe("queue bootstrap safety", () => {
     fetchSpy.mockRestore();
   });
 });
+
+describe("queue batch publication", () => {
+  const env = (sendBatch: ReturnType<typeof vi.fn>) =>
+    ({
+      UPSTREAM_API_ORIGIN: "https://api-preview.agroai-pilot.com",
+      QUEUE_CONSUMER_TOKEN: "consumer-test-value",
+      QUEUE_PUBLISH_TOKEN: "publish-test-value",
+      CONNECTOR_TASKS: { sendBatch },
+    }) as unknown as Env;
+  const publish = (body: unknown) =>
+    new Request("https://edge.test/v1/internal/edge/connector-tasks/batch", {
+      method: "POST",
+      headers: { authorization: "Bearer publish-test-value", "content-type": "application/json" },
+      body: JSON.stringify(body),
+    });
+
+  it("sends every task in one queue batch", async () => {
+    const sendBatch = vi.fn().mockResolvedValue(undefined);
+    const tasks = [
+      { job_id: "job-1", tenant_id: "tenant-1", task_type: "connector_ingest_object" },
+      { job_id: "job-2", tenant_id: "tenant-1", task_type: "platform_webhook_delivery" },
+    ];
+
+    const response = await enqueueTaskBatch(publish({ tasks }), env(sendBatch));
+
+    expect(response.status).toBe(202);
+    expect(await response.json()).toMatchObject({ status: "queued", count: 2, job_ids: ["job-1", "job-2"] });
+    expect(sendBatch).toHaveBeenCalledTimes(1);
+    expect(sendBatch.mock.calls[0][0].map((message: { body: ConnectorTaskEnvelope }) => message.body.job_id)).toEqual(["job-1", "job-2"]);
+  });
+
+  it("accepts every task type the API publishes", async () => {
+    const sendBatch = vi.fn().mockResolvedValue(undefined);
+    const tasks = [
+      "connector_ingest_object",
+      "connector_provider_sync",
+      "platform_webhook_delivery",
+      "platform_api_operation",
+      "platform_stripe_meter_export",
+      "source_text_extract",
+    ].map((task_type, index) => ({ job_id: `job-${index}`, tenant_id: "tenant-1", task_type }));
+
+    expect(tasks.every(validTask)).toBe(true);
+    const response = await enqueueTaskBatch(publish({ tasks }), env(sendBatch));
+
+    expect(response.status).toBe(202);
+    expect(sendBatch.mock.calls[0][0]).toHaveLength(tasks.length);
+  });
+
+  it("sends the valid tasks and reports each invalid one by index", async () => {
+    const sendBatch = vi.fn().mockResolvedValue(undefined);
+    const tasks = [
+      { job_id: "job-1", tenant_id: "tenant-1", task_type: "connector_ingest_object" },
+      { job_id: "job-2", tenant_id: "tenant-1", task_type: "unknown" },
+      { job_id: "job-3", tenant_id: "tenant-1", task_type: "platform_webhook_delivery" },
+    ];
+
+    const response = await enqueueTaskBatch(publish({ tasks }), env(sendBatch));
+
+    expect(response.status).toBe(202);
+    expect(await response.json()).toMatchObject({
+      status: "queued",
+      count: 2,
+      job_ids: ["job-1", "job-3"],
+      rejected: [{ index: 1, error: "invalid_connector_task" }],
+    });
+    expect(sendBatch.mock.calls[0][0].map((message: { body: ConnectorTaskEnvelope }) => message.body.job_id)).toEqual(["job-1", "job-3"]);
+  });
+
+  it("rejects a batch with no valid task without sending", async () => {
+    const sendBatch = vi.fn();
+    const tasks = [{ job_id: "job-1", tenant_id: "tenant-1", task_type: "unknown" }];
+
+    const response = await enqueueTaskBatch(publish({ tasks }), env(sendBatch));
+
+    expect(response.status).toBe(400);
+    expect(await response.json()).toMatchObject({ rejected: [{ index: 0, error: "invalid_connector_task" }] });
+    expect(sendBatch).not.toHaveBeenCalled();
+  });
+});